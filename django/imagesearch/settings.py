@@ -154,6 +154,29 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # 업로드 파일 개수 제한 (기본값: 1000)
 DATA_UPLOAD_MAX_NUMBER_FILES = int(os.getenv("DATA_UPLOAD_MAX_NUMBER_FILES", "1000"))
 
+# 업로드 중복 판별 설정
+# 지각 해시(dHash)가 같은 이미지는 기존 임베딩을 재사용해 API 호출을 생략
+IMAGE_PERCEPTUAL_HASH_ENABLED = (
+    os.getenv("IMAGE_PERCEPTUAL_HASH_ENABLED", "True").lower() == "true"
+)
+
+# 오프라인 역지오코딩 설정 (GeoPlace 테이블, load_geonames 커맨드로 적재)
+REVERSE_GEOCODER = {
+    # 이 거리 안에 지명이 없으면 도시명을 비워 둠
+    "MAX_DISTANCE_KM": float(os.getenv("REVERSE_GEOCODER_MAX_DISTANCE_KM", "50")),
+    # 좌표 격자 메모 캐시 정밀도 (소수점 자릿수, 2 ≈ 1km)
+    "GRID_PRECISION": int(os.getenv("REVERSE_GEOCODER_GRID_PRECISION", "2")),
+    "MEMO_SIZE": int(os.getenv("REVERSE_GEOCODER_MEMO_SIZE", "10000")),
+}
+
+# EXIF 촬영일 타임존 판별 설정 (TimezoneFinder는 프로세스당 한 번만 로드)
+TIMEZONE_RESOLVER = {
+    # True면 폴리곤 데이터를 메모리에 올려 조회가 빨라지는 대신 메모리 사용 증가
+    "IN_MEMORY": os.getenv("TIMEZONE_RESOLVER_IN_MEMORY", "False").lower() == "true",
+    "GRID_PRECISION": int(os.getenv("TIMEZONE_RESOLVER_GRID_PRECISION", "2")),
+    "MEMO_SIZE": int(os.getenv("TIMEZONE_RESOLVER_MEMO_SIZE", "10000")),
+}
+
 # Celery 설정
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = "django-db"
@@ -163,24 +186,228 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+# 임베딩 마이크로 배치 설정
+# WINDOW_SECONDS 동안 모인 pending 이미지를 최대 MAX_SIZE개씩 한 번에 처리
+EMBEDDING_BATCH = {
+    "WINDOW_SECONDS": float(os.getenv("EMBEDDING_BATCH_WINDOW_SECONDS", "2")),
+    "MAX_SIZE": int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32")),
+    "CONCURRENCY": int(os.getenv("EMBEDDING_BATCH_CONCURRENCY", "4")),
+    # 이 시간 동안 processing에 머문 행은 워커가 중단된 것으로 보고 다시 처리
+    "STALE_SECONDS": int(os.getenv("EMBEDDING_BATCH_STALE_SECONDS", "900")),
+}
+
+# 업로드 수집 파이프라인 설정
+# 수신 → 메타데이터 추출 → 저장 단계가 각각 별도 큐에서 실행됩니다.
+# 단계별 동시성은 큐를 구독하는 워커의 --concurrency로 조절합니다 (docker-compose 참고).
+INGESTION_PIPELINE = {
+    # 웹 서버와 Celery 워커가 함께 접근할 수 있는 경로여야 함 (기본: MEDIA_ROOT/spool)
+    "SPOOL_DIR": os.getenv("INGESTION_SPOOL_DIR", os.path.join(MEDIA_ROOT, "spool")),
+    "RECEIVE_QUEUE": os.getenv("INGESTION_RECEIVE_QUEUE", "ingest_receive"),
+    "EXTRACT_QUEUE": os.getenv("INGESTION_EXTRACT_QUEUE", "ingest_extract"),
+    # 추출 태스크 하나가 처리하는 파일 수 (역지오코딩을 묶음 단위로 조회)
+    "EXTRACT_BATCH_SIZE": int(os.getenv("INGESTION_EXTRACT_BATCH_SIZE", "32")),
+    "PERSIST_QUEUE": os.getenv("INGESTION_PERSIST_QUEUE", "ingest_persist"),
+}
+# 클라우드 이미지 다운로드 설정 (프로바이더별 커넥션 풀 + 스트리밍 저장)
+CLOUD_DOWNLOAD = {
+    "MAX_WORKERS": int(os.getenv("CLOUD_DOWNLOAD_MAX_WORKERS", "8")),
+    "POOL_SIZE": int(os.getenv("CLOUD_DOWNLOAD_POOL_SIZE", "16")),
+    "MAX_BYTES": int(os.getenv("CLOUD_DOWNLOAD_MAX_BYTES", str(10 * 1024 * 1024))),
+    "CONNECT_TIMEOUT": float(os.getenv("CLOUD_DOWNLOAD_CONNECT_TIMEOUT", "5")),
+    "READ_TIMEOUT": float(os.getenv("CLOUD_DOWNLOAD_READ_TIMEOUT", "30")),
+    # 429/5xx 재시도 횟수와 지수 백오프 계수 (Retry-After 헤더가 있으면 우선)
+    "RETRIES": int(os.getenv("CLOUD_DOWNLOAD_RETRIES", "3")),
+    "BACKOFF_FACTOR": float(os.getenv("CLOUD_DOWNLOAD_BACKOFF_FACTOR", "0.5")),
+}
+# 클라우드 폴더 목록 캐시 설정
+# 변경분(Drive changes / Graph delta)은 refresh-cloud-folder-caches 비트 태스크가 반영
+CLOUD_FOLDER_CACHE = {
+    "CACHE_ALIAS": "default",
+    "TTL": int(os.getenv("CLOUD_FOLDER_CACHE_TTL", str(7 * 24 * 3600))),
+    # 동기화가 밀려도 이 시간(초)이 지난 목록은 다시 조회
+    "MAX_AGE": int(os.getenv("CLOUD_FOLDER_CACHE_MAX_AGE", "3600")),
+}
+
+# Microsoft Graph(OneDrive) 목록 조회 설정
+GRAPH_CLIENT = {
+    "PAGE_SIZE": int(os.getenv("GRAPH_CLIENT_PAGE_SIZE", "200")),
+    # 429/503 응답 재시도 횟수와 Retry-After 최대 대기 시간(초)
+    "MAX_RETRIES": int(os.getenv("GRAPH_CLIENT_MAX_RETRIES", "4")),
+    "MAX_RETRY_AFTER": float(os.getenv("GRAPH_CLIENT_MAX_RETRY_AFTER", "30")),
+}
+# 썸네일/미리보기 렌디션 설정 (수집 시 생성, 기존 이미지는 generate_renditions 커맨드)
+RENDITIONS = {
+    "SIZES": {
+        "thumb": int(os.getenv("RENDITION_THUMB_SIZE", "160")),
+        "preview": int(os.getenv("RENDITION_PREVIEW_SIZE", "640")),
+    },
+    "FORMAT": os.getenv("RENDITION_FORMAT", "WEBP"),
+    "QUALITY": int(os.getenv("RENDITION_QUALITY", "80")),
+    # 운영 환경에서 nginx가 렌디션을 전송하도록 할 internal location 경로
+    # (미설정 시 운영 환경 렌디션 URL은 MEDIA_URL 등 저장소 URL을 사용)
+    "X_ACCEL_REDIRECT": os.getenv("RENDITION_X_ACCEL_REDIRECT") or None,
+}
+
+# 임베딩 백엔드 설정
+# vertex(기본, Vertex AI), onnx_clip(로컬 CPU CLIP), fake(해시 기반 결정적 벡터, 오프라인 테스트용)
+# 또는 EmbeddingBackend 하위 클래스의 import 경로
+EMBEDDING_BACKEND = {
+    "BACKEND": os.getenv("EMBEDDING_BACKEND", "vertex"),
+    "OPTIONS": {
+        "IMAGE_MODEL": os.getenv("ONNX_CLIP_IMAGE_MODEL", ""),
+        "TEXT_MODEL": os.getenv("ONNX_CLIP_TEXT_MODEL", ""),
+        "TOKENIZER": os.getenv("ONNX_CLIP_TOKENIZER", ""),
+        "NAME": os.getenv("ONNX_CLIP_NAME", "clip-vit-b-32-onnx"),
+        "BATCH_SIZE": int(os.getenv("ONNX_CLIP_BATCH_SIZE", "32")),
+        "NUM_THREADS": int(os.getenv("ONNX_CLIP_NUM_THREADS", "0")),
+    },
+}
+
+# 임베딩 API 입력 전처리 (EXIF 방향 적용 후 MAX_SIDE로 축소해 JPEG로 전송)
+EMBEDDING_INPUT = {
+    "ENABLED": os.getenv("EMBEDDING_INPUT_DOWNSCALE", "True").lower() == "true",
+    "MAX_SIDE": int(os.getenv("EMBEDDING_INPUT_MAX_SIDE", "512")),
+    "JPEG_QUALITY": int(os.getenv("EMBEDDING_INPUT_JPEG_QUALITY", "90")),
+}
+
+# 감시 폴더 자동 수집 설정
+# INTERVAL마다 변경분(delta)만 조회하고, 분당 MAX_ITEMS_PER_MINUTE개까지
+# CHUNK_SIZE개 묶음으로 나눠 수신 단계에 넘깁니다 (남은 항목은 다음 주기로 이월).
+WATCHED_FOLDER_SYNC = {
+    "INTERVAL": int(os.getenv("WATCHED_FOLDER_SYNC_INTERVAL", "300")),
+    "MAX_ITEMS_PER_MINUTE": int(
+        os.getenv("WATCHED_FOLDER_MAX_ITEMS_PER_MINUTE", "120")
+    ),
+    "CHUNK_SIZE": int(os.getenv("WATCHED_FOLDER_CHUNK_SIZE", "20")),
+}
+CELERY_TASK_ROUTES = {
+    "imagesearch_gemini.tasks.ingest_receive_task": {
+        "queue": INGESTION_PIPELINE["RECEIVE_QUEUE"]
+    },
+    "imagesearch_gemini.tasks.ingest_extract_task": {
+        "queue": INGESTION_PIPELINE["EXTRACT_QUEUE"]
+    },
+    "imagesearch_gemini.tasks.ingest_persist_task": {
+        "queue": INGESTION_PIPELINE["PERSIST_QUEUE"]
+    },
+}
+
+# OAuth 토큰 관리 설정 (프로세스 메모리 → Redis → DB 순으로 조회)
+OAUTH_TOKEN_MANAGER = {
+    "CACHE_ALIAS": "default",
+    # 만료 EXPIRY_SKEW초 전부터는 만료로 취급하고, beat 태스크는 REFRESH_AHEAD초 안에
+    # 만료될 토큰을 미리 갱신
+    "EXPIRY_SKEW": int(os.getenv("OAUTH_TOKEN_EXPIRY_SKEW", "60")),
+    "REFRESH_AHEAD": int(os.getenv("OAUTH_TOKEN_REFRESH_AHEAD", "600")),
+    "LOCK_TIMEOUT": int(os.getenv("OAUTH_TOKEN_LOCK_TIMEOUT", "30")),
+    "WAIT_TIMEOUT": float(os.getenv("OAUTH_TOKEN_WAIT_TIMEOUT", "10")),
+}
+
 # Celery Beat 스케줄 설정
 CELERY_BEAT_SCHEDULE = {
     "retry-failed-embeddings": {
         "task": "imagesearch_gemini.tasks.retry_failed_embeddings",
         "schedule": 300.0,  # 5분마다 실행
     },
+    "refresh-cloud-folder-caches": {
+        "task": "imagesearch_gemini.tasks.refresh_cloud_folder_caches",
+        "schedule": float(os.getenv("CLOUD_FOLDER_CACHE_REFRESH_SECONDS", "60")),
+    },
+    "refresh-oauth-tokens": {
+        "task": "oauth.tasks.refresh_expiring_oauth_tokens",
+        "schedule": float(os.getenv("OAUTH_TOKEN_REFRESH_SECONDS", "300")),
+    },
+    "sync-watched-folders": {
+        "task": "imagesearch_gemini.tasks.sync_watched_folders",
+        "schedule": float(WATCHED_FOLDER_SYNC["INTERVAL"]),
+    },
+}
+
+# 벡터 인덱스(ANN) 설정
+# TYPE: "hnsw" 또는 "ivfflat"
+# 인덱스 종류/생성 파라미터를 바꾼 뒤에는 rebuild_vector_index 커맨드로 재생성합니다.
+VECTOR_INDEX = {
+    "TYPE": os.getenv("VECTOR_INDEX_TYPE", "hnsw"),
+    "HNSW_M": int(os.getenv("VECTOR_INDEX_HNSW_M", "16")),
+    "HNSW_EF_CONSTRUCTION": int(os.getenv("VECTOR_INDEX_HNSW_EF_CONSTRUCTION", "64")),
+    "IVFFLAT_LISTS": int(os.getenv("VECTOR_INDEX_IVFFLAT_LISTS", "100")),
+    # 쿼리 시점 파라미터 (검색마다 SET LOCAL로 적용)
+    "HNSW_EF_SEARCH": int(os.getenv("VECTOR_INDEX_HNSW_EF_SEARCH", "40")),
+    "IVFFLAT_PROBES": int(os.getenv("VECTOR_INDEX_IVFFLAT_PROBES", "10")),
+    # 거리 척도: "l2"(<->), "cosine"(<=>), "ip"(<#>, 단위 벡터 내적)
+    # ip/cosine은 저장·검색 시 벡터를 정규화합니다. 바꾼 뒤에는
+    # renormalize_embeddings → rebuild_vector_index 순서로 실행합니다.
+    "METRIC": os.getenv("VECTOR_INDEX_METRIC", "l2"),
+    # 필터가 있는 검색의 HNSW 반복 스캔: "strict_order", "relaxed_order", "off"
+    # (pgvector 0.8 이상 필요, 이전 버전은 "off")
+    "HNSW_ITERATIVE_SCAN": os.getenv(
+        "VECTOR_INDEX_HNSW_ITERATIVE_SCAN", "strict_order"
+    ),
+    "HNSW_MAX_SCAN_TUPLES": int(
+        os.getenv("VECTOR_INDEX_HNSW_MAX_SCAN_TUPLES", "20000")
+    ),
+}
+
+# 필터 검색 계획 설정
+# 필터 결과가 EXACT_THRESHOLD 이하면 정확 검색, 그보다 크면 선택도만큼
+# ef_search를 늘린 반복 스캔 ANN을 사용합니다 (최대 MAX_OVERSAMPLE배, MAX_EF_SEARCH).
+# 자주 검색하는 도시는 create_partial_vector_index 커맨드로 부분 인덱스를 만듭니다.
+SEARCH_PLANNER = {
+    "EXACT_THRESHOLD": int(os.getenv("SEARCH_PLANNER_EXACT_THRESHOLD", "5000")),
+    "MAX_OVERSAMPLE": int(os.getenv("SEARCH_PLANNER_MAX_OVERSAMPLE", "20")),
+    "MAX_EF_SEARCH": int(os.getenv("SEARCH_PLANNER_MAX_EF_SEARCH", "1000")),
+    "PARTIAL_INDEX_CACHE_SECONDS": int(
+        os.getenv("SEARCH_PLANNER_PARTIAL_INDEX_CACHE_SECONDS", "300")
+    ),
+}
+
+# 벡터 압축 저장 설정
+# MODE: "full"(float32 인덱스), "halfvec"(float16 인덱스), "binary"(비트 해밍 인덱스)
+# 압축 모드는 후보 RERANK_CANDIDATES개를 고른 뒤 float32 embedding으로 재정렬합니다.
+# 모드를 바꾸기 전에 backfill_compact_embeddings 커맨드로 기존 행을 채웁니다.
+VECTOR_STORAGE = {
+    "MODE": os.getenv("VECTOR_STORAGE_MODE", "full"),
+    "COMPACT_COLUMNS": os.getenv("VECTOR_STORAGE_COMPACT_COLUMNS", "False").lower()
+    == "true",
+    "RERANK_CANDIDATES": int(os.getenv("VECTOR_STORAGE_RERANK_CANDIDATES", "200")),
+}
+
+# 캐시 설정
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL", "redis://localhost:6379/1"),
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # Redis 장애 시 캐시 미스로 처리하고 요청은 계속 진행
+            "IGNORE_EXCEPTIONS": True,
+        },
+    }
+}
+
+# 검색어 임베딩 캐시 설정 (프로세스 LRU → Redis → SearchQuery 테이블)
+QUERY_EMBEDDING_CACHE = {
+    "LRU_SIZE": int(os.getenv("QUERY_EMBEDDING_LRU_SIZE", "1024")),
+    "LRU_TTL": int(os.getenv("QUERY_EMBEDDING_LRU_TTL", "3600")),  # 초
+    "CACHE_ALIAS": "default",  # None이면 Redis 계층 사용 안 함
+    "CACHE_TTL": int(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "604800")),  # 7일
 }
 
-# # 캐시 설정
-# CACHES = {
-#     "default": {
-#         "BACKEND": "django.core.cache.backends.redis.RedisCache",
-#         "LOCATION": os.getenv("REDIS_URL", "redis://localhost:6379/1"),
-#         "OPTIONS": {
-#             "CLIENT_CLASS": "django_redis.client.DefaultClient",
-#         },
-#     }
-# }
+# 검색 결과 캐시 설정 (정렬된 ID/거리만 저장, 적중 시 in_bulk로 행 조회)
+# 임베딩 완료/이미지 삭제 시 코퍼스 세대 번호가 올라가 이전 결과는 무효화됩니다.
+SEARCH_RESULT_CACHE = {
+    "ENABLED": os.getenv("SEARCH_RESULT_CACHE_ENABLED", "True").lower() == "true",
+    "CACHE_ALIAS": "default",  # None이면 사용 안 함
+    "CACHE_TTL": int(os.getenv("SEARCH_RESULT_CACHE_TTL", "600")),  # 초
+}
+
+# JSON 검색 API 설정 (/api/search/)
+# 벡터 검색은 WINDOW_SIZE개씩 한 번 검색해 캐시하고 페이지는 그 안에서 커서로 나눕니다.
+SEARCH_API = {
+    "DEFAULT_PAGE_SIZE": int(os.getenv("SEARCH_API_DEFAULT_PAGE_SIZE", "20")),
+    "MAX_PAGE_SIZE": int(os.getenv("SEARCH_API_MAX_PAGE_SIZE", "100")),
+    "WINDOW_SIZE": int(os.getenv("SEARCH_API_WINDOW_SIZE", "1000")),
+}
 
 # 보안 설정
 SECURE_BROWSER_XSS_FILTER = True
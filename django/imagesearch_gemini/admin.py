@@ -1,30 +1,17 @@
-from django.conf import settings
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import ImageEmbedding, SearchQuery
+from .models import ImageEmbedding, IngestionJob, SearchQuery, WatchedFolder
 
 
 @admin.register(ImageEmbedding)
 class ImageEmbeddingAdmin(admin.ModelAdmin):
     def image_thumbnail(self, obj):
         if obj.image_path:
-            # 외부 URL이면 그대로, 아니면 MEDIA_URL 기준으로 경로 생성
-            if obj.image_path.startswith("http://") or obj.image_path.startswith(
-                "https://"
-            ):
-                url = obj.image_path
-            else:
-                # image_path가 'images/...' 등 상대경로라면 MEDIA_URL + image_path
-                rel_path = obj.image_path.lstrip("/")
-                url = (
-                    settings.MEDIA_URL + rel_path
-                    if not rel_path.startswith(settings.MEDIA_URL.lstrip("/"))
-                    else rel_path
-                )
+            # 렌디션이 있으면 썸네일, 없으면 원본(외부 URL 또는 MEDIA_URL 기준)
             return format_html(
                 '<img src="{}" style="max-height:100px; max-width:150px;" />',
-                url,
+                obj.thumbnail_url,
             )
         return ""
 
@@ -47,6 +34,13 @@ class ImageEmbeddingAdmin(admin.ModelAdmin):
     search_fields = ("image_path", "image_unique_id", "location_user")
     list_filter = ("date_taken_exif", "date_taken_user", "created_at")
     readonly_fields = ("created_at", "updated_at")
+    # 압축 컬럼은 embedding에서 계산되므로 직접 편집하지 않음
+    exclude = ("embedding_half", "embedding_bits")
+
+    def get_queryset(self, request):
+        # 목록의 태그 열이 행마다 조회하지 않도록 한 번에 읽음
+        # (embedding/exif_json은 기본 매니저에서 지연 로딩, 변경 화면에서만 읽힘)
+        return super().get_queryset(request).prefetch_related("tags")
 
 
 @admin.register(SearchQuery)
@@ -54,3 +48,43 @@ class SearchQueryAdmin(admin.ModelAdmin):
     list_display = ("query_text", "searched_at")
     search_fields = ("query_text",)
     readonly_fields = ("searched_at",)
+
+
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "source",
+        "status",
+        "total_count",
+        "persisted_count",
+        "duplicate_count",
+        "failed_count",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "source")
+    readonly_fields = ("created_at", "updated_at", "finished_at")
+
+
+@admin.register(WatchedFolder)
+class WatchedFolderAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "provider",
+        "user_email",
+        "enabled",
+        "ingested_count",
+        "last_synced_at",
+    )
+    list_filter = ("provider", "enabled")
+    search_fields = ("name", "folder_id", "user_email")
+    readonly_fields = (
+        "cursor",
+        "scan_completed",
+        "last_synced_at",
+        "last_error",
+        "ingested_count",
+        "created_at",
+        "updated_at",
+    )
@@ -1,6 +1,23 @@
 from django.apps import AppConfig
+from django.core import checks
+from django.db.models.signals import post_migrate
+
+
+def _create_search_indexes(sender, using, **kwargs):
+    from .utils.search_filters import create_tag_trigram_index
+
+    create_tag_trigram_index(using)
 
 
 class ImagesearchGeminiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "imagesearch_gemini"
+
+    def ready(self):
+        # taggit_tag는 서드파티 모델이라 태그 검색용 인덱스를 migrate 후에 생성
+        post_migrate.connect(_create_search_indexes, sender=self)
+
+        from .checks import check_geoplace_loaded
+
+        # 지명 데이터가 없으면 city_from_gps가 조용히 비므로 migrate 시 경고
+        checks.register(check_geoplace_loaded, checks.Tags.database)
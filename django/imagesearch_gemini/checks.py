@@ -0,0 +1,30 @@
+from django.core.checks import Warning
+
+from .utils.geocoding import EMPTY_TABLE_MESSAGE
+
+
+def check_geoplace_loaded(app_configs, databases=None, **kwargs):
+    """역지오코딩용 GeoPlace 테이블이 비어 있으면 경고합니다.
+
+    DB를 조회하므로 database 태그로 등록되어 migrate 또는
+    check --database 실행 시에만 검사합니다.
+    """
+    from .models import GeoPlace
+
+    errors = []
+    for alias in databases or []:
+        try:
+            empty = not GeoPlace.objects.using(alias).exists()
+        except Exception:
+            # 마이그레이션 전이라 테이블이 없는 경우
+            continue
+        if empty:
+            errors.append(
+                Warning(
+                    EMPTY_TABLE_MESSAGE,
+                    hint="GeoNames cities 덤프: https://download.geonames.org/export/dump/",
+                    obj=GeoPlace,
+                    id="imagesearch_gemini.W001",
+                )
+            )
+    return errors
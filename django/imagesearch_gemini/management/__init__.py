@@ -0,0 +1 @@
+# imagesearch_gemini 관리 커맨드 패키지
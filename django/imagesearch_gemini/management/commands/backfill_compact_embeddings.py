@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Q
+
+from ...models import ImageEmbedding
+from ...utils.result_cache import bump_corpus_generation
+from ...utils.vector_storage import quantize_embeddings
+
+
+class Command(BaseCommand):
+    help = (
+        "기존 임베딩의 압축 컬럼(embedding_half, embedding_bits)을 채웁니다. "
+        "id 구간별로 짧은 UPDATE를 반복하므로 서비스 중에도 실행할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="UPDATE 한 번에 처리할 id 범위"
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="이미 채워진 행도 다시 계산합니다",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("PostgreSQL(pgvector)에서만 사용할 수 있습니다.")
+
+        batch_size = options["batch_size"]
+        queryset = ImageEmbedding.objects.filter(embedding__isnull=False)
+        if not options["force"]:
+            queryset = queryset.filter(
+                Q(embedding_half__isnull=True) | Q(embedding_bits__isnull=True)
+            )
+        max_id = queryset.aggregate(max_id=Max("id"))["max_id"]
+        if max_id is None:
+            self.stdout.write("채울 행이 없습니다.")
+            return
+
+        start_time = time.time()
+        updated = 0
+        for start in range(0, max_id + 1, batch_size):
+            updated += quantize_embeddings(
+                queryset.filter(id__gte=start, id__lt=start + batch_size)
+            )
+            self.stdout.write(f"id {start + batch_size - 1}까지 {updated}개 처리...")
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {ImageEmbedding._meta.db_table}")
+        # 거리가 바뀌었으므로 이전 값으로 캐시된 검색 결과/ETag를 무효화
+        bump_corpus_generation()
+
+        duration = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f"압축 컬럼 채우기 완료: {updated}개 ({duration:.2f}s)")
+        )
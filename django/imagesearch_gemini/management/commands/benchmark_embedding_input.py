@@ -0,0 +1,72 @@
+import os
+import time
+
+from vertexai.vision_models import Image
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import ImageEmbedding
+from ...utils.embedding_input import prepare_embedding_input
+from ...utils.embeddings import VECTOR_DIMENSION, get_embedding_model
+
+
+def _original_image(image_path: str) -> tuple:
+    """이전 방식: 원본 파일을 그대로 전송."""
+    return Image.load_from_file(image_path), os.path.getsize(image_path)
+
+
+def _prepared_image(image_path: str) -> tuple:
+    """축소/재인코딩한 JPEG를 전송."""
+    data, _ = prepare_embedding_input(image_path)
+    return Image(image_bytes=data), len(data)
+
+
+class Command(BaseCommand):
+    help = (
+        "임베딩 API 입력 이미지를 원본 그대로 보낼 때와 모델 입력 크기로 축소해 보낼 때의 "
+        "전송 바이트와 이미지당 end-to-end 지연(로드 + 전처리 + API 호출)을 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="*", help="이미지 파일 경로 (생략 시 DB의 로컬 이미지 사용)"
+        )
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument(
+            "--no-api",
+            action="store_true",
+            help="API를 호출하지 않고 전처리 비용과 전송 바이트만 측정합니다.",
+        )
+
+    def _collect_paths(self, options) -> list:
+        if options["paths"]:
+            return options["paths"]
+        image_paths = (
+            ImageEmbedding.objects.exclude(image_path__startswith="http://")
+            .exclude(image_path__startswith="https://")
+            .order_by("-id")
+            .values_list("image_path", flat=True)[: options["limit"]]
+        )
+        return [default_storage.path(path) for path in image_paths]
+
+    def handle(self, *args, **options):
+        paths = [path for path in self._collect_paths(options) if os.path.exists(path)]
+        if not paths:
+            raise CommandError("측정할 이미지가 없습니다.")
+
+        model = None if options["no_api"] else get_embedding_model()
+        cases = [("original", _original_image), ("downscaled", _prepared_image)]
+
+        self.stdout.write(f"{'case':<14}{'avg KB':>10}{'ms/image':>12}")
+        for name, load_func in cases:
+            total_bytes = 0
+            start_time = time.perf_counter()
+            for path in paths:
+                image, sent_bytes = load_func(path)
+                total_bytes += sent_bytes
+                if model is not None:
+                    model.get_embeddings(image=image, dimension=VECTOR_DIMENSION)
+            elapsed_ms = (time.perf_counter() - start_time) * 1000 / len(paths)
+            avg_kb = total_bytes / len(paths) / 1024
+            self.stdout.write(f"{name:<14}{avg_kb:>10.1f}{elapsed_ms:>12.1f}")
@@ -0,0 +1,88 @@
+import time
+
+import numpy as np
+from pgvector import Vector
+
+from django.core.management.base import BaseCommand
+
+from ...models import ImageEmbedding
+from ...utils.embeddings import VECTOR_DIMENSION
+from ...utils.search import VectorSearchEngine
+
+
+def _legacy_vector_sql(embedding) -> str:
+    """이전 방식: float 문자열을 SQL에 직접 붙여 넣던 구현."""
+    vec_str = "[" + ",".join(str(float(x)) for x in embedding) + "]"
+    return f"embedding <-> '{vec_str}'::vector"
+
+
+def _legacy_similar_images(image_id: int, limit: int) -> list:
+    """이전 방식: 기준 벡터를 Python으로 읽어와 다시 문자열로 만들던 구현."""
+    base_image = ImageEmbedding.objects.with_heavy_fields("embedding").get(
+        id=image_id, embedding_status="done"
+    )
+    similar_images = (
+        ImageEmbedding.objects.filter(embedding_status="done")
+        .exclude(id=image_id)
+        .extra(
+            select={"l2": _legacy_vector_sql(base_image.embedding)}, order_by=["l2"]
+        )[:limit]
+    )
+    return list(similar_images)
+
+
+def _measure(func, iterations: int) -> tuple:
+    """(쿼리당 CPU ms, 쿼리당 wall ms)를 반환합니다."""
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / iterations
+    wall_ms = (time.perf_counter() - wall_start) * 1000 / iterations
+    return cpu_ms, wall_ms
+
+
+class Command(BaseCommand):
+    help = (
+        "검색 쿼리 벡터 전달 방식(문자열 포맷 vs 바인딩 파라미터/서브쿼리)의 "
+        "쿼리당 CPU 비용을 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument(
+            "--image-id",
+            type=int,
+            help="지정 시 유사 이미지 조회를 실제 DB에서 비교합니다.",
+        )
+        parser.add_argument("--limit", type=int, default=10)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        embedding = np.random.default_rng(0).random(VECTOR_DIMENSION, dtype=np.float32)
+
+        rows = [
+            ("query vector / legacy str", lambda: _legacy_vector_sql(embedding)),
+            ("query vector / bound param", lambda: Vector._to_db(embedding)),
+        ]
+
+        image_id = options["image_id"]
+        if image_id is not None:
+            limit = options["limit"]
+            rows += [
+                (
+                    "similar / legacy round-trip",
+                    lambda: _legacy_similar_images(image_id, limit),
+                ),
+                (
+                    "similar / SQL subquery",
+                    lambda: list(
+                        VectorSearchEngine.get_similar_images(image_id, limit)
+                    ),
+                ),
+            ]
+
+        self.stdout.write(f"{'case':<32}{'cpu ms/q':>12}{'wall ms/q':>12}")
+        for name, func in rows:
+            cpu_ms, wall_ms = _measure(func, iterations)
+            self.stdout.write(f"{name:<32}{cpu_ms:>12.3f}{wall_ms:>12.3f}")
@@ -0,0 +1,145 @@
+import time
+
+import numpy as np
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from ...models import ImageEmbedding
+from ...utils.vector_index import (
+    BITS_INDEX_NAME,
+    EMBEDDING_INDEX_NAME,
+    HALFVEC_INDEX_NAME,
+    get_vector_index_config,
+    vector_distance,
+    vector_search_session,
+)
+from ...utils.vector_storage import (
+    MODE_BINARY,
+    MODE_FULL,
+    MODE_HALFVEC,
+    MODES,
+    annotate_distance,
+    get_rerank_candidates,
+    prepare_embedding,
+)
+
+# 모드별 (검색 컬럼, ANN 인덱스 이름)
+MODE_STORAGE = {
+    MODE_FULL: ("embedding", EMBEDDING_INDEX_NAME),
+    MODE_HALFVEC: ("embedding_half", HALFVEC_INDEX_NAME),
+    MODE_BINARY: ("embedding_bits", BITS_INDEX_NAME),
+}
+
+
+def _exact_top_ids(query_vector: np.ndarray, limit: int) -> list:
+    """인덱스 없이 순차 스캔으로 정확한 상위 limit개 id를 구합니다 (정답셋)."""
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('enable_indexscan', 'off', true)")
+        return list(
+            ImageEmbedding.objects.filter(embedding_status="done")
+            .annotate(distance=vector_distance("embedding", query_vector))
+            .order_by("distance")
+            .values_list("id", flat=True)[:limit]
+        )
+
+
+def _storage_sizes(column: str, index_name: str) -> tuple:
+    """(행당 평균 컬럼 바이트, 인덱스 바이트)를 반환합니다."""
+    table = ImageEmbedding._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT avg(pg_column_size({column})) FROM {table}")
+        column_bytes = cursor.fetchone()[0] or 0
+        cursor.execute(
+            "SELECT coalesce(pg_relation_size(to_regclass(%s)), 0)", [index_name]
+        )
+        index_bytes = cursor.fetchone()[0]
+    return float(column_bytes), index_bytes
+
+
+class Command(BaseCommand):
+    help = (
+        "벡터 저장 모드(full/halfvec/binary)별 검색 recall@k와 쿼리 지연, "
+        "컬럼/인덱스 크기를 비교합니다. 압축 모드는 재정렬 후의 결과를 측정합니다. "
+        "먼저 backfill_compact_embeddings로 압축 컬럼을 채워야 합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", type=int, default=50, help="검색 횟수")
+        parser.add_argument("--limit", type=int, default=20, help="k (결과 수)")
+        parser.add_argument(
+            "--candidates", type=int, help="재정렬 후보 수 (생략 시 settings 값)"
+        )
+        parser.add_argument("--ef-search", type=int, help="HNSW ef_search")
+        parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("PostgreSQL(pgvector)에서만 사용할 수 있습니다.")
+
+        limit = options["limit"]
+        candidates = options["candidates"] or get_rerank_candidates(limit)
+        ef_search = options["ef_search"] or get_vector_index_config()["HNSW_EF_SEARCH"]
+
+        missing = ImageEmbedding.objects.filter(
+            embedding_status="done", embedding_bits__isnull=True
+        ).count()
+        if missing and set(options["modes"]) - {MODE_FULL}:
+            self.stderr.write(
+                f"압축 컬럼이 비어 있는 행 {missing}개 (압축 모드 recall이 낮게 측정됨)"
+            )
+
+        # 저장된 임베딩에 잡음을 더해 검색어 벡터로 사용 (자기 자신만 찾는 경우 방지)
+        rng = np.random.default_rng(0)
+        samples = (
+            ImageEmbedding.objects.filter(embedding_status="done")
+            .order_by("?")
+            .values_list("embedding", flat=True)[: options["queries"]]
+        )
+        queries = []
+        for embedding in samples:
+            vector = np.asarray(embedding, dtype=np.float32)
+            noise = rng.standard_normal(vector.shape[0]).astype(np.float32)
+            query = vector + noise * float(np.std(vector)) * 0.5
+            queries.append(np.asarray(prepare_embedding(query), dtype=np.float32))
+        if not queries:
+            raise CommandError("임베딩이 생성된 이미지가 없습니다.")
+
+        truths = [set(_exact_top_ids(query, limit)) for query in queries]
+
+        self.stdout.write(
+            f"{len(queries)} queries, k={limit}, candidates={candidates}, "
+            f"ef_search={ef_search}"
+        )
+        self.stdout.write(
+            f"{'mode':<10}{'recall@k':>10}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'col B/row':>12}{'index MB':>12}"
+        )
+        for mode in options["modes"]:
+            mode_ef_search = (
+                ef_search if mode == MODE_FULL else max(ef_search, candidates)
+            )
+            latencies = []
+            recalls = []
+            for query, truth in zip(queries, truths):
+                qs = annotate_distance(
+                    ImageEmbedding.objects.filter(embedding_status="done"),
+                    query,
+                    limit,
+                    mode=mode,
+                    candidates=candidates,
+                )
+                start = time.perf_counter()
+                with vector_search_session(ef_search=mode_ef_search):
+                    ids = [obj.id for obj in qs]
+                latencies.append((time.perf_counter() - start) * 1000)
+                recalls.append(len(truth & set(ids)) / max(1, len(truth)))
+
+            column_bytes, index_bytes = _storage_sizes(*MODE_STORAGE[mode])
+            self.stdout.write(
+                f"{mode:<10}{np.mean(recalls):>10.3f}"
+                f"{np.percentile(latencies, 50):>10.2f}"
+                f"{np.percentile(latencies, 95):>10.2f}"
+                f"{column_bytes:>12.0f}{index_bytes / 1024 / 1024:>12.1f}"
+            )
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ...models import ImageEmbedding
+from ...utils.search_planner import partial_index_registry
+from ...utils.vector_index import build_partial_city_index
+
+
+class Command(BaseCommand):
+    help = (
+        "city_from_gps가 지정한 도시인 행만 담는 부분 HNSW 인덱스를 CONCURRENTLY로 "
+        "생성합니다. 장소 필터가 해당 도시와 같은 검색은 부분 인덱스로 ANN 검색합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--city",
+            action="append",
+            required=True,
+            help="도시명 (city_from_gps 값, 여러 번 지정 가능)",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="부분 인덱스를 삭제만 합니다",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("PostgreSQL(pgvector)에서만 사용할 수 있습니다.")
+        if connection.in_atomic_block:
+            raise CommandError("CONCURRENTLY 작업은 트랜잭션 밖에서 실행해야 합니다.")
+
+        start_time = time.time()
+        for city in options["city"]:
+            index = build_partial_city_index(city)
+            with connection.schema_editor(atomic=False) as editor:
+                # 거리 척도 변경 후 재생성하거나 중단되어 남은 INVALID 인덱스 정리
+                editor.remove_index(ImageEmbedding, index, concurrently=True)
+                if options["drop"]:
+                    self.stdout.write(f"{index.name} ({city}) 삭제")
+                    continue
+                rows = ImageEmbedding.objects.filter(
+                    city_from_gps=city, embedding__isnull=False
+                ).count()
+                self.stdout.write(f"{index.name} ({city}, {rows}개 행) 생성 중...")
+                editor.add_index(ImageEmbedding, index, concurrently=True)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {ImageEmbedding._meta.db_table}")
+        # 이 프로세스의 캐시만 비움 (다른 워커는 PARTIAL_INDEX_CACHE_SECONDS 후 반영)
+        partial_index_registry.clear()
+
+        duration = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f"부분 인덱스 작업 완료 ({duration:.2f}s)")
+        )
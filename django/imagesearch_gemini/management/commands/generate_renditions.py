@@ -0,0 +1,69 @@
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from ...models import ImageEmbedding
+from ...utils.renditions import generate_renditions
+from ...utils.result_cache import bump_corpus_generation
+
+
+class Command(BaseCommand):
+    help = (
+        "렌디션(썸네일/미리보기)이 없는 기존 이미지의 렌디션을 생성합니다. "
+        "외부 URL 이미지는 건너뜁니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=200, help="한 번에 저장할 행 수"
+        )
+        parser.add_argument("--limit", type=int, help="처리할 최대 이미지 수")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="이미 렌디션이 있는 이미지도 다시 확인합니다 (설정 변경 후 사용)",
+        )
+
+    def handle(self, *args, **options):
+        queryset = ImageEmbedding.objects.exclude(
+            image_path__startswith="http://"
+        ).exclude(image_path__startswith="https://")
+        if not options["force"]:
+            queryset = queryset.filter(renditions={})
+        queryset = queryset.only("id", "image_path", "content_sha256").order_by("id")
+        if options["limit"]:
+            queryset = queryset[: options["limit"]]
+
+        start_time = time.time()
+        done = failed = 0
+        pending = []
+        for obj in queryset.iterator(chunk_size=options["batch_size"]):
+            try:
+                with default_storage.open(obj.image_path, "rb") as f:
+                    obj.renditions = generate_renditions(f, obj.content_sha256)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"ID {obj.id} 렌디션 생성 실패: {e}")
+                continue
+            pending.append(obj)
+            done += 1
+            if len(pending) >= options["batch_size"]:
+                self._save(pending)
+                pending = []
+                self.stdout.write(f"{done}개 처리...")
+        if pending:
+            self._save(pending)
+
+        duration = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"렌디션 생성 완료: {done}개 성공, {failed}개 실패 ({duration:.2f}s)"
+            )
+        )
+
+    def _save(self, objs):
+        ImageEmbedding.objects.bulk_update(objs, ["renditions"])
+        # bulk_update는 post_save를 보내지 않으므로 썸네일 URL이 바뀐 것을
+        # 검색 결과 캐시/ETag에 직접 알림
+        bump_corpus_generation()
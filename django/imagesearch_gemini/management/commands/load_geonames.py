@@ -0,0 +1,104 @@
+import csv
+import io
+import re
+import sys
+import zipfile
+
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...models import GeoPlace
+
+HANGUL_RE = re.compile(r"[가-힣]")
+BATCH_SIZE = 5000
+
+
+def _open_text(path):
+    """텍스트 파일 또는 GeoNames zip 파일(첫 번째 .txt 멤버)을 엽니다."""
+    if path.endswith(".zip"):
+        archive = zipfile.ZipFile(path)
+        members = [name for name in archive.namelist() if name.endswith(".txt")]
+        if not members:
+            raise CommandError(f"zip 안에 .txt 파일이 없습니다: {path}")
+        return io.TextIOWrapper(archive.open(members[0]), encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _load_admin1_names(path):
+    """admin1CodesASCII.txt를 {"KR.11": "Seoul", ...} 형태로 읽습니다."""
+    names = {}
+    with _open_text(path) as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) >= 2:
+                names[row[0]] = row[1]
+    return names
+
+
+def _korean_name(alternate_names):
+    for name in alternate_names.split(","):
+        if HANGUL_RE.search(name):
+            return name
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        "GeoNames cities 덤프(cities1000/cities5000 등)를 GeoPlace 테이블에 적재합니다. "
+        "적재 후에는 역지오코딩이 네트워크 호출 없이 동작합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="citiesXXXX.txt 또는 .zip 경로")
+        parser.add_argument("--admin1", help="admin1CodesASCII.txt 경로 (선택)")
+        parser.add_argument(
+            "--min-population", type=int, default=0, help="이 인구 미만 지명 제외"
+        )
+        parser.add_argument(
+            "--truncate", action="store_true", help="기존 데이터를 지우고 적재"
+        )
+
+    def handle(self, *args, **options):
+        csv.field_size_limit(sys.maxsize)
+        admin1_names = (
+            _load_admin1_names(options["admin1"]) if options["admin1"] else {}
+        )
+        min_population = options["min_population"]
+
+        if options["truncate"]:
+            GeoPlace.objects.all().delete()
+
+        total = 0
+        batch = []
+        with _open_text(options["path"]) as f:
+            for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                if len(row) < 15:
+                    continue
+                population = int(row[14] or 0)
+                if population < min_population:
+                    continue
+                country_code = row[8]
+                batch.append(
+                    GeoPlace(
+                        geoname_id=int(row[0]),
+                        name=row[1][:200],
+                        name_ko=(_korean_name(row[3]) or "")[:200] or None,
+                        admin1_name=admin1_names.get(f"{country_code}.{row[10]}"),
+                        country_code=country_code,
+                        population=population,
+                        location=Point(float(row[5]), float(row[4]), srid=4326),
+                    )
+                )
+                if len(batch) >= BATCH_SIZE:
+                    total += self._flush(batch)
+                    batch = []
+        if batch:
+            total += self._flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"GeoPlace {total}건 적재 완료"))
+
+    @staticmethod
+    def _flush(batch):
+        with transaction.atomic():
+            GeoPlace.objects.bulk_create(batch, ignore_conflicts=True)
+        return len(batch)
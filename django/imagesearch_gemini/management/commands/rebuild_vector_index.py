@@ -0,0 +1,90 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ...models import ImageEmbedding
+from ...utils.vector_index import (
+    EMBEDDING_INDEX_NAME,
+    INDEX_TYPES,
+    build_embedding_index,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "ImageEmbedding.embedding ANN 인덱스(HNSW/IVFFlat)를 CONCURRENTLY로 재생성합니다. "
+        "새 인덱스를 임시 이름으로 만든 뒤 기존 인덱스와 교체하므로 "
+        "재생성 중에도 임베딩 저장과 검색이 막히지 않습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--type",
+            dest="index_type",
+            choices=INDEX_TYPES,
+            help="인덱스 종류 (생략 시 settings.VECTOR_INDEX['TYPE'])",
+        )
+        parser.add_argument("--m", type=int, help="HNSW m")
+        parser.add_argument("--ef-construction", type=int, help="HNSW ef_construction")
+        parser.add_argument("--lists", type=int, help="IVFFlat lists")
+        parser.add_argument(
+            "--maintenance-work-mem",
+            help="인덱스 생성 세션의 maintenance_work_mem (예: 1GB)",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="인덱스를 삭제만 합니다 (순차 스캔으로 되돌림)",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("PostgreSQL(pgvector)에서만 사용할 수 있습니다.")
+        if connection.in_atomic_block:
+            raise CommandError("CONCURRENTLY 작업은 트랜잭션 밖에서 실행해야 합니다.")
+
+        index_kwargs = {
+            "index_type": options["index_type"],
+            "m": options["m"],
+            "ef_construction": options["ef_construction"],
+            "lists": options["lists"],
+        }
+        index = build_embedding_index(name=EMBEDDING_INDEX_NAME, **index_kwargs)
+
+        if options["drop"]:
+            with connection.schema_editor(atomic=False) as editor:
+                editor.remove_index(ImageEmbedding, index, concurrently=True)
+            self.stdout.write(self.style.SUCCESS(f"{EMBEDDING_INDEX_NAME} 삭제 완료"))
+            return
+
+        tmp_index = build_embedding_index(
+            name=f"{EMBEDDING_INDEX_NAME}_new", **index_kwargs
+        )
+
+        if options["maintenance_work_mem"]:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config('maintenance_work_mem', %s, false)",
+                    [options["maintenance_work_mem"]],
+                )
+
+        start_time = time.time()
+        with connection.schema_editor(atomic=False) as editor:
+            # 이전 실행이 중단되어 남은 INVALID 임시 인덱스 정리
+            editor.remove_index(ImageEmbedding, tmp_index, concurrently=True)
+            self.stdout.write(
+                f"{tmp_index.name} 생성 중 ({tmp_index.suffix}, "
+                f"{', '.join(tmp_index.get_with_params())})..."
+            )
+            editor.add_index(ImageEmbedding, tmp_index, concurrently=True)
+            editor.remove_index(ImageEmbedding, index, concurrently=True)
+            editor.rename_index(ImageEmbedding, tmp_index, index)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {ImageEmbedding._meta.db_table}")
+
+        duration = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f"{EMBEDDING_INDEX_NAME} 재생성 완료 ({duration:.2f}s)")
+        )
@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max
+
+from ...models import ImageEmbedding
+from ...utils.result_cache import bump_corpus_generation
+from ...utils.vector_index import get_metric, uses_normalized_vectors
+from ...utils.vector_storage import (
+    compact_columns_enabled,
+    normalize_embeddings,
+    quantize_embeddings,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "저장된 임베딩을 DB 안에서 단위 길이로 정규화합니다. "
+        "VECTOR_INDEX['METRIC']을 ip/cosine으로 바꾼 뒤 실행하고, 이어서 "
+        "rebuild_vector_index로 인덱스를 새 operator class로 재생성합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="UPDATE 한 번에 처리할 id 범위"
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="현재 거리 척도가 l2여도 정규화합니다",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("PostgreSQL(pgvector)에서만 사용할 수 있습니다.")
+        if not uses_normalized_vectors() and not options["force"]:
+            raise CommandError(
+                f"현재 거리 척도({get_metric()})는 정규화가 필요하지 않습니다. "
+                "--force로 강제 실행할 수 있습니다."
+            )
+
+        batch_size = options["batch_size"]
+        queryset = ImageEmbedding.objects.filter(embedding__isnull=False)
+        max_id = queryset.aggregate(max_id=Max("id"))["max_id"]
+        if max_id is None:
+            self.stdout.write("정규화할 행이 없습니다.")
+            return
+
+        # 압축 컬럼도 정규화된 벡터 기준으로 다시 계산
+        requantize = compact_columns_enabled()
+        start_time = time.time()
+        updated = 0
+        for start in range(0, max_id + 1, batch_size):
+            batch = queryset.filter(id__gte=start, id__lt=start + batch_size)
+            updated += normalize_embeddings(batch)
+            if requantize:
+                quantize_embeddings(batch)
+            self.stdout.write(f"id {start + batch_size - 1}까지 {updated}개 처리...")
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {ImageEmbedding._meta.db_table}")
+        # 거리가 바뀌었으므로 이전 값으로 캐시된 검색 결과/ETag를 무효화
+        bump_corpus_generation()
+
+        duration = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f"임베딩 정규화 완료: {updated}개 ({duration:.2f}s)")
+        )
@@ -1,13 +1,64 @@
 import os
+import uuid
 
-from pgvector.django import VectorField
+from pgvector.django import BitField, HalfVectorField, VectorField
 from taggit.managers import TaggableManager
 
 from django.conf import settings
 from django.contrib.gis.db.models import PointField
-from django.db import models
-from django.db.models.signals import post_delete
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Upper
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from .utils.renditions import delete_renditions, rendition_url
+from .utils.result_cache import bump_corpus_generation
+from .utils.vector_index import build_compact_indexes, build_embedding_index
+
+# 목록/검색 화면에서 기본으로 읽지 않는 큰 컬럼 (벡터 5.6KB, 크기 제한 없는 EXIF)
+HEAVY_FIELDS = ("embedding", "embedding_half", "embedding_bits", "exif_json")
+# 검색 응답/필터에 드러나는 컬럼 (수정되면 검색 결과 캐시와 ETag를 무효화)
+SEARCH_VISIBLE_FIELDS = frozenset(
+    (
+        "image_path",
+        "renditions",
+        "gps",
+        "city_from_gps",
+        "location_user",
+        "date_taken_user",
+        "date_taken_exif",
+        "embedding_status",
+    )
+)
+
+
+class ImageEmbeddingQuerySet(models.QuerySet):
+    def with_heavy_fields(self, *fields):
+        """기본으로 제외한 큰 컬럼을 함께 읽습니다.
+
+        Args:
+            *fields: 읽을 컬럼 (생략하면 HEAVY_FIELDS 전체)
+
+        Returns:
+            QuerySet (이전에 지정한 defer/only는 초기화됨)
+
+        """
+        fields = fields or HEAVY_FIELDS
+        unknown = set(fields) - set(HEAVY_FIELDS)
+        if unknown:
+            raise ValueError(f"기본 제외 컬럼이 아닙니다: {', '.join(sorted(unknown))}")
+        remaining = [name for name in HEAVY_FIELDS if name not in fields]
+        qs = self.defer(None)
+        return qs.defer(*remaining) if remaining else qs
+
+
+class ImageEmbeddingManager(models.Manager.from_queryset(ImageEmbeddingQuerySet)):
+    def get_queryset(self):
+        # 인스턴스에서 필요할 때만 with_heavy_fields()로 명시해 읽음
+        return super().get_queryset().defer(*HEAVY_FIELDS)
 
 
 # 예시 모델: 이미지 벡터 저장 및 EXIF 정보 포함
@@ -17,6 +68,9 @@ class ImageEmbedding(models.Model):
     embedding_model = models.CharField(
         max_length=128, null=True, blank=True
     )  # 임베딩 모델명
+    # 압축 저장 (settings.VECTOR_STORAGE): float16 벡터와 부호 비트열
+    embedding_half = HalfVectorField(dimensions=1408, null=True, blank=True)
+    embedding_bits = BitField(length=1408, null=True, blank=True)
 
     gps = PointField(null=True, blank=True)  # PostGIS Point (경도, 위도)
     city_from_gps = models.CharField(
@@ -29,6 +83,20 @@ class ImageEmbedding(models.Model):
         max_length=128, null=True, blank=True
     )  # ImageUniqueID
     exif_json = models.JSONField(null=True, blank=True)  # 기타 EXIF 정보
+    content_sha256 = models.CharField(
+        max_length=64, null=True, blank=True, db_index=True
+    )  # 파일 내용 SHA-256 (완전 중복 판별)
+    perceptual_hash = models.CharField(
+        max_length=16, null=True, blank=True, db_index=True
+    )  # dHash 64bit hex (유사 중복 판별)
+    image_width = models.PositiveIntegerField(null=True, blank=True)  # 원본 가로 px
+    image_height = models.PositiveIntegerField(null=True, blank=True)  # 원본 세로 px
+    source_ref = models.CharField(
+        max_length=255, null=True, blank=True, db_index=True
+    )  # 클라우드 원본 "프로바이더:파일ID:버전" (감시 폴더 중복 판별)
+    renditions = models.JSONField(
+        default=dict, blank=True
+    )  # 썸네일/미리보기 저장 경로 {"thumb": ..., "preview": ...}
 
     date_taken_user = models.DateField(
         null=True, blank=True
@@ -53,18 +121,94 @@ class ImageEmbedding(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)  # 수정일시
 
+    # 기본 조회는 HEAVY_FIELDS를 지연 로딩 (필요하면 with_heavy_fields())
+    objects = ImageEmbeddingManager()
+
+    class Meta:
+        indexes = [
+            # 벡터 ANN 인덱스 (종류/파라미터는 settings.VECTOR_INDEX)
+            build_embedding_index(),
+            *build_compact_indexes(),
+            # 검색 필터: 촬영일 범위, 장소 부분 일치(UPPER(...) LIKE, pg_trgm 필요)
+            models.Index(fields=["date_taken_exif"], name="imgemb_date_taken_exif"),
+            models.Index(fields=["date_taken_user"], name="imgemb_date_taken_user"),
+            # 검색어 없는 최신 순 목록의 키셋 페이지네이션 (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="imgemb_created_at_id"),
+            GinIndex(
+                OpClass(Upper("location_user"), name="gin_trgm_ops"),
+                name="imgemb_location_user_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("city_from_gps"), name="gin_trgm_ops"),
+                name="imgemb_city_from_gps_trgm",
+            ),
+        ]
+
     @property
     def date_taken(self):
         """사용자 입력 촬영일이 있으면 우선, 없으면 EXIF 촬영일 반환"""
         return self.date_taken_user or self.date_taken_exif
 
+    def get_rendition_url(self, name="thumb"):
+        """렌디션 URL을 반환하고, 렌디션이 없으면 원본 URL을 반환합니다."""
+        path = (self.renditions or {}).get(name)
+        if path:
+            return rendition_url(path)
+        if self.image_path.startswith("http://") or self.image_path.startswith(
+            "https://"
+        ):
+            return self.image_path
+        return settings.MEDIA_URL + self.image_path.replace("\\", "/").lstrip("/")
+
+    @property
+    def thumbnail_url(self):
+        return self.get_rendition_url("thumb")
+
+    @property
+    def preview_url(self):
+        return self.get_rendition_url("preview")
+
     def save(self, *args, **kwargs):
         is_new = self.pk is None
         super().save(*args, **kwargs)
         if is_new:
-            from .tasks import generate_image_embedding
+            from .tasks import enqueue_image_embedding
 
-            generate_image_embedding.delay(self.id)
+            # 커밋 이후 마이크로 배치에 추가 (플러시 태스크가 행을 볼 수 있도록)
+            transaction.on_commit(lambda: enqueue_image_embedding(self.id))
+
+
+@receiver(post_delete, sender=ImageEmbedding)
+def invalidate_search_results(sender, instance, **kwargs):
+    # 삭제가 커밋된 뒤 세대를 올려야 커밋 전 검색 결과가 새 세대로 캐시되지 않음
+    transaction.on_commit(bump_corpus_generation)
+
+
+@receiver(post_save, sender=ImageEmbedding)
+def invalidate_search_results_on_save(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    # 새 행은 임베딩이 완료될 때 세대가 올라가므로 기존 행 수정만 처리
+    if created:
+        return
+    if update_fields is not None and not SEARCH_VISIBLE_FIELDS.intersection(
+        update_fields
+    ):
+        return
+    transaction.on_commit(bump_corpus_generation)
+
+
+@receiver(m2m_changed, sender=ImageEmbedding.tags.through)
+def invalidate_search_results_on_tags(sender, instance, action, **kwargs):
+    # TaggedItem은 모든 모델이 공유하므로 ImageEmbedding만 처리하고,
+    # 아직 검색되지 않는 (임베딩 대기 중) 행의 태그는 무시
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not isinstance(instance, ImageEmbedding):
+        return
+    if instance.embedding_status != "done":
+        return
+    transaction.on_commit(bump_corpus_generation)
 
 
 @receiver(post_delete, sender=ImageEmbedding)
@@ -82,10 +226,18 @@ def delete_image_file(sender, instance, **kwargs):
                 os.remove(file_path)
             except Exception:
                 pass
+    # 같은 내용의 다른 이미지가 없을 때만 렌디션 삭제 (내용 주소 파일명 공유)
+    if instance.renditions and not (
+        instance.content_sha256
+        and ImageEmbedding.objects.filter(
+            content_sha256=instance.content_sha256
+        ).exists()
+    ):
+        delete_renditions(instance.renditions)
 
 
 class SearchQuery(models.Model):
-    query_text = models.CharField(max_length=255)
+    query_text = models.CharField(max_length=255, db_index=True)  # 정규화된 검색어
     query_embedding = VectorField(
         dimensions=1408, null=True, blank=True
     )  # 검색어 임베딩 벡터
@@ -96,3 +248,173 @@ class SearchQuery(models.Model):
 
     def __str__(self):
         return f"{self.query_text} ({self.searched_at:%Y-%m-%d %H:%M:%S})"
+
+
+class GeoPlace(models.Model):
+    """오프라인 역지오코딩용 지명 데이터 (GeoNames cities 덤프에서 적재)"""
+
+    geoname_id = models.BigIntegerField(unique=True)
+    name = models.CharField(max_length=200)
+    name_ko = models.CharField(max_length=200, null=True, blank=True)  # 한글 지명
+    admin1_name = models.CharField(
+        max_length=200, null=True, blank=True
+    )  # 광역 행정구역명
+    country_code = models.CharField(max_length=2, blank=True)
+    population = models.BigIntegerField(default=0)
+    location = PointField(geography=True)  # GiST 인덱스로 최근접(KNN) 조회
+
+    def __str__(self):
+        return f"{self.name_ko or self.name} ({self.country_code})"
+
+
+class IngestionJob(models.Model):
+    """업로드 묶음 하나의 단계별 수집(수신 → 메타데이터 추출 → 저장) 진행 상황"""
+
+    STATUS_CHOICES = [
+        ("queued", "대기"),
+        ("running", "처리 중"),
+        ("done", "완료"),
+        ("failed", "실패"),
+    ]
+    SOURCE_CHOICES = [
+        ("upload", "로컬 업로드"),
+        ("cloud", "클라우드"),
+        ("watched", "감시 폴더"),
+    ]
+    # 단계명 → 해당 단계를 통과한 항목 수 필드
+    STAGE_FIELDS = {
+        "receive": "received_count",
+        "extract": "extracted_count",
+        "persist": "persisted_count",
+    }
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default="queued")
+    options = models.JSONField(
+        default=dict, blank=True
+    )  # 사용자 입력 메타데이터 (촬영일, 장소, 태그)
+
+    total_count = models.PositiveIntegerField(default=0)
+    received_count = models.PositiveIntegerField(default=0)
+    extracted_count = models.PositiveIntegerField(default=0)
+    persisted_count = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0)
+    not_allowed_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
+
+    @classmethod
+    def record(cls, job_id, error=None, **increments):
+        """단계 카운터를 원자적으로 증가시키고, 모든 항목이 끝나면 작업을 완료 처리합니다.
+
+        여러 워커가 동시에 호출하므로 F() 식으로 DB에서 직접 증가시킵니다.
+
+        Args:
+            job_id: IngestionJob ID
+            error: 마지막 오류 메시지 (선택사항)
+            **increments: {"persisted_count": 1, ...}
+
+        """
+        now = timezone.now()
+        updates = {field: F(field) + count for field, count in increments.items()}
+        if error:
+            updates["last_error"] = error
+        cls.objects.filter(pk=job_id).update(updated_at=now, **updates)
+
+        finished = (
+            F("persisted_count")
+            + F("duplicate_count")
+            + F("not_allowed_count")
+            + F("failed_count")
+        )
+        cls.objects.filter(
+            pk=job_id, finished_at__isnull=True, total_count__lte=finished
+        ).update(
+            status=Case(
+                When(persisted_count=0, failed_count__gt=0, then=Value("failed")),
+                default=Value("done"),
+            ),
+            finished_at=now,
+        )
+
+    def get_progress(self):
+        """단계별 진행 수와 처리량(건/초)을 dict로 반환합니다."""
+        elapsed = (
+            (self.finished_at or timezone.now()) - self.created_at
+        ).total_seconds()
+        stages = {}
+        for stage, field in self.STAGE_FIELDS.items():
+            completed = getattr(self, field)
+            stages[stage] = {
+                "completed": completed,
+                "throughput": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+            }
+        return {
+            "job_id": str(self.id),
+            "source": self.source,
+            "status": self.status,
+            "total": self.total_count,
+            "stages": stages,
+            "duplicates": self.duplicate_count,
+            "not_allowed": self.not_allowed_count,
+            "failed": self.failed_count,
+            "last_error": self.last_error,
+            "elapsed_seconds": round(elapsed, 2),
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class WatchedFolder(models.Model):
+    """새 사진을 주기적으로 자동 수집하는 클라우드 폴더
+
+    cursor에는 Drive changes page token 또는 Graph delta 링크를 저장해
+    마지막 동기화 이후 바뀐 항목만 가져옵니다.
+    """
+
+    PROVIDER_CHOICES = [
+        ("google", "Google Drive"),
+        ("onedrive", "OneDrive"),
+    ]
+
+    provider = models.CharField(max_length=16, choices=PROVIDER_CHOICES)
+    user_email = models.EmailField()  # 토큰을 가진 사용자
+    folder_id = models.CharField(max_length=255)
+    drive_id = models.CharField(
+        max_length=255, null=True, blank=True
+    )  # 공유 드라이브 ID
+    name = models.CharField(max_length=255, blank=True)
+    options = models.JSONField(
+        default=dict, blank=True
+    )  # 수집 시 적용할 메타데이터 (촬영일, 장소, 태그)
+    enabled = models.BooleanField(default=True)
+
+    cursor = models.TextField(null=True, blank=True)  # 변경분 커서
+    scan_completed = models.BooleanField(
+        default=False
+    )  # 최초 전체 스캔 완료 여부 (이후로는 변경분만 조회)
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+    ingested_count = models.PositiveIntegerField(default=0)  # 수집 요청한 누적 수
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["provider", "user_email", "folder_id"],
+                name="unique_watched_folder",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.get_provider_display()}: {self.name or self.folder_id}"
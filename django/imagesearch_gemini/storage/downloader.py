@@ -0,0 +1,194 @@
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import requests
+from imagesearch_gemini.utils.validators import FileValidator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLOUD_DOWNLOAD = {
+    "MAX_WORKERS": 8,  # 동시 다운로드 수
+    "POOL_SIZE": 16,  # 프로바이더별 커넥션 풀 크기
+    "CHUNK_SIZE": 64 * 1024,
+    "MAX_BYTES": FileValidator.MAX_FILE_SIZE,
+    "CONNECT_TIMEOUT": 5.0,
+    "READ_TIMEOUT": 30.0,
+    "RETRIES": 3,
+    "BACKOFF_FACTOR": 0.5,
+}
+
+# 재시도 대상 상태 코드 (429/503은 Retry-After 헤더를 우선 적용)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+IMAGE_CONTENT_TYPES = ("jpeg", "jpg", "png")
+
+
+def _get_config() -> dict:
+    config = dict(DEFAULT_CLOUD_DOWNLOAD)
+    config.update(getattr(settings, "CLOUD_DOWNLOAD", {}) or {})
+    return config
+
+
+class CloudDownloader:
+    """클라우드 프로바이더별로 커넥션 풀을 공유하며 이미지를 스트리밍으로 내려받습니다.
+
+    Session은 프로바이더마다 한 번만 만들고(프로세스별), 본문은 청크 단위로
+    디스크에 쓰면서 크기 제한을 확인하므로 큰 파일도 메모리에 올리지 않습니다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._pid: Optional[int] = None
+
+    def get_session(self, provider: str, retry_status: bool = True) -> requests.Session:
+        """프로바이더용 pooled Session을 반환합니다 (재시도/백오프 포함).
+
+        Args:
+            provider: 커넥션 풀을 나누는 이름
+            retry_status: False면 연결 오류만 재시도하고 429/5xx 응답은 그대로
+                반환 (호출하는 쪽이 Retry-After를 직접 처리하는 경우)
+
+        """
+        key = provider if retry_status else f"{provider}:no_status_retry"
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork된 워커는 부모의 소켓을 공유하지 않도록 새로 생성
+                self._sessions = {}
+                self._pid = os.getpid()
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._build_session(_get_config(), retry_status)
+                self._sessions[key] = session
+            return session
+
+    @staticmethod
+    def _build_session(config: dict, retry_status: bool = True) -> requests.Session:
+        retry = Retry(
+            total=config["RETRIES"],
+            backoff_factor=config["BACKOFF_FACTOR"],
+            status_forcelist=RETRY_STATUS_CODES if retry_status else (),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=retry_status,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=config["POOL_SIZE"],
+            pool_maxsize=config["POOL_SIZE"],
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def download(
+        self,
+        provider: str,
+        url: str,
+        spool_dir: Optional[str] = None,
+        suffix: str = ".jpg",
+        hasher=None,
+        headers: Optional[dict] = None,
+    ) -> str:
+        """URL 본문을 임시 파일로 스트리밍 저장하고 경로를 반환합니다.
+
+        Args:
+            provider: 커넥션 풀 구분용 프로바이더명 ("google", "onedrive")
+            url: 다운로드 URL
+            spool_dir: 임시 파일 디렉터리 (선택사항)
+            suffix: 임시 파일 확장자
+            hasher: 청크를 쓰면서 함께 갱신할 hashlib 객체 (선택사항)
+            headers: 추가 요청 헤더 (선택사항)
+
+        Returns:
+            str: 임시 파일 경로
+
+        Raises:
+            ValidationError: 이미지 형식이 아니거나 크기 제한을 넘은 경우
+            requests.RequestException: 재시도 후에도 다운로드에 실패한 경우
+
+        """
+        config = _get_config()
+        max_bytes = config["MAX_BYTES"]
+        session = self.get_session(provider)
+
+        with session.get(
+            url,
+            headers=headers,
+            stream=True,
+            timeout=(config["CONNECT_TIMEOUT"], config["READ_TIMEOUT"]),
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "").lower()
+            if not any(ext in content_type for ext in IMAGE_CONTENT_TYPES):
+                raise ValidationError("지원하지 않는 이미지 형식입니다.")
+            content_length = response.headers.get("content-length")
+            if content_length and content_length.isdigit():
+                if int(content_length) > max_bytes:
+                    raise ValidationError(self._size_error(max_bytes))
+
+            written = 0
+            with tempfile.NamedTemporaryFile(
+                delete=False, suffix=suffix, dir=spool_dir
+            ) as temp_file:
+                temp_path = temp_file.name
+                try:
+                    for chunk in response.iter_content(chunk_size=config["CHUNK_SIZE"]):
+                        written += len(chunk)
+                        # Content-Length가 없거나 틀린 경우에도 받는 도중 중단
+                        if written > max_bytes:
+                            raise ValidationError(self._size_error(max_bytes))
+                        temp_file.write(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+                except BaseException:
+                    temp_file.close()
+                    os.remove(temp_path)
+                    raise
+        return temp_path
+
+    def map(
+        self, func: Callable, items: Iterable, max_workers: Optional[int] = None
+    ) -> List:
+        """items 각각에 func를 제한된 동시성으로 실행하고 결과(또는 예외)를 순서대로 반환합니다."""
+        items = list(items)
+        if not items:
+            return []
+        workers = max(1, min(max_workers or _get_config()["MAX_WORKERS"], len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(func, item) for item in items]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    @staticmethod
+    def _size_error(max_bytes: int) -> str:
+        return f"파일 크기가 너무 큽니다. 최대 {max_bytes // (1024 * 1024)}MB까지 허용됩니다."
+
+    def clear(self) -> None:
+        """생성된 Session을 모두 닫습니다."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+cloud_downloader = CloudDownloader()
+
+
+def download_to_spool(provider: str, url: str, **kwargs) -> str:
+    """공유 다운로더로 URL을 임시 파일에 내려받습니다."""
+    return cloud_downloader.download(provider, url, **kwargs)
@@ -0,0 +1,330 @@
+import hashlib
+import logging
+import time
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .google_drive import (
+    get_google_drive_change_token,
+    list_folders_and_images_in_google_drive,
+    list_google_drive_changes,
+)
+from .onedrive import (
+    get_onedrive_delta_link,
+    list_folders_and_images_in_onedrive,
+    list_onedrive_changes,
+)
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "imagesearch:cloud_tree"
+ACCOUNTS_KEY = f"{CACHE_KEY_PREFIX}:accounts"
+ROOT_FOLDER_KEY = "root"
+
+DEFAULT_CLOUD_FOLDER_CACHE = {
+    "CACHE_ALIAS": "default",
+    "TTL": 7 * 24 * 3600,  # 캐시 보관 기간(초)
+    "MAX_AGE": 3600,  # delta 동기화가 없어도 이 시간이 지나면 다시 조회(초)
+}
+
+# 프로바이더별 (목록 조회, 시작 커서 조회, 변경분 조회) 함수
+PROVIDERS = {
+    "google": (
+        list_folders_and_images_in_google_drive,
+        get_google_drive_change_token,
+        list_google_drive_changes,
+    ),
+    "onedrive": (
+        list_folders_and_images_in_onedrive,
+        get_onedrive_delta_link,
+        list_onedrive_changes,
+    ),
+}
+
+
+def _get_config() -> dict:
+    config = dict(DEFAULT_CLOUD_FOLDER_CACHE)
+    config.update(getattr(settings, "CLOUD_FOLDER_CACHE", {}) or {})
+    return config
+
+
+def _folder_key(parent_id: Optional[str]) -> str:
+    return parent_id if parent_id and parent_id != "root" else ROOT_FOLDER_KEY
+
+
+class CloudFolderCache:
+    """계정별 클라우드 폴더 목록 캐시입니다.
+
+    폴더 목록은 Django 캐시(Redis)에 저장하고, Drive changes.list page token /
+    Graph delta 링크로 변경된 폴더만 골라 무효화합니다. 세대(generation) 번호는
+    별도 키에 두고 cache.incr로 올리며, 계정 메타데이터(동기화 커서, 캐시된 폴더
+    목록)는 현재 세대일 때만 유효합니다. 느린 목록 조회 도중 계정 전체가
+    무효화되면 조회 결과로 이전 세대의 커서/목록을 되살리지 않습니다.
+    """
+
+    def _cache(self):
+        return caches[_get_config()["CACHE_ALIAS"]]
+
+    @staticmethod
+    def _account_key(provider: str, user_email: str) -> str:
+        email_hash = hashlib.sha1((user_email or "").lower().encode("utf-8"))
+        return f"{CACHE_KEY_PREFIX}:{provider}:{email_hash.hexdigest()}"
+
+    def _generation_key(self, provider: str, user_email: str) -> str:
+        return f"{self._account_key(provider, user_email)}:generation"
+
+    def _get_generation(self, provider: str, user_email: str) -> int:
+        cache = self._cache()
+        key = self._generation_key(provider, user_email)
+        generation = cache.get(key)
+        if generation is None:
+            # 키가 만료/축출된 경우 이전 값과 겹치지 않도록 현재 시각으로 시작
+            cache.add(key, int(time.time() * 1000), None)
+            generation = cache.get(key)
+        return generation
+
+    def _bump_generation(self, provider: str, user_email: str) -> int:
+        cache = self._cache()
+        key = self._generation_key(provider, user_email)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), None)
+            return cache.get(key)
+
+    def _get_account(self, provider: str, user_email: str) -> dict:
+        generation = self._get_generation(provider, user_email)
+        account = self._cache().get(self._account_key(provider, user_email))
+        if not account or account.get("generation") != generation:
+            return {"generation": generation, "cursor": None, "folders": {}}
+        return account
+
+    def _set_account(self, provider: str, user_email: str, account: dict) -> None:
+        cache = self._cache()
+        ttl = _get_config()["TTL"]
+        cache.set(self._account_key(provider, user_email), account, ttl)
+        # 백그라운드 동기화 대상 계정 목록
+        accounts = cache.get(ACCOUNTS_KEY) or {}
+        account_key = self._account_key(provider, user_email)
+        if account_key not in accounts:
+            accounts[account_key] = [provider, user_email]
+            cache.set(ACCOUNTS_KEY, accounts, ttl)
+
+    def _update_account(
+        self, provider: str, user_email: str, generation: int, update
+    ) -> bool:
+        """조회를 시작한 세대가 그대로일 때만 최신 계정 정보에 update를 적용해 저장합니다.
+
+        Returns:
+            저장 여부 (그 사이 계정 전체가 무효화됐으면 False)
+
+        """
+        account = self._get_account(provider, user_email)
+        if account["generation"] != generation:
+            return False
+        update(account)
+        self._set_account(provider, user_email, account)
+        return True
+
+    def _listing_key(self, provider, user_email, generation, folder_key) -> str:
+        account_key = self._account_key(provider, user_email)
+        return f"{account_key}:{generation}:{folder_key}"
+
+    def get_listing(
+        self,
+        provider: str,
+        user_email: str,
+        parent_id: Optional[str] = None,
+        is_shared: bool = False,
+        drive_id: Optional[str] = None,
+        refresh: bool = False,
+    ):
+        """캐시된 폴더 목록을 반환하고, 없거나 오래됐으면 실시간으로 조회해 저장합니다.
+
+        Args:
+            provider: "google" 또는 "onedrive"
+            user_email: 사용자 이메일
+            parent_id: 상위 폴더 ID (None이면 루트)
+            is_shared: 공유 폴더 탐색 여부
+            drive_id: 공유 드라이브 ID
+            refresh: True면 캐시를 무시하고 다시 조회
+
+        Returns:
+            (folders, images, folder_name, parent_info)
+
+        """
+        config = _get_config()
+        cache = self._cache()
+        account = self._get_account(provider, user_email)
+        generation = account["generation"]
+        folder_key = _folder_key(parent_id)
+        listing_key = self._listing_key(provider, user_email, generation, folder_key)
+
+        if not refresh:
+            cached = cache.get(listing_key)
+            if cached and time.time() - cached["fetched_at"] < config["MAX_AGE"]:
+                return (
+                    cached["folders"],
+                    cached["images"],
+                    cached["folder_name"],
+                    cached["parent_info"],
+                )
+
+        list_func, start_cursor_func, _ = PROVIDERS[provider]
+        cursor = account["cursor"]
+        if cursor is None:
+            # 목록 조회 전에 커서를 받아 두어야 조회 중 변경도 다음 동기화에 잡힘
+            try:
+                cursor = start_cursor_func(user_email)
+            except Exception as e:
+                logger.warning(f"클라우드 변경 커서 조회 실패({provider}): {e}")
+
+        folders, images, folder_name, parent_info = list_func(
+            user_email, parent_id, is_shared=is_shared, drive_id=drive_id
+        )
+        cache.set(
+            listing_key,
+            {
+                "folders": folders,
+                "images": images,
+                "folder_name": folder_name,
+                "parent_info": parent_info,
+                "fetched_at": time.time(),
+            },
+            config["TTL"],
+        )
+
+        def register(account):
+            # 조회 중 다른 요청이 저장한 커서/폴더는 그대로 두고 이 폴더만 추가
+            if account["cursor"] is None:
+                account["cursor"] = cursor
+            account["folders"][folder_key] = [parent_id, is_shared, drive_id]
+
+        self._update_account(provider, user_email, generation, register)
+        return folders, images, folder_name, parent_info
+
+    def invalidate(
+        self,
+        provider: str,
+        user_email: str,
+        folder_ids: Optional[Iterable[str]] = None,
+    ) -> None:
+        """캐시를 무효화합니다.
+
+        Args:
+            provider: "google" 또는 "onedrive"
+            user_email: 사용자 이메일
+            folder_ids: 무효화할 폴더 ID 목록 (None이면 계정 전체)
+
+        """
+        if folder_ids is None:
+            # 세대 번호를 올려 기존 키를 한 번에 버림 (커서도 다시 받음)
+            generation = self._bump_generation(provider, user_email)
+            self._set_account(
+                provider,
+                user_email,
+                {"generation": generation, "cursor": None, "folders": {}},
+            )
+            return
+
+        account = self._get_account(provider, user_email)
+        folder_keys = [_folder_key(folder_id) for folder_id in folder_ids]
+        self._cache().delete_many(
+            [
+                self._listing_key(
+                    provider, user_email, account["generation"], folder_key
+                )
+                for folder_key in folder_keys
+            ]
+        )
+
+        def forget(account):
+            for folder_key in folder_keys:
+                account["folders"].pop(folder_key, None)
+
+        self._update_account(provider, user_email, account["generation"], forget)
+
+    def sync(self, provider: str, user_email: str, rewarm: bool = True) -> int:
+        """변경분(delta)을 받아 바뀐 폴더만 무효화하고 필요하면 다시 채웁니다.
+
+        Args:
+            provider: "google" 또는 "onedrive"
+            user_email: 사용자 이메일
+            rewarm: 무효화한 폴더를 바로 다시 조회해 캐시에 채울지 여부
+
+        Returns:
+            무효화한 폴더 수
+
+        """
+        account = self._get_account(provider, user_email)
+        if not account["cursor"]:
+            return 0
+
+        _, _, changes_func = PROVIDERS[provider]
+        try:
+            changed_ids, new_cursor = changes_func(user_email, account["cursor"])
+        except Exception as e:
+            # 커서가 만료된 경우(410 등) 계정 전체를 다시 조회하도록 초기화
+            logger.warning(f"클라우드 변경분 동기화 실패({provider}): {e}")
+            self.invalidate(provider, user_email)
+            return len(account["folders"])
+
+        cached_folders = account["folders"]
+        stale = {key for key in cached_folders if key in changed_ids}
+        # 루트 폴더는 실제 ID를 모르므로 알 수 없는 폴더가 바뀌면 함께 무효화
+        if changed_ids - set(cached_folders) and ROOT_FOLDER_KEY in cached_folders:
+            stale.add(ROOT_FOLDER_KEY)
+        to_rewarm = [cached_folders[key] for key in stale]
+
+        self._cache().delete_many(
+            [
+                self._listing_key(
+                    provider, user_email, account["generation"], folder_key
+                )
+                for folder_key in stale
+            ]
+        )
+
+        def advance(account):
+            for folder_key in stale:
+                account["folders"].pop(folder_key, None)
+            account["cursor"] = new_cursor
+
+        # 조회 중 계정 전체가 무효화됐으면 새 세대의 커서를 덮어쓰지 않음
+        if not self._update_account(
+            provider, user_email, account["generation"], advance
+        ):
+            return len(stale)
+
+        if rewarm:
+            for parent_id, is_shared, drive_id in to_rewarm:
+                try:
+                    self.get_listing(
+                        provider, user_email, parent_id, is_shared, drive_id
+                    )
+                except Exception as e:
+                    logger.warning(f"클라우드 폴더 캐시 갱신 실패({provider}): {e}")
+        return len(stale)
+
+    def sync_all(self) -> int:
+        """캐시를 사용 중인 모든 계정을 동기화합니다."""
+        accounts = self._cache().get(ACCOUNTS_KEY) or {}
+        total = 0
+        for provider, user_email in accounts.values():
+            total += self.sync(provider, user_email)
+        return total
+
+
+cloud_folder_cache = CloudFolderCache()
+
+
+def get_cloud_listing(provider, user_email, parent_id=None, **kwargs):
+    """캐시를 거쳐 클라우드 폴더 목록을 반환합니다."""
+    return cloud_folder_cache.get_listing(provider, user_email, parent_id, **kwargs)
+
+
+def invalidate_cloud_listing(provider, user_email, folder_ids=None):
+    """클라우드 폴더 목록 캐시를 무효화합니다."""
+    cloud_folder_cache.invalidate(provider, user_email, folder_ids)
@@ -1,9 +1,14 @@
-import tempfile
+import json
+import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
-import requests
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+from imagesearch_gemini.storage.downloader import download_to_spool
 from imagesearch_gemini.utils.validators import validate_upload_data
 from oauth.google_drive import build_google_auth_url
 from oauth.utils import get_token
@@ -15,39 +20,181 @@ from django.core.files import File
 BYTES_PER_KB = 1024
 BYTES_PER_MB = 1024 * 1024
 
+# Drive files.list 최대 페이지 크기 (nextPageToken으로 다음 페이지 조회)
+DRIVE_PAGE_SIZE = 1000
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+# 필요한 필드만 받도록 제한 (fields 마스크)
+FOLDER_FIELDS = "nextPageToken, files(id, name, createdTime, modifiedTime, driveId)"
+IMAGE_FIELDS = (
+    "nextPageToken, files(id, name, mimeType, webViewLink, createdTime, "
+    "modifiedTime, size, driveId)"
+)
+SHARED_FOLDER_FIELDS = (
+    "nextPageToken, files(id, name, createdTime, modifiedTime, driveId, owners)"
+)
+PARENT_FIELDS = "name,parents,driveId"
+CHANGE_FIELDS = "nextPageToken, newStartPageToken, changes(fileId, file(parents))"
+# 감시 폴더 동기화용 (파일명/형식/내용 체크섬까지)
+WATCH_FILE_FIELDS = "nextPageToken, files(id, name, mimeType, parents, md5Checksum)"
+WATCH_CHANGE_FIELDS = (
+    "nextPageToken, newStartPageToken, changes(fileId, removed, "
+    "file(id, name, mimeType, parents, md5Checksum, trashed))"
+)
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+
+# 자격 증명(access token)별 서비스 객체 캐시 크기
+SERVICE_CACHE_SIZE = 32
+
+_discovery_lock = threading.Lock()
+_discovery_document = None
+# httplib2 기반 서비스 객체는 스레드 간 공유가 안전하지 않으므로 스레드별로 캐시
+_service_cache = threading.local()
+
+
+def _get_discovery_document():
+    """패키지에 포함된 Drive v3 discovery 문서를 한 번만 읽어 재사용합니다."""
+    global _discovery_document
+    with _discovery_lock:
+        if _discovery_document is None:
+            _discovery_document = json.loads(get_static_doc("drive", "v3"))
+        return _discovery_document
 
-def list_folders_and_images_in_google_drive(
-    user_email, parent_id=None, is_shared=False, drive_id=None
-):
-    """인증된 사용자의 Google Drive에서 폴더와 이미지 파일 목록을 함께 가져온다.
-    폴더는 상위에, 이미지는 하위에 표시하도록 데이터를 구성한다.
+
+def get_drive_service(access_token):
+    """access token별로 캐시된 Drive v3 서비스 객체를 반환합니다."""
+    services = getattr(_service_cache, "services", None)
+    if services is None:
+        services = _service_cache.services = OrderedDict()
+    service = services.get(access_token)
+    if service is not None:
+        services.move_to_end(access_token)
+        return service
+
+    service = build_from_document(
+        _get_discovery_document(), credentials=Credentials(token=access_token)
+    )
+    services[access_token] = service
+    while len(services) > SERVICE_CACHE_SIZE:
+        services.popitem(last=False)
+    return service
+
+
+def execute_batch(service, requests_by_key):
+    """서로 독립적인 Drive 요청들을 배치 HTTP 요청 한 번으로 실행합니다.
 
     Args:
-        user_email: 사용자 이메일
-        parent_id: 상위 폴더 ID (None이면 루트 조회)    Returns:
-        folders: 폴더 목록 [{'id': str, 'name': str, 'date': str}]
-        images: 이미지 목록 [{'id': str, 'name': str, 'url': str, 'date': str, 'size': str, 'type': str}]
-        folder_name: 현재 폴더 이름
+        service: Drive 서비스 객체
+        requests_by_key: {키: HttpRequest}
+
+    Returns:
+        {키: (응답 dict 또는 None, 예외 또는 None)}
 
     """
+    results = {}
+
+    def _callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    batch = service.new_batch_http_request(callback=_callback)
+    for key, request in requests_by_key.items():
+        batch.add(request, request_id=key)
+    batch.execute()
+    return results
+
+
+def iter_drive_files(service, first_page, list_kwargs):
+    """첫 페이지 응답부터 nextPageToken을 따라가며 파일을 하나씩 반환하는 제너레이터입니다.
+
+    다음 페이지는 앞 페이지를 모두 소비한 뒤에만 요청합니다.
+    """
+    page = first_page
+    while True:
+        yield from page.get("files", [])
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return
+        page = service.files().list(pageToken=page_token, **list_kwargs).execute()
+
+
+def _format_drive_date(item):
+    modified_time = item.get("modifiedTime", "")
+    if not modified_time:
+        return ""
+    date_obj = datetime.fromisoformat(modified_time.replace("Z", "+00:00"))
+    return date_obj.strftime("%Y-%m-%d %H:%M")
+
+
+def _format_size(size_bytes):
+    if size_bytes < BYTES_PER_KB:
+        return f"{size_bytes} B"
+    if size_bytes < BYTES_PER_MB:
+        return f"{size_bytes / BYTES_PER_KB:.1f} KB"
+    return f"{size_bytes / BYTES_PER_MB:.1f} MB"
+
+
+def _format_folder(folder, is_shared, name_suffix=""):
+    return {
+        "id": folder.get("id", ""),
+        "name": folder.get("name", "") + name_suffix,
+        "date": _format_drive_date(folder),
+        "type": "폴더(공유)" if is_shared else "폴더",
+        "shared": is_shared,
+        "drive_id": folder.get("driveId"),
+    }
+
+
+def _format_image(img, is_shared):
+    mime_type = img.get("mimeType", "")
+    file_type = mime_type.split("/")[1] if "/" in mime_type else "파일"
+    return {
+        "id": img.get("id", ""),
+        "name": img.get("name", ""),
+        "url": img.get("webViewLink", ""),
+        "date": _format_drive_date(img),
+        "size": _format_size(int(img.get("size", 0))),
+        "type": file_type.upper() + ("(공유)" if is_shared else ""),
+        "shared": is_shared,
+        "drive_id": img.get("driveId"),
+    }
+
+
+def _get_google_drive_service(user_email):
     access_token = get_token(user_email, "google")
     if not access_token:
         auth_url = build_google_auth_url()
         raise Exception(
             f"Google Drive 인증이 필요합니다. <a href='{auth_url}' class='cloud-auth-link' target='_blank'>Google Drive 인증하기</a>"
         )
-    creds = Credentials(token=access_token)
-    service = build("drive", "v3", credentials=creds)
+    return get_drive_service(access_token)
+
+
+def iter_google_drive_listing(
+    user_email, parent_id=None, is_shared=False, drive_id=None
+):
+    """Google Drive 폴더 목록을 점진적으로 조회합니다.
+
+    폴더/이미지/상위 폴더/공유 폴더의 첫 페이지는 배치 HTTP 요청 한 번으로 함께
+    가져오고, 나머지 페이지는 entries를 소비하는 만큼 nextPageToken으로 이어서 조회합니다.
+
+    Args:
+        user_email: 사용자 이메일
+        parent_id: 상위 폴더 ID (None이면 루트 조회)
+        is_shared: 공유 드라이브 탐색 여부
+        drive_id: 공유 드라이브 ID
+
+    Returns:
+        (folder_name, parent_info, entries)
+        entries: ("folder" 또는 "image", 항목 dict)를 순서대로 반환하는 제너레이터
+
+    """
+    service = _get_google_drive_service(user_email)
 
     folder_name = "내 드라이브" if not is_shared else "공유 폴더"
-    parent_info = {"parent_id": None, "drive_id": None, "is_shared": is_shared}
     # 공유폴더 탐색이면 driveId와 id로 children API 사용
     if is_shared and parent_id:
         if not drive_id:
             # driveId 없는 공유폴더는 children 탐색 불가
             return (
-                [],
-                [],
                 "(공유 폴더 정보 없음)",
                 {
                     "parent_id": None,
@@ -55,206 +202,247 @@ def list_folders_and_images_in_google_drive(
                     "is_shared": True,
                     "error": "Google Drive 공유폴더의 driveId 정보가 없어 하위 탐색이 불가합니다.",
                 },
+                iter(()),
             )
-        try:
-            folder = (
-                service.files()
-                .get(
-                    fileId=parent_id,
-                    supportsAllDrives=True,
-                    fields="name,parents,driveId",
-                )
-                .execute()
-            )
-            folder_name = folder.get("name", folder_name)
-            parents = folder.get("parents", [])
-            parent_info = {
-                "parent_id": parents[0] if parents else None,
-                "drive_id": folder.get("driveId"),
-                "is_shared": True,
-            }
-        except Exception:
-            parent_info = {"parent_id": None, "drive_id": drive_id, "is_shared": True}
         query = f"'{parent_id}' in parents and trashed = false"
-        folder_query = f"{query} and mimeType = 'application/vnd.google-apps.folder'"
-        image_query = f"{query} and mimeType contains 'image/'"
-        folder_results = (
-            service.files()
-            .list(
-                pageSize=100,
-                fields="files(id, name, createdTime, modifiedTime, driveId)",
-                q=folder_query,
-                supportsAllDrives=True,
-                includeItemsFromAllDrives=True,
-                corpora="drive",
-                driveId=drive_id,
-                orderBy="name",
-            )
-            .execute()
-        )
-        image_results = (
-            service.files()
-            .list(
-                pageSize=100,
-                fields="files(id, name, mimeType, webViewLink, createdTime, modifiedTime, size, driveId)",
-                q=image_query,
-                supportsAllDrives=True,
-                includeItemsFromAllDrives=True,
-                corpora="drive",
-                driveId=drive_id,
-                orderBy="name",
-            )
-            .execute()
-        )
+        common_kwargs = {
+            "supportsAllDrives": True,
+            "includeItemsFromAllDrives": True,
+            "corpora": "drive",
+            "driveId": drive_id,
+        }
+        parent_kwargs = {"supportsAllDrives": True}
+        fallback_parent_info = {
+            "parent_id": None,
+            "drive_id": drive_id,
+            "is_shared": True,
+        }
     else:
         # 내 드라이브(또는 일반 폴더) 탐색
-        if parent_id:
-            try:
-                folder = (
-                    service.files()
-                    .get(fileId=parent_id, fields="name,parents,driveId")
-                    .execute()
-                )
-                folder_name = folder.get("name", "내 드라이브")
-                parents = folder.get("parents", [])
-                parent_info = {
-                    "parent_id": parents[0] if parents else None,
-                    "drive_id": folder.get("driveId"),
-                    "is_shared": False,
-                }
-            except Exception:
-                folder_name = "내 드라이브"
-                parent_info = {"parent_id": None, "drive_id": None, "is_shared": False}
-        else:
-            parent_info = {"parent_id": None, "drive_id": None, "is_shared": False}
         query = "trashed = false"
         if parent_id:
             query += f" and '{parent_id}' in parents"
         else:
             query += " and 'root' in parents"
-        folder_query = f"{query} and mimeType = 'application/vnd.google-apps.folder'"
-        image_query = f"{query} and mimeType contains 'image/'"
-        folder_results = (
-            service.files()
-            .list(
-                pageSize=100,
-                fields="files(id, name, createdTime, modifiedTime, driveId)",
-                q=folder_query,
-                orderBy="name",
-            )
-            .execute()
-        )
-        image_results = (
-            service.files()
-            .list(
-                pageSize=100,
-                fields="files(id, name, mimeType, webViewLink, createdTime, modifiedTime, size, driveId)",
-                q=image_query,
-                orderBy="name",
-            )
-            .execute()
+        common_kwargs = {}
+        parent_kwargs = {}
+        fallback_parent_info = {"parent_id": None, "drive_id": None, "is_shared": False}
+
+    folder_kwargs = dict(
+        common_kwargs,
+        q=f"{query} and mimeType = '{FOLDER_MIME_TYPE}'",
+        fields=FOLDER_FIELDS,
+        pageSize=DRIVE_PAGE_SIZE,
+        orderBy="name",
+    )
+    image_kwargs = dict(
+        common_kwargs,
+        q=f"{query} and mimeType contains 'image/'",
+        fields=IMAGE_FIELDS,
+        pageSize=DRIVE_PAGE_SIZE,
+        orderBy="name",
+    )
+    shared_kwargs = {
+        "q": f"sharedWithMe and mimeType = '{FOLDER_MIME_TYPE}' and trashed = false",
+        "fields": SHARED_FOLDER_FIELDS,
+        "pageSize": DRIVE_PAGE_SIZE,
+        "supportsAllDrives": True,
+        "includeItemsFromAllDrives": True,
+        "orderBy": "name",
+    }
+
+    batch_requests = {
+        "folders": service.files().list(**folder_kwargs),
+        "images": service.files().list(**image_kwargs),
+    }
+    if parent_id:
+        batch_requests["parent"] = service.files().get(
+            fileId=parent_id, fields=PARENT_FIELDS, **parent_kwargs
         )
-    # 폴더 정보 포맷팅
-    folders = []
-    for folder in folder_results.get("files", []):
-        modified_time = folder.get("modifiedTime", "")
-        if modified_time:
-            date_obj = datetime.fromisoformat(modified_time.replace("Z", "+00:00"))
-            formatted_date = date_obj.strftime("%Y-%m-%d %H:%M")
-        else:
-            formatted_date = ""
-        folders.append(
-            {
-                "id": folder.get("id", ""),
-                "name": folder.get("name", ""),
-                "date": formatted_date,
-                "type": "폴더(공유)" if is_shared else "폴더",
-                "shared": is_shared,
+    # 루트에서는 sharedWithMe도 추가
+    include_shared = not parent_id and not is_shared
+    if include_shared:
+        batch_requests["shared"] = service.files().list(**shared_kwargs)
+
+    results = execute_batch(service, batch_requests)
+    for key in ("folders", "images", "shared"):
+        if key in results and results[key][1] is not None:
+            raise results[key][1]
+
+    parent_info = fallback_parent_info
+    if parent_id:
+        folder, error = results["parent"]
+        if error is None:
+            folder_name = folder.get("name", folder_name)
+            parents = folder.get("parents", [])
+            parent_info = {
+                "parent_id": parents[0] if parents else None,
                 "drive_id": folder.get("driveId"),
+                "is_shared": is_shared,
             }
-        )
-    # 이미지 정보 포맷팅
-    images = []
-    for img in image_results.get("files", []):
-        modified_time = img.get("modifiedTime", "")
-        if modified_time:
-            date_obj = datetime.fromisoformat(modified_time.replace("Z", "+00:00"))
-            formatted_date = date_obj.strftime("%Y-%m-%d %H:%M")
-        else:
-            formatted_date = ""
-        size_bytes = int(img.get("size", 0))
-        if size_bytes < BYTES_PER_KB:
-            size_str = f"{size_bytes} B"
-        elif size_bytes < BYTES_PER_MB:
-            size_str = f"{size_bytes / BYTES_PER_KB:.1f} KB"
-        else:
-            size_str = f"{size_bytes / BYTES_PER_MB:.1f} MB"
-        mime_type = img.get("mimeType", "")
-        file_type = mime_type.split("/")[1] if "/" in mime_type else "파일"
-        images.append(
-            {
-                "id": img.get("id", ""),
-                "name": img.get("name", ""),
-                "url": img.get("webViewLink", ""),
-                "date": formatted_date,
-                "size": size_str,
-                "type": file_type.upper() + ("(공유)" if is_shared else ""),
-                "shared": is_shared,
-                "drive_id": img.get("driveId"),
-            }
-        )
-    # 루트에서는 sharedWithMe도 추가
-    if not parent_id and not is_shared:
-        shared_results = (
-            service.files()
+
+    def _entries():
+        for folder in iter_drive_files(service, results["folders"][0], folder_kwargs):
+            yield "folder", _format_folder(folder, is_shared)
+        if include_shared:
+            for folder in iter_drive_files(
+                service, results["shared"][0], shared_kwargs
+            ):
+                # driveId가 없는 공유폴더는 표시하지 않음
+                if folder.get("driveId"):
+                    yield "folder", _format_folder(folder, True, " (공유됨)")
+        for img in iter_drive_files(service, results["images"][0], image_kwargs):
+            yield "image", _format_image(img, is_shared)
+
+    return folder_name, parent_info, _entries()
+
+
+def list_folders_and_images_in_google_drive(
+    user_email, parent_id=None, is_shared=False, drive_id=None
+):
+    """인증된 사용자의 Google Drive에서 폴더와 이미지 파일 목록을 함께 가져온다.
+    폴더는 상위에, 이미지는 하위에 표시하도록 데이터를 구성한다.
+
+    Args:
+        user_email: 사용자 이메일
+        parent_id: 상위 폴더 ID (None이면 루트 조회)    Returns:
+        folders: 폴더 목록 [{'id': str, 'name': str, 'date': str}]
+        images: 이미지 목록 [{'id': str, 'name': str, 'url': str, 'date': str, 'size': str, 'type': str}]
+        folder_name: 현재 폴더 이름
+
+    """
+    folder_name, parent_info, entries = iter_google_drive_listing(
+        user_email, parent_id, is_shared=is_shared, drive_id=drive_id
+    )
+    folders, images = [], []
+    for kind, item in entries:
+        (folders if kind == "folder" else images).append(item)
+    return folders, images, folder_name, parent_info
+
+
+def get_google_drive_change_token(user_email):
+    """Drive changes.list의 시작 page token을 반환합니다 (이후 변경분만 조회)."""
+    service = _get_google_drive_service(user_email)
+    return service.changes().getStartPageToken().execute()["startPageToken"]
+
+
+def list_google_drive_changed_files(user_email, page_token, fields=CHANGE_FIELDS):
+    """page token 이후의 변경 목록(changes)을 모두 가져옵니다.
+
+    Args:
+        user_email: 사용자 이메일
+        page_token: 이전에 받은 changes page token
+        fields: changes.list fields 마스크
+
+    Returns:
+        (change dict 목록, 다음 동기화에 쓸 새 page token)
+
+    """
+    service = _get_google_drive_service(user_email)
+    changes = []
+    while page_token:
+        response = (
+            service.changes()
             .list(
-                q="sharedWithMe and mimeType = 'application/vnd.google-apps.folder' and trashed = false",
-                fields="files(id, name, createdTime, modifiedTime, driveId, owners)",
-                pageSize=100,
-                supportsAllDrives=True,
+                pageToken=page_token,
+                pageSize=DRIVE_PAGE_SIZE,
+                fields=fields,
                 includeItemsFromAllDrives=True,
-                orderBy="name",
+                supportsAllDrives=True,
             )
             .execute()
         )
-        for folder in shared_results.get("files", []):
-            # driveId가 없는 공유폴더는 표시하지 않음
-            if not folder.get("driveId"):
-                continue
-            modified_time = folder.get("modifiedTime", "")
-            if modified_time:
-                date_obj = datetime.fromisoformat(modified_time.replace("Z", "+00:00"))
-                formatted_date = date_obj.strftime("%Y-%m-%d %H:%M")
-            else:
-                formatted_date = ""
-            folders.append(
-                {
-                    "id": folder.get("id", ""),
-                    "name": folder.get("name", "") + " (공유됨)",
-                    "date": formatted_date,
-                    "type": "폴더(공유)",
-                    "shared": True,
-                    "drive_id": folder.get("driveId"),
-                }
-            )
-    return folders, images, folder_name, parent_info
+        changes.extend(response.get("changes", []))
+        if "newStartPageToken" in response:
+            return changes, response["newStartPageToken"]
+        page_token = response.get("nextPageToken")
+    return changes, page_token
+
+
+def is_change_token_expired(error):
+    """changes page token이 만료/무효화되어 처음부터 다시 동기화해야 하는 오류인지 반환합니다.
+
+    Drive는 410 Gone 또는 pageToken 파라미터 오류(400/404)로 응답합니다.
+    """
+    if not isinstance(error, HttpError):
+        return False
+    status = getattr(error.resp, "status", None)
+    if status == 410:
+        return True
+    content = error.content or b""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", "replace")
+    return status in (400, 404) and '"pageToken"' in content
+
+
+def list_google_drive_changes(user_email, page_token):
+    """page token 이후 변경된 항목과 그 상위 폴더 ID를 모읍니다.
+
+    Args:
+        user_email: 사용자 이메일
+        page_token: 이전에 받은 changes page token
+
+    Returns:
+        (변경 항목/상위 폴더 ID set, 다음 동기화에 쓸 새 page token)
+
+    """
+    changes, new_token = list_google_drive_changed_files(user_email, page_token)
+    changed_ids = set()
+    for change in changes:
+        if change.get("fileId"):
+            changed_ids.add(change["fileId"])
+        changed_ids.update((change.get("file") or {}).get("parents", []))
+    return changed_ids, new_token
+
+
+def iter_google_drive_folder_images(user_email, folder_id, drive_id=None):
+    """폴더 바로 아래의 이미지 파일을 페이지 단위로 따라가며 반환합니다."""
+    service = _get_google_drive_service(user_email)
+    list_kwargs = {
+        "q": f"'{folder_id}' in parents and trashed = false and mimeType contains 'image/'",
+        "fields": WATCH_FILE_FIELDS,
+        "pageSize": DRIVE_PAGE_SIZE,
+        "supportsAllDrives": True,
+        "includeItemsFromAllDrives": True,
+    }
+    if drive_id:
+        list_kwargs.update(corpora="drive", driveId=drive_id)
+    first_page = service.files().list(**list_kwargs).execute()
+    return iter_drive_files(service, first_page, list_kwargs)
+
+
+def build_google_drive_download(user_email, file_id):
+    """Drive API로 파일 본문을 받는 URL과 인증 헤더를 반환합니다."""
+    access_token = get_token(user_email, "google")
+    if not access_token:
+        raise Exception("Google Drive 인증이 필요합니다.")
+    url = f"{DRIVE_FILES_URL}/{file_id}?alt=media&supportsAllDrives=true"
+    return url, {"Authorization": f"Bearer {access_token}"}
 
 
 def save_google_drive_image(
-    image_url: str, file_name: str, date_taken_user=None, location_user=None, tags=None
+    image_url: str,
+    file_name: str,
+    date_taken_user=None,
+    location_user=None,
+    tags=None,
+    hasher=None,
+    spool_dir=None,
+    headers=None,
 ) -> str:
     """Google Drive 이미지를 다운로드하여 임시로 저장하고, 임시 파일 경로를 반환합니다."""
-    # 파일 다운로드 및 검증
-    response = requests.get(image_url, timeout=30)
-    response.raise_for_status()
-    content_type = response.headers.get("content-type", "")
-    if not any(ext in content_type.lower() for ext in ["jpeg", "jpg", "png"]):
-        raise ValidationError("지원하지 않는 이미지 형식입니다.")
     if not any(file_name.lower().endswith(ext) for ext in [".jpg", ".jpeg", ".png"]):
         file_name += ".jpg"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-        temp_file.write(response.content)
-        temp_path = temp_file.name
+    # 공유 커넥션 풀로 스트리밍 다운로드 (크기 제한/429·503 재시도 포함)
+    temp_path = download_to_spool(
+        "google",
+        image_url,
+        spool_dir=spool_dir,
+        suffix=".jpg",
+        hasher=hasher,
+        headers=headers,
+    )
+    try:
         with open(temp_path, "rb") as f:
             file_obj = File(f, name=file_name)
             is_valid, errors = validate_upload_data(
@@ -263,6 +451,9 @@ def save_google_drive_image(
                 location=location_user,
                 tags=tags,
             )
-            if not is_valid:
-                raise ValidationError("; ".join(errors))
+        if not is_valid:
+            raise ValidationError("; ".join(errors))
+    except Exception:
+        os.remove(temp_path)
+        raise
     return temp_path
@@ -0,0 +1,172 @@
+import logging
+import time
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlencode
+
+from imagesearch_gemini.storage.downloader import cloud_downloader
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
+
+DEFAULT_GRAPH_CLIENT = {
+    "PAGE_SIZE": 200,  # children $top
+    "MAX_RETRIES": 4,  # 429/503 재시도 횟수
+    "BACKOFF_FACTOR": 1.0,  # Retry-After가 없을 때 지수 백오프 기준(초)
+    "MAX_RETRY_AFTER": 30.0,  # 한 번에 기다리는 최대 시간(초)
+    "TIMEOUT": 30.0,
+}
+
+THROTTLED_STATUS_CODES = (429, 503)
+
+
+class GraphRequestError(Exception):
+    """Graph 요청이 2xx가 아닌 상태로 끝났습니다."""
+
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _get_config() -> dict:
+    config = dict(DEFAULT_GRAPH_CLIENT)
+    config.update(getattr(settings, "GRAPH_CLIENT", {}) or {})
+    return config
+
+
+def build_graph_path(path: str, **params) -> str:
+    """OData 쿼리 파라미터($select, $top 등)를 붙인 상대 경로를 만듭니다."""
+    params = {key: value for key, value in params.items() if value is not None}
+    if not params:
+        return path
+    return f"{path}?{urlencode(params, safe='$,')}"
+
+
+class GraphClient:
+    """Microsoft Graph 호출을 묶어 주는 얇은 클라이언트입니다.
+
+    keep-alive 커넥션 풀을 가진 공유 Session을 사용하고, 독립적인 GET 요청은
+    JSON $batch 한 번으로 보냅니다. 429/503 응답은 Retry-After 만큼 기다린 뒤
+    해당 요청만 다시 보냅니다. 재시도 횟수와 대기 상한(MAX_RETRIES,
+    MAX_RETRY_AFTER)이 한 곳에서만 적용되도록 Session은 상태 코드 재시도를
+    하지 않습니다.
+    """
+
+    def __init__(self, access_token: str) -> None:
+        self.session = cloud_downloader.get_session("graph", retry_status=False)
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
+        self.config = _get_config()
+
+    def _retry_delay(self, headers, attempt: int) -> float:
+        retry_after = (headers or {}).get("Retry-After") or (headers or {}).get(
+            "retry-after"
+        )
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.config["BACKOFF_FACTOR"] * (2**attempt)
+        return min(delay, self.config["MAX_RETRY_AFTER"])
+
+    def _send(self, method: str, url: str, **kwargs):
+        for attempt in range(self.config["MAX_RETRIES"] + 1):
+            response = self.session.request(
+                method,
+                url,
+                headers=self.headers,
+                timeout=self.config["TIMEOUT"],
+                **kwargs,
+            )
+            if (
+                response.status_code not in THROTTLED_STATUS_CODES
+                or attempt == self.config["MAX_RETRIES"]
+            ):
+                return response
+            delay = self._retry_delay(response.headers, attempt)
+            logger.warning(
+                f"Graph 요청 제한({response.status_code}), {delay:.1f}s 대기"
+            )
+            time.sleep(delay)
+        return response
+
+    def get(self, path_or_url: str) -> dict:
+        """GET 요청을 보내고 JSON 본문을 반환합니다.
+
+        Raises:
+            GraphRequestError: 응답이 2xx가 아닌 경우
+
+        """
+        url = (
+            path_or_url
+            if path_or_url.startswith("https://")
+            else f"{GRAPH_BASE_URL}{path_or_url}"
+        )
+        response = self._send("GET", url)
+        if not response.ok:
+            raise GraphRequestError(
+                response.status_code,
+                f"Graph 요청 실패({response.status_code}): {response.text}",
+            )
+        return response.json()
+
+    def batch(self, paths: Dict[str, str]) -> Dict[str, Tuple[int, dict]]:
+        """여러 GET 요청을 JSON $batch 한 번으로 보냅니다.
+
+        Args:
+            paths: {요청 ID: 상대 경로}
+
+        Returns:
+            {요청 ID: (상태 코드, 본문 dict)}
+
+        """
+        results = {}
+        pending = dict(paths)
+        for attempt in range(self.config["MAX_RETRIES"] + 1):
+            payload = {
+                "requests": [
+                    {"id": key, "method": "GET", "url": path}
+                    for key, path in pending.items()
+                ]
+            }
+            response = self._send("POST", f"{GRAPH_BASE_URL}/$batch", json=payload)
+            if not response.ok:
+                raise GraphRequestError(
+                    response.status_code,
+                    f"Graph $batch 실패({response.status_code}): {response.text}",
+                )
+
+            throttled = {}
+            delay = 0.0
+            for item in response.json().get("responses", []):
+                key = item.get("id")
+                status = item.get("status", 500)
+                if (
+                    status in THROTTLED_STATUS_CODES
+                    and attempt < self.config["MAX_RETRIES"]
+                ):
+                    throttled[key] = pending[key]
+                    delay = max(delay, self._retry_delay(item.get("headers"), attempt))
+                else:
+                    results[key] = (status, item.get("body") or {})
+            if not throttled:
+                break
+            # 제한된 하위 요청만 Retry-After 후 다시 전송
+            logger.warning(f"Graph $batch 일부 요청 제한, {delay:.1f}s 대기")
+            time.sleep(delay)
+            pending = throttled
+        return results
+
+    def iter_collection(self, first_page: dict) -> Iterator[list]:
+        """첫 페이지부터 @odata.nextLink를 따라 항목 묶음(페이지)을 하나씩 반환합니다.
+
+        다음 페이지는 앞 페이지를 모두 소비한 뒤에만 요청합니다.
+        """
+        page: Optional[dict] = first_page
+        while page is not None:
+            yield page.get("value", [])
+            next_link = page.get("@odata.nextLink")
+            page = self.get(next_link) if next_link else None
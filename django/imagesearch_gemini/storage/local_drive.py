@@ -8,7 +8,12 @@ from django.core.files.uploadedfile import UploadedFile
 
 
 def save_uploaded_image(
-    uploaded_file: UploadedFile, date_taken_user=None, location_user=None, tags=None
+    uploaded_file: UploadedFile,
+    date_taken_user=None,
+    location_user=None,
+    tags=None,
+    hasher=None,
+    spool_dir=None,
 ) -> str:
     """업로드된 이미지 파일을 임시로 저장하고, 임시 파일 경로를 반환합니다.
 
@@ -17,6 +22,8 @@ def save_uploaded_image(
         date_taken_user: 사용자가 입력한 촬영일 (선택사항)
         location_user: 사용자가 입력한 장소 (선택사항)
         tags: 태그 문자열 (쉼표로 구분, 선택사항)
+        hasher: 청크를 쓰면서 함께 갱신할 hashlib 객체 (선택사항)
+        spool_dir: 임시 파일을 만들 디렉터리 (Celery 워커와 공유, 생략 시 시스템 임시 디렉터리)
 
     Returns:
         str: 임시 파일 경로
@@ -39,8 +46,10 @@ def save_uploaded_image(
     _, ext = os.path.splitext(uploaded_file.name)
     if not ext:
         ext = ".jpg"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=ext, dir=spool_dir) as tmp:
         for chunk in uploaded_file.chunks():
             tmp.write(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
         tmp_path = tmp.name
     return tmp_path
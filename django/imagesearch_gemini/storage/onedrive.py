@@ -1,8 +1,13 @@
 import os
-import tempfile
 from datetime import datetime
 
-import requests
+from imagesearch_gemini.storage.downloader import download_to_spool
+from imagesearch_gemini.storage.graph_client import (
+    GRAPH_BASE_URL,
+    GraphClient,
+    GraphRequestError,
+    build_graph_path,
+)
 from imagesearch_gemini.utils.validators import validate_upload_data
 from oauth.onedrive import build_onedrive_auth_url
 from oauth.utils import get_token
@@ -17,6 +22,15 @@ BYTES_PER_MB = 1024 * 1024
 # HTTP 응답 상태 코드
 HTTP_OK = 200
 
+# Graph $select 필드 (목록 표시에 필요한 필드만 조회)
+FOLDER_SELECT = "id,name,parentReference"
+ITEM_SELECT = "id,name,folder,file,size,webUrl,lastModifiedDateTime,parentReference"
+SHARED_ITEM_SELECT = "id,name,remoteItem,lastModifiedDateTime,size,webUrl"
+DELTA_PATH = "/me/drive/root/delta"
+DELTA_SELECT = "id,parentReference"
+# 감시 폴더 동기화용 (cTag는 내용이 바뀔 때만 변경됨)
+WATCH_ITEM_SELECT = "id,name,file,folder,parentReference,cTag,deleted"
+
 
 def _parse_onedrive_items(items, is_shared=False):
     """폴더/이미지 분류 및 변환 (공유/내드라이브 공통)"""
@@ -75,6 +89,90 @@ def _parse_onedrive_items(items, is_shared=False):
     return folders, images
 
 
+def iter_onedrive_listing(user_email, parent_id=None, is_shared=False, drive_id=None):
+    """OneDrive 폴더 목록을 점진적으로 조회합니다.
+
+    폴더 메타데이터, children, sharedWithMe 첫 페이지는 JSON $batch 한 번으로 함께
+    가져오고($select로 필요한 필드만), 나머지 페이지는 entries를 소비하는 만큼
+    @odata.nextLink로 이어서 조회합니다.
+
+    Args:
+        user_email: 사용자 이메일
+        parent_id: 폴더 id (None이면 루트)
+        is_shared: 공유폴더 탐색 여부
+        drive_id: 공유폴더 탐색 시 driveId
+
+    Returns:
+        (folder_name, parent_info, entries)
+        entries: ("folder" 또는 "image", 항목 dict)를 순서대로 반환하는 제너레이터
+
+    """
+    client = _get_graph_client(user_email)
+
+    # 폴더 이름 및 children API 경로 결정
+    if is_shared and parent_id and drive_id:
+        folder_path = f"/drives/{drive_id}/items/{parent_id}"
+        folder_name = "공유 폴더"
+    elif parent_id and parent_id != "root":
+        folder_path = f"/me/drive/items/{parent_id}"
+        folder_name = "내 폴더"
+    else:
+        folder_path = "/me/drive/root"
+        folder_name = "내 폴더"
+    include_shared = not parent_id or parent_id == "root"
+
+    batch_paths = {
+        "folder": build_graph_path(folder_path, **{"$select": FOLDER_SELECT}),
+        "children": build_graph_path(
+            f"{folder_path}/children",
+            **{"$select": ITEM_SELECT, "$top": client.config["PAGE_SIZE"]},
+        ),
+    }
+    # 루트에서는 sharedWithMe도 추가
+    if include_shared:
+        batch_paths["shared"] = build_graph_path(
+            "/me/drive/sharedWithMe", **{"$select": SHARED_ITEM_SELECT}
+        )
+    results = client.batch(batch_paths)
+
+    status, children_page = results.get("children", (500, {}))
+    if status != HTTP_OK:
+        raise Exception(f"OneDrive 목록 조회 실패: {children_page}")
+
+    parent_info = {}
+    status, folder_data = results.get("folder", (500, {}))
+    if status == HTTP_OK:
+        folder_name = folder_data.get("name", folder_name)
+        parent_ref = folder_data.get("parentReference", {})
+        parent_info = {
+            "parent_id": parent_ref.get("id"),
+            "drive_id": parent_ref.get("driveId"),
+            "is_shared": is_shared
+            or (
+                parent_ref.get("driveId") is not None
+                and drive_id is not None
+                and parent_ref.get("driveId") != drive_id
+            ),
+        }
+
+    pages = [(children_page, is_shared)]
+    if include_shared:
+        status, shared_page = results.get("shared", (500, {}))
+        if status == HTTP_OK:
+            pages.append((shared_page, True))
+
+    def _entries():
+        for first_page, shared in pages:
+            for items in client.iter_collection(first_page):
+                folders, images = _parse_onedrive_items(items, is_shared=shared)
+                for folder in folders:
+                    yield "folder", folder
+                for image in images:
+                    yield "image", image
+
+    return folder_name, parent_info, _entries()
+
+
 def list_folders_and_images_in_onedrive(
     user_email, parent_id=None, is_shared=False, drive_id=None
 ):
@@ -83,68 +181,119 @@ def list_folders_and_images_in_onedrive(
     is_shared: 공유폴더 탐색 여부
     drive_id: 공유폴더 탐색 시 driveId
     """
+    folder_name, parent_info, entries = iter_onedrive_listing(
+        user_email, parent_id, is_shared=is_shared, drive_id=drive_id
+    )
+    folders, images = [], []
+    for kind, item in entries:
+        (folders if kind == "folder" else images).append(item)
+    return folders, images, folder_name, parent_info
+
+
+def _get_graph_client(user_email):
     access_token = get_token(user_email, "onedrive")
     if not access_token:
         auth_url = build_onedrive_auth_url()
         raise Exception(
             f"OneDrive 인증이 필요합니다. <a href='{auth_url}' class='cloud-auth-link' target='_blank'>OneDrive 인증하기</a>"
         )
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-    }
-    # 폴더 이름 및 children API URL 결정
-    if is_shared and parent_id and drive_id:
-        url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{parent_id}/children"
-        folder_url = (
-            f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{parent_id}"
+    return GraphClient(access_token)
+
+
+def get_onedrive_delta_link(user_email, select=DELTA_SELECT, drive_id=None):
+    """현재 시점의 Graph delta 링크를 반환합니다 (token=latest, 항목 없이 링크만 받음).
+
+    Args:
+        user_email: 사용자 이메일
+        select: delta 항목 $select
+        drive_id: 공유 드라이브 ID (None이면 내 드라이브)
+
+    """
+    client = _get_graph_client(user_email)
+    path = f"/drives/{drive_id}/root/delta" if drive_id else DELTA_PATH
+    response = client.get(
+        build_graph_path(path, **{"$select": select, "token": "latest"})
+    )
+    return response.get("@odata.deltaLink")
+
+
+def list_onedrive_changed_items(user_email, delta_link):
+    """delta 링크 이후 변경된 항목을 모두 가져옵니다.
+
+    Args:
+        user_email: 사용자 이메일
+        delta_link: 이전에 받은 @odata.deltaLink
+
+    Returns:
+        (변경 항목 dict 목록, 다음 동기화에 쓸 새 delta 링크)
+
+    """
+    client = _get_graph_client(user_email)
+    items = []
+    page = client.get(delta_link)
+    while True:
+        items.extend(page.get("value", []))
+        if "@odata.nextLink" not in page:
+            return items, page.get("@odata.deltaLink", delta_link)
+        page = client.get(page["@odata.nextLink"])
+
+
+def is_delta_link_expired(error):
+    """delta 링크가 만료되어 처음부터 다시 동기화해야 하는 오류인지 반환합니다.
+
+    Graph는 이때 410 Gone (resyncRequired)으로 응답합니다.
+    """
+    return isinstance(error, GraphRequestError) and error.status_code == 410
+
+
+def list_onedrive_changes(user_email, delta_link):
+    """delta 링크 이후 변경된 항목과 그 상위 폴더 ID를 모읍니다.
+
+    Args:
+        user_email: 사용자 이메일
+        delta_link: 이전에 받은 @odata.deltaLink
+
+    Returns:
+        (변경 항목/상위 폴더 ID set, 다음 동기화에 쓸 새 delta 링크)
+
+    """
+    items, new_link = list_onedrive_changed_items(user_email, delta_link)
+    changed_ids = set()
+    for item in items:
+        changed_ids.add(item.get("id"))
+        parent_id = (item.get("parentReference") or {}).get("id")
+        if parent_id:
+            changed_ids.add(parent_id)
+    changed_ids.discard(None)
+    return changed_ids, new_link
+
+
+def _onedrive_item_path(item_id, drive_id=None):
+    if drive_id:
+        return f"/drives/{drive_id}/items/{item_id}"
+    return f"/me/drive/items/{item_id}"
+
+
+def iter_onedrive_folder_items(user_email, folder_id, drive_id=None):
+    """폴더 바로 아래 항목을 @odata.nextLink를 따라가며 반환합니다."""
+    client = _get_graph_client(user_email)
+    first_page = client.get(
+        build_graph_path(
+            f"{_onedrive_item_path(folder_id, drive_id)}/children",
+            **{"$select": WATCH_ITEM_SELECT, "$top": client.config["PAGE_SIZE"]},
         )
-        folder_name = "공유 폴더"
-    elif parent_id and parent_id != "root":
-        url = f"https://graph.microsoft.com/v1.0/me/drive/items/{parent_id}/children"
-        folder_url = f"https://graph.microsoft.com/v1.0/me/drive/items/{parent_id}"
-        folder_name = "내 폴더"
-    else:
-        url = "https://graph.microsoft.com/v1.0/me/drive/root/children"
-        folder_url = "https://graph.microsoft.com/v1.0/me/drive/root"
-        folder_name = "내 폴더"
-    parent_info = {}
-    try:
-        folder_response = requests.get(folder_url, headers=headers, timeout=30)
-        if folder_response.status_code == HTTP_OK:
-            folder_data = folder_response.json()
-            folder_name = folder_data.get("name", folder_name)
-            parent_ref = folder_data.get("parentReference", {})
-            parent_info = {
-                "parent_id": parent_ref.get("id"),
-                "drive_id": parent_ref.get("driveId"),
-                "is_shared": is_shared
-                or (
-                    parent_ref.get("driveId") is not None
-                    and drive_id is not None
-                    and parent_ref.get("driveId") != drive_id
-                ),
-            }
-    except Exception:
-        pass
-    # 항목 목록 가져오기
-    response = requests.get(url, headers=headers, timeout=30)
-    if response.status_code != HTTP_OK:
-        raise Exception(f"OneDrive 목록 조회 실패: {response.text}")
-    items = response.json().get("value", [])
-    folders, images = _parse_onedrive_items(items, is_shared=is_shared)
-    # 루트에서는 sharedWithMe도 추가
-    if not parent_id or parent_id == "root":
-        shared_url = "https://graph.microsoft.com/v1.0/me/drive/sharedWithMe"
-        shared_response = requests.get(shared_url, headers=headers, timeout=30)
-        if shared_response.status_code == HTTP_OK:
-            shared_items = shared_response.json().get("value", [])
-            shared_folders, shared_images = _parse_onedrive_items(
-                shared_items, is_shared=True
-            )
-            folders.extend(shared_folders)
-            images.extend(shared_images)
-    return folders, images, folder_name, parent_info
+    )
+    for items in client.iter_collection(first_page):
+        yield from items
+
+
+def build_onedrive_download(user_email, item_id, drive_id=None):
+    """Graph content API URL과 인증 헤더를 반환합니다 (사전 인증 URL로 리다이렉트됨)."""
+    access_token = get_token(user_email, "onedrive")
+    if not access_token:
+        raise Exception("OneDrive 인증이 필요합니다.")
+    url = f"{GRAPH_BASE_URL}{_onedrive_item_path(item_id, drive_id)}/content"
+    return url, {"Authorization": f"Bearer {access_token}"}
 
 
 def _is_image_file(filename: str) -> bool:
@@ -165,19 +314,28 @@ def _is_image_file(filename: str) -> bool:
 
 
 def save_onedrive_image(
-    image_url: str, file_name: str, date_taken_user=None, location_user=None, tags=None
+    image_url: str,
+    file_name: str,
+    date_taken_user=None,
+    location_user=None,
+    tags=None,
+    hasher=None,
+    spool_dir=None,
+    headers=None,
 ) -> str:
     """OneDrive 이미지를 다운로드하여 임시로 저장하고, 임시 파일 경로를 반환합니다."""
-    response = requests.get(image_url, timeout=30)
-    response.raise_for_status()
-    content_type = response.headers.get("content-type", "")
-    if not any(ext in content_type.lower() for ext in ["jpeg", "jpg", "png"]):
-        raise ValidationError("지원하지 않는 이미지 형식입니다.")
     if not any(file_name.lower().endswith(ext) for ext in [".jpg", ".jpeg", ".png"]):
         file_name += ".jpg"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-        temp_file.write(response.content)
-        temp_path = temp_file.name
+    # 공유 커넥션 풀로 스트리밍 다운로드 (크기 제한/429·503 재시도 포함)
+    temp_path = download_to_spool(
+        "onedrive",
+        image_url,
+        spool_dir=spool_dir,
+        suffix=".jpg",
+        hasher=hasher,
+        headers=headers,
+    )
+    try:
         with open(temp_path, "rb") as f:
             file_obj = File(f, name=file_name)
             is_valid, errors = validate_upload_data(
@@ -186,6 +344,9 @@ def save_onedrive_image(
                 location=location_user,
                 tags=tags,
             )
-            if not is_valid:
-                raise ValidationError("; ".join(errors))
+        if not is_valid:
+            raise ValidationError("; ".join(errors))
+    except Exception:
+        os.remove(temp_path)
+        raise
     return temp_path
@@ -1,52 +1,525 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import List, Optional
 
 from celery import shared_task
+from celery.signals import worker_process_init
 
-from .models import ImageEmbedding
-from .utils.embeddings import get_image_embedding
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ImageEmbedding, IngestionJob, WatchedFolder
+from .storage.downloader import cloud_downloader
+from .storage.folder_cache import cloud_folder_cache
+from .utils.embedding_backends import get_embedding_backend
+from .utils.embeddings import get_image_embedding, get_image_embeddings
+from .utils.image_processing import (
+    _remove_temp_file,
+    extract_images_metadata,
+    is_allowed_image_file,
+    persist_image,
+    split_duplicate_uploads,
+)
+from .utils.ingestion import (
+    download_cloud_file,
+    download_cloud_image,
+    get_ingestion_config,
+    get_spool_dir,
+    normalize_cloud_file_name,
+    parse_tag_list,
+)
 from .utils.logger import log_embedding_generation
+from .utils.result_cache import bump_corpus_generation
+from .utils.vector_storage import (
+    compact_columns_enabled,
+    prepare_embedding,
+    quantize_embeddings,
+)
+from .utils.watched_folders import get_watched_folder_config, sync_watched_folder
 
 logger = logging.getLogger(__name__)
 
+# 마이크로 배치 스케줄링용 캐시 키
+BATCH_SCHEDULED_KEY = "imagesearch:embedding_batch:scheduled"
+BATCH_COUNT_KEY = "imagesearch:embedding_batch:count"
 
-@shared_task
-def generate_image_embedding_task(image_embedding_id):
+DEFAULT_EMBEDDING_BATCH = {
+    "WINDOW_SECONDS": 2.0,
+    "MAX_SIZE": 32,
+    "CONCURRENCY": 4,
+    # 이 시간 동안 processing에 머문 행은 워커가 중단된 것으로 보고 다시 선점
+    "STALE_SECONDS": 900,
+}
+
+
+def _get_batch_config() -> dict:
+    config = dict(DEFAULT_EMBEDDING_BATCH)
+    config.update(getattr(settings, "EMBEDDING_BATCH", {}) or {})
+    return config
+
+
+@worker_process_init.connect
+def warm_up_embedding_model(**kwargs):
+    """워커 프로세스 시작 시 임베딩 모델을 미리 로드합니다."""
     try:
-        image_embedding = ImageEmbedding.objects.get(id=image_embedding_id)
-        file_path = image_embedding.image_path  # Django storage 경로 그대로 사용
-        # 임베딩 생성
-        embedding_model, embedding = get_image_embedding(file_path)
-        image_embedding.embedding = embedding
-        image_embedding.embedding_model = embedding_model
-        image_embedding.embedding_status = "done"
-        image_embedding.save()
+        get_embedding_backend().warm_up()
     except Exception as e:
-        logger.error(f"임베딩 생성 실패: {e}")
+        # 초기화 실패 시 첫 태스크에서 다시 시도됨
+        logger.warning(f"임베딩 모델 사전 로드 실패: {e}")
+
+
+@shared_task
+def generate_image_embedding_task(image_embedding_id):
+    """단일 이미지 임베딩을 생성합니다 (배치 처리 경로를 그대로 사용)."""
+    return generate_image_embeddings_batch_task([image_embedding_id])
+
+
+# 이전 태스크 이름 호환 (모델 save, 재시도 뷰, 테스트에서 사용)
+generate_image_embedding = generate_image_embedding_task
+
+
+def _embed_image(image_embedding: ImageEmbedding):
+    file_path = image_embedding.image_path  # Django storage 경로 그대로 사용
+    embedding_model, embedding = get_image_embedding(file_path)
+    if embedding is None:
+        raise ValueError("임베딩이 생성되지 않았습니다.")
+    return embedding_model, embedding
+
+
+def _embed_images(images: dict, concurrency: int) -> dict:
+    """{image_id: (embedding_model, embedding) 또는 예외}를 반환합니다.
+
+    배치 추론을 지원하는 로컬 백엔드는 한 번에 추론하고, 원격 API 백엔드는
+    제한된 스레드 풀에서 이미지별로 동시에 호출합니다.
+    """
+    if get_embedding_backend().supports_batch:
+        try:
+            embedding_model, embeddings = get_image_embeddings(
+                [image.image_path for image in images.values()]
+            )
+            return {
+                image_id: (
+                    (embedding_model, embedding)
+                    if embedding is not None
+                    else ValueError("임베딩이 생성되지 않았습니다.")
+                )
+                for image_id, embedding in zip(images.keys(), embeddings)
+            }
+        except Exception as e:
+            # 묶음 중 한 파일 오류로 전체가 실패하면 이미지별로 다시 시도
+            logger.warning(f"배치 임베딩 실패, 이미지별로 재시도: {e}")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            image_id: pool.submit(_embed_image, image)
+            for image_id, image in images.items()
+        }
+    results = {}
+    for image_id, future in futures.items():
         try:
-            image_embedding = ImageEmbedding.objects.get(id=image_embedding_id)
-            image_embedding.embedding_status = "failed"
-            image_embedding.save()
-        except Exception:
-            pass
+            results[image_id] = future.result()
+        except Exception as e:
+            results[image_id] = e
+    return results
+
+
+@shared_task
+def generate_image_embeddings_batch_task(image_embedding_ids: List[int]) -> dict:
+    """여러 이미지의 임베딩을 한 번에 생성합니다.
+
+    한 번의 in_bulk 조회로 대상을 읽고, 백엔드에 따라 배치 추론 또는 제한된
+    스레드 풀에서의 동시 API 호출로 임베딩을 만든 뒤 bulk_update로 저장합니다.
+    개별 이미지 실패는 해당 행만 failed로 기록하고 나머지는 계속 처리합니다.
+
+    Args:
+        image_embedding_ids: 처리할 ImageEmbedding ID 목록
+
+    Returns:
+        {"done": 성공 수, "failed": 실패 수}
+
+    """
+    images = ImageEmbedding.objects.in_bulk(list(image_embedding_ids))
+    if not images:
+        return {"done": 0, "failed": 0}
+
+    # update()는 auto_now를 갱신하지 않으므로 선점 시각을 직접 기록
+    ImageEmbedding.objects.filter(id__in=images.keys()).update(
+        embedding_status="processing", updated_at=timezone.now()
+    )
+
+    concurrency = max(1, min(_get_batch_config()["CONCURRENCY"], len(images)))
+    results = _embed_images(images, concurrency)
+
+    now = timezone.now()
+    done_images = []
+    failed_images = []
+    for image_id, result in results.items():
+        image = images[image_id]
+        image.updated_at = now
+        if isinstance(result, Exception):
+            image.embedding_status = "failed"
+            image.embedding_error = str(result)
+            failed_images.append(image)
+            log_embedding_generation(image_id, "failed", str(result))
+        else:
+            image.embedding_model, embedding = result
+            # ip/cosine 척도면 단위 길이로 저장 (검색 시 <#> 비교가 코사인 순위와 같도록)
+            image.embedding = prepare_embedding(embedding)
+            image.embedding_status = "done"
+            image.embedding_error = None
+            done_images.append(image)
+            log_embedding_generation(image_id, "done")
+
+    # 저장과 압축 컬럼 갱신을 한 트랜잭션으로 묶어, 검색 결과 캐시 무효화가
+    # 양자화까지 끝난 뒤(커밋 시점)에 일어나도록 함
+    status_fields = ["embedding_status", "embedding_error", "updated_at"]
+    with transaction.atomic():
+        if done_images:
+            ImageEmbedding.objects.bulk_update(
+                done_images, ["embedding", "embedding_model", *status_fields]
+            )
+            if compact_columns_enabled():
+                quantize_embeddings(
+                    ImageEmbedding.objects.filter(
+                        id__in=[image.id for image in done_images]
+                    )
+                )
+            # 새 임베딩이 검색 대상에 추가되었으므로 검색 결과 캐시 무효화
+            transaction.on_commit(bump_corpus_generation)
+        if failed_images:
+            # 실패한 행은 상태만 기록하고 기존 임베딩(재시도 전 벡터)은 그대로 둠
+            ImageEmbedding.objects.bulk_update(failed_images, status_fields)
+    return {"done": len(done_images), "failed": len(failed_images)}
+
+
+def _stale_processing_filter() -> Q:
+    """선점 후 STALE_SECONDS 동안 끝나지 않은 processing 행 조건을 반환합니다."""
+    cutoff = timezone.now() - timedelta(seconds=_get_batch_config()["STALE_SECONDS"])
+    return Q(embedding_status="processing", updated_at__lt=cutoff)
+
+
+def _overdue_filter() -> Q:
+    """플러시되지 않은 채 WINDOW_SECONDS가 지난 pending 행과 중단된 processing 행 조건."""
+    cutoff = timezone.now() - timedelta(seconds=_get_batch_config()["WINDOW_SECONDS"])
+    overdue_pending = Q(embedding_status="pending", updated_at__lt=cutoff)
+    return overdue_pending | _stale_processing_filter()
+
+
+def _claim_pending_ids(limit: int) -> List[int]:
+    """pending 상태 이미지를 최대 limit개 가져와 processing으로 선점합니다.
+
+    SKIP LOCKED로 여러 워커가 동시에 실행해도 같은 행을 중복 처리하지 않습니다.
+    선점한 워커가 중단되어 processing에 오래 머문 행도 다시 선점합니다.
+    """
+    with transaction.atomic():
+        ids = list(
+            ImageEmbedding.objects.select_for_update(skip_locked=True)
+            .filter(Q(embedding_status="pending") | _stale_processing_filter())
+            .order_by("id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if ids:
+            # update()는 auto_now를 갱신하지 않으므로 선점 시각을 직접 기록
+            ImageEmbedding.objects.filter(id__in=ids).update(
+                embedding_status="processing", updated_at=timezone.now()
+            )
+    return ids
+
+
+@shared_task
+def flush_pending_embeddings() -> int:
+    """모인 pending 이미지를 배치 크기만큼 처리합니다.
+
+    처리 후에도 pending이 남아 있으면 다음 배치를 바로 예약합니다.
+
+    Returns:
+        이번 배치에서 처리한 이미지 수
+
+    """
+    cache.delete(BATCH_SCHEDULED_KEY)
+    cache.delete(BATCH_COUNT_KEY)
+
+    max_size = _get_batch_config()["MAX_SIZE"]
+    ids = _claim_pending_ids(max_size)
+    if not ids:
+        return 0
+
+    generate_image_embeddings_batch_task(ids)
+
+    if len(ids) >= max_size:
+        flush_pending_embeddings.delay()
+    return len(ids)
+
+
+def enqueue_image_embedding(image_embedding_id: int) -> None:
+    """이미지 임베딩을 마이크로 배치에 추가합니다.
+
+    대상 행은 이미 pending 상태로 DB에 있으므로 여기서는 플러시 태스크만
+    예약합니다. 윈도우당 한 번만 예약하고, 윈도우 안에 MAX_SIZE개가 모이면
+    즉시 플러시합니다.
+    """
+    config = _get_batch_config()
+    window = config["WINDOW_SECONDS"]
+
+    cache.add(BATCH_COUNT_KEY, 0, timeout=max(1, int(window * 2)))
+    try:
+        count = cache.incr(BATCH_COUNT_KEY)
+    except ValueError:
+        # 카운터가 그 사이 만료된 경우
+        count = 1
+
+    # 캐시 장애 시 django_redis(IGNORE_EXCEPTIONS)는 예외 대신 None을 반환하므로
+    # 윈도우를 세지 못하면 바로 플러시 (pending 행이 예약 없이 남지 않도록)
+    if count is None or count >= config["MAX_SIZE"]:
+        cache.delete(BATCH_COUNT_KEY)
+        flush_pending_embeddings.delay()
+        return
+    scheduled = cache.add(BATCH_SCHEDULED_KEY, image_embedding_id, timeout=window)
+    if scheduled:
+        flush_pending_embeddings.apply_async(countdown=window)
+    elif scheduled is None:
+        flush_pending_embeddings.delay()
 
 
 @shared_task
 def retry_failed_embeddings() -> int:
     """실패한 임베딩들을 재시도하는 태스크입니다.
 
+    워커 중단으로 processing에 남은 행이나, 플러시 예약이 누락되어 WINDOW_SECONDS
+    넘게 pending에 머문 행이 있으면 함께 다시 처리합니다.
+
     Returns:
         재시도된 태스크 수
 
     """
-    failed_images = ImageEmbedding.objects.filter(embedding_status="failed")
-    retry_count = 0
-
-    for image in failed_images:
+    retry_count = ImageEmbedding.objects.filter(embedding_status="failed").update(
+        embedding_status="pending", embedding_error=None, updated_at=timezone.now()
+    )
+    if retry_count or ImageEmbedding.objects.filter(_overdue_filter()).exists():
         try:
-            generate_image_embedding_task.delay(image.id)
-            retry_count += 1
+            flush_pending_embeddings.delay()
         except Exception as e:
-            # 개별 실패는 로깅만 하고 계속 진행
-            log_embedding_generation(image.id, "failed", f"Retry failed: {e}")
+            # 예약 실패는 로깅만 하고 다음 주기에 다시 시도
+            logger.error(f"Retry failed: {e}")
 
     return retry_count
+
+
+@shared_task
+def refresh_cloud_folder_caches() -> int:
+    """클라우드 폴더 캐시를 변경분(delta) 기준으로 갱신합니다.
+
+    Returns:
+        무효화 후 다시 채운 폴더 수
+
+    """
+    return cloud_folder_cache.sync_all()
+
+
+WATCHED_FOLDER_LOCK_KEY = "imagesearch:watched:lock:{}"
+
+
+@shared_task
+def sync_watched_folders() -> int:
+    """활성화된 감시 폴더마다 동기화 태스크를 예약합니다."""
+    folder_ids = list(
+        WatchedFolder.objects.filter(enabled=True).values_list("id", flat=True)
+    )
+    for folder_id in folder_ids:
+        sync_watched_folder_task.delay(folder_id)
+    return len(folder_ids)
+
+
+@shared_task
+def sync_watched_folder_task(folder_id: int) -> int:
+    """감시 폴더 하나를 동기화합니다 (같은 폴더는 동시에 한 워커만 실행).
+
+    Returns:
+        수집 파이프라인에 넘긴 항목 수
+
+    """
+    lock_key = WATCHED_FOLDER_LOCK_KEY.format(folder_id)
+    if not cache.add(lock_key, 1, get_watched_folder_config()["INTERVAL"] * 3):
+        return 0
+    try:
+        folder = WatchedFolder.objects.filter(pk=folder_id, enabled=True).first()
+        if folder is None:
+            return 0
+        return sync_watched_folder(folder)
+    finally:
+        cache.delete(lock_key)
+
+
+# 업로드 수집 파이프라인
+# 수신(receive) → 메타데이터 추출(extract) → 저장/임베딩 예약(persist) 단계가
+# 각각 별도 큐(settings.CELERY_TASK_ROUTES)에서 독립된 동시성으로 실행됩니다.
+
+
+@shared_task
+def ingest_receive_task(job_id: str, items: List[dict]) -> int:
+    """수신 단계: 파일을 스풀 디렉터리에 모으고 중복을 걸러 추출 단계로 넘깁니다.
+
+    로컬 업로드는 뷰에서 이미 스풀된 파일({"path", "sha256"})을,
+    클라우드는 내려받을 URL({"url", "name"})을, 감시 폴더는 API로 내려받을
+    파일 ID({"provider", "user_email", "file_id", "name", "source_ref"})를 받습니다.
+
+    Args:
+        job_id: IngestionJob ID
+        items: 수신할 항목 목록
+
+    Returns:
+        추출 단계로 넘긴 항목 수
+
+    """
+    job = IngestionJob.objects.get(pk=job_id)
+    IngestionJob.objects.filter(pk=job_id, status="queued").update(status="running")
+
+    spool_dir = get_spool_dir()
+    spooled = [(item["path"], item.get("sha256")) for item in items if "path" in item]
+    downloads = [
+        (index, item) for index, item in enumerate(items) if "path" not in item
+    ]
+
+    def _download(entry):
+        index, item = entry
+        file_name = normalize_cloud_file_name(item.get("name"), index)
+        if "file_id" in item:
+            return download_cloud_file(
+                {**item, "name": file_name}, job.options, spool_dir
+            )
+        return download_cloud_image(item["url"], file_name, job.options, spool_dir)
+
+    # 클라우드 이미지는 프로바이더별 커넥션 풀을 공유하며 제한된 동시성으로 다운로드
+    not_allowed_count = 0
+    failed_count = 0
+    last_error = None
+    source_refs = {}
+    results = cloud_downloader.map(_download, downloads)
+    for (_, item), result in zip(downloads, results):
+        if isinstance(result, ValidationError):
+            not_allowed_count += 1
+            last_error = str(result)
+        elif isinstance(result, Exception):
+            failed_count += 1
+            last_error = str(result)
+            logger.error(
+                f"클라우드 이미지 수신 실패: {item.get('url') or item.get('file_id')}, "
+                f"오류: {result}"
+            )
+        else:
+            spooled.append(result)
+            if item.get("source_ref"):
+                source_refs[result[0]] = item["source_ref"]
+
+    # 묶음 전체를 한 번의 쿼리로 중복 확인 (중복 파일은 여기서 삭제)
+    new_items, duplicate_count = split_duplicate_uploads(spooled)
+    IngestionJob.record(
+        job_id,
+        error=last_error,
+        received_count=len(spooled),
+        duplicate_count=duplicate_count,
+        not_allowed_count=not_allowed_count,
+        failed_count=failed_count,
+    )
+
+    # 역지오코딩/타임존 조회를 묶음 단위로 하도록 EXTRACT_BATCH_SIZE개씩 넘김
+    batch_size = max(1, get_ingestion_config()["EXTRACT_BATCH_SIZE"])
+    for start in range(0, len(new_items), batch_size):
+        ingest_extract_task.delay(
+            job_id,
+            [
+                {
+                    "path": tmp_path,
+                    "sha256": content_sha256,
+                    "source_ref": source_refs.get(tmp_path),
+                }
+                for tmp_path, content_sha256 in new_items[start : start + batch_size]
+            ],
+        )
+    return len(new_items)
+
+
+@shared_task
+def ingest_extract_task(job_id: str, items: List[dict]) -> None:
+    """추출 단계: EXIF, 역지오코딩, 촬영일 타임존, 지각 해시를 계산합니다.
+
+    역지오코딩은 묶음 전체의 GPS 좌표를 한 번에 조회합니다.
+
+    Args:
+        job_id: IngestionJob ID
+        items: [{"path", "sha256", "source_ref"}, ...]
+
+    """
+    allowed = []
+    not_allowed_count = 0
+    for item in items:
+        if is_allowed_image_file(item["path"]):
+            allowed.append(item)
+        else:
+            _remove_temp_file(item["path"])
+            not_allowed_count += 1
+
+    extracted_count = 0
+    failed_count = 0
+    last_error = None
+    results = extract_images_metadata([item["path"] for item in allowed])
+    for item, metadata in zip(allowed, results):
+        if isinstance(metadata, Exception):
+            logger.error(f"메타데이터 추출 실패: {item['path']}, 오류: {metadata}")
+            _remove_temp_file(item["path"])
+            failed_count += 1
+            last_error = str(metadata)
+            continue
+        extracted_count += 1
+        ingest_persist_task.delay(
+            job_id, item["path"], item["sha256"], metadata, item.get("source_ref")
+        )
+
+    IngestionJob.record(
+        job_id,
+        error=last_error,
+        extracted_count=extracted_count,
+        not_allowed_count=not_allowed_count,
+        failed_count=failed_count,
+    )
+
+
+@shared_task
+def ingest_persist_task(
+    job_id: str,
+    image_path: str,
+    content_sha256: str,
+    metadata: dict,
+    source_ref: Optional[str] = None,
+) -> None:
+    """저장 단계: 저장소에 파일을 올리고 DB에 저장합니다 (임베딩은 커밋 후 자동 예약)."""
+    options = (
+        IngestionJob.objects.filter(pk=job_id).values_list("options", flat=True).first()
+        or {}
+    )
+    try:
+        obj = persist_image(
+            image_path,
+            metadata,
+            date_taken_user=options.get("date_taken_user") or None,
+            user_location=options.get("location_user") or None,
+            tag_list=parse_tag_list(options.get("tags")),
+            content_sha256=content_sha256,
+            source_ref=source_ref,
+        )
+    except Exception as e:
+        logger.error(f"이미지 저장 실패: {image_path}, 오류: {e}")
+        IngestionJob.record(job_id, error=str(e), failed_count=1)
+        return
+    finally:
+        _remove_temp_file(image_path)
+
+    if obj:
+        IngestionJob.record(job_id, persisted_count=1)
+    else:
+        IngestionJob.record(job_id, duplicate_count=1)
@@ -0,0 +1,94 @@
+"""클라우드 다운로더 테스트입니다."""
+
+import hashlib
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+
+from ..storage.downloader import CloudDownloader
+
+
+def _fake_response(chunks, headers):
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.headers = headers
+    response.iter_content.return_value = iter(chunks)
+    return response
+
+
+@override_settings(CLOUD_DOWNLOAD={"MAX_BYTES": 10, "CHUNK_SIZE": 4})
+class CloudDownloaderTests(TestCase):
+    """클라우드 다운로더 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.downloader = CloudDownloader()
+        self.spool_dir = tempfile.mkdtemp()
+
+    def test_session_reused_per_provider(self):
+        """프로바이더별 Session을 재사용하고 Retry-After를 따르는지 테스트."""
+        session = self.downloader.get_session("google")
+
+        self.assertIs(session, self.downloader.get_session("google"))
+        self.assertIsNot(session, self.downloader.get_session("onedrive"))
+        retry = session.get_adapter("https://").max_retries
+        self.assertIn(429, retry.status_forcelist)
+        self.assertIn(503, retry.status_forcelist)
+        self.assertTrue(retry.respect_retry_after_header)
+
+    def test_session_without_status_retry(self):
+        """상태 코드 재시도를 끈 Session은 429/503을 재시도하지 않는지 테스트."""
+        session = self.downloader.get_session("graph", retry_status=False)
+
+        self.assertIsNot(session, self.downloader.get_session("graph"))
+        self.assertIs(session, self.downloader.get_session("graph", retry_status=False))
+        retry = session.get_adapter("https://").max_retries
+        self.assertFalse(retry.status_forcelist)
+        self.assertFalse(retry.respect_retry_after_header)
+
+    @patch.object(CloudDownloader, "get_session")
+    def test_streams_to_disk_with_hash(self, mock_get_session):
+        """본문을 청크 단위로 저장하고 해시를 함께 계산하는지 테스트."""
+        mock_get_session.return_value.get.return_value = _fake_response(
+            [b"abcd", b"efg"], {"content-type": "image/jpeg"}
+        )
+        hasher = hashlib.sha256()
+
+        path = self.downloader.download(
+            "google", "https://example.com/a", spool_dir=self.spool_dir, hasher=hasher
+        )
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"abcdefg")
+        self.assertEqual(hasher.hexdigest(), hashlib.sha256(b"abcdefg").hexdigest())
+
+    @patch.object(CloudDownloader, "get_session")
+    def test_size_cap_enforced_mid_stream(self, mock_get_session):
+        """Content-Length 없이 크기 제한을 넘으면 중단하고 파일을 지우는지 테스트."""
+        mock_get_session.return_value.get.return_value = _fake_response(
+            [b"abcd", b"efgh", b"ijkl"], {"content-type": "image/png"}
+        )
+
+        with self.assertRaises(ValidationError):
+            self.downloader.download(
+                "onedrive", "https://example.com/b", spool_dir=self.spool_dir
+            )
+
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_map_isolates_failures(self):
+        """병렬 실행 중 한 항목의 예외가 다른 결과에 영향을 주지 않는지 테스트."""
+
+        def work(item):
+            if item == 2:
+                raise ValueError("bad")
+            return item * 10
+
+        results = self.downloader.map(work, [1, 2, 3], max_workers=2)
+
+        self.assertEqual(results[0], 10)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], 30)
@@ -0,0 +1,141 @@
+"""임베딩 백엔드 테스트입니다."""
+
+import os
+import tempfile
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+
+from ..tasks import generate_image_embeddings_batch_task
+from ..utils.embedding_backends import (
+    VECTOR_DIMENSION,
+    EmbeddingBackend,
+    FakeEmbeddingBackend,
+    get_embedding_backend,
+    pad_vector,
+    reset_embedding_backend,
+)
+from ..utils.embeddings import VertexAIBackend, get_image_embeddings
+
+FAKE_BACKEND = {"BACKEND": "fake", "OPTIONS": {}}
+
+
+class EmbeddingBackendTests(TestCase):
+    """임베딩 백엔드 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        reset_embedding_backend()
+        self.addCleanup(reset_embedding_backend)
+
+    def _write_file(self, data):
+        fd, path = tempfile.mkstemp(suffix=".jpg")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_default_backend_is_vertex(self):
+        """기본 설정에서 Vertex AI 백엔드가 선택되는지 테스트."""
+        self.assertIsInstance(get_embedding_backend(), VertexAIBackend)
+
+    @override_settings(EMBEDDING_BACKEND=FAKE_BACKEND)
+    def test_backend_selected_from_settings(self):
+        """settings로 지정한 백엔드가 선택되는지 테스트."""
+        self.assertIsInstance(get_embedding_backend(), FakeEmbeddingBackend)
+
+    @override_settings(EMBEDDING_BACKEND={"BACKEND": "no.such.Backend"})
+    def test_unknown_backend_raises(self):
+        """존재하지 않는 백엔드 경로 설정 시 오류 테스트."""
+        with self.assertRaises(ImproperlyConfigured):
+            get_embedding_backend()
+
+    def test_incomplete_backend_fails_on_instantiation(self):
+        """embed_text를 구현하지 않은 백엔드는 생성 시점에 실패하는지 테스트."""
+
+        class ImageOnlyBackend(EmbeddingBackend):
+            name = "image-only"
+
+            def embed_image(self, image_path):
+                return [0.0] * VECTOR_DIMENSION
+
+        with self.assertRaises(TypeError):
+            ImageOnlyBackend()
+
+    @override_settings(EMBEDDING_BACKEND={"BACKEND": "onnx_clip", "OPTIONS": {}})
+    def test_onnx_backend_requires_model_paths(self):
+        """ONNX 백엔드에 모델 경로가 없으면 오류 테스트."""
+        with self.assertRaises(ImproperlyConfigured):
+            get_embedding_backend()
+
+    def test_fake_backend_is_deterministic(self):
+        """같은 입력이면 같은 단위 벡터를 반환하는지 테스트."""
+        backend = FakeEmbeddingBackend()
+        first = self._write_file(b"image-a")
+        same = self._write_file(b"image-a")
+        other = self._write_file(b"image-b")
+
+        vector = backend.embed_image(first)
+
+        self.assertEqual(len(vector), VECTOR_DIMENSION)
+        self.assertAlmostEqual(float(np.linalg.norm(vector)), 1.0, places=5)
+        self.assertEqual(vector, backend.embed_image(same))
+        self.assertNotEqual(vector, backend.embed_image(other))
+        self.assertEqual(backend.embed_text("Cat "), backend.embed_text("cat"))
+        with self.assertRaises(ValueError):
+            backend.embed_text("  ")
+
+    def test_fake_backend_pads_short_vectors(self):
+        """백엔드 차원이 컬럼보다 작으면 0으로 채우는지 테스트."""
+        backend = FakeEmbeddingBackend({"DIMENSION": 512})
+
+        vector = backend.embed_text("dog")
+
+        self.assertEqual(len(vector), VECTOR_DIMENSION)
+        self.assertEqual(vector[512:], [0.0] * (VECTOR_DIMENSION - 512))
+        with self.assertRaises(ValueError):
+            pad_vector([0.0] * (VECTOR_DIMENSION + 1))
+
+    @override_settings(EMBEDDING_BACKEND=FAKE_BACKEND)
+    def test_get_image_embeddings_records_backend_name(self):
+        """일괄 임베딩 결과에 백엔드 이름이 함께 반환되는지 테스트."""
+        path = self._write_file(b"image-a")
+
+        model_name, vectors = get_image_embeddings([path, path])
+
+        self.assertEqual(model_name, FakeEmbeddingBackend.name)
+        self.assertEqual(vectors[0], vectors[1])
+
+    @override_settings(EMBEDDING_BACKEND=FAKE_BACKEND)
+    @patch("imagesearch_gemini.tasks.get_image_embedding")
+    @patch("imagesearch_gemini.tasks.ImageEmbedding")
+    def test_batch_task_uses_batch_backend(self, mock_model, mock_get_embedding):
+        """배치 지원 백엔드는 이미지별 호출 없이 한 번에 추론하는지 테스트."""
+        good_image = Mock(id=1, image_path=self._write_file(b"image-a"))
+        missing_image = Mock(id=2, image_path="/nonexistent/image.jpg")
+        mock_model.objects.in_bulk.return_value = {1: good_image, 2: missing_image}
+
+        def fallback_embedding(path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(path)
+            return "fallback", [0.1] * VECTOR_DIMENSION
+
+        mock_get_embedding.side_effect = fallback_embedding
+
+        # 한 파일 오류로 배치 추론이 실패하면 이미지별로 다시 시도
+        result = generate_image_embeddings_batch_task([1, 2])
+
+        self.assertEqual(result, {"done": 1, "failed": 1})
+        self.assertEqual(missing_image.embedding_status, "failed")
+
+        mock_get_embedding.reset_mock()
+        missing_image.image_path = good_image.image_path
+
+        result = generate_image_embeddings_batch_task([1, 2])
+
+        self.assertEqual(result, {"done": 2, "failed": 0})
+        self.assertEqual(good_image.embedding_model, FakeEmbeddingBackend.name)
+        mock_get_embedding.assert_not_called()
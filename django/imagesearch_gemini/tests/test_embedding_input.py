@@ -0,0 +1,57 @@
+"""임베딩 입력 전처리 테스트입니다."""
+
+import io
+import os
+import shutil
+import tempfile
+
+from PIL import Image as PilImage
+
+from django.test import TestCase, override_settings
+
+from ..utils.embedding_input import embedding_input_stats, prepare_embedding_input
+
+
+@override_settings(EMBEDDING_INPUT={"MAX_SIDE": 512, "JPEG_QUALITY": 90})
+class EmbeddingInputTests(TestCase):
+    """임베딩 입력 전처리 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        embedding_input_stats.clear()
+
+    def _save(self, name, size, orientation=None):
+        path = os.path.join(self.tmp_dir, name)
+        image = PilImage.effect_noise(size, 64).convert("RGB")
+        exif = PilImage.Exif()
+        if orientation:
+            exif[0x0112] = orientation
+        image.save(path, "JPEG", quality=95, exif=exif)
+        return path
+
+    def test_large_image_downscaled_and_oriented(self):
+        """큰 이미지를 축소하고 EXIF 방향(90도 회전)을 적용하는지 테스트."""
+        path = self._save("large.jpg", (3000, 2000), orientation=6)
+
+        data, stats = prepare_embedding_input(path)
+
+        self.assertTrue(stats["resized"])
+        self.assertGreater(stats["saved_bytes"], 0)
+        with PilImage.open(io.BytesIO(data)) as image:
+            self.assertEqual(max(image.size), 512)
+            self.assertGreater(image.height, image.width)
+        self.assertEqual(embedding_input_stats.get_metrics()["requests"], 1)
+
+    def test_small_image_sent_as_is(self):
+        """이미 작은 이미지는 원본 바이트를 그대로 보내는지 테스트."""
+        path = os.path.join(self.tmp_dir, "small.jpg")
+        PilImage.new("RGB", (64, 64), (10, 20, 30)).save(path, "JPEG", quality=50)
+
+        data, stats = prepare_embedding_input(path)
+
+        with open(path, "rb") as f:
+            self.assertEqual(data, f.read())
+        self.assertFalse(stats["resized"])
+        self.assertEqual(stats["saved_bytes"], 0)
@@ -7,7 +7,12 @@ from unittest.mock import Mock, patch
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 
-from ..utils.embeddings import get_image_embedding, get_text_embedding
+from ..utils.embeddings import (
+    get_embedding_client_metrics,
+    get_image_embedding,
+    get_text_embedding,
+    reset_embedding_client,
+)
 
 
 class EmbeddingTests(TestCase):
@@ -20,6 +25,9 @@ class EmbeddingTests(TestCase):
         self.test_image = SimpleUploadedFile(
             "test.jpg", self.test_image_content, content_type="image/jpeg"
         )
+        # 프로세스 캐시된 모델이 테스트 간에 공유되지 않도록 초기화
+        reset_embedding_client()
+        self.addCleanup(reset_embedding_client)
 
     @patch("imagesearch_gemini.utils.embeddings._setup_google_credentials")
     @patch("imagesearch_gemini.utils.embeddings._initialize_vertex_ai")
@@ -103,3 +111,24 @@ class EmbeddingTests(TestCase):
 
         with self.assertRaises(ValueError):
             get_text_embedding("   ")
+
+    @patch("imagesearch_gemini.utils.embeddings._setup_google_credentials")
+    @patch("imagesearch_gemini.utils.embeddings._initialize_vertex_ai")
+    @patch("imagesearch_gemini.utils.embeddings.log_api_usage")
+    def test_embedding_model_is_reused(self, mock_log, mock_init, mock_setup):
+        """모델 초기화가 프로세스당 한 번만 수행되는지 테스트."""
+        mock_model = Mock()
+        mock_init.return_value = mock_model
+
+        mock_embeddings = Mock()
+        mock_embeddings.text_embedding = [0.1, 0.2, 0.3] * 469
+        mock_model.get_embeddings.return_value = mock_embeddings
+
+        for _ in range(3):
+            get_text_embedding("test query")
+
+        mock_setup.assert_called_once()
+        mock_init.assert_called_once()
+        metrics = get_embedding_client_metrics()
+        self.assertEqual(metrics["init_count"], 1)
+        self.assertEqual(metrics["reuse_count"], 2)
@@ -0,0 +1,95 @@
+"""클라우드 폴더 목록 캐시 테스트입니다."""
+
+from unittest.mock import Mock, patch
+
+from django.test import TestCase, override_settings
+
+from ..storage import folder_cache
+from ..storage.folder_cache import CloudFolderCache
+from .utils import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CloudFolderCacheTests(TestCase):
+    """클라우드 폴더 목록 캐시 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.list_func = Mock(
+            return_value=([{"id": "f1"}], [{"id": "i1"}], "내 드라이브", {})
+        )
+        self.cursor_func = Mock(return_value="cursor-1")
+        self.changes_func = Mock(return_value=({"f1"}, "cursor-2"))
+        patcher = patch.dict(
+            folder_cache.PROVIDERS,
+            {"google": (self.list_func, self.cursor_func, self.changes_func)},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = CloudFolderCache()
+
+    def test_listing_served_from_cache(self):
+        """두 번째 조회는 API를 호출하지 않는지 테스트."""
+        first = self.cache.get_listing("google", "user@example.com", "f1")
+        second = self.cache.get_listing("google", "user@example.com", "f1")
+
+        self.assertEqual(first, second)
+        self.list_func.assert_called_once()
+        self.cursor_func.assert_called_once_with("user@example.com")
+
+    def test_sync_invalidates_changed_folders_only(self):
+        """변경된 폴더만 무효화하고 커서를 갱신하는지 테스트."""
+        self.cache.get_listing("google", "user@example.com", "f1")
+        self.cache.get_listing("google", "user@example.com", "f2")
+        self.list_func.reset_mock()
+
+        invalidated = self.cache.sync("google", "user@example.com", rewarm=False)
+
+        self.assertEqual(invalidated, 1)
+        self.changes_func.assert_called_once_with("user@example.com", "cursor-1")
+        self.cache.get_listing("google", "user@example.com", "f2")
+        self.list_func.assert_not_called()
+        self.cache.get_listing("google", "user@example.com", "f1")
+        self.list_func.assert_called_once()
+
+    def test_explicit_account_invalidation(self):
+        """계정 전체 무효화 후 다시 조회하는지 테스트."""
+        self.cache.get_listing("google", "user@example.com")
+        self.cache.invalidate("google", "user@example.com")
+        self.cache.get_listing("google", "user@example.com")
+
+        self.assertEqual(self.list_func.call_count, 2)
+        self.assertEqual(self.cursor_func.call_count, 2)
+
+    def test_invalidation_during_listing_not_undone(self):
+        """목록 조회 중 계정 전체가 무효화되면 이전 세대 커서/목록을 되살리지 않는지 테스트."""
+        listing = self.list_func.return_value
+
+        def list_and_refresh(*args, **kwargs):
+            # 느린 조회 도중 ?refresh=1 요청이 들어온 경우
+            self.cache.invalidate("google", "user@example.com")
+            return listing
+
+        self.list_func.side_effect = list_and_refresh
+        self.cache.get_listing("google", "user@example.com", "f1")
+
+        account = self.cache._get_account("google", "user@example.com")
+        self.assertIsNone(account["cursor"])
+        self.assertEqual(account["folders"], {})
+        self.list_func.side_effect = None
+        self.cache.get_listing("google", "user@example.com", "f1")
+        self.assertEqual(self.list_func.call_count, 2)
+
+    def test_invalidation_during_sync_keeps_new_cursor(self):
+        """변경분 조회 중 계정 전체가 무효화되면 이전 커서로 덮어쓰지 않는지 테스트."""
+        self.cache.get_listing("google", "user@example.com", "f1")
+
+        def changes_and_refresh(user_email, cursor):
+            self.cache.invalidate("google", "user@example.com")
+            return {"f1"}, "cursor-2"
+
+        self.changes_func.side_effect = changes_and_refresh
+        self.cache.sync("google", "user@example.com", rewarm=False)
+
+        account = self.cache._get_account("google", "user@example.com")
+        self.assertIsNone(account["cursor"])
@@ -0,0 +1,79 @@
+"""오프라인 역지오코딩 테스트입니다."""
+
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from ..checks import check_geoplace_loaded
+from ..utils.geocoding import ReverseGeocoder
+
+
+@override_settings(REVERSE_GEOCODER={"GRID_PRECISION": 2, "MEMO_SIZE": 10})
+class ReverseGeocoderTests(TestCase):
+    """역지오코딩 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.geocoder = ReverseGeocoder()
+
+    @patch.object(ReverseGeocoder, "_query_nearest")
+    def test_batch_lookup_uses_single_query(self, mock_query):
+        """여러 좌표를 한 번의 쿼리로 조회하는지 테스트."""
+        mock_query.return_value = {(126.98, 37.57): "서울", (129.08, 35.18): "부산"}
+
+        result = self.geocoder.lookup_many(
+            [(126.9780, 37.5665), None, (129.0756, 35.1796), (126.9781, 37.5666)]
+        )
+
+        self.assertEqual(result, ["서울", None, "부산", "서울"])
+        mock_query.assert_called_once()
+        self.assertEqual(mock_query.call_args[0][0], [(126.98, 37.57), (129.08, 35.18)])
+
+    @patch.object(ReverseGeocoder, "_table_is_empty", return_value=False)
+    @patch.object(ReverseGeocoder, "_query_nearest")
+    def test_grid_memo_cache(self, mock_query, mock_empty):
+        """같은 격자의 좌표는 DB를 다시 조회하지 않는지 테스트."""
+        mock_query.return_value = {}
+
+        self.assertIsNone(self.geocoder.lookup(126.9780, 37.5665))
+        self.assertIsNone(self.geocoder.lookup(126.9779, 37.5664))
+
+        mock_query.assert_called_once()
+        self.assertEqual(self.geocoder.hits, 1)
+        self.assertEqual(self.geocoder.misses, 1)
+
+    @patch.object(ReverseGeocoder, "_query_nearest")
+    def test_query_failure_returns_none(self, mock_query):
+        """지명 조회 실패 시 None을 반환하는지 테스트."""
+        mock_query.side_effect = Exception("relation does not exist")
+
+        self.assertIsNone(self.geocoder.lookup(126.9780, 37.5665))
+        # 일시적인 오류일 수 있으므로 같은 격자를 다시 조회
+        self.assertIsNone(self.geocoder.lookup(126.9780, 37.5665))
+        self.assertEqual(mock_query.call_count, 2)
+
+    @patch.object(ReverseGeocoder, "_query_nearest", return_value={})
+    def test_empty_table_not_memoized(self, mock_query):
+        """지명 테이블이 비어 있을 때의 결과는 메모하지 않는지 테스트."""
+        with self.assertLogs("imagesearch_gemini.utils.geocoding", "WARNING"):
+            self.assertIsNone(self.geocoder.lookup(126.9780, 37.5665))
+        mock_query.return_value = {(126.98, 37.57): "서울"}
+
+        self.assertEqual(self.geocoder.lookup(126.9780, 37.5665), "서울")
+
+    @patch.object(ReverseGeocoder, "_query_nearest", return_value={})
+    def test_empty_table_warns_once(self, mock_query):
+        """지명 테이블이 비어 있으면 프로세스당 한 번 경고하는지 테스트."""
+        with self.assertLogs("imagesearch_gemini.utils.geocoding", "WARNING") as logs:
+            self.geocoder.lookup(126.9780, 37.5665)
+            self.geocoder.lookup(129.0756, 35.1796)
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("load_geonames", logs.output[0])
+
+    def test_system_check_warns_on_empty_table(self):
+        """지명 테이블이 비어 있으면 시스템 체크가 경고를 반환하는지 테스트."""
+        warnings = check_geoplace_loaded(None, databases=["default"])
+
+        self.assertEqual([w.id for w in warnings], ["imagesearch_gemini.W001"])
+        self.assertEqual(check_geoplace_loaded(None), [])
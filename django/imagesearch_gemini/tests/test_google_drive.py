@@ -0,0 +1,70 @@
+"""Google Drive 목록 조회 테스트입니다."""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from ..storage.google_drive import (
+    iter_drive_files,
+    list_folders_and_images_in_google_drive,
+)
+
+
+class GoogleDriveListingTests(TestCase):
+    """Google Drive 목록 조회 테스트 클래스입니다."""
+
+    def test_iter_drive_files_follows_page_tokens_lazily(self):
+        """nextPageToken을 따라가되 필요할 때만 다음 페이지를 요청하는지 테스트."""
+        service = MagicMock()
+        service.files.return_value.list.return_value.execute.return_value = {
+            "files": [{"id": "3"}]
+        }
+        first_page = {"files": [{"id": "1"}, {"id": "2"}], "nextPageToken": "next"}
+
+        files = iter_drive_files(service, first_page, {"q": "query"})
+
+        self.assertEqual(next(files)["id"], "1")
+        self.assertEqual(next(files)["id"], "2")
+        service.files.return_value.list.assert_not_called()
+        self.assertEqual([f["id"] for f in files], ["3"])
+        service.files.return_value.list.assert_called_once_with(
+            pageToken="next", q="query"
+        )
+
+    @patch("imagesearch_gemini.storage.google_drive.get_token", return_value="token")
+    @patch("imagesearch_gemini.storage.google_drive.get_drive_service")
+    @patch("imagesearch_gemini.storage.google_drive.execute_batch")
+    def test_root_listing_uses_single_batch(
+        self, mock_batch, mock_get_service, mock_get_token
+    ):
+        """루트 조회 시 폴더/이미지/공유 폴더를 배치 한 번으로 가져오는지 테스트."""
+        mock_batch.return_value = {
+            "folders": ({"files": [{"id": "f1", "name": "여행"}]}, None),
+            "images": (
+                {"files": [{"id": "i1", "name": "a.jpg", "mimeType": "image/jpeg"}]},
+                None,
+            ),
+            "shared": (
+                {
+                    "files": [
+                        {"id": "s1", "name": "공유", "driveId": "d1"},
+                        {"id": "s2"},
+                    ]
+                },
+                None,
+            ),
+        }
+
+        folders, images, folder_name, parent_info = (
+            list_folders_and_images_in_google_drive("user@example.com")
+        )
+
+        mock_batch.assert_called_once()
+        self.assertEqual(
+            set(mock_batch.call_args[0][1].keys()), {"folders", "images", "shared"}
+        )
+        self.assertEqual([f["id"] for f in folders], ["f1", "s1"])
+        self.assertEqual(folders[1]["name"], "공유 (공유됨)")
+        self.assertEqual(images[0]["type"], "JPEG")
+        self.assertEqual(folder_name, "내 드라이브")
+        self.assertIsNone(parent_info["parent_id"])
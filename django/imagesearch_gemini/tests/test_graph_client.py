@@ -0,0 +1,141 @@
+"""Microsoft Graph 클라이언트 테스트입니다."""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from ..storage.graph_client import GraphClient, build_graph_path
+from ..storage.onedrive import (
+    is_delta_link_expired,
+    list_folders_and_images_in_onedrive,
+)
+
+
+def _response(status_code, body, headers=None):
+    response = MagicMock(status_code=status_code, ok=200 <= status_code < 300)
+    response.json.return_value = body
+    response.headers = headers or {}
+    return response
+
+
+@patch("imagesearch_gemini.storage.graph_client.time.sleep")
+class GraphClientTests(TestCase):
+    """Graph 클라이언트 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.client = GraphClient("token")
+        self.client.session = MagicMock()
+
+    def test_build_graph_path(self, mock_sleep):
+        """OData 파라미터를 인코딩해 붙이는지 테스트."""
+        path = build_graph_path("/me/drive/root/children", **{"$select": "id,name"})
+
+        self.assertEqual(path, "/me/drive/root/children?$select=id,name")
+
+    def test_batch_retries_only_throttled_requests(self, mock_sleep):
+        """$batch 안의 429 요청만 Retry-After 후 다시 보내는지 테스트."""
+        self.client.session.request.side_effect = [
+            _response(
+                200,
+                {
+                    "responses": [
+                        {"id": "folder", "status": 200, "body": {"name": "사진"}},
+                        {
+                            "id": "children",
+                            "status": 429,
+                            "headers": {"Retry-After": "2"},
+                        },
+                    ]
+                },
+            ),
+            _response(
+                200,
+                {
+                    "responses": [
+                        {"id": "children", "status": 200, "body": {"value": []}}
+                    ]
+                },
+            ),
+        ]
+
+        results = self.client.batch({"folder": "/a", "children": "/a/children"})
+
+        self.assertEqual(results["folder"], (200, {"name": "사진"}))
+        self.assertEqual(results["children"], (200, {"value": []}))
+        mock_sleep.assert_called_once_with(2.0)
+        retried = self.client.session.request.call_args_list[1].kwargs["json"]
+        self.assertEqual(
+            retried["requests"],
+            [{"id": "children", "method": "GET", "url": "/a/children"}],
+        )
+
+    def test_expired_delta_link_detected(self, mock_sleep):
+        """delta 링크 만료(410)만 재동기화가 필요한 오류로 판별하는지 테스트."""
+        self.client.session.request.side_effect = [
+            _response(410, {"error": {"code": "resyncRequired"}}),
+            _response(401, {"error": {"code": "InvalidAuthenticationToken"}}),
+        ]
+
+        errors = []
+        for _ in range(2):
+            with self.assertRaises(Exception) as ctx:
+                self.client.get("/me/drive/root/delta?token=old")
+            errors.append(ctx.exception)
+
+        self.assertEqual([is_delta_link_expired(e) for e in errors], [True, False])
+        self.assertFalse(is_delta_link_expired(ConnectionError("reset")))
+
+    def test_iter_collection_follows_next_link(self, mock_sleep):
+        """@odata.nextLink를 따라 다음 페이지를 조회하는지 테스트."""
+        next_link = (
+            "https://graph.microsoft.com/v1.0/me/drive/root/children?$skiptoken=x"
+        )
+        self.client.session.request.return_value = _response(
+            200, {"value": [{"id": 2}]}
+        )
+
+        pages = list(
+            self.client.iter_collection(
+                {"value": [{"id": 1}], "@odata.nextLink": next_link}
+            )
+        )
+
+        self.assertEqual(pages, [[{"id": 1}], [{"id": 2}]])
+        self.assertEqual(self.client.session.request.call_args[0], ("GET", next_link))
+
+
+class OneDriveListingTests(TestCase):
+    """OneDrive 목록 조회 테스트 클래스입니다."""
+
+    @patch("imagesearch_gemini.storage.onedrive.get_token", return_value="token")
+    @patch.object(GraphClient, "batch")
+    def test_root_listing_uses_single_batch(self, mock_batch, mock_get_token):
+        """루트 조회 시 폴더/children/sharedWithMe를 $batch 한 번으로 가져오는지 테스트."""
+        mock_batch.return_value = {
+            "folder": (200, {"name": "root", "parentReference": {}}),
+            "children": (
+                200,
+                {
+                    "value": [
+                        {"id": "f1", "name": "여행", "folder": {}},
+                        {"id": "i1", "name": "a.jpg", "size": 2048},
+                    ]
+                },
+            ),
+            "shared": (
+                200,
+                {"value": [{"remoteItem": {"id": "s1", "name": "공유", "folder": {}}}]},
+            ),
+        }
+
+        folders, images, folder_name, parent_info = list_folders_and_images_in_onedrive(
+            "user@example.com"
+        )
+
+        mock_batch.assert_called_once()
+        paths = mock_batch.call_args[0][0]
+        self.assertIn("$select=", paths["children"])
+        self.assertEqual([f["id"] for f in folders], ["f1", "s1"])
+        self.assertEqual(images[0]["size"], "2.0 KB")
+        self.assertEqual(folder_name, "root")
@@ -0,0 +1,126 @@
+"""큰 컬럼 지연 로딩 테스트입니다.
+
+목록 화면의 쿼리 수와, 화면이 읽는 행들의 크기(pg_column_size 합계)로
+DB에서 전송되는 양을 확인합니다.
+"""
+
+from unittest import skipUnless
+
+import numpy as np
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import HEAVY_FIELDS, ImageEmbedding
+from .utils import LOCMEM_CACHES
+
+
+def _result_bytes(sql: str) -> int:
+    """쿼리 결과 행들의 크기 합계를 반환합니다."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COALESCE(SUM(pg_column_size(r.*)), 0) FROM ({sql}) r")
+        return cursor.fetchone()[0]
+
+
+def _selects_heavy_column(sql: str) -> bool:
+    select_list = sql.split(" FROM ", 1)[0]
+    return any(f'"{name}"' in select_list for name in HEAVY_FIELDS)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class HeavyFieldTests(TestCase):
+    """큰 컬럼 지연 로딩 테스트 클래스입니다."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """목록 한 페이지 분량의 이미지 생성 (save()의 임베딩 예약을 피하려고 bulk_create)."""
+        rng = np.random.default_rng(0)
+        exif = {f"Tag{i}": "x" * 64 for i in range(100)}
+        images = ImageEmbedding.objects.bulk_create(
+            ImageEmbedding(
+                image_path=f"images/{i}.jpg",
+                embedding=rng.random(1408, dtype=np.float32),
+                embedding_status="done",
+                exif_json=exif,
+            )
+            for i in range(20)
+        )
+        for image in images:
+            image.tags.add("sun", "beach")
+
+    def test_default_manager_defers_heavy_fields(self):
+        """기본 조회가 큰 컬럼을 읽지 않고 필요할 때만 읽는지 테스트."""
+        image = ImageEmbedding.objects.first()
+
+        self.assertEqual(image.get_deferred_fields(), set(HEAVY_FIELDS))
+        with self.assertNumQueries(1):
+            self.assertEqual(len(image.embedding), 1408)
+
+    def test_with_heavy_fields_opt_in(self):
+        """with_heavy_fields()로 지정한 컬럼만 함께 읽는지 테스트."""
+        image = ImageEmbedding.objects.with_heavy_fields("embedding").first()
+
+        self.assertNotIn("embedding", image.get_deferred_fields())
+        self.assertIn("exif_json", image.get_deferred_fields())
+        self.assertEqual(
+            ImageEmbedding.objects.with_heavy_fields().first().get_deferred_fields(),
+            set(),
+        )
+        with self.assertRaises(ValueError):
+            ImageEmbedding.objects.with_heavy_fields("image_path")
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL 전용")
+    def test_list_bytes_transferred(self):
+        """20행 목록에서 큰 컬럼 제외 시 전송 크기가 크게 줄어드는지 테스트."""
+        light_sql = str(ImageEmbedding.objects.order_by("-created_at")[:20].query)
+        full_sql = str(
+            ImageEmbedding.objects.with_heavy_fields()
+            .order_by("-created_at")[:20]
+            .query
+        )
+
+        light_bytes = _result_bytes(light_sql)
+        full_bytes = _result_bytes(full_sql)
+
+        # 벡터(5.6KB)와 EXIF만으로도 행당 수 KB
+        self.assertGreater(full_bytes, 20 * 5000)
+        self.assertLess(light_bytes * 10, full_bytes)
+
+    def test_embedding_status_list_queries(self):
+        """임베딩 상태 목록이 개수/페이지 두 쿼리로 큰 컬럼 없이 조회되는지 테스트."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("embedding_status_list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 2)
+        self.assertFalse(any(_selects_heavy_column(q["sql"]) for q in queries))
+        self.assertContains(response, "images/", count=20)
+
+    def test_image_search_queries(self):
+        """검색 화면이 행마다 태그를 조회하지 않고 큰 컬럼을 읽지 않는지 테스트."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("image_search"))
+
+        self.assertEqual(response.status_code, 200)
+        # 결과 1번 + 태그 prefetch 1번
+        self.assertEqual(len(queries), 2)
+        self.assertFalse(any(_selects_heavy_column(q["sql"]) for q in queries))
+        self.assertContains(response, "sun", count=20)
+
+    def test_admin_changelist_queries(self):
+        """관리자 목록이 큰 컬럼 없이, 태그를 한 번에 조회하는지 테스트."""
+        admin = get_user_model().objects.create_superuser("admin", "a@b.c", "pw")
+        self.client.force_login(admin)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("admin:imagesearch_gemini_imageembedding_changelist")
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any(_selects_heavy_column(q["sql"]) for q in queries))
+        tag_queries = [q for q in queries if "taggit_tag" in q["sql"]]
+        self.assertEqual(len(tag_queries), 1)
@@ -0,0 +1,192 @@
+"""이미지 처리(중복 판별) 테스트입니다."""
+
+import hashlib
+import os
+import random
+import tempfile
+from unittest.mock import patch
+
+from PIL import Image as PilImage
+
+from django.test import TestCase, override_settings
+
+from ..models import ImageEmbedding
+from ..utils.image_processing import (
+    _reuse_near_duplicate_embedding,
+    compute_dhash,
+    compute_file_sha256,
+    extract_images_metadata,
+    is_distinctive_dhash,
+    split_duplicate_uploads,
+)
+
+
+class DuplicateDetectionTests(TestCase):
+    """중복 판별 테스트 클래스입니다."""
+
+    def _make_image(self, size=(64, 48), suffix=".jpg", quality=95):
+        img = PilImage.new("RGB", size)
+        for x in range(size[0]):
+            for y in range(size[1]):
+                img.putpixel((x, y), (x * 4 % 256, y * 5 % 256, (x + y) % 256))
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            img.save(tmp, quality=quality)
+        self.addCleanup(lambda: os.path.exists(tmp.name) and os.unlink(tmp.name))
+        return tmp.name
+
+    def test_compute_file_sha256(self):
+        """스트리밍 SHA-256 계산 테스트."""
+        path = self._make_image()
+        with open(path, "rb") as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+
+        self.assertEqual(compute_file_sha256(path), expected)
+
+    def test_dhash_matches_resized_copy(self):
+        """리사이즈/재압축된 사진의 dHash가 같은지 테스트."""
+        original = self._make_image(size=(640, 480), quality=95)
+        with PilImage.open(original) as img:
+            smaller = img.resize((320, 240))
+        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
+            smaller.save(tmp, quality=70)
+        self.addCleanup(os.unlink, tmp.name)
+
+        original_hash = compute_dhash(original)
+        self.assertEqual(len(original_hash), 16)
+        self.assertEqual(original_hash, compute_dhash(tmp.name))
+
+    def test_dhash_invalid_file(self):
+        """이미지가 아닌 파일의 dHash 테스트."""
+        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
+            tmp.write(b"fake image content")
+        self.addCleanup(os.unlink, tmp.name)
+
+        self.assertIsNone(compute_dhash(tmp.name))
+
+    def test_flat_images_not_distinctive(self):
+        """단색/그라데이션 이미지의 dHash는 유사 중복 판별에 쓰지 않는지 테스트."""
+        gradient = PilImage.new("L", (64, 48))
+        for x in range(64):
+            for y in range(48):
+                gradient.putpixel((x, y), x * 4)
+        noise = PilImage.new("L", (64, 48))
+        rng = random.Random(0)
+        noise.putdata([rng.randrange(256) for _ in range(64 * 48)])
+        paths = []
+        for img in (
+            PilImage.new("RGB", (64, 48), "white"),
+            PilImage.new("RGB", (64, 48), (0, 0, 255)),
+            gradient,
+            gradient.transpose(PilImage.Transpose.FLIP_LEFT_RIGHT),
+            noise,
+        ):
+            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
+                img.save(tmp)
+            self.addCleanup(os.unlink, tmp.name)
+            paths.append(tmp.name)
+
+        *flat, textured = [is_distinctive_dhash(compute_dhash(p)) for p in paths]
+
+        self.assertEqual(flat, [False, False, False, False])
+        self.assertTrue(textured)
+
+    @patch("imagesearch_gemini.utils.image_processing.get_embedding_backend")
+    def test_near_duplicate_requires_same_aspect_and_model(self, mock_backend):
+        """해시가 같아도 비율이나 임베딩 모델이 다르면 재사용하지 않는지 테스트."""
+        mock_backend.return_value.name = "fake-hash@1"
+        rows = [
+            ("clip", 640, 480, "done"),
+            ("fake-hash@1", 480, 640, "done"),
+            ("fake-hash@1", 1280, 960, "done"),
+            (None, 320, 240, "pending"),
+            (None, 300, 300, "pending"),
+        ]
+        _, _, source, resized, cropped = ImageEmbedding.objects.bulk_create(
+            ImageEmbedding(
+                image_path=f"images/{i}.jpg",
+                embedding=[0.1 * (i + 1)] * 1408 if status == "done" else None,
+                embedding_model=model,
+                embedding_status=status,
+                perceptual_hash="0f0f0f0f0f0f0f0f",
+                image_width=width,
+                image_height=height,
+            )
+            for i, (model, width, height, status) in enumerate(rows)
+        )
+
+        self.assertTrue(_reuse_near_duplicate_embedding(resized))
+        self.assertFalse(_reuse_near_duplicate_embedding(cropped))
+        resized.refresh_from_db(fields=["embedding_model", "embedding_status"])
+        self.assertEqual(resized.embedding_model, "fake-hash@1")
+        self.assertEqual(resized.embedding_status, "done")
+        self.assertEqual(
+            ImageEmbedding.objects.with_heavy_fields("embedding")
+            .get(pk=resized.pk)
+            .embedding[0],
+            ImageEmbedding.objects.with_heavy_fields("embedding")
+            .get(pk=source.pk)
+            .embedding[0],
+        )
+
+    def test_degenerate_hash_not_reused(self):
+        """켜진 비트가 거의 없는 dHash는 DB 조회 없이 재사용하지 않는지 테스트."""
+        image = ImageEmbedding(
+            pk=1, perceptual_hash="0000000000000000", image_width=64, image_height=48
+        )
+
+        with patch(
+            "imagesearch_gemini.utils.image_processing.ImageEmbedding"
+        ) as mock_model:
+            self.assertFalse(_reuse_near_duplicate_embedding(image))
+        mock_model.objects.filter.assert_not_called()
+
+    @patch("imagesearch_gemini.utils.image_processing.ImageEmbedding")
+    def test_split_duplicate_uploads(self, mock_model):
+        """기존/묶음 내 중복 제거 테스트."""
+        mock_model.objects.filter.return_value.values_list.return_value = ["aaa"]
+        existing_path = self._make_image()
+        new_path = self._make_image()
+        repeated_path = self._make_image()
+
+        new_items, duplicate_count = split_duplicate_uploads(
+            [(existing_path, "aaa"), (new_path, "bbb"), (repeated_path, "bbb")]
+        )
+
+        self.assertEqual(new_items, [(new_path, "bbb")])
+        self.assertEqual(duplicate_count, 2)
+        self.assertFalse(os.path.exists(existing_path))
+        self.assertFalse(os.path.exists(repeated_path))
+        mock_model.objects.filter.assert_called_once()
+
+
+@override_settings(IMAGE_PERCEPTUAL_HASH_ENABLED=False)
+class ExtractMetadataTests(TestCase):
+    """묶음 메타데이터 추출 테스트 클래스입니다."""
+
+    @patch("imagesearch_gemini.utils.image_processing.resolve_timezones")
+    @patch("imagesearch_gemini.utils.image_processing.reverse_geocode_many")
+    @patch("imagesearch_gemini.utils.image_processing.extract_exif_metadata_for_db")
+    def test_resolves_batch_once(self, mock_exif, mock_geocode, mock_timezone):
+        """묶음의 GPS 좌표로 도시명/타임존을 한 번씩 조회하고 실패한 파일만 예외로 반환하는지 테스트."""
+        exif = {
+            "/tmp/a.jpg": ((126.98, 37.57), "2024:05:01 10:30:00", None, {}),
+            "/tmp/b.jpg": (None, None, None, {}),
+        }
+
+        def fake_exif(path):
+            if path not in exif:
+                raise OSError("broken")
+            return exif[path]
+
+        mock_exif.side_effect = fake_exif
+        mock_geocode.return_value = ["서울", None, None]
+        mock_timezone.return_value = ["Asia/Seoul", None, None]
+
+        results = extract_images_metadata(["/tmp/a.jpg", "/tmp/b.jpg", "/tmp/c.jpg"])
+
+        mock_geocode.assert_called_once_with([(126.98, 37.57), None, None])
+        mock_timezone.assert_called_once_with([(126.98, 37.57), None, None])
+        self.assertEqual(results[0]["city_from_gps"], "서울")
+        self.assertEqual(results[0]["date_taken_exif"], "2024-05-01T10:30:00+09:00")
+        self.assertIsNone(results[1]["city_from_gps"])
+        self.assertIsInstance(results[2], OSError)
@@ -0,0 +1,128 @@
+"""업로드 수집 파이프라인 테스트입니다."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import IngestionJob
+from ..tasks import ingest_extract_task, ingest_persist_task, ingest_receive_task
+
+
+class IngestionJobProgressTests(TestCase):
+    """작업 진행 상황 계산 테스트 클래스입니다."""
+
+    def test_progress_reports_stage_throughput(self):
+        """단계별 처리 수와 처리량을 계산하는지 테스트."""
+        created_at = timezone.now() - timedelta(seconds=10)
+        job = IngestionJob(
+            source="upload",
+            status="done",
+            total_count=12,
+            received_count=12,
+            extracted_count=10,
+            persisted_count=10,
+            duplicate_count=2,
+            created_at=created_at,
+            finished_at=created_at + timedelta(seconds=5),
+        )
+
+        progress = job.get_progress()
+
+        self.assertEqual(progress["stages"]["receive"]["completed"], 12)
+        self.assertEqual(progress["stages"]["persist"]["throughput"], 2.0)
+        self.assertEqual(progress["elapsed_seconds"], 5.0)
+        self.assertEqual(progress["duplicates"], 2)
+
+
+@patch("imagesearch_gemini.tasks.IngestionJob")
+class IngestionTaskTests(TestCase):
+    """파이프라인 단계 태스크 테스트 클래스입니다."""
+
+    @patch("imagesearch_gemini.tasks.ingest_extract_task")
+    @patch("imagesearch_gemini.tasks.split_duplicate_uploads")
+    @patch("imagesearch_gemini.tasks.get_spool_dir", return_value="/tmp")
+    def test_receive_filters_duplicates_and_fans_out(
+        self, mock_spool_dir, mock_split, mock_extract, mock_job
+    ):
+        """수신 단계가 중복을 걸러 추출 단계로 넘기는지 테스트."""
+        mock_split.return_value = ([("/tmp/a.jpg", "aaa")], 1)
+
+        result = ingest_receive_task(
+            "job-1",
+            [
+                {"path": "/tmp/a.jpg", "sha256": "aaa"},
+                {"path": "/tmp/b.jpg", "sha256": "bbb"},
+            ],
+        )
+
+        self.assertEqual(result, 1)
+        mock_split.assert_called_once_with(
+            [("/tmp/a.jpg", "aaa"), ("/tmp/b.jpg", "bbb")]
+        )
+        mock_job.record.assert_called_once_with(
+            "job-1",
+            error=None,
+            received_count=2,
+            duplicate_count=1,
+            not_allowed_count=0,
+            failed_count=0,
+        )
+        mock_extract.delay.assert_called_once_with(
+            "job-1", [{"path": "/tmp/a.jpg", "sha256": "aaa", "source_ref": None}]
+        )
+
+    @patch("imagesearch_gemini.tasks._remove_temp_file")
+    @patch("imagesearch_gemini.tasks.ingest_persist_task")
+    @patch("imagesearch_gemini.tasks.extract_images_metadata")
+    def test_extract_chains_persist(
+        self, mock_extract_metadata, mock_persist, mock_remove, mock_job
+    ):
+        """추출 단계가 묶음을 한 번에 추출해 파일별로 저장 단계에 넘기는지 테스트."""
+        metadata = {"gps": None, "perceptual_hash": "0f0f0f0f0f0f0f0f"}
+        mock_extract_metadata.return_value = [metadata, OSError("broken")]
+
+        ingest_extract_task(
+            "job-1",
+            [
+                {"path": "/tmp/a.jpg", "sha256": "aaa", "source_ref": "drive:1"},
+                {"path": "/tmp/b.jpg", "sha256": "bbb", "source_ref": None},
+                {"path": "/tmp/c.txt", "sha256": "ccc", "source_ref": None},
+            ],
+        )
+
+        mock_extract_metadata.assert_called_once_with(["/tmp/a.jpg", "/tmp/b.jpg"])
+        mock_persist.delay.assert_called_once_with(
+            "job-1", "/tmp/a.jpg", "aaa", metadata, "drive:1"
+        )
+        mock_job.record.assert_called_once_with(
+            "job-1",
+            error="broken",
+            extracted_count=1,
+            not_allowed_count=1,
+            failed_count=1,
+        )
+        self.assertEqual(
+            [c.args[0] for c in mock_remove.call_args_list],
+            ["/tmp/c.txt", "/tmp/b.jpg"],
+        )
+
+    @patch("imagesearch_gemini.tasks._remove_temp_file")
+    @patch("imagesearch_gemini.tasks.persist_image")
+    def test_persist_records_failure(self, mock_persist_image, mock_remove, mock_job):
+        """저장 실패 시 실패 수를 기록하고 임시 파일을 지우는지 테스트."""
+        mock_job.objects.filter.return_value.values_list.return_value.first.return_value = {
+            "tags": "바다, 여행"
+        }
+        mock_persist_image.side_effect = OSError("disk full")
+
+        ingest_persist_task("job-1", "/tmp/a.jpg", "aaa", {})
+
+        self.assertEqual(
+            mock_persist_image.call_args.kwargs["tag_list"], ["바다", "여행"]
+        )
+        mock_job.record.assert_called_once_with(
+            "job-1", error="disk full", failed_count=1
+        )
+        mock_remove.assert_called_once_with("/tmp/a.jpg")
@@ -0,0 +1,72 @@
+"""검색어 임베딩 캐시 테스트입니다."""
+
+import numpy as np
+
+from django.test import TestCase, override_settings
+
+from ..utils.query_cache import (
+    QueryEmbeddingCache,
+    decode_embedding,
+    encode_embedding,
+    normalize_query_text,
+)
+
+
+@override_settings(
+    QUERY_EMBEDDING_CACHE={"CACHE_ALIAS": None, "LRU_SIZE": 2, "LRU_TTL": 60}
+)
+class QueryEmbeddingCacheTests(TestCase):
+    """검색어 임베딩 캐시 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.cache = QueryEmbeddingCache()
+
+    def test_normalize_query_text(self):
+        """대소문자, 공백, 쉼표 순서 정규화 테스트."""
+        self.assertEqual(
+            normalize_query_text("  Sea,CAT   mountain"), "cat mountain, sea"
+        )
+        self.assertEqual(
+            normalize_query_text("cat mountain , sea"),
+            normalize_query_text("SEA, cat  mountain"),
+        )
+        self.assertEqual(normalize_query_text(" , "), "")
+
+    def test_encode_decode_float32(self):
+        """float32 바이트 직렬화 테스트."""
+        embedding = [0.1, 0.2, 0.3] * 469
+
+        data = encode_embedding(embedding)
+
+        self.assertEqual(len(data), len(embedding) * 4)
+        np.testing.assert_allclose(decode_embedding(data), embedding, rtol=1e-6)
+
+    def test_lru_hit_and_miss_counters(self):
+        """LRU 적중/미스 카운터 테스트."""
+        self.assertIsNone(self.cache.get("cat"))
+        self.cache.set("cat", [1.0, 2.0])
+
+        np.testing.assert_array_equal(self.cache.get("cat"), [1.0, 2.0])
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["lru_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_lru_size_eviction(self):
+        """LRU 크기 제한에 따른 제거 테스트."""
+        self.cache.set("a", [1.0])
+        self.cache.set("b", [2.0])
+        self.cache.get("a")  # a를 최근 사용으로 갱신
+        self.cache.set("c", [3.0])
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    @override_settings(QUERY_EMBEDDING_CACHE={"CACHE_ALIAS": None, "LRU_TTL": -1})
+    def test_lru_ttl_expiry(self):
+        """LRU TTL 만료 테스트."""
+        self.cache.set("cat", [1.0])
+
+        self.assertIsNone(self.cache.get("cat"))
@@ -0,0 +1,74 @@
+"""썸네일/미리보기 렌디션 테스트입니다."""
+
+import os
+import shutil
+import tempfile
+
+from PIL import Image as PilImage
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..utils.renditions import downscale, generate_renditions, rendition_url
+
+
+class RenditionTests(TestCase):
+    """렌디션 생성 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.source = os.path.join(self.media_root, "source.jpg")
+        PilImage.new("RGB", (4000, 3000), (200, 100, 50)).save(self.source, "JPEG")
+
+    def test_downscale_fits_longest_side(self):
+        """reduce 후 리샘플해도 긴 변이 지정 크기에 맞는지 테스트."""
+        image = downscale(PilImage.new("RGB", (4000, 3000)), 160)
+        self.assertEqual(image.size, (160, 120))
+
+    def test_generate_renditions_content_addressed(self):
+        """내용 해시 기반 경로에 렌디션을 저장하고 재생성하지 않는지 테스트."""
+        with override_settings(
+            MEDIA_ROOT=self.media_root,
+            RENDITIONS={"SIZES": {"thumb": 160, "preview": 640}, "FORMAT": "JPEG"},
+        ):
+            renditions = generate_renditions(self.source, "ab" * 32)
+            self.assertEqual(
+                renditions["thumb"], f"renditions/ab/{'ab' * 32}-thumb-160.jpg"
+            )
+            thumb_path = os.path.join(self.media_root, renditions["thumb"])
+            with PilImage.open(thumb_path) as thumb:
+                self.assertEqual(thumb.size, (160, 120))
+
+            mtime = os.path.getmtime(thumb_path)
+            self.assertEqual(generate_renditions(self.source, "ab" * 32), renditions)
+            self.assertEqual(os.path.getmtime(thumb_path), mtime)
+
+    @override_settings(MEDIA_URL="/media/", RENDITIONS={"X_ACCEL_REDIRECT": None})
+    def test_production_serves_from_storage(self):
+        """운영 환경(DEBUG=False)에서는 static.serve 대신 저장소 URL을 쓰는지 테스트."""
+        path = "renditions/ab/abc-thumb-160.webp"
+
+        self.assertEqual(rendition_url(path), f"/media/{path}")
+        response = self.client.get(reverse("rendition", args=["ab/abc-thumb-160.webp"]))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(RENDITIONS={"X_ACCEL_REDIRECT": "/protected/renditions/"})
+    def test_x_accel_redirect(self):
+        """X_ACCEL_REDIRECT 설정 시 nginx에 파일 전송을 넘기는지 테스트."""
+        url = rendition_url("renditions/ab/abc-thumb-160.webp")
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/protected/renditions/ab/abc-thumb-160.webp",
+        )
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(
+            self.client.get(reverse("rendition", args=["../secret.txt"])).status_code,
+            404,
+        )
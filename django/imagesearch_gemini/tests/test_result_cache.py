@@ -0,0 +1,135 @@
+"""검색 결과 캐시 테스트입니다."""
+
+from unittest.mock import Mock, patch
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from ..models import ImageEmbedding
+from ..utils.result_cache import (
+    bump_corpus_generation,
+    get_corpus_generation,
+    search_result_cache,
+)
+from ..utils.search import VectorSearchEngine
+from .utils import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES, SEARCH_RESULT_CACHE={"CACHE_TTL": 60})
+class SearchResultCacheTests(TestCase):
+    """검색 결과 캐시 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        caches["default"].clear()
+        search_result_cache.clear()
+
+    def test_key_normalizes_query_and_filters(self):
+        """검색어/태그 표기 차이는 같은 키, 결과 수 차이는 다른 키인지 테스트."""
+        key = search_result_cache.make_key(
+            1, "fake", "Sea,  cat", tags="b, a", limit=20
+        )
+
+        self.assertEqual(
+            key,
+            search_result_cache.make_key(1, "fake", "cat, sea", tags="A,B", limit=20),
+        )
+        self.assertNotEqual(
+            key,
+            search_result_cache.make_key(1, "fake", "cat, sea", tags="a, b", limit=10),
+        )
+
+    def test_key_includes_vector_settings(self):
+        """거리 척도나 저장 모드를 바꾸면 같은 세대에서도 다른 키인지 테스트."""
+        key = search_result_cache.make_key(1, "fake", "sunset", limit=20)
+
+        with override_settings(VECTOR_INDEX={"METRIC": "ip"}):
+            metric_key = search_result_cache.make_key(1, "fake", "sunset", limit=20)
+        with override_settings(VECTOR_STORAGE={"MODE": "halfvec"}):
+            mode_key = search_result_cache.make_key(1, "fake", "sunset", limit=20)
+
+        self.assertEqual(len({key, metric_key, mode_key}), 3)
+
+    def test_bump_changes_generation(self):
+        """세대 번호 증가로 이전 키가 더 이상 쓰이지 않는지 테스트."""
+        generation = get_corpus_generation()
+        bump_corpus_generation()
+
+        self.assertEqual(get_corpus_generation(), generation + 1)
+
+    @override_settings(SEARCH_RESULT_CACHE={"CACHE_ALIAS": None})
+    def test_disabled_without_cache(self):
+        """공유 캐시가 없으면 세대 번호를 쓰지 않는지 테스트."""
+        self.assertIsNone(get_corpus_generation())
+
+    @patch("imagesearch_gemini.utils.search.ImageEmbedding")
+    @patch.object(VectorSearchEngine, "_apply_vector_search")
+    def test_hit_hydrates_in_order(self, mock_apply_vector_search, mock_model):
+        """캐시 적중 시 벡터 검색 없이 in_bulk 한 번으로 순서대로 읽는지 테스트."""
+        first, second = Mock(id=1), Mock(id=2)
+        # 3번은 캐시 이후 삭제된 행
+        mock_model.objects.in_bulk.return_value = {1: first, 2: second}
+        key = search_result_cache.make_key(
+            get_corpus_generation(), "fake-hash@1", "sunset", limit=20
+        )
+        search_result_cache.set(key, [(2, 0.1), (3, 0.2), (1, 0.3)])
+
+        with patch(
+            "imagesearch_gemini.utils.search.get_embedding_backend"
+        ) as mock_backend:
+            mock_backend.return_value.name = "fake-hash@1"
+            results, error = VectorSearchEngine.search_images(query_text="sunset")
+
+        self.assertIsNone(error)
+        self.assertEqual(results, [second, first])
+        self.assertEqual(second.distance, 0.1)
+        mock_model.objects.in_bulk.assert_called_once_with([2, 3, 1])
+        mock_apply_vector_search.assert_not_called()
+        self.assertEqual(search_result_cache.get_stats()["hit_ratio"], 1.0)
+
+    def _create_done_image(self):
+        # bulk_create는 save()/post_save를 거치지 않음 (임베딩 예약 없이 생성)
+        (image,) = ImageEmbedding.objects.bulk_create(
+            [
+                ImageEmbedding(
+                    image_path="images/sunset.jpg",
+                    embedding=[0.1] * 1408,
+                    embedding_status="done",
+                )
+            ]
+        )
+        return image
+
+    def test_user_edit_bumps_generation(self):
+        """검색 응답에 드러나는 컬럼을 수정하면 커밋 후 세대가 오르는지 테스트."""
+        image = self._create_done_image()
+        generation = get_corpus_generation()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.location_user = "부산"
+            image.save()
+
+        self.assertEqual(get_corpus_generation(), generation + 1)
+
+    def test_internal_field_edit_keeps_generation(self):
+        """검색 응답과 무관한 컬럼만 저장하면 세대가 그대로인지 테스트."""
+        image = self._create_done_image()
+        generation = get_corpus_generation()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.embedding_error = "timeout"
+            image.save(update_fields=["embedding_error"])
+
+        self.assertEqual(get_corpus_generation(), generation)
+
+    def test_tag_change_bumps_generation(self):
+        """태그를 추가/삭제하면 커밋 후 세대가 오르는지 테스트."""
+        image = self._create_done_image()
+        generation = get_corpus_generation()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.tags.add("바다")
+        with self.captureOnCommitCallbacks(execute=True):
+            image.tags.remove("바다")
+
+        self.assertEqual(get_corpus_generation(), generation + 2)
@@ -2,14 +2,22 @@
 
 from unittest.mock import Mock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
+from ..models import ImageEmbedding
+from ..utils.query_cache import query_embedding_cache
 from ..utils.search import VectorSearchEngine
 
 
+@override_settings(QUERY_EMBEDDING_CACHE={"CACHE_ALIAS": None})
 class SearchEngineTests(TestCase):
     """검색 엔진 테스트 클래스입니다."""
 
+    def setUp(self):
+        """테스트 설정."""
+        # 프로세스 LRU에 남은 검색어 임베딩이 다른 테스트에 영향을 주지 않도록 초기화
+        query_embedding_cache.clear()
+
     @patch("imagesearch_gemini.utils.search.SearchQuery")
     @patch("imagesearch_gemini.utils.search.get_text_embedding")
     def test_get_query_embedding_db_hit(self, mock_get_embedding, mock_search_query):
@@ -64,3 +72,46 @@ class SearchEngineTests(TestCase):
         # 검증
         self.assertIsNone(result)
         mock_get_embedding.assert_called_once_with("test query")
+
+    @patch.object(VectorSearchEngine, "_get_query_embedding")
+    def test_apply_vector_search_binds_vector(self, mock_get_query_embedding):
+        """검색어 벡터가 SQL 문자열이 아닌 바인딩 파라미터로 전달되는지 테스트."""
+        mock_get_query_embedding.return_value = [0.1, 0.2, 0.3] * 469
+
+        qs, error = VectorSearchEngine._apply_vector_search(
+            ImageEmbedding.objects.all(), "test query", 5
+        )
+        sql, params = qs.query.sql_with_params()
+
+        self.assertIsNone(error)
+        self.assertIn("<->", sql)
+        self.assertNotIn("0.1", sql)
+        self.assertTrue(any(str(p).startswith("[0.1") for p in params))
+
+    def test_get_similar_images_uses_subquery(self):
+        """유사 이미지 검색이 기준 벡터를 서브쿼리로 참조하는지 테스트."""
+        qs = VectorSearchEngine.get_similar_images(image_id=1, limit=5)
+        sql, _ = qs.query.sql_with_params()
+
+        self.assertIn("<-> (SELECT", sql)
+        self.assertEqual(list(qs), [])
+
+    def test_get_similar_images_same_embedding_model(self):
+        """유사 이미지 검색이 기준 이미지와 같은 임베딩 모델의 벡터만 비교하는지 테스트."""
+        base, same_model, other_model = ImageEmbedding.objects.bulk_create(
+            ImageEmbedding(
+                image_path=f"images/{model}.jpg",
+                embedding=[value] * 1408,
+                embedding_model=model,
+                embedding_status="done",
+            )
+            for model, value in [
+                ("fake-hash@1", 0.1),
+                ("fake-hash@1", 0.2),
+                ("clip", 0.1),
+            ]
+        )
+
+        results = VectorSearchEngine.get_similar_images(image_id=base.id, limit=5)
+
+        self.assertEqual([image.id for image in results], [same_model.id])
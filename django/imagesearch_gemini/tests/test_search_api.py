@@ -0,0 +1,212 @@
+"""JSON 검색 API 테스트입니다."""
+
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import ImageEmbedding
+from ..utils.search import VectorSearchEngine
+from ..utils.search_api import (
+    InvalidCursor,
+    _projection,
+    decode_cursor,
+    encode_cursor,
+    search_page,
+)
+from ..utils.search_planner import PLAN_ANN, SearchPlan
+from .utils import LOCMEM_CACHES
+
+WINDOWS = {
+    None: {"entries": [(1, 0.1), (2, 0.2), (3, 0.3)], "exhausted": False},
+    (0.3, 3): {"entries": [(4, 0.4), (5, 0.5)], "exhausted": True},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, SEARCH_API={"WINDOW_SIZE": 3})
+class SearchApiTests(TestCase):
+    """JSON 검색 API 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        caches["default"].clear()
+
+    def test_cursor_round_trip(self):
+        """커서 인코딩/디코딩과 잘못된 커서 처리 테스트."""
+        data = {"w": [0.3, 3], "p": [0.123456789012345, 7]}
+
+        self.assertEqual(decode_cursor(encode_cursor(data)), data)
+        self.assertIsNone(decode_cursor(""))
+        with self.assertRaises(InvalidCursor):
+            decode_cursor("not-a-cursor!")
+
+    def test_projection_skips_large_columns(self):
+        """결과 조회가 임베딩/EXIF 컬럼을 읽지 않는지 테스트."""
+        sql = str(_projection().query)
+
+        self.assertNotIn('"embedding"', sql)
+        self.assertNotIn('"exif_json"', sql)
+        self.assertIn('"renditions"', sql)
+
+    @patch("imagesearch_gemini.utils.search_api.serialize_image")
+    @patch("imagesearch_gemini.utils.search_api._projection")
+    @patch("imagesearch_gemini.utils.search_api.VectorSearchEngine.search_window")
+    def test_vector_pages_follow_windows(
+        self, mock_search_window, mock_projection, mock_serialize
+    ):
+        """페이지가 구간 경계를 넘어 이어지고 구간을 다시 계산하지 않는지 테스트."""
+        mock_search_window.side_effect = lambda *args, after=None, **kwargs: (
+            WINDOWS[after],
+            None,
+        )
+        mock_projection.return_value.in_bulk.side_effect = lambda ids: {
+            image_id: Mock(id=image_id) for image_id in ids
+        }
+        mock_serialize.side_effect = lambda obj, distance=None: obj.id
+
+        pages, cursor = [], None
+        while True:
+            results, cursor, error = search_page("sunset", page_size=2, cursor=cursor)
+            self.assertIsNone(error)
+            pages.append(results)
+            if not cursor:
+                break
+
+        self.assertEqual(pages, [[1, 2], [3, 4], [5]])
+        # 페이지 3개 동안 구간 검색은 구간마다 한 번씩 + 경계를 넘는 페이지에서 한 번
+        self.assertEqual(mock_search_window.call_count, 4)
+        # 두 번째 구간은 앞 구간의 결과 수(3)를 offset으로 받음
+        self.assertEqual(
+            [c.kwargs["offset"] for c in mock_search_window.call_args_list],
+            [0, 0, 3, 3],
+        )
+
+    @patch("imagesearch_gemini.views.search_page")
+    def test_etag_not_modified(self, mock_search_page):
+        """같은 세대의 같은 요청은 검색 없이 304로 응답하는지 테스트."""
+        mock_search_page.return_value = ([], None, None)
+        url = reverse("search_api") + "?tags=sun"
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cached.status_code, 304)
+        mock_search_page.assert_called_once()
+
+    def test_invalid_cursor_returns_400(self):
+        """잘못된 커서 요청에 400으로 응답하는지 테스트."""
+        response = self.client.get(reverse("search_api") + "?cursor=bad!")
+
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    SEARCH_RESULT_CACHE={"ENABLED": False},
+    VECTOR_INDEX={"TYPE": "hnsw", "HNSW_EF_SEARCH": 10},
+    VECTOR_STORAGE={"MODE": "full"},
+)
+class SearchWindowTests(TestCase):
+    """벡터 검색 구간 테스트 클래스입니다."""
+
+    @patch("imagesearch_gemini.utils.search.count_filtered_rows", return_value=10)
+    @patch("imagesearch_gemini.utils.search.vector_search_session")
+    @patch.object(VectorSearchEngine, "_apply_vector_search")
+    @patch("imagesearch_gemini.utils.search.plan_vector_search")
+    def test_short_ann_window_rechecked_exactly(
+        self, mock_plan, mock_apply_vector_search, mock_session, mock_count
+    ):
+        """뒤 구간을 반복 스캔으로 찾고, 결과가 모자라면 (행이 적으면) 정확 검색으로 다시 찾는지 테스트."""
+        mock_plan.return_value = SearchPlan(PLAN_ANN)
+        ann_qs, exact_qs = Mock(), Mock()
+        # ANN 인덱스가 탐색 한도에서 멈춰 한 행만 반환한 경우
+        ann_qs.values_list.return_value = [(4, 0.4)]
+        exact_qs.values_list.return_value = [(6, 0.6), (4, 0.4), (5, 0.5)]
+        mock_apply_vector_search.side_effect = [(ann_qs, None), (exact_qs, None)]
+
+        window, error = VectorSearchEngine.search_window(
+            "sunset", window_size=3, after=(0.3, 3)
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual(window, {"entries": [(4, 0.4), (5, 0.5)], "exhausted": False})
+        ann_params, exact_params = (c.kwargs for c in mock_session.call_args_list)
+        self.assertTrue(ann_params["iterative"])
+        self.assertEqual(ann_params["limit"], 3)
+        self.assertEqual(exact_params, {"exact": True})
+
+    @override_settings(
+        VECTOR_INDEX={"TYPE": "hnsw", "HNSW_MAX_SCAN_TUPLES": 100},
+        SEARCH_PLANNER={"EXACT_THRESHOLD": 5},
+    )
+    @patch("imagesearch_gemini.utils.search.count_filtered_rows", return_value=6)
+    @patch("imagesearch_gemini.utils.search.vector_search_session")
+    @patch.object(VectorSearchEngine, "_apply_vector_search")
+    @patch("imagesearch_gemini.utils.search.plan_vector_search")
+    def test_short_deep_window_raises_scan_limit(
+        self, mock_plan, mock_apply_vector_search, mock_session, mock_count
+    ):
+        """행이 많으면 정확 검색 대신 탐색 한도를 늘린 ANN으로 다시 찾는지 테스트."""
+        mock_plan.return_value = SearchPlan(PLAN_ANN)
+        qs = Mock()
+        qs.values_list.side_effect = [[(4, 0.4)], [(5, 0.5), (4, 0.4)]]
+        mock_apply_vector_search.return_value = (qs, None)
+
+        window, error = VectorSearchEngine.search_window(
+            "sunset", window_size=3, after=(0.3, 3), offset=60
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual(window, {"entries": [(4, 0.4), (5, 0.5)], "exhausted": True})
+        first, retry = (c.kwargs for c in mock_session.call_args_list)
+        self.assertIsNone(first["max_scan_tuples"])
+        # (offset + window_size) * oversample * 2
+        self.assertEqual(retry["max_scan_tuples"], 126)
+        self.assertNotIn("exact", retry)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL 전용")
+    @override_settings(SEARCH_API={"WINDOW_SIZE": 25})
+    def test_pages_past_ef_search_and_first_window(self):
+        """ef_search와 첫 구간을 넘어 모든 결과를 거리 순으로 페이지에 나누는지 테스트."""
+        rng = np.random.default_rng(0)
+        vectors = rng.random((60, 1408), dtype=np.float32)
+        query = rng.random(1408, dtype=np.float32)
+        images = ImageEmbedding.objects.bulk_create(
+            ImageEmbedding(
+                image_path=f"images/{i}.jpg",
+                embedding=vector,
+                embedding_model="fake-hash@1",
+                embedding_status="done",
+            )
+            for i, vector in enumerate(vectors)
+        )
+        distances = np.linalg.norm(vectors - query, axis=1)
+        expected = [images[i].id for i in np.argsort(distances)]
+        # 행이 적어도 HNSW 인덱스를 쓰도록 순차 스캔을 끔 (테스트 트랜잭션 범위)
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        ids, cursor = [], None
+        with patch(
+            "imagesearch_gemini.utils.search.get_embedding_backend"
+        ) as mock_backend, patch.object(
+            VectorSearchEngine, "_get_query_embedding", return_value=query.tolist()
+        ):
+            mock_backend.return_value.name = "fake-hash@1"
+            while True:
+                results, cursor, error = search_page(
+                    "sunset", page_size=20, cursor=cursor
+                )
+                self.assertIsNone(error)
+                ids.extend(result["id"] for result in results)
+                if not cursor:
+                    break
+
+        self.assertEqual(ids, expected)
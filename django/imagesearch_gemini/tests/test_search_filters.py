@@ -0,0 +1,83 @@
+"""검색 필터 테스트입니다."""
+
+import datetime
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from ..models import ImageEmbedding
+from ..utils.search_filters import (
+    TAG_NAME_TRGM_INDEX,
+    apply_search_filters,
+    split_tags,
+)
+
+
+class SearchFilterTests(TestCase):
+    """검색 필터 테스트 클래스입니다."""
+
+    def _filtered(self, **filters):
+        return apply_search_filters(ImageEmbedding.objects.all(), **filters)
+
+    def test_split_tags(self):
+        """태그 문자열 분리와 중복 제거 테스트."""
+        self.assertEqual(split_tags(" sun, beach ,,sun "), ["sun", "beach"])
+        self.assertEqual(split_tags(None), [])
+
+    def test_date_filter_is_range_on_columns(self):
+        """날짜 필터가 컬럼 변환 없이 범위 비교로 바뀌는지 테스트."""
+        sql, params = self._filtered(
+            date_from="2024-01-01", date_to="2024-01-31"
+        ).query.sql_with_params()
+
+        self.assertNotIn("AT TIME ZONE", sql)
+        self.assertIn('"date_taken_user" >=', sql)
+        self.assertIn('"date_taken_exif" <', sql)
+        # 종료일은 다음날 0시 미만으로 비교
+        exif_end = [p for p in params if isinstance(p, datetime.datetime)][-1]
+        self.assertEqual(exif_end.date(), datetime.date(2024, 2, 1))
+
+    def test_location_matches_user_and_gps_city(self):
+        """장소 필터가 사용자 입력 장소와 GPS 도시명을 모두 검색하는지 테스트."""
+        sql, _ = self._filtered(location="Seoul").query.sql_with_params()
+
+        self.assertIn('UPPER("imagesearch_gemini_imageembedding"."location_user"', sql)
+        self.assertIn('UPPER("imagesearch_gemini_imageembedding"."city_from_gps"', sql)
+
+    def test_multiple_tags_single_exists(self):
+        """여러 태그가 조인 없이 하나의 EXISTS로 합쳐지는지 테스트."""
+        sql, _ = self._filtered(tags="sun, beach, sea").query.sql_with_params()
+        outer_sql = sql.split("EXISTS", 1)[0]
+
+        self.assertEqual(sql.count("EXISTS"), 1)
+        self.assertNotIn("JOIN", outer_sql)
+        self.assertIn("HAVING", sql)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL 전용")
+    def test_explain_uses_filter_indexes(self):
+        """EXPLAIN 결과에서 날짜/장소 필터가 인덱스를 사용하는지 테스트."""
+        with connection.cursor() as cursor:
+            # 빈 테이블에서도 인덱스 사용 가능 여부만 확인 (TestCase 트랜잭션 범위)
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        date_plan = self._filtered(
+            date_from="2024-01-01", date_to="2024-01-31"
+        ).explain()
+        location_plan = self._filtered(location="Seoul").explain()
+
+        # 날짜 조건은 OR 분기마다 두 날짜 인덱스 중 비용이 낮은 쪽을 사용
+        self.assertNotIn("Seq Scan", date_plan)
+        self.assertIn("imgemb_date_taken_", date_plan)
+        self.assertNotIn("Seq Scan", location_plan)
+        self.assertIn("imgemb_location_user_trgm", location_plan)
+        self.assertIn("imgemb_city_from_gps_trgm", location_plan)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL 전용")
+    def test_tag_trigram_index_created(self):
+        """migrate 후 태그 이름 트라이그램 인덱스가 생성되는지 테스트."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_indexes WHERE indexname = %s", [TAG_NAME_TRGM_INDEX]
+            )
+            self.assertIsNotNone(cursor.fetchone())
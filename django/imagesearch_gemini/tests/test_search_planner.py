@@ -0,0 +1,118 @@
+"""필터 검색 계획 테스트입니다."""
+
+from unittest.mock import patch
+
+import numpy as np
+
+from django.test import TestCase, override_settings
+
+from ..models import ImageEmbedding
+from ..utils.search_planner import (
+    _CITY_PREDICATE_RE,
+    PLAN_ANN,
+    PLAN_EXACT,
+    PLAN_ITERATIVE,
+    PLAN_PARTIAL_INDEX,
+    SearchPlan,
+    plan_vector_search,
+)
+from ..utils.vector_index import (
+    PARTIAL_CITY_INDEX_PREFIX,
+    build_partial_city_index,
+    get_search_params,
+)
+
+
+class SearchPlannerTests(TestCase):
+    """필터 검색 계획 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.query_vector = np.full(1408, 0.1, dtype=np.float32)
+        self.qs = ImageEmbedding.objects.filter(embedding_status="done")
+
+    def test_no_filter_uses_ann(self):
+        """필터가 없으면 전체 ANN 검색을 고르는지 테스트."""
+        plan = plan_vector_search(self.qs, 10, filtered=False)
+
+        self.assertEqual(plan.name, PLAN_ANN)
+
+    @override_settings(SEARCH_PLANNER={"EXACT_THRESHOLD": 100})
+    def test_small_filter_uses_exact(self):
+        """필터 결과가 임계값 이하면 정확 검색을 고르는지 테스트."""
+        plan = plan_vector_search(self.qs.filter(city_from_gps="Seoul"), 10, True)
+
+        self.assertEqual(plan.name, PLAN_EXACT)
+        self.assertEqual(plan.filtered_rows, 0)
+        self.assertEqual(plan.session_params(None, None, 10), {"exact": True})
+
+    @override_settings(
+        VECTOR_INDEX={"TYPE": "hnsw", "HNSW_EF_SEARCH": 40},
+        VECTOR_STORAGE={"MODE": "full"},
+        SEARCH_PLANNER={"MAX_EF_SEARCH": 300},
+    )
+    def test_iterative_oversamples_ef_search(self):
+        """반복 스캔 계획이 선택도만큼 ef_search를 늘리고 상한을 지키는지 테스트."""
+        plan = SearchPlan(PLAN_ITERATIVE, selectivity=0.1, oversample=10)
+
+        self.assertEqual(
+            plan.session_params(None, None, 10),
+            {"ef_search": 100, "probes": 100, "iterative": True, "limit": 10},
+        )
+        self.assertEqual(plan.session_params(None, None, 50)["ef_search"], 300)
+
+    @override_settings(
+        VECTOR_INDEX={
+            "TYPE": "hnsw",
+            "HNSW_ITERATIVE_SCAN": "relaxed_order",
+            "HNSW_MAX_SCAN_TUPLES": 5000,
+        }
+    )
+    def test_session_search_params(self):
+        """반복 스캔/정확 검색 GUC 파라미터 테스트."""
+        params = get_search_params(ef_search=100, iterative=True)
+
+        self.assertEqual(params["hnsw.iterative_scan"], "relaxed_order")
+        self.assertEqual(params["hnsw.max_scan_tuples"], 5000)
+        self.assertNotIn("hnsw.iterative_scan", get_search_params(ef_search=100))
+        self.assertEqual(get_search_params(exact=True), {"enable_indexscan": "off"})
+
+    @override_settings(VECTOR_INDEX={"TYPE": "hnsw", "METRIC": "cosine"})
+    def test_build_partial_city_index(self):
+        """도시별 부분 인덱스가 도시 조건과 척도 operator class를 갖는지 테스트."""
+        index = build_partial_city_index("Seoul")
+
+        self.assertTrue(index.name.startswith(PARTIAL_CITY_INDEX_PREFIX))
+        self.assertLessEqual(len(index.name), 30)
+        self.assertEqual(index.condition.children, [("city_from_gps", "Seoul")])
+        self.assertEqual(index.opclasses, ["vector_cosine_ops"])
+
+    def test_partial_plan_splits_city(self):
+        """부분 인덱스 계획이 도시 조건 검색과 나머지 검색을 합치는지 테스트."""
+        plan = SearchPlan(PLAN_PARTIAL_INDEX, partial_city="Seoul", partial_index="idx")
+        sql, params = plan.build(self.qs, self.query_vector, 10).query.sql_with_params()
+
+        self.assertIn('"city_from_gps" =', sql)
+        self.assertEqual(sql.count("IN (SELECT"), 2)
+        self.assertIn("Seoul", params)
+
+    def test_city_predicate_parse(self):
+        """pg_index 조건식에서 도시명을 읽는지 테스트."""
+        match = _CITY_PREDICATE_RE.search("((city_from_gps)::text = 'Xi''an'::text)")
+
+        self.assertEqual(match.group(1).replace("''", "'"), "Xi'an")
+
+    @override_settings(SEARCH_PLANNER={"EXACT_THRESHOLD": 0, "MAX_OVERSAMPLE": 8})
+    def test_large_filter_uses_iterative(self):
+        """필터 결과가 크면 선택도의 역수만큼 oversampling하는지 테스트."""
+        planner = "imagesearch_gemini.utils.search_planner"
+        with patch(f"{planner}.QuerySet.count", return_value=1), patch(
+            f"{planner}._planner_row_estimate", return_value=50
+        ), patch(f"{planner}._table_row_estimate", return_value=1000), patch(
+            f"{planner}.partial_index_registry.find", return_value=None
+        ):
+            plan = plan_vector_search(self.qs, 10, True, location="Busan")
+
+        self.assertEqual(plan.name, PLAN_ITERATIVE)
+        self.assertAlmostEqual(plan.selectivity, 0.05)
+        self.assertEqual(plan.oversample, 8)
@@ -0,0 +1,136 @@
+"""임베딩 배치 태스크 테스트입니다."""
+
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import ImageEmbedding
+from ..tasks import (
+    _claim_pending_ids,
+    enqueue_image_embedding,
+    generate_image_embeddings_batch_task,
+    retry_failed_embeddings,
+)
+from ..utils.result_cache import bump_corpus_generation
+
+
+class EmbeddingBatchTaskTests(TestCase):
+    """임베딩 배치 태스크 테스트 클래스입니다."""
+
+    @patch("imagesearch_gemini.tasks.get_image_embedding")
+    @patch("imagesearch_gemini.tasks.ImageEmbedding")
+    def test_batch_isolates_item_failures(self, mock_model, mock_get_embedding):
+        """한 이미지 실패가 배치 전체를 실패시키지 않는지 테스트."""
+        good_image = Mock(id=1, image_path="images/good.jpg")
+        bad_image = Mock(id=2, image_path="images/bad.jpg")
+        mock_model.objects.in_bulk.return_value = {1: good_image, 2: bad_image}
+
+        def fake_embedding(path):
+            if path == "images/bad.jpg":
+                raise FileNotFoundError(path)
+            return "multimodalembedding@001", [0.1] * 1408
+
+        mock_get_embedding.side_effect = fake_embedding
+
+        result = generate_image_embeddings_batch_task([1, 2])
+
+        self.assertEqual(result, {"done": 1, "failed": 1})
+        self.assertEqual(good_image.embedding_status, "done")
+        self.assertEqual(bad_image.embedding_status, "failed")
+        self.assertIn("bad.jpg", bad_image.embedding_error)
+        mock_model.objects.in_bulk.assert_called_once_with([1, 2])
+        # 실패한 행은 embedding을 저장하지 않아 기존 벡터를 덮어쓰지 않음
+        done_call, failed_call = mock_model.objects.bulk_update.call_args_list
+        self.assertEqual(done_call.args[0], [good_image])
+        self.assertIn("embedding", done_call.args[1])
+        self.assertEqual(failed_call.args[0], [bad_image])
+        self.assertNotIn("embedding", failed_call.args[1])
+
+    @patch("imagesearch_gemini.tasks.get_image_embedding")
+    @patch("imagesearch_gemini.tasks.ImageEmbedding")
+    def test_batch_empty(self, mock_model, mock_get_embedding):
+        """대상이 없는 배치 테스트."""
+        mock_model.objects.in_bulk.return_value = {}
+
+        result = generate_image_embeddings_batch_task([99])
+
+        self.assertEqual(result, {"done": 0, "failed": 0})
+        mock_get_embedding.assert_not_called()
+        mock_model.objects.bulk_update.assert_not_called()
+
+    @patch("imagesearch_gemini.tasks.transaction")
+    @patch("imagesearch_gemini.tasks.quantize_embeddings")
+    @patch("imagesearch_gemini.tasks.compact_columns_enabled", return_value=True)
+    @patch("imagesearch_gemini.tasks.get_image_embedding")
+    @patch("imagesearch_gemini.tasks.ImageEmbedding")
+    def test_batch_invalidates_cache_after_quantize(
+        self, mock_model, mock_get_embedding, _, mock_quantize, mock_transaction
+    ):
+        """검색 결과 캐시 무효화가 압축 컬럼 갱신 뒤 같은 트랜잭션 커밋 시점에 일어나는지 테스트."""
+        mock_model.objects.in_bulk.return_value = {
+            1: Mock(id=1, image_path="images/good.jpg")
+        }
+        mock_get_embedding.return_value = ("multimodalembedding@001", [0.1] * 1408)
+        events = []
+        mock_quantize.side_effect = lambda qs: events.append("quantize")
+        mock_transaction.on_commit.side_effect = lambda func: events.append(func)
+        mock_transaction.atomic.return_value.__exit__.side_effect = (
+            lambda *args: events.append("commit")
+        )
+
+        generate_image_embeddings_batch_task([1])
+
+        self.assertEqual(events, ["quantize", bump_corpus_generation, "commit"])
+
+    @override_settings(EMBEDDING_BATCH={"STALE_SECONDS": 60})
+    def test_claim_reclaims_stale_processing(self):
+        """오래 processing에 머문 행은 다시 선점하고 최근 선점된 행은 건너뛰는지 테스트."""
+        pending, stale, fresh, done = ImageEmbedding.objects.bulk_create(
+            ImageEmbedding(
+                image_path=f"images/{i}.jpg",
+                embedding=[0.1] * 1408,
+                embedding_status=status,
+            )
+            for i, status in enumerate(["pending", "processing", "processing", "done"])
+        )
+        ImageEmbedding.objects.filter(id=stale.id).update(
+            updated_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        ids = _claim_pending_ids(10)
+
+        self.assertEqual(ids, [pending.id, stale.id])
+        stale.refresh_from_db(fields=["embedding_status", "updated_at"])
+        self.assertEqual(stale.embedding_status, "processing")
+        self.assertGreater(stale.updated_at, timezone.now() - timedelta(minutes=1))
+
+    @patch("imagesearch_gemini.tasks.flush_pending_embeddings")
+    @patch("imagesearch_gemini.tasks.cache")
+    def test_enqueue_flushes_when_cache_unavailable(self, mock_cache, mock_flush):
+        """캐시 장애로 카운터가 None이면 바로 플러시를 예약하는지 테스트."""
+        mock_cache.add.return_value = None
+        mock_cache.incr.return_value = None
+
+        enqueue_image_embedding(1)
+
+        mock_flush.delay.assert_called_once_with()
+        mock_flush.apply_async.assert_not_called()
+
+    @override_settings(EMBEDDING_BATCH={"WINDOW_SECONDS": 2})
+    @patch("imagesearch_gemini.tasks.flush_pending_embeddings")
+    def test_retry_flushes_overdue_pending(self, mock_flush):
+        """플러시 예약 없이 윈도우보다 오래 pending에 머문 행이 있으면 플러시하는지 테스트."""
+        (image,) = ImageEmbedding.objects.bulk_create(
+            [ImageEmbedding(image_path="images/a.jpg", embedding=[0.1] * 1408)]
+        )
+
+        retry_failed_embeddings()
+        mock_flush.delay.assert_not_called()
+
+        ImageEmbedding.objects.filter(id=image.id).update(
+            updated_at=timezone.now() - timedelta(minutes=1)
+        )
+        retry_failed_embeddings()
+        mock_flush.delay.assert_called_once_with()
@@ -0,0 +1,66 @@
+"""타임존 리졸버 테스트입니다."""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+
+from ..utils.image_processing import parse_exif_datetime
+from ..utils.timezones import TimezoneResolver
+
+
+@override_settings(TIMEZONE_RESOLVER={"GRID_PRECISION": 2, "MEMO_SIZE": 10})
+class TimezoneResolverTests(TestCase):
+    """타임존 리졸버 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.resolver = TimezoneResolver()
+
+    @patch("imagesearch_gemini.utils.timezones.TimezoneFinder")
+    def test_finder_loaded_once(self, mock_finder_cls):
+        """TimezoneFinder를 한 번만 생성하는지 테스트."""
+        mock_finder_cls.return_value.timezone_at.return_value = "Asia/Seoul"
+
+        self.resolver.resolve(126.9780, 37.5665)
+        self.resolver.resolve(129.0756, 35.1796)
+
+        mock_finder_cls.assert_called_once_with(in_memory=False)
+        self.assertEqual(self.resolver.get_metrics()["lookups"], 2)
+
+    @patch("imagesearch_gemini.utils.timezones.TimezoneFinder")
+    def test_batch_resolution_with_grid_memo(self, mock_finder_cls):
+        """같은 격자의 좌표는 다시 조회하지 않는지 테스트."""
+        mock_finder = MagicMock()
+        mock_finder.timezone_at.side_effect = ["Asia/Seoul", "Asia/Tokyo"]
+        mock_finder_cls.return_value = mock_finder
+
+        result = self.resolver.resolve_many(
+            [(126.9780, 37.5665), None, (139.6917, 35.6895), (126.9781, 37.5666)]
+        )
+
+        self.assertEqual(result, ["Asia/Seoul", None, "Asia/Tokyo", "Asia/Seoul"])
+        self.assertEqual(mock_finder.timezone_at.call_count, 2)
+        metrics = self.resolver.get_metrics()
+        self.assertEqual(metrics["memo_hits"], 1)
+        self.assertEqual(metrics["memo_size"], 2)
+
+
+class ParseExifDatetimeTests(TestCase):
+    """EXIF 촬영일 파싱 테스트 클래스입니다."""
+
+    def test_localizes_with_given_timezone(self):
+        """미리 구한 타임존으로 지역화하는지 테스트."""
+        parsed = parse_exif_datetime("2024:05:01 10:30:00", tzname="Asia/Tokyo")
+
+        self.assertEqual(parsed.isoformat(), "2024-05-01T10:30:00+09:00")
+
+    def test_defaults_to_seoul_without_timezone(self):
+        """타임존을 찾지 못하면 서울 시간으로 지역화하는지 테스트."""
+        parsed = parse_exif_datetime("2024:01:01 00:00:00", tzname=None)
+
+        self.assertEqual(str(parsed.tzinfo), "Asia/Seoul")
+
+    def test_invalid_value_returns_none(self):
+        """잘못된 EXIF 날짜는 None을 반환하는지 테스트."""
+        self.assertIsNone(parse_exif_datetime("not a date"))
+        self.assertIsNone(parse_exif_datetime(None))
@@ -0,0 +1,75 @@
+"""벡터 인덱스 설정 테스트입니다."""
+
+from pgvector.django import HnswIndex, IvfflatIndex
+
+from django.test import TestCase, override_settings
+
+from ..utils.vector_index import (
+    EMBEDDING_INDEX_NAME,
+    build_compact_indexes,
+    build_embedding_index,
+    get_search_params,
+    get_vector_index_config,
+)
+
+
+class VectorIndexTests(TestCase):
+    """벡터 인덱스 설정 테스트 클래스입니다."""
+
+    @override_settings(
+        VECTOR_INDEX={"TYPE": "hnsw", "HNSW_M": 24, "HNSW_EF_CONSTRUCTION": 128}
+    )
+    def test_build_hnsw_index(self):
+        """HNSW 인덱스 생성 파라미터 테스트."""
+        index = build_embedding_index()
+
+        self.assertIsInstance(index, HnswIndex)
+        self.assertEqual(index.name, EMBEDDING_INDEX_NAME)
+        self.assertEqual(index.get_with_params(), ["m = 24", "ef_construction = 128"])
+
+    @override_settings(VECTOR_INDEX={"TYPE": "IVFFlat", "IVFFLAT_LISTS": 500})
+    def test_build_ivfflat_index(self):
+        """IVFFlat 인덱스 생성 파라미터 테스트."""
+        index = build_embedding_index()
+
+        self.assertIsInstance(index, IvfflatIndex)
+        self.assertEqual(index.get_with_params(), ["lists = 500"])
+
+    @override_settings(VECTOR_INDEX={"TYPE": "flat"})
+    def test_invalid_index_type(self):
+        """지원하지 않는 인덱스 종류 테스트."""
+        with self.assertRaises(ValueError):
+            get_vector_index_config()
+
+    @override_settings(VECTOR_INDEX={"TYPE": "hnsw", "HNSW_EF_SEARCH": 80})
+    def test_search_params_hnsw(self):
+        """HNSW 쿼리 파라미터 테스트."""
+        self.assertEqual(get_search_params(), {"hnsw.ef_search": 80})
+        self.assertEqual(get_search_params(ef_search=200), {"hnsw.ef_search": 200})
+
+    @override_settings(VECTOR_INDEX={"TYPE": "hnsw", "HNSW_EF_SEARCH": 40})
+    def test_search_params_hnsw_limit(self):
+        """결과 수가 ef_search보다 크면 ef_search를 결과 수까지 올리는지 테스트."""
+        self.assertEqual(get_search_params(limit=50), {"hnsw.ef_search": 50})
+        self.assertEqual(get_search_params(limit=10), {"hnsw.ef_search": 40})
+        self.assertEqual(get_search_params(limit=5000), {"hnsw.ef_search": 1000})
+
+    @override_settings(VECTOR_INDEX={"TYPE": "ivfflat", "IVFFLAT_PROBES": 5})
+    def test_search_params_ivfflat(self):
+        """IVFFlat 쿼리 파라미터 테스트."""
+        self.assertEqual(get_search_params(), {"ivfflat.probes": 5})
+
+    @override_settings(VECTOR_INDEX={"TYPE": "hnsw", "METRIC": "ip"})
+    def test_ip_metric_opclasses(self):
+        """내적 척도에서 인덱스가 ip operator class를 쓰는지 테스트."""
+        half_index, bits_index = build_compact_indexes()
+
+        self.assertEqual(build_embedding_index().opclasses, ["vector_ip_ops"])
+        self.assertEqual(half_index.opclasses, ["halfvec_ip_ops"])
+        self.assertEqual(bits_index.opclasses, ["bit_hamming_ops"])
+
+    @override_settings(VECTOR_INDEX={"TYPE": "hnsw", "METRIC": "dot"})
+    def test_invalid_metric(self):
+        """지원하지 않는 거리 척도 테스트."""
+        with self.assertRaises(ValueError):
+            get_vector_index_config()
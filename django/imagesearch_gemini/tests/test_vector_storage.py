@@ -0,0 +1,108 @@
+"""벡터 압축 저장/재정렬 테스트입니다."""
+
+import numpy as np
+
+from django.test import TestCase, override_settings
+
+from ..models import ImageEmbedding
+from ..utils.vector_storage import (
+    MODE_BINARY,
+    MODE_FULL,
+    MODE_HALFVEC,
+    annotate_distance,
+    binary_quantize,
+    compact_columns_enabled,
+    get_candidate_ef_search,
+    prepare_embedding,
+)
+
+
+class VectorStorageTests(TestCase):
+    """벡터 압축 저장 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.query_vector = np.full(1408, 0.1, dtype=np.float32)
+        self.query_vector[::2] = -0.1
+
+    def _sql(self, mode, candidates=None):
+        qs = annotate_distance(
+            ImageEmbedding.objects.filter(embedding_status="done"),
+            self.query_vector,
+            10,
+            mode=mode,
+            candidates=candidates,
+        )
+        return qs.query.sql_with_params()
+
+    def test_full_mode_single_stage(self):
+        """full 모드는 float32 컬럼만으로 정렬하는지 테스트."""
+        sql, _ = self._sql(MODE_FULL)
+
+        self.assertIn('"embedding" <->', sql)
+        self.assertNotIn('"embedding_half" <->', sql)
+        self.assertNotIn("IN (SELECT", sql)
+
+    def test_halfvec_mode_reranks_candidates(self):
+        """halfvec 후보를 float32 거리로 재정렬하는지 테스트."""
+        sql, _ = self._sql(MODE_HALFVEC, candidates=100)
+
+        self.assertIn('"embedding_half" <->', sql)
+        self.assertIn("IN (SELECT", sql)
+        self.assertIn("LIMIT 100", sql)
+        self.assertIn('"embedding" <->', sql)
+
+    def test_binary_mode_uses_hamming_distance(self):
+        """binary 모드가 해밍 거리로 후보를 고르는지 테스트."""
+        sql, params = self._sql(MODE_BINARY)
+
+        self.assertIn('"embedding_bits" <~>', sql)
+        self.assertIn("LIMIT 200", sql)
+        self.assertIn(binary_quantize(self.query_vector), params)
+
+    def test_binary_quantize_sign_bits(self):
+        """양수 성분만 1로 변환되는지 테스트."""
+        self.assertEqual(binary_quantize([0.5, -0.2, 0.0, 1e-6]), "1001")
+
+    @override_settings(VECTOR_STORAGE={"MODE": "binary", "RERANK_CANDIDATES": 300})
+    def test_compact_mode_raises_ef_search(self):
+        """압축 모드에서 ef_search가 후보 수 이상으로 올라가는지 테스트."""
+        self.assertEqual(get_candidate_ef_search(None, 10), 300)
+        self.assertEqual(get_candidate_ef_search(500, 10), 500)
+        self.assertTrue(compact_columns_enabled())
+
+    @override_settings(VECTOR_STORAGE={"MODE": "full"})
+    def test_full_mode_keeps_settings(self):
+        """full 모드에서는 ef_search와 압축 컬럼 기록을 바꾸지 않는지 테스트."""
+        self.assertIsNone(get_candidate_ef_search(None, 10))
+        self.assertFalse(compact_columns_enabled())
+
+    @override_settings(VECTOR_INDEX={"TYPE": "hnsw", "METRIC": "ip"})
+    def test_ip_metric_uses_inner_product(self):
+        """내적 척도에서 후보 선택과 재정렬 모두 <#>를 쓰는지 테스트."""
+        full_sql, _ = self._sql(MODE_FULL)
+        half_sql, _ = self._sql(MODE_HALFVEC)
+
+        self.assertIn('"embedding" <#>', full_sql)
+        self.assertIn('"embedding_half" <#>', half_sql)
+        self.assertIn('"embedding" <#>', half_sql)
+
+    @override_settings(VECTOR_INDEX={"TYPE": "hnsw", "METRIC": "ip"})
+    def test_prepare_embedding_normalizes_for_ip(self):
+        """내적 척도에서 벡터가 단위 길이로 정규화되는지 테스트."""
+        vector = prepare_embedding([3.0, 4.0])
+
+        self.assertAlmostEqual(vector[0], 0.6, places=6)
+        self.assertAlmostEqual(vector[1], 0.8, places=6)
+        self.assertEqual(prepare_embedding([0.0, 0.0]), [0.0, 0.0])
+
+    @override_settings(VECTOR_INDEX={"TYPE": "hnsw", "METRIC": "l2"})
+    def test_prepare_embedding_keeps_vector_for_l2(self):
+        """L2 척도에서는 벡터를 그대로 두는지 테스트."""
+        self.assertEqual(prepare_embedding([3.0, 4.0]), [3.0, 4.0])
+
+    @override_settings(VECTOR_STORAGE={"MODE": "pq"})
+    def test_invalid_mode(self):
+        """지원하지 않는 모드 설정 시 오류 테스트."""
+        with self.assertRaises(ValueError):
+            compact_columns_enabled()
@@ -0,0 +1,124 @@
+"""감시 폴더 자동 수집 테스트입니다."""
+
+from unittest.mock import Mock, patch
+
+from django.test import TestCase, override_settings
+
+from ..models import ImageEmbedding, IngestionJob, WatchedFolder
+from ..utils import watched_folders
+from ..utils.watched_folders import sync_watched_folder
+from .utils import LOCMEM_CACHES
+
+SYNC_SETTINGS = {"INTERVAL": 60, "MAX_ITEMS_PER_MINUTE": 2, "CHUNK_SIZE": 1}
+
+
+def _drive_file(file_id, parent="folder-1", md5="m1", name=None):
+    return {
+        "id": file_id,
+        "name": name or f"{file_id}.jpg",
+        "mimeType": "image/jpeg",
+        "parents": [parent],
+        "md5Checksum": md5,
+    }
+
+
+@override_settings(CACHES=LOCMEM_CACHES, WATCHED_FOLDER_SYNC=SYNC_SETTINGS)
+class WatchedFolderSyncTests(TestCase):
+    """감시 폴더 동기화 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.folder = WatchedFolder.objects.create(
+            provider="google", user_email="user@example.com", folder_id="folder-1"
+        )
+        self.cursor_func = Mock(return_value="cursor-1")
+        self.collect_func = Mock()
+        self.expired_func = Mock(side_effect=lambda error: str(error).startswith("410"))
+        patcher = patch.dict(
+            watched_folders.PROVIDERS,
+            {"google": (self.cursor_func, self.collect_func, self.expired_func)},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        task_patcher = patch("imagesearch_gemini.tasks.ingest_receive_task")
+        self.receive_task = task_patcher.start()
+        self.addCleanup(task_patcher.stop)
+
+    def _collect(self, files, cursor):
+        self.collect_func.side_effect = lambda folder: (
+            (watched_folders._google_item(folder, f) for f in files),
+            cursor or folder.cursor,
+        )
+
+    def test_initial_scan_takes_cursor_first(self):
+        """최초 동기화는 커서를 먼저 받고 전체 스캔 후 완료 표시하는지 테스트."""
+        self._collect([_drive_file("a"), _drive_file("b", parent="other")], None)
+
+        dispatched = sync_watched_folder(self.folder)
+
+        self.folder.refresh_from_db()
+        self.assertEqual(dispatched, 1)
+        self.cursor_func.assert_called_once()
+        self.assertEqual(self.folder.cursor, "cursor-1")
+        self.assertTrue(self.folder.scan_completed)
+        job = IngestionJob.objects.get(source="watched")
+        self.assertEqual(job.total_count, 1)
+        args, kwargs = self.receive_task.apply_async.call_args
+        self.assertEqual(args[0][1][0]["source_ref"], "google:a:m1")
+
+    def test_known_and_inflight_items_skipped(self):
+        """이미 저장됐거나 수집 중인 항목은 다시 예약하지 않는지 테스트."""
+        self._collect([_drive_file("a"), _drive_file("b")], None)
+
+        with patch.object(ImageEmbedding.objects, "filter") as mock_filter:
+            mock_filter.return_value.values_list.return_value = ["google:a:m1"]
+            self.assertEqual(sync_watched_folder(self.folder), 1)
+        self.folder.refresh_from_db()
+        self.assertEqual(sync_watched_folder(self.folder), 0)
+
+    def test_rate_limit_defers_cursor(self):
+        """주기당 처리량을 넘으면 커서를 옮기지 않고 나머지를 이월하는지 테스트."""
+        self.folder.cursor = "cursor-1"
+        self.folder.scan_completed = True
+        self.folder.save()
+        files = [_drive_file(name) for name in "abc"]
+        self._collect(files, "cursor-2")
+
+        self.assertEqual(sync_watched_folder(self.folder), 2)
+        self.folder.refresh_from_db()
+        self.assertEqual(self.folder.cursor, "cursor-1")
+        countdowns = [
+            call.kwargs["countdown"]
+            for call in self.receive_task.apply_async.call_args_list
+        ]
+        self.assertEqual(countdowns, [0, 30.0])
+
+        self.assertEqual(sync_watched_folder(self.folder), 1)
+        self.folder.refresh_from_db()
+        self.assertEqual(self.folder.cursor, "cursor-2")
+
+    def test_failure_keeps_cursor(self):
+        """일시적인 오류는 커서를 유지하고 오류만 기록하는지 테스트."""
+        self.folder.cursor = "cursor-1"
+        self.folder.scan_completed = True
+        self.folder.save()
+        self.collect_func.side_effect = Exception("429 Too Many Requests")
+
+        self.assertEqual(sync_watched_folder(self.folder), 0)
+        self.folder.refresh_from_db()
+        self.assertEqual(self.folder.cursor, "cursor-1")
+        self.assertTrue(self.folder.scan_completed)
+        self.assertEqual(self.folder.last_error, "429 Too Many Requests")
+
+    def test_expired_cursor_resets_scan(self):
+        """커서 만료 오류면 다음 주기에 전체 스캔하도록 초기화하는지 테스트."""
+        self.folder.cursor = "expired"
+        self.folder.scan_completed = True
+        self.folder.save()
+        self.collect_func.side_effect = Exception("410 Gone")
+
+        self.assertEqual(sync_watched_folder(self.folder), 0)
+        self.folder.refresh_from_db()
+        self.assertIsNone(self.folder.cursor)
+        self.assertFalse(self.folder.scan_completed)
+        self.assertEqual(self.folder.last_error, "410 Gone")
@@ -0,0 +1,6 @@
+"""여러 테스트 모듈이 함께 쓰는 설정입니다."""
+
+# 캐시를 쓰는 테스트는 Redis 대신 프로세스 내부 메모리 캐시 사용
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
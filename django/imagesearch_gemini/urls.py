@@ -7,7 +7,13 @@ urlpatterns = [
     path("", lambda request: redirect("search/")),
     path("image-select/", views.image_select, name="image_select"),
     path("search/", views.image_search, name="image_search"),
+    path("api/search/", views.search_api, name="search_api"),
     path("cloud-image-list/", views.cloud_image_list, name="cloud_image_list"),
+    path(
+        "cloud-image-list/stream/",
+        views.cloud_image_list_stream,
+        name="cloud_image_list_stream",
+    ),
     path(
         "embedding-status/", views.embedding_status_list, name="embedding_status_list"
     ),
@@ -16,5 +22,11 @@ urlpatterns = [
         views.retry_failed_embedding,
         name="retry_failed_embedding",
     ),
+    path(
+        "ingestion-jobs/<uuid:job_id>/",
+        views.ingestion_job_status,
+        name="ingestion_job_status",
+    ),
     path("similar-images/<int:image_id>/", views.similar_images, name="similar_images"),
+    path("renditions/<path:path>", views.rendition, name="rendition"),
 ]
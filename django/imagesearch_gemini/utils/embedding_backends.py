@@ -0,0 +1,275 @@
+import abc
+import hashlib
+import logging
+import os
+import threading
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from .renditions import open_for_downscale
+
+logger = logging.getLogger(__name__)
+
+# ImageEmbedding.embedding 컬럼 차원 (백엔드 벡터가 더 짧으면 0으로 채움)
+VECTOR_DIMENSION = 1408
+
+DEFAULT_EMBEDDING_BACKEND = {
+    "BACKEND": "vertex",
+    "OPTIONS": {},
+}
+
+# settings에서 짧은 이름으로 고를 수 있는 백엔드
+BACKENDS = {
+    "vertex": "imagesearch_gemini.utils.embeddings.VertexAIBackend",
+    "onnx_clip": "imagesearch_gemini.utils.embedding_backends.OnnxClipBackend",
+    "fake": "imagesearch_gemini.utils.embedding_backends.FakeEmbeddingBackend",
+}
+
+
+def _get_config() -> dict:
+    config = dict(DEFAULT_EMBEDDING_BACKEND)
+    config.update(getattr(settings, "EMBEDDING_BACKEND", {}) or {})
+    return config
+
+
+def pad_vector(vector: Sequence[float], dimension: int = VECTOR_DIMENSION) -> list:
+    """벡터를 컬럼 차원에 맞춰 0으로 채웁니다 (같은 백엔드 벡터끼리의 거리는 그대로)."""
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    if vector.shape[0] > dimension:
+        raise ValueError(
+            f"임베딩 차원({vector.shape[0]})이 컬럼 차원({dimension})보다 큽니다."
+        )
+    if vector.shape[0] < dimension:
+        vector = np.pad(vector, (0, dimension - vector.shape[0]))
+    return vector.tolist()
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class EmbeddingBackend(abc.ABC):
+    """이미지/텍스트 임베딩 백엔드 인터페이스입니다.
+
+    name은 ImageEmbedding.embedding_model / SearchQuery.query_embedding_model에
+    기록되어, 어떤 백엔드가 만든 벡터인지 구분하는 데 사용됩니다.
+    embed_image/embed_text를 모두 구현하지 않은 백엔드는 생성 시점에 실패합니다.
+    """
+
+    name = ""
+    # True면 embed_images로 여러 이미지를 한 번에 추론 (배치 태스크가 스레드 풀 대신 사용)
+    supports_batch = False
+
+    def __init__(self, options: Optional[dict] = None) -> None:
+        self.options = options or {}
+
+    @abc.abstractmethod
+    def embed_image(self, image_path: str) -> Optional[List[float]]:
+        """이미지 한 장의 임베딩을 반환합니다 (실패하면 None)."""
+
+    def embed_images(self, image_paths: Sequence[str]) -> List[Optional[List[float]]]:
+        return [self.embed_image(path) for path in image_paths]
+
+    @abc.abstractmethod
+    def embed_text(self, text: str) -> Optional[List[float]]:
+        """검색어 텍스트의 임베딩을 반환합니다 (실패하면 None)."""
+
+    def warm_up(self) -> None:
+        """워커 시작 시 모델을 미리 로드합니다 (필요한 백엔드만 구현)."""
+
+
+class FakeEmbeddingBackend(EmbeddingBackend):
+    """입력 내용 해시로 결정적인 단위 벡터를 만드는 오프라인용 백엔드입니다.
+
+    네트워크/자격 증명 없이 수집·검색 부하 테스트를 돌릴 때 사용합니다.
+    같은 파일(바이트)과 같은 텍스트는 항상 같은 벡터가 됩니다.
+    """
+
+    name = "fake-hash@1"
+    supports_batch = True
+
+    def _vector(self, kind: str, payload: bytes) -> List[float]:
+        digest = hashlib.sha256(kind.encode("utf-8") + b":" + payload).digest()
+        rng = np.random.default_rng(int.from_bytes(digest[:8], "big"))
+        dimension = self.options.get("DIMENSION", VECTOR_DIMENSION)
+        vector = _l2_normalize(rng.standard_normal(dimension).astype(np.float32))
+        return pad_vector(vector)
+
+    def embed_image(self, image_path: str) -> Optional[List[float]]:
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_path}")
+        with open(image_path, "rb") as f:
+            return self._vector("image", f.read())
+
+    def embed_text(self, text: str) -> Optional[List[float]]:
+        if not text or not text.strip():
+            raise ValueError("텍스트가 비어있습니다.")
+        return self._vector("text", text.strip().lower().encode("utf-8"))
+
+
+class OnnxClipBackend(EmbeddingBackend):
+    """ONNX로 내보낸 CLIP 모델로 CPU에서 임베딩을 계산하는 로컬 백엔드입니다.
+
+    onnxruntime과 tokenizers 패키지가 필요합니다 (선택 의존성).
+
+    OPTIONS:
+        IMAGE_MODEL: 이미지 인코더 .onnx 경로 (입력: float32 NCHW)
+        TEXT_MODEL: 텍스트 인코더 .onnx 경로 (입력: input_ids[, attention_mask])
+        TOKENIZER: tokenizer.json 경로
+        NAME: embedding_model에 기록할 이름
+        IMAGE_SIZE: 입력 해상도 (기본 224)
+        CONTEXT_LENGTH: 텍스트 토큰 길이 (기본 77)
+        BATCH_SIZE: 한 번에 추론할 이미지 수
+        NUM_THREADS: onnxruntime intra-op 스레드 수 (0이면 자동)
+    """
+
+    supports_batch = True
+
+    # OpenAI CLIP 전처리 정규화 값
+    MEAN = np.array([0.48145466, 0.4578275, 0.40821073], dtype=np.float32)
+    STD = np.array([0.26862954, 0.26130258, 0.27577711], dtype=np.float32)
+
+    def __init__(self, options: Optional[dict] = None) -> None:
+        super().__init__(options)
+        for key in ("IMAGE_MODEL", "TEXT_MODEL", "TOKENIZER"):
+            if not self.options.get(key):
+                raise ImproperlyConfigured(
+                    f"EMBEDDING_BACKEND['OPTIONS']['{key}']가 필요합니다."
+                )
+        self.name = self.options.get("NAME", "clip-onnx")
+        self.image_size = self.options.get("IMAGE_SIZE", 224)
+        self.context_length = self.options.get("CONTEXT_LENGTH", 77)
+        self.batch_size = self.options.get("BATCH_SIZE", 32)
+        self._lock = threading.Lock()
+        self._sessions = None
+        self._pid: Optional[int] = None
+
+    def _load(self):
+        with self._lock:
+            if self._sessions is not None and self._pid == os.getpid():
+                return self._sessions
+            try:
+                import onnxruntime
+                from tokenizers import Tokenizer
+            except ImportError as e:
+                raise ImproperlyConfigured(
+                    "onnx_clip 백엔드에는 onnxruntime, tokenizers 패키지가 필요합니다."
+                ) from e
+
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = self.options.get("NUM_THREADS", 0)
+            providers = ["CPUExecutionProvider"]
+            image_session = onnxruntime.InferenceSession(
+                self.options["IMAGE_MODEL"], session_options, providers=providers
+            )
+            text_session = onnxruntime.InferenceSession(
+                self.options["TEXT_MODEL"], session_options, providers=providers
+            )
+            tokenizer = Tokenizer.from_file(self.options["TOKENIZER"])
+            tokenizer.enable_padding(length=self.context_length)
+            tokenizer.enable_truncation(max_length=self.context_length)
+            self._sessions = (image_session, text_session, tokenizer)
+            self._pid = os.getpid()
+            return self._sessions
+
+    def warm_up(self) -> None:
+        self._load()
+
+    def _preprocess(self, image_path: str) -> np.ndarray:
+        size = self.image_size
+        with open(image_path, "rb") as f:
+            image = open_for_downscale(f, size).convert("RGB")
+        # 짧은 변을 size로 맞춘 뒤 가운데를 정사각형으로 자름
+        scale = size / min(image.size)
+        width, height = (
+            max(size, round(image.width * scale)),
+            max(size, round(image.height * scale)),
+        )
+        image = image.resize((width, height), resample=3)  # BICUBIC
+        left, top = (width - size) // 2, (height - size) // 2
+        image = image.crop((left, top, left + size, top + size))
+        pixels = np.asarray(image, dtype=np.float32) / 255.0
+        pixels = (pixels - self.MEAN) / self.STD
+        return pixels.transpose(2, 0, 1)
+
+    def embed_images(self, image_paths: Sequence[str]) -> List[Optional[List[float]]]:
+        image_session, _, _ = self._load()
+        input_name = image_session.get_inputs()[0].name
+        results: List[Optional[List[float]]] = []
+        for start in range(0, len(image_paths), self.batch_size):
+            batch = np.stack(
+                [
+                    self._preprocess(path)
+                    for path in image_paths[start : start + self.batch_size]
+                ]
+            )
+            outputs = image_session.run(None, {input_name: batch})[0]
+            results.extend(pad_vector(row) for row in _l2_normalize(outputs))
+        return results
+
+    def embed_image(self, image_path: str) -> Optional[List[float]]:
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_path}")
+        return self.embed_images([image_path])[0]
+
+    def embed_text(self, text: str) -> Optional[List[float]]:
+        if not text or not text.strip():
+            raise ValueError("텍스트가 비어있습니다.")
+        _, text_session, tokenizer = self._load()
+        encoding = tokenizer.encode(text.strip())
+        feeds = {}
+        for model_input in text_session.get_inputs():
+            if model_input.name == "attention_mask":
+                feeds[model_input.name] = np.array(
+                    [encoding.attention_mask], dtype=np.int64
+                )
+            else:
+                feeds[model_input.name] = np.array([encoding.ids], dtype=np.int64)
+        outputs = text_session.run(None, feeds)[0]
+        return pad_vector(_l2_normalize(outputs)[0])
+
+
+class _BackendHolder:
+    """settings로 고른 백엔드 인스턴스를 프로세스 단위로 캐시합니다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._backend: Optional[EmbeddingBackend] = None
+
+    def get(self) -> EmbeddingBackend:
+        with self._lock:
+            if self._backend is None:
+                config = _get_config()
+                backend_path = BACKENDS.get(config["BACKEND"], config["BACKEND"])
+                try:
+                    backend_class = import_string(backend_path)
+                except ImportError as e:
+                    raise ImproperlyConfigured(
+                        f"임베딩 백엔드를 불러올 수 없습니다: {backend_path}"
+                    ) from e
+                self._backend = backend_class(config.get("OPTIONS"))
+                logger.info(f"Embedding backend: {self._backend.name}")
+            return self._backend
+
+    def reset(self) -> None:
+        with self._lock:
+            self._backend = None
+
+
+_backend_holder = _BackendHolder()
+
+
+def get_embedding_backend() -> EmbeddingBackend:
+    """settings.EMBEDDING_BACKEND로 선택된 백엔드를 반환합니다."""
+    return _backend_holder.get()
+
+
+def reset_embedding_backend() -> None:
+    """캐시된 백엔드를 버립니다 (설정 변경/테스트용)."""
+    _backend_holder.reset()
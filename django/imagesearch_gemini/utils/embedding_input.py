@@ -0,0 +1,119 @@
+import io
+import logging
+import os
+import threading
+import time
+from typing import Tuple
+
+from django.conf import settings
+
+from .renditions import downscale, open_for_downscale
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_INPUT = {
+    "ENABLED": True,
+    # multimodalembedding@001은 입력을 내부적으로 축소하므로 그 이상 해상도는 불필요
+    "MAX_SIDE": 512,
+    "JPEG_QUALITY": 90,
+}
+
+
+def get_embedding_input_config() -> dict:
+    """settings.EMBEDDING_INPUT과 기본값을 합친 설정을 반환합니다."""
+    config = dict(DEFAULT_EMBEDDING_INPUT)
+    config.update(getattr(settings, "EMBEDDING_INPUT", {}) or {})
+    return config
+
+
+class EmbeddingInputStats:
+    """임베딩 API로 보낸 이미지 바이트 절감량을 누적하는 클래스입니다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics = {
+            "requests": 0,
+            "original_bytes": 0,
+            "sent_bytes": 0,
+            "saved_bytes": 0,
+            "prepare_seconds": 0.0,
+        }
+
+    def record(self, original_bytes: int, sent_bytes: int, seconds: float) -> None:
+        with self._lock:
+            self._metrics["requests"] += 1
+            self._metrics["original_bytes"] += original_bytes
+            self._metrics["sent_bytes"] += sent_bytes
+            self._metrics["saved_bytes"] += original_bytes - sent_bytes
+            self._metrics["prepare_seconds"] += seconds
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+        original = metrics["original_bytes"]
+        metrics["saved_ratio"] = (
+            round(metrics["saved_bytes"] / original, 4) if original else 0.0
+        )
+        return metrics
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._metrics:
+                self._metrics[key] = 0
+
+
+embedding_input_stats = EmbeddingInputStats()
+
+
+def prepare_embedding_input(image_path: str) -> Tuple[bytes, dict]:
+    """임베딩 API에 보낼 이미지를 메모리에서 축소/재인코딩합니다.
+
+    EXIF 방향을 적용하고 긴 변을 MAX_SIDE 이하로 줄여 JPEG로 인코딩합니다.
+    결과가 원본보다 크면 원본 바이트를 그대로 사용합니다.
+
+    Args:
+        image_path: 원본 이미지 경로
+
+    Returns:
+        (전송할 이미지 바이트, {"original_bytes", "sent_bytes", "saved_bytes", "resized"})
+
+    Raises:
+        PIL.UnidentifiedImageError: 이미지로 읽을 수 없는 경우
+
+    """
+    config = get_embedding_input_config()
+    start_time = time.perf_counter()
+    original_bytes = os.path.getsize(image_path)
+
+    with open(image_path, "rb") as f:
+        image = open_for_downscale(f, config["MAX_SIDE"])
+        image = downscale(image, config["MAX_SIDE"])
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=config["JPEG_QUALITY"])
+        data = buffer.getvalue()
+
+        resized = len(data) < original_bytes
+        if not resized:
+            f.seek(0)
+            data = f.read()
+
+    seconds = time.perf_counter() - start_time
+    embedding_input_stats.record(original_bytes, len(data), seconds)
+    stats = {
+        "original_bytes": original_bytes,
+        "sent_bytes": len(data),
+        "saved_bytes": original_bytes - len(data),
+        "resized": resized,
+    }
+    logger.debug(
+        f"임베딩 입력 축소: {image_path} {original_bytes} → {len(data)} bytes "
+        f"({seconds * 1000:.1f}ms)"
+    )
+    return data, stats
+
+
+def get_embedding_input_metrics() -> dict:
+    """누적 전송 바이트/절감량 지표를 반환합니다."""
+    return embedding_input_stats.get_metrics()
@@ -1,18 +1,33 @@
+import logging
 import os
+import threading
+import time
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-import vertexai
 from dotenv import load_dotenv
-from vertexai.vision_models import Image, MultiModalEmbeddingModel
 
+from .embedding_backends import (
+    VECTOR_DIMENSION,
+    EmbeddingBackend,
+    get_embedding_backend,
+)
+from .embedding_input import get_embedding_input_config, prepare_embedding_input
 from .logger import log_api_usage, log_performance
 
+try:
+    import vertexai
+    from vertexai.vision_models import Image, MultiModalEmbeddingModel
+except ImportError:  # 로컬/가짜 백엔드만 쓰는 환경
+    vertexai = None
+    Image = MultiModalEmbeddingModel = None
+
 # Gemini API 설정
 EMBEDDING_MODEL = "multimodalembedding@001"
-VECTOR_DIMENSION = 1408
 API_LOCATION = "us-central1"
 
+logger = logging.getLogger(__name__)
+
 
 # 환경 변수 설정
 def _setup_google_credentials() -> None:
@@ -35,6 +50,10 @@ def _setup_google_credentials() -> None:
 
 def _initialize_vertex_ai() -> MultiModalEmbeddingModel:
     """Vertex AI를 초기화하고 모델을 반환합니다."""
+    if vertexai is None:
+        raise ImportError(
+            "vertex 백엔드에는 google-cloud-aiplatform 패키지가 필요합니다."
+        )
     project_id = os.getenv("PROJECT_ID")
     if not project_id:
         raise ValueError("PROJECT_ID 환경 변수가 설정되지 않았습니다.")
@@ -43,9 +62,170 @@ def _initialize_vertex_ai() -> MultiModalEmbeddingModel:
     return MultiModalEmbeddingModel.from_pretrained(EMBEDDING_MODEL)
 
 
+class EmbeddingModelClient:
+    """프로세스 단위로 Vertex AI 임베딩 모델 핸들을 캐시하는 클래스입니다.
+
+    최초 호출 시에만 인증 설정과 모델 로드를 수행하고 이후에는 같은 핸들을
+    재사용합니다. fork 이후 자식 프로세스(Celery prefork 워커 등)에서는
+    부모의 핸들을 버리고 새로 초기화합니다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._model: Optional[MultiModalEmbeddingModel] = None
+        self._pid: Optional[int] = None
+        self.init_count = 0
+        self.init_seconds = 0.0
+        self.reuse_count = 0
+
+    def get_model(self) -> MultiModalEmbeddingModel:
+        """캐시된 모델을 반환하고, 없으면 초기화합니다."""
+        with self._lock:
+            if self._model is not None and self._pid == os.getpid():
+                self.reuse_count += 1
+                return self._model
+
+            start_time = time.perf_counter()
+            _setup_google_credentials()
+            self._model = _initialize_vertex_ai()
+            self._pid = os.getpid()
+            self.init_count += 1
+            self.init_seconds = time.perf_counter() - start_time
+            logger.info(
+                f"Vertex AI embedding model initialized in {self.init_seconds:.2f}s "
+                f"(pid={self._pid})"
+            )
+            return self._model
+
+    def reset(self) -> None:
+        """캐시된 모델과 지표를 초기화합니다."""
+        self._lock = threading.Lock()
+        self._model = None
+        self._pid = None
+        self.init_count = 0
+        self.init_seconds = 0.0
+        self.reuse_count = 0
+
+    def get_metrics(self) -> dict:
+        """초기화 시간과 재사용 횟수 지표를 반환합니다."""
+        return {
+            "initialized": self._model is not None and self._pid == os.getpid(),
+            "pid": self._pid,
+            "init_count": self.init_count,
+            "init_seconds": self.init_seconds,
+            "reuse_count": self.reuse_count,
+        }
+
+
+_embedding_client = EmbeddingModelClient()
+
+# fork 시점에 잠금이 잡혀 있을 수 있으므로 자식 프로세스에서는 상태를 새로 만든다
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_embedding_client.reset)
+
+
+def get_embedding_model() -> MultiModalEmbeddingModel:
+    """프로세스 전역에서 공유되는 임베딩 모델을 반환합니다."""
+    return _embedding_client.get_model()
+
+
+def get_embedding_client_metrics() -> dict:
+    """임베딩 모델 클라이언트 지표를 반환합니다."""
+    return _embedding_client.get_metrics()
+
+
+def reset_embedding_client() -> None:
+    """캐시된 임베딩 모델을 버립니다 (테스트/자격 증명 교체용)."""
+    _embedding_client.reset()
+
+
+def load_embedding_image(image_path: str) -> Image:
+    """임베딩 API에 보낼 이미지를 로드합니다 (가능하면 축소한 JPEG).
+
+    축소에 실패하면 원본 파일을 그대로 사용합니다.
+    """
+    if get_embedding_input_config()["ENABLED"]:
+        try:
+            data, _ = prepare_embedding_input(image_path)
+            return Image(image_bytes=data)
+        except Exception as e:
+            logger.warning(f"임베딩 입력 축소 실패, 원본 사용: {image_path}, 오류: {e}")
+    return Image.load_from_file(image_path)
+
+
+class VertexAIBackend(EmbeddingBackend):
+    """Vertex AI multimodalembedding@001 백엔드입니다 (기본값)."""
+
+    name = EMBEDDING_MODEL
+
+    def warm_up(self) -> None:
+        get_embedding_model()
+
+    def embed_image(self, image_path: str) -> Optional[List[float]]:
+        try:
+            # 파일 존재 확인
+            if not os.path.exists(image_path):
+                raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_path}")
+
+            # 프로세스에 캐시된 모델 사용 (최초 1회만 인증/초기화)
+            model = get_embedding_model()
+
+            # 이미지 로드 (모델 입력 크기로 축소해 전송량 절감)
+            image = load_embedding_image(image_path)
+
+            # 임베딩 생성
+            embeddings = model.get_embeddings(
+                image=image,
+                dimension=VECTOR_DIMENSION,
+            )
+
+            embedding_vector = (
+                embeddings.image_embedding if embeddings.image_embedding else None
+            )
+
+            if embedding_vector:
+                log_api_usage("Gemini Image Embedding", True)
+                return embedding_vector
+            log_api_usage("Gemini Image Embedding", False, "No embedding generated")
+            return None
+
+        except Exception as e:
+            log_api_usage("Gemini Image Embedding", False, str(e))
+            raise
+
+    def embed_text(self, text: str) -> Optional[List[float]]:
+        try:
+            # 텍스트 검증
+            if not text or not text.strip():
+                raise ValueError("텍스트가 비어있습니다.")
+
+            # 프로세스에 캐시된 모델 사용 (최초 1회만 인증/초기화)
+            model = get_embedding_model()
+
+            # 임베딩 생성
+            embeddings = model.get_embeddings(
+                contextual_text=text.strip(),
+                dimension=VECTOR_DIMENSION,
+            )
+
+            embedding_vector = (
+                embeddings.text_embedding if embeddings.text_embedding else None
+            )
+
+            if embedding_vector:
+                log_api_usage("Gemini Text Embedding", True)
+                return embedding_vector
+            log_api_usage("Gemini Text Embedding", False, "No embedding generated")
+            return None
+
+        except Exception as e:
+            log_api_usage("Gemini Text Embedding", False, str(e))
+            raise
+
+
 @log_performance
 def get_image_embedding(image_path: str) -> Tuple[str, Optional[List[float]]]:
-    """Gemini API의 multimodalembedding@001 모델을 사용해 이미지 임베딩 벡터를 생성합니다.
+    """설정된 임베딩 백엔드로 이미지 임베딩 벡터를 생성합니다.
 
     Args:
         image_path: 임베딩할 이미지 파일 경로
@@ -59,44 +239,26 @@ def get_image_embedding(image_path: str) -> Tuple[str, Optional[List[float]]]:
         Exception: API 호출 실패
 
     """
-    try:
-        # 파일 존재 확인
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_path}")
-
-        # Google Cloud 인증 설정
-        _setup_google_credentials()
+    backend = get_embedding_backend()
+    return backend.name, backend.embed_image(image_path)
 
-        # Vertex AI 초기화
-        model = _initialize_vertex_ai()
 
-        # 이미지 로드
-        image = Image.load_from_file(image_path)
+def get_image_embeddings(
+    image_paths: List[str],
+) -> Tuple[str, List[Optional[List[float]]]]:
+    """여러 이미지의 임베딩을 한 번에 생성합니다 (배치 추론 지원 백엔드용).
 
-        # 임베딩 생성
-        embeddings = model.get_embeddings(
-            image=image,
-            dimension=VECTOR_DIMENSION,
-        )
-
-        embedding_vector = (
-            embeddings.image_embedding if embeddings.image_embedding else None
-        )
-
-        if embedding_vector:
-            log_api_usage("Gemini Image Embedding", True)
-            return EMBEDDING_MODEL, embedding_vector
-        log_api_usage("Gemini Image Embedding", False, "No embedding generated")
-        return EMBEDDING_MODEL, None
+    Returns:
+        (embedding_model, 이미지 순서대로의 벡터 목록)
 
-    except Exception as e:
-        log_api_usage("Gemini Image Embedding", False, str(e))
-        raise
+    """
+    backend = get_embedding_backend()
+    return backend.name, backend.embed_images(image_paths)
 
 
 @log_performance
 def get_text_embedding(text: str) -> Tuple[str, Optional[List[float]]]:
-    """Gemini API의 multimodalembedding@001 모델을 사용해 텍스트 임베딩 벡터를 생성합니다.
+    """설정된 임베딩 백엔드로 텍스트 임베딩 벡터를 생성합니다.
 
     Args:
         text: 임베딩할 텍스트 (영어만 지원)
@@ -109,36 +271,8 @@ def get_text_embedding(text: str) -> Tuple[str, Optional[List[float]]]:
         Exception: API 호출 실패
 
     """
-    try:
-        # 텍스트 검증
-        if not text or not text.strip():
-            raise ValueError("텍스트가 비어있습니다.")
-
-        # Google Cloud 인증 설정
-        _setup_google_credentials()
-
-        # Vertex AI 초기화
-        model = _initialize_vertex_ai()
-
-        # 임베딩 생성
-        embeddings = model.get_embeddings(
-            contextual_text=text.strip(),
-            dimension=VECTOR_DIMENSION,
-        )
-
-        embedding_vector = (
-            embeddings.text_embedding if embeddings.text_embedding else None
-        )
-
-        if embedding_vector:
-            log_api_usage("Gemini Text Embedding", True)
-            return EMBEDDING_MODEL, embedding_vector
-        log_api_usage("Gemini Text Embedding", False, "No embedding generated")
-        return EMBEDDING_MODEL, None
-
-    except Exception as e:
-        log_api_usage("Gemini Text Embedding", False, str(e))
-        raise
+    backend = get_embedding_backend()
+    return backend.name, backend.embed_text(text)
 
 
 def generate_embedding_vector(image_path: str) -> Optional[List[float]]:
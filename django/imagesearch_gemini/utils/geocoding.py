@@ -0,0 +1,167 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+
+from ..models import GeoPlace
+
+logger = logging.getLogger(__name__)
+
+EMPTY_TABLE_MESSAGE = (
+    "GeoPlace 테이블이 비어 있어 GPS 좌표의 도시명(city_from_gps)을 찾을 수 없습니다. "
+    "python manage.py load_geonames <cities1000.zip>으로 지명 데이터를 적재하세요."
+)
+
+DEFAULT_REVERSE_GEOCODER = {
+    "MAX_DISTANCE_KM": 50.0,
+    "GRID_PRECISION": 2,
+    "MEMO_SIZE": 10000,
+}
+
+# (경도, 위도) 좌표 목록을 받아 각 좌표의 최근접 지명을 한 번에 조회
+NEAREST_PLACE_SQL = """
+SELECT q.idx, p.name, p.name_ko
+FROM unnest(%s::float8[], %s::float8[]) WITH ORDINALITY AS q(lon, lat, idx)
+CROSS JOIN LATERAL (
+    SELECT g.name, g.name_ko
+    FROM {table} g
+    WHERE ST_DWithin(
+        g.location, ST_SetSRID(ST_MakePoint(q.lon, q.lat), 4326)::geography, %s
+    )
+    ORDER BY g.location <-> ST_SetSRID(ST_MakePoint(q.lon, q.lat), 4326)::geography
+    LIMIT 1
+) p
+"""
+
+
+def _get_config() -> dict:
+    config = dict(DEFAULT_REVERSE_GEOCODER)
+    config.update(getattr(settings, "REVERSE_GEOCODER", {}) or {})
+    return config
+
+
+class ReverseGeocoder:
+    """네트워크 호출 없이 GeoPlace 테이블로 GPS 좌표의 도시명을 찾는 클래스입니다.
+
+    좌표는 GRID_PRECISION 자릿수로 반올림한 격자 단위로 메모해 같은 장소에서
+    찍은 사진들은 DB를 다시 조회하지 않습니다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._memo: "OrderedDict[Tuple[float, float], Optional[str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._empty_warned = False
+
+    def lookup(self, lon: float, lat: float) -> Optional[str]:
+        """단일 좌표의 도시명을 반환합니다."""
+        return self.lookup_many([(lon, lat)])[0]
+
+    def lookup_many(
+        self, points: Iterable[Optional[Tuple[float, float]]]
+    ) -> List[Optional[str]]:
+        """여러 좌표의 도시명을 한 번의 쿼리로 조회합니다.
+
+        Args:
+            points: [(경도, 위도) 또는 None, ...]
+
+        Returns:
+            입력 순서와 같은 도시명 목록 (찾지 못하면 None)
+
+        """
+        config = _get_config()
+        precision = config["GRID_PRECISION"]
+        keys = [
+            (round(point[0], precision), round(point[1], precision)) if point else None
+            for point in points
+        ]
+
+        results = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                if key is None or key in results:
+                    continue
+                if key in self._memo:
+                    self._memo.move_to_end(key)
+                    results[key] = self._memo[key]
+                    self.hits += 1
+                elif key not in missing:
+                    missing.append(key)
+                    self.misses += 1
+
+        if missing:
+            memoize = True
+            try:
+                found = self._query_nearest(missing, config["MAX_DISTANCE_KM"])
+            except Exception as e:
+                # 지명 테이블이 없거나 조회 실패 시 도시명 없이 진행하고,
+                # 일시적인 오류일 수 있으므로 메모하지 않고 다음에 다시 조회
+                logger.warning(f"역지오코딩 실패: {e}")
+                found = {}
+                memoize = False
+            if not found and self._table_is_empty():
+                # load_geonames 적재 후에는 바로 도시명을 찾도록 메모하지 않음
+                memoize = False
+            with self._lock:
+                for key in missing:
+                    results[key] = found.get(key)
+                    if memoize:
+                        self._memo[key] = results[key]
+                while len(self._memo) > config["MEMO_SIZE"]:
+                    self._memo.popitem(last=False)
+
+        return [results.get(key) if key else None for key in keys]
+
+    def _table_is_empty(self) -> bool:
+        """지명 테이블이 비었는지 (확인할 수 없으면 True) 반환합니다.
+
+        비어 있으면 프로세스당 한 번 경고를 남깁니다.
+        """
+        try:
+            empty = not GeoPlace.objects.exists()
+        except Exception:
+            return True
+        if empty and not self._empty_warned:
+            self._empty_warned = True
+            logger.warning(EMPTY_TABLE_MESSAGE)
+        return empty
+
+    @staticmethod
+    def _query_nearest(keys, max_distance_km) -> dict:
+        sql = NEAREST_PLACE_SQL.format(
+            table=connection.ops.quote_name(GeoPlace._meta.db_table)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql,
+                [
+                    [key[0] for key in keys],
+                    [key[1] for key in keys],
+                    max_distance_km * 1000,
+                ],
+            )
+            rows = cursor.fetchall()
+        return {keys[idx - 1]: name_ko or name for idx, name, name_ko in rows}
+
+    def clear(self) -> None:
+        """메모 캐시와 지표를 초기화합니다."""
+        with self._lock:
+            self._memo.clear()
+            self.hits = 0
+            self.misses = 0
+            self._empty_warned = False
+
+
+reverse_geocoder = ReverseGeocoder()
+
+
+def reverse_geocode_many(
+    points: Iterable[Optional[Tuple[float, float]]],
+) -> List[Optional[str]]:
+    """여러 GPS 좌표의 도시명을 한 번에 반환합니다."""
+    return reverse_geocoder.lookup_many(points)
@@ -1,18 +1,27 @@
+import hashlib
 import logging
 import os
 
 import pytz
-from geopy.geocoders import Nominatim
 from imagesearch_gemini.models import ImageEmbedding
 from PIL import Image as PilImage
 from PIL.ExifTags import GPSTAGS, TAGS
-from timezonefinder import TimezoneFinder
 
+from django.conf import settings
 from django.contrib.gis.geos import Point
 from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Exists, Subquery
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
+from .embedding_backends import get_embedding_backend
+from .geocoding import reverse_geocode_many
+from .renditions import generate_renditions
+from .result_cache import bump_corpus_generation
+from .timezones import resolve_timezones
+from .vector_storage import compact_columns_enabled, quantize_embeddings
+
 logger = logging.getLogger(__name__)
 
 # ...existing code...
@@ -123,113 +132,371 @@ def extract_exif_metadata_for_db(image_path):
     return gps_point, date_taken, image_unique_id, exif_dict
 
 
-def process_image(
-    image_path,
-    date_taken_user=None,
-    user_location=None,
-    tag_list=None,
-):
-    """임시 파일 경로를 받아 DB에 ImageEmbedding 객체만 생성하는 함수 (임베딩은 Celery에서 처리)
+HASH_CHUNK_SIZE = 1024 * 1024
+DHASH_SIZE = 8  # 8x8 = 64bit
+# 켜진 비트 수가 이 범위 밖인 dHash는 단색/완만한 그라데이션 이미지라 서로 다른
+# 사진도 같은 값이 나오므로 (예: 흰 배경, 하늘 → 0000000000000000) 재사용하지 않음
+DHASH_MIN_BITS = 9
+DHASH_MAX_BITS = 55
+# 유사 중복으로 볼 가로세로 비율 차이 상한 (리사이즈 반올림 오차 허용)
+NEAR_DUPLICATE_ASPECT_TOLERANCE = 0.01
 
-    Args:
-        image_path: 임시 파일 경로 (필수)
-        date_taken_user: 사용자가 입력한 촬영 날짜
-        user_location: 사용자가 입력한 위치
-        tag_list: 태그 리스트
 
-    Returns:
-        ImageEmbedding 객체 또는 "not_allowed" 또는 None
+def compute_file_sha256(image_path):
+    """파일 내용을 청크 단위로 읽어 SHA-256 hex 문자열을 반환합니다."""
+    hasher = hashlib.sha256()
+    with open(image_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def compute_dhash(image_path, hash_size=DHASH_SIZE):
+    """이미지의 지각 해시(dHash)를 hex 문자열로 반환합니다.
 
+    재압축/리사이즈된 같은 사진은 동일한 값이 나오므로 유사 중복 판별에 사용합니다.
+    이미지를 열 수 없으면 None을 반환합니다.
     """
-    file_name = os.path.basename(image_path)
+    try:
+        with PilImage.open(image_path) as img:
+            # JPEG는 디코딩 단계에서 축소해 전체 해상도 디코딩을 피함
+            img.draft("L", (hash_size * 8, hash_size * 8))
+            small = img.convert("L").resize(
+                (hash_size + 1, hash_size), PilImage.Resampling.BILINEAR
+            )
+            pixels = list(small.getdata())
+    except Exception:
+        return None
+
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return f"{bits:0{hash_size * hash_size // 4}x}"
+
+
+def read_image_size(image_path):
+    """이미지의 (가로, 세로) 픽셀 크기를 반환합니다 (헤더만 읽음, 실패 시 None)."""
+    try:
+        with PilImage.open(image_path) as img:
+            return img.size
+    except Exception:
+        return None
 
-    # 파일 확장자 확인
-    if not is_allowed_image_file(file_name):
-        return "not_allowed"
 
+def is_distinctive_dhash(perceptual_hash):
+    """유사 중복 판별에 쓸 수 있을 만큼 정보가 있는 dHash인지 반환합니다."""
     try:
-        # EXIF 정보 추출
-        gps_point, date_taken_exif, image_unique_id, exif_json = (
-            extract_exif_metadata_for_db(image_path)
+        bits = bin(int(perceptual_hash, 16)).count("1")
+    except (TypeError, ValueError):
+        return False
+    return DHASH_MIN_BITS <= bits <= DHASH_MAX_BITS
+
+
+def _same_aspect_ratio(size, other_size):
+    width, height = size
+    other_width, other_height = other_size
+    if not (width and height and other_width and other_height):
+        return False
+    ratio = width / height
+    other_ratio = other_width / other_height
+    return abs(ratio - other_ratio) <= NEAR_DUPLICATE_ASPECT_TOLERANCE * other_ratio
+
+
+def split_duplicate_uploads(items):
+    """업로드 묶음에서 이미 등록된/묶음 내 중복 파일을 걸러냅니다.
+
+    한 번의 쿼리로 묶음 전체의 SHA-256을 확인하고, 중복 파일의 임시 파일은
+    저장소에 올리기 전에 삭제합니다.
+
+    Args:
+        items: [(임시 파일 경로, content_sha256), ...]
+
+    Returns:
+        (새 파일 목록 [(경로, sha256), ...], 중복으로 건너뛴 수)
+
+    """
+    hashes = {sha for _, sha in items if sha}
+    existing = set(
+        ImageEmbedding.objects.filter(content_sha256__in=hashes).values_list(
+            "content_sha256", flat=True
         )
+    )
+
+    new_items = []
+    duplicate_count = 0
+    for tmp_path, sha in items:
+        if sha and sha in existing:
+            duplicate_count += 1
+            _remove_temp_file(tmp_path)
+            continue
+        if sha:
+            existing.add(sha)  # 같은 묶음 안의 중복도 제외
+        new_items.append((tmp_path, sha))
+    return new_items, duplicate_count
+
+
+def _remove_temp_file(image_path):
+    if image_path and os.path.exists(image_path):
+        try:
+            os.remove(image_path)
+        except Exception:
+            pass
 
-        # GPS 기반 도시명 추출
-        city_from_gps = None
-        if gps_point:
-            try:
-                geolocator = Nominatim(user_agent="imagesearch")
-                location = geolocator.reverse(
-                    (gps_point[1], gps_point[0]), language="ko"
-                )
-                if location and location.raw.get("address"):
-                    city_from_gps = (
-                        location.raw["address"].get("city")
-                        or location.raw["address"].get("town")
-                        or location.raw["address"].get("village")
-                        or location.raw["address"].get("state")
-                    )
-            except Exception:
-                city_from_gps = None
 
-        # 중복 이미지 확인
-        if (
-            image_unique_id
-            and ImageEmbedding.objects.filter(image_unique_id=image_unique_id).exists()
-        ):
-            return None
+def _reuse_near_duplicate_embedding(image_embedding):
+    """지각 해시와 가로세로 비율이 같은 기존 이미지의 임베딩을 DB 안에서 복사합니다.
 
-        # GPS Point 생성
-        point = Point(gps_point[0], gps_point[1]) if gps_point else None
+    정보가 적은 해시(단색/그라데이션)는 무관한 사진끼리도 같으므로 건너뛰고,
+    현재 임베딩 백엔드로 만든 벡터만 복사합니다.
 
-        # EXIF 날짜 파싱
-        date_taken_exif_parsed = None
-        if date_taken_exif:
-            try:
-                date_taken_exif_parsed = parse_datetime(
-                    date_taken_exif.replace(":", "-", 2).replace(" ", "T")
-                )
-                if date_taken_exif_parsed is not None and timezone.is_naive(
-                    date_taken_exif_parsed
-                ):
-                    tz = pytz.timezone("Asia/Seoul")
-                    if gps_point:
-                        tf = TimezoneFinder()
-                        tzname = tf.timezone_at(lng=gps_point[0], lat=gps_point[1])
-                        if tzname:
-                            try:
-                                tz = pytz.timezone(tzname)
-                            except Exception:
-                                pass
-                    date_taken_exif_parsed = tz.localize(date_taken_exif_parsed)
-            except Exception:
-                date_taken_exif_parsed = None
-
-        # ImageEmbedding 객체 생성 (임베딩 없이)
-        saved_path = default_storage.save(f"images/{file_name}", open(image_path, "rb"))
-        image_embedding = ImageEmbedding.objects.create(
-            image_path=saved_path,
-            embedding=None,
-            embedding_model=None,
-            gps=point,
-            city_from_gps=city_from_gps,
-            date_taken_exif=date_taken_exif_parsed,
-            date_taken_user=date_taken_user,
-            location_user=user_location,
-            image_unique_id=image_unique_id,
-            exif_json=exif_json,
-            embedding_status="pending",
+    Returns:
+        재사용 여부
+
+    """
+    if not is_distinctive_dhash(image_embedding.perceptual_hash):
+        return False
+    size = (image_embedding.image_width, image_embedding.image_height)
+    candidates = (
+        ImageEmbedding.objects.filter(
+            perceptual_hash=image_embedding.perceptual_hash,
+            embedding_model=get_embedding_backend().name,
+            embedding_status="done",
         )
+        .exclude(pk=image_embedding.pk)
+        .order_by("id")
+        .values_list("id", "image_width", "image_height")
+    )
+    source_id = next(
+        (
+            pk
+            for pk, width, height in candidates
+            if _same_aspect_ratio(size, (width, height))
+        ),
+        None,
+    )
+    if source_id is None:
+        return False
+
+    source = ImageEmbedding.objects.filter(pk=source_id, embedding_status="done")
+    # 복사와 압축 컬럼 갱신을 한 트랜잭션으로 묶어, 검색 결과 캐시 무효화가
+    # 양자화까지 끝난 뒤(커밋 시점)에 일어나도록 함
+    with transaction.atomic():
+        updated = (
+            ImageEmbedding.objects.filter(
+                pk=image_embedding.pk, embedding_status="pending"
+            )
+            .filter(Exists(source))
+            .update(
+                embedding=Subquery(source.values("embedding")[:1]),
+                embedding_model=Subquery(source.values("embedding_model")[:1]),
+                embedding_status="done",
+            )
+        )
+        if updated and compact_columns_enabled():
+            quantize_embeddings(ImageEmbedding.objects.filter(pk=image_embedding.pk))
+        if updated:
+            transaction.on_commit(bump_corpus_generation)
+    return bool(updated)
 
-        # 태그 추가
-        if tag_list:
-            image_embedding.tags.add(*tag_list)
 
-        return image_embedding
+def parse_exif_datetime(date_taken_exif, tzname=None):
+    """EXIF DateTimeOriginal 문자열을 타임존이 있는 datetime으로 변환합니다.
 
-    finally:
-        # 임시 파일 정리
-        if image_path and os.path.exists(image_path):
+    Args:
+        date_taken_exif: "YYYY:MM:DD HH:MM:SS" 형식 문자열
+        tzname: 촬영 위치의 타임존 이름 (resolve_timezones 결과, 없으면 서울)
+
+    Returns:
+        datetime 또는 None
+
+    """
+    if not date_taken_exif:
+        return None
+    try:
+        parsed = parse_datetime(date_taken_exif.replace(":", "-", 2).replace(" ", "T"))
+        if parsed is None or not timezone.is_naive(parsed):
+            return parsed
+        tz = pytz.timezone("Asia/Seoul")
+        if tzname:
             try:
-                os.remove(image_path)
+                tz = pytz.timezone(tzname)
             except Exception:
                 pass
+        return tz.localize(parsed)
+    except Exception:
+        return None
+
+
+def extract_images_metadata(image_paths):
+    """임시 파일들에서 DB 저장에 필요한 메타데이터를 추출합니다.
+
+    EXIF 파싱과 지각 해시 계산은 파일마다 수행하고, 역지오코딩과 촬영일
+    타임존 판별은 묶음 전체의 GPS 좌표로 한 번씩 조회합니다.
+    결과는 Celery 태스크 사이에 전달할 수 있도록 JSON 직렬화 가능한 dict입니다.
+
+    Args:
+        image_paths: 임시 파일 경로 목록
+
+    Returns:
+        입력 순서와 같은 목록. 각 항목은
+        {"gps", "city_from_gps", "date_taken_exif", "image_unique_id",
+         "exif_json", "perceptual_hash", "image_size"} 또는 추출 중 발생한 예외
+
+    """
+    extracted = []
+    for image_path in image_paths:
+        try:
+            # EXIF 정보 추출
+            gps_point, date_taken_exif, image_unique_id, exif_json = (
+                extract_exif_metadata_for_db(image_path)
+            )
+            # 지각 해시 계산 (설정으로 끌 수 있음)
+            perceptual_hash = None
+            if getattr(settings, "IMAGE_PERCEPTUAL_HASH_ENABLED", True):
+                perceptual_hash = compute_dhash(image_path)
+            image_size = read_image_size(image_path)
+        except Exception as e:
+            extracted.append(e)
+            continue
+        extracted.append(
+            (
+                gps_point,
+                date_taken_exif,
+                image_unique_id,
+                exif_json,
+                perceptual_hash,
+                image_size,
+            )
+        )
+
+    # GPS 기반 도시명 (오프라인 지명 테이블, 네트워크 호출 없음)
+    gps_points = [
+        None if isinstance(item, Exception) else item[0] for item in extracted
+    ]
+    cities = reverse_geocode_many(gps_points)
+    # 촬영일 타임존 (촬영일이 있는 좌표만 조회)
+    tznames = resolve_timezones(
+        [
+            None if isinstance(item, Exception) or not item[1] else item[0]
+            for item in extracted
+        ]
+    )
+
+    results = []
+    for item, city_from_gps, tzname in zip(extracted, cities, tznames):
+        if isinstance(item, Exception):
+            results.append(item)
+            continue
+        (
+            gps_point,
+            date_taken_exif,
+            image_unique_id,
+            exif_json,
+            perceptual_hash,
+            image_size,
+        ) = item
+        # EXIF 날짜 파싱 (GPS가 있으면 해당 지역 타임존 기준)
+        date_taken_exif_parsed = parse_exif_datetime(date_taken_exif, tzname)
+        results.append(
+            {
+                "gps": list(gps_point) if gps_point else None,
+                "city_from_gps": city_from_gps,
+                "date_taken_exif": (
+                    date_taken_exif_parsed.isoformat()
+                    if date_taken_exif_parsed
+                    else None
+                ),
+                "image_unique_id": image_unique_id,
+                "exif_json": exif_json,
+                "perceptual_hash": perceptual_hash,
+                "image_size": list(image_size) if image_size else None,
+            }
+        )
+    return results
+
+
+def persist_image(
+    image_path,
+    metadata,
+    date_taken_user=None,
+    user_location=None,
+    tag_list=None,
+    content_sha256=None,
+    source_ref=None,
+):
+    """추출한 메타데이터로 파일을 저장소에 올리고 ImageEmbedding을 생성합니다.
+
+    임시 파일은 삭제하지 않으므로 호출한 쪽에서 정리해야 합니다.
+
+    Args:
+        image_path: 임시 파일 경로
+        metadata: extract_images_metadata 결과 항목
+        date_taken_user: 사용자가 입력한 촬영 날짜
+        user_location: 사용자가 입력한 위치
+        tag_list: 태그 리스트
+        content_sha256: 파일 내용 SHA-256
+        source_ref: 클라우드 원본 식별자 (감시 폴더 수집 시)
+
+    Returns:
+        ImageEmbedding 객체 또는 None (ImageUniqueID 중복)
+
+    """
+    # 중복 이미지 확인
+    image_unique_id = metadata.get("image_unique_id")
+    if (
+        image_unique_id
+        and ImageEmbedding.objects.filter(image_unique_id=image_unique_id).exists()
+    ):
+        return None
+
+    # GPS Point 생성
+    gps_point = metadata.get("gps")
+    point = Point(gps_point[0], gps_point[1]) if gps_point else None
+
+    date_taken_exif = metadata.get("date_taken_exif")
+    perceptual_hash = metadata.get("perceptual_hash")
+    image_width, image_height = metadata.get("image_size") or (None, None)
+
+    # ImageEmbedding 객체 생성 (임베딩 없이)
+    file_name = os.path.basename(image_path)
+    with open(image_path, "rb") as f:
+        saved_path = default_storage.save(f"images/{file_name}", f)
+
+    # 검색 결과/관리자 화면용 썸네일 (실패해도 원본으로 대체 표시)
+    try:
+        renditions = generate_renditions(image_path, content_sha256)
+    except Exception as e:
+        logger.warning(f"렌디션 생성 실패: {image_path}, 오류: {e}")
+        renditions = {}
+
+    image_embedding = ImageEmbedding.objects.create(
+        image_path=saved_path,
+        embedding=None,
+        embedding_model=None,
+        gps=point,
+        city_from_gps=metadata.get("city_from_gps"),
+        date_taken_exif=parse_datetime(date_taken_exif) if date_taken_exif else None,
+        date_taken_user=date_taken_user,
+        location_user=user_location,
+        image_unique_id=image_unique_id,
+        exif_json=metadata.get("exif_json"),
+        content_sha256=content_sha256,
+        perceptual_hash=perceptual_hash,
+        image_width=image_width,
+        image_height=image_height,
+        source_ref=source_ref,
+        renditions=renditions,
+        embedding_status="pending",
+    )
+
+    # 유사 중복 이미지는 기존 임베딩 재사용
+    if perceptual_hash and _reuse_near_duplicate_embedding(image_embedding):
+        image_embedding.refresh_from_db(fields=["embedding_model", "embedding_status"])
+
+    # 태그 추가
+    if tag_list:
+        image_embedding.tags.add(*tag_list)
+
+    return image_embedding
@@ -0,0 +1,130 @@
+import hashlib
+import os
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from ..storage.google_drive import build_google_drive_download, save_google_drive_image
+from ..storage.onedrive import build_onedrive_download, save_onedrive_image
+
+DEFAULT_INGESTION_PIPELINE = {
+    "SPOOL_DIR": None,
+    "RECEIVE_QUEUE": "ingest_receive",
+    "EXTRACT_QUEUE": "ingest_extract",
+    # 추출 태스크 하나가 처리하는 파일 수 (역지오코딩을 묶음 단위로 조회)
+    "EXTRACT_BATCH_SIZE": 32,
+    "PERSIST_QUEUE": "ingest_persist",
+}
+
+
+def get_ingestion_config() -> dict:
+    """settings.INGESTION_PIPELINE과 기본값을 합친 설정을 반환합니다."""
+    config = dict(DEFAULT_INGESTION_PIPELINE)
+    config.update(getattr(settings, "INGESTION_PIPELINE", {}) or {})
+    if not config["SPOOL_DIR"]:
+        config["SPOOL_DIR"] = os.path.join(settings.MEDIA_ROOT, "spool")
+    return config
+
+
+def get_spool_dir() -> str:
+    """웹 서버와 Celery 워커가 함께 쓰는 임시 파일 디렉터리를 반환합니다."""
+    spool_dir = get_ingestion_config()["SPOOL_DIR"]
+    os.makedirs(spool_dir, exist_ok=True)
+    return spool_dir
+
+
+def parse_tag_list(tags: Optional[str]) -> List[str]:
+    """쉼표로 구분된 태그 문자열을 태그 리스트로 변환합니다."""
+    if not tags:
+        return []
+    return [t.strip() for t in tags.split(",") if t.strip()]
+
+
+def normalize_cloud_file_name(file_name: Optional[str], index: int) -> str:
+    """클라우드 이미지 파일명에 허용 확장자가 없으면 .jpg를 붙입니다."""
+    file_name = file_name or f"cloud_image_{index}.jpg"
+    if not any(file_name.lower().endswith(ext) for ext in [".jpg", ".jpeg", ".png"]):
+        file_name += ".jpg"
+    return file_name
+
+
+def download_cloud_image(
+    url: str, file_name: str, options: dict, spool_dir: str
+) -> Tuple[str, str]:
+    """클라우드 이미지를 스풀 디렉터리에 내려받습니다.
+
+    Args:
+        url: Google Drive/OneDrive 이미지 URL
+        file_name: 파일명
+        options: 사용자 입력 메타데이터 {"date_taken_user", "location_user", "tags"}
+        spool_dir: 임시 파일 디렉터리
+
+    Returns:
+        (임시 파일 경로, content_sha256)
+
+    Raises:
+        ValidationError: 지원하지 않는 URL이거나 파일 검증 실패 시
+
+    """
+    if "drive.google.com" in url:
+        save_func = save_google_drive_image
+    elif "1drv.ms" in url or "onedrive.live.com" in url:
+        save_func = save_onedrive_image
+    else:
+        raise ValidationError("지원하지 않는 클라우드 URL입니다.")
+
+    hasher = hashlib.sha256()
+    tmp_path = save_func(
+        image_url=url,
+        file_name=file_name,
+        date_taken_user=options.get("date_taken_user"),
+        location_user=options.get("location_user"),
+        tags=options.get("tags"),
+        hasher=hasher,
+        spool_dir=spool_dir,
+    )
+    return tmp_path, hasher.hexdigest()
+
+
+def download_cloud_file(item: dict, options: dict, spool_dir: str) -> Tuple[str, str]:
+    """파일 ID로 지정된 클라우드 파일을 API(인증 헤더)로 스풀 디렉터리에 내려받습니다.
+
+    감시 폴더 동기화처럼 공유 링크가 없는 항목에 사용합니다.
+
+    Args:
+        item: {"provider", "user_email", "file_id", "name", "drive_id"}
+        options: 사용자 입력 메타데이터 {"date_taken_user", "location_user", "tags"}
+        spool_dir: 임시 파일 디렉터리
+
+    Returns:
+        (임시 파일 경로, content_sha256)
+
+    Raises:
+        ValidationError: 지원하지 않는 프로바이더이거나 파일 검증 실패 시
+
+    """
+    provider = item.get("provider")
+    if provider == "google":
+        url, headers = build_google_drive_download(item["user_email"], item["file_id"])
+        save_func = save_google_drive_image
+    elif provider == "onedrive":
+        url, headers = build_onedrive_download(
+            item["user_email"], item["file_id"], item.get("drive_id")
+        )
+        save_func = save_onedrive_image
+    else:
+        raise ValidationError("지원하지 않는 클라우드 프로바이더입니다.")
+
+    hasher = hashlib.sha256()
+    tmp_path = save_func(
+        image_url=url,
+        file_name=item.get("name"),
+        date_taken_user=options.get("date_taken_user"),
+        location_user=options.get("location_user"),
+        tags=options.get("tags"),
+        hasher=hasher,
+        spool_dir=spool_dir,
+        headers=headers,
+    )
+    return tmp_path, hasher.hexdigest()
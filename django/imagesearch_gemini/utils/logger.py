@@ -54,6 +54,22 @@ def log_search_performance(query: str, duration: float, result_count: int) -> No
     )
 
 
+def log_search_plan(plan: str, planning: float, execution: float) -> None:
+    """벡터 검색 계획과 계획/실행 시간을 로깅합니다."""
+    logger.info(
+        f"Search plan {plan}: planning {planning * 1000:.1f}ms, "
+        f"execution {execution * 1000:.1f}ms"
+    )
+
+
+def log_search_cache(hit: bool, duration: float, hit_ratio: float) -> None:
+    """검색 결과 캐시 적중 여부와 누적 적중률을 로깅합니다."""
+    logger.info(
+        f"Search result cache {'hit' if hit else 'miss'} in {duration * 1000:.1f}ms "
+        f"(hit ratio {hit_ratio:.2%})"
+    )
+
+
 def log_api_usage(api_name: str, success: bool, error: Optional[str] = None) -> None:
     """API 사용량을 로깅합니다."""
     if success:
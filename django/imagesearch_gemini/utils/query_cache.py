@@ -0,0 +1,156 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+import numpy as np
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_EMBEDDING_CACHE = {
+    "LRU_SIZE": 1024,
+    "LRU_TTL": 3600,
+    "CACHE_ALIAS": "default",
+    "CACHE_TTL": 7 * 24 * 3600,
+}
+
+CACHE_KEY_PREFIX = "imagesearch:query_embedding:"
+
+
+def normalize_query_text(query_text: str) -> str:
+    """검색어를 캐시 키로 쓸 수 있도록 정규화합니다.
+
+    대소문자와 연속 공백을 통일하고, 쉼표로 구분된 항목은 정렬합니다.
+    예: "  Sea,CAT   mountain" → "cat mountain, sea"
+    """
+    parts = (" ".join(part.split()) for part in query_text.lower().split(","))
+    return ", ".join(sorted(part for part in parts if part))
+
+
+def encode_embedding(embedding: Sequence[float]) -> bytes:
+    """임베딩을 float32 바이트로 직렬화합니다 (1408차원 기준 5.6KB)."""
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def decode_embedding(data: bytes) -> np.ndarray:
+    """float32 바이트를 임베딩 배열로 복원합니다."""
+    return np.frombuffer(data, dtype=np.float32)
+
+
+def _get_config() -> dict:
+    config = dict(DEFAULT_QUERY_EMBEDDING_CACHE)
+    config.update(getattr(settings, "QUERY_EMBEDDING_CACHE", {}) or {})
+    return config
+
+
+class QueryEmbeddingCache:
+    """검색어 임베딩용 2단계 캐시 클래스입니다.
+
+    1단계는 프로세스 내 LRU(크기/TTL 제한), 2단계는 Django 캐시(Redis)입니다.
+    영구 저장소인 SearchQuery 테이블 조회는 호출하는 쪽에서 담당합니다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()
+        self._stats = {
+            "lru_hits": 0,
+            "cache_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def _cache_key(key: str) -> str:
+        # Redis 키 길이/문자 제한을 피하기 위해 해시 사용
+        return CACHE_KEY_PREFIX + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _shared_cache(self, config: dict):
+        alias = config["CACHE_ALIAS"]
+        return caches[alias] if alias else None
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """정규화된 검색어로 임베딩을 조회합니다."""
+        config = _get_config()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                data, expires_at = entry
+                if expires_at > now:
+                    self._lru.move_to_end(key)
+                    self._stats["lru_hits"] += 1
+                    return decode_embedding(data)
+                del self._lru[key]
+
+        shared_cache = self._shared_cache(config)
+        if shared_cache is not None:
+            try:
+                data = shared_cache.get(self._cache_key(key))
+            except Exception as e:
+                logger.warning(f"검색어 임베딩 캐시 조회 실패: {e}")
+                data = None
+            if data:
+                self._set_lru(key, data, config)
+                with self._lock:
+                    self._stats["cache_hits"] += 1
+                return decode_embedding(data)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, embedding: Sequence[float]) -> None:
+        """임베딩을 LRU와 공유 캐시에 저장합니다."""
+        config = _get_config()
+        data = encode_embedding(embedding)
+        self._set_lru(key, data, config)
+
+        shared_cache = self._shared_cache(config)
+        if shared_cache is not None:
+            try:
+                shared_cache.set(self._cache_key(key), data, config["CACHE_TTL"])
+            except Exception as e:
+                logger.warning(f"검색어 임베딩 캐시 저장 실패: {e}")
+
+    def _set_lru(self, key: str, data: bytes, config: dict) -> None:
+        expires_at = time.monotonic() + config["LRU_TTL"]
+        with self._lock:
+            self._lru[key] = (data, expires_at)
+            self._lru.move_to_end(key)
+            while len(self._lru) > config["LRU_SIZE"]:
+                self._lru.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def record_db_hit(self) -> None:
+        """캐시 미스 후 SearchQuery 테이블에서 찾은 경우를 기록합니다."""
+        with self._lock:
+            self._stats["db_hits"] += 1
+
+    def clear(self) -> None:
+        """프로세스 LRU와 지표를 초기화합니다 (공유 캐시는 유지)."""
+        with self._lock:
+            self._lru.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def get_stats(self) -> dict:
+        """계층별 적중/미스 지표를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["lru_size"] = len(self._lru)
+        lookups = stats["lru_hits"] + stats["cache_hits"] + stats["misses"]
+        stats["hit_ratio"] = (
+            (stats["lru_hits"] + stats["cache_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+
+query_embedding_cache = QueryEmbeddingCache()
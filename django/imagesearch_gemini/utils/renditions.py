@@ -0,0 +1,176 @@
+import hashlib
+import io
+import logging
+import os
+import posixpath
+from typing import BinaryIO, Dict, Optional, Union
+
+from PIL import Image as PilImage
+from PIL import ImageOps, features
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RENDITIONS = {
+    "SIZES": {"thumb": 160, "preview": 640},  # 렌디션명: 긴 변 최대 픽셀
+    "FORMAT": "WEBP",  # WEBP 또는 JPEG (WEBP 미지원 Pillow는 JPEG로 대체)
+    "QUALITY": 80,
+    "DIR": "renditions",  # MEDIA_ROOT 아래 저장 경로
+    "CACHE_MAX_AGE": 365 * 24 * 3600,  # 내용 주소 파일명이므로 길게 캐시
+    # nginx internal location 경로 (예: "/protected/renditions/")
+    # 설정하면 뷰는 캐시 헤더와 X-Accel-Redirect만 반환하고 파일은 nginx가 전송
+    "X_ACCEL_REDIRECT": None,
+}
+
+FORMAT_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+# 최종 LANCZOS 리샘플 전에 남겨 둘 배율 (reduce()로 이만큼까지만 줄임)
+REDUCE_GAP = 2
+
+
+def get_rendition_config() -> dict:
+    """settings.RENDITIONS와 기본값을 합친 설정을 반환합니다."""
+    config = dict(DEFAULT_RENDITIONS)
+    config.update(getattr(settings, "RENDITIONS", {}) or {})
+    if config["FORMAT"] == "WEBP" and not features.check("webp"):
+        config["FORMAT"] = "JPEG"
+    return config
+
+
+def rendition_name(content_sha256: str, name: str, size: int, config: dict) -> str:
+    """내용 해시와 크기/형식으로 렌디션 저장 경로를 만듭니다 (같은 내용이면 같은 이름)."""
+    ext = FORMAT_EXTENSIONS[config["FORMAT"]]
+    return f"{config['DIR']}/{content_sha256[:2]}/{content_sha256}-{name}-{size}.{ext}"
+
+
+def rendition_url(path: str) -> str:
+    """렌디션 저장 경로를 서빙 URL로 변환합니다.
+
+    DEBUG 또는 X_ACCEL_REDIRECT 설정 시에는 장기 캐시 헤더를 붙이는 rendition
+    뷰를, 그 외 운영 환경에서는 저장소 URL(웹 서버/CDN이 직접 서빙)을 사용합니다.
+    """
+    config = get_rendition_config()
+    if not (settings.DEBUG or config["X_ACCEL_REDIRECT"]):
+        return default_storage.url(path)
+    prefix = f"{config['DIR']}/"
+    return reverse("rendition", args=[path[len(prefix) :]])
+
+
+def rendition_accel_redirect(path: str) -> Optional[str]:
+    """렌디션 상대 경로의 X-Accel-Redirect 값을 반환합니다.
+
+    Returns:
+        nginx internal location 경로 (설정이 없거나 경로가 렌디션 디렉터리를
+        벗어나면 None)
+
+    """
+    location = get_rendition_config()["X_ACCEL_REDIRECT"]
+    normalized = posixpath.normpath(path)
+    if not location or normalized.startswith(("/", "..")):
+        return None
+    return f"{location.rstrip('/')}/{normalized}"
+
+
+def downscale(image: PilImage.Image, max_side: int) -> PilImage.Image:
+    """긴 변이 max_side 이하가 되도록 줄입니다.
+
+    정수 배율 reduce()로 대부분을 빠르게 줄인 뒤, 남은 배율만 LANCZOS로 리샘플합니다.
+    """
+    factor = max(image.size) // (max_side * REDUCE_GAP)
+    if factor > 1:
+        image = image.reduce(factor)
+    if max(image.size) > max_side:
+        image = image.copy()
+        image.thumbnail((max_side, max_side), PilImage.Resampling.LANCZOS)
+    return image
+
+
+def open_for_downscale(source, max_side: int) -> PilImage.Image:
+    """max_side 이상 크기로만 디코딩하고 EXIF 방향을 적용해 이미지를 엽니다."""
+    image = PilImage.open(source)
+    if image.format == "JPEG":
+        # JPEG는 DCT 단계에서 1/2~1/8로 디코딩 (전체 해상도 디코딩 생략)
+        image.draft("RGB", (max_side, max_side))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    return image
+
+
+def _encode(image: PilImage.Image, config: dict) -> bytes:
+    if config["FORMAT"] == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format=config["FORMAT"], quality=config["QUALITY"])
+    return buffer.getvalue()
+
+
+def _sha256_of(source: Union[str, BinaryIO]) -> str:
+    hasher = hashlib.sha256()
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+    else:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            hasher.update(chunk)
+        source.seek(0)
+    return hasher.hexdigest()
+
+
+def generate_renditions(
+    source: Union[str, BinaryIO], content_sha256: Optional[str] = None
+) -> Dict[str, str]:
+    """원본 이미지에서 설정된 크기의 렌디션을 만들어 저장소에 저장합니다.
+
+    원본은 가장 큰 렌디션 크기로 한 번만 디코딩하고, 작은 렌디션은 앞서 만든
+    렌디션에서 이어서 줄입니다. 이미 저장된 렌디션은 다시 만들지 않습니다.
+
+    Args:
+        source: 원본 파일 경로 또는 파일 객체
+        content_sha256: 원본 SHA-256 (없으면 계산)
+
+    Returns:
+        {렌디션명: 저장 경로}
+
+    """
+    config = get_rendition_config()
+    content_sha256 = content_sha256 or _sha256_of(source)
+    sizes = sorted(config["SIZES"].items(), key=lambda item: item[1], reverse=True)
+    targets = {
+        name: rendition_name(content_sha256, name, size, config) for name, size in sizes
+    }
+    missing = [
+        (name, size)
+        for name, size in sizes
+        if not default_storage.exists(targets[name])
+    ]
+    if not missing:
+        return targets
+
+    image = open_for_downscale(source, missing[0][1])
+    for name, size in missing:
+        image = downscale(image, size)
+        data = _encode(image, config)
+        saved = default_storage.save(targets[name], ContentFile(data))
+        if saved != targets[name]:
+            # 동시에 같은 렌디션을 만든 경우 먼저 저장된 파일을 사용
+            default_storage.delete(saved)
+    return targets
+
+
+def delete_renditions(renditions: Optional[Dict[str, str]]) -> None:
+    """렌디션 파일을 삭제합니다."""
+    for path in (renditions or {}).values():
+        try:
+            default_storage.delete(path)
+        except Exception as e:
+            logger.warning(f"렌디션 삭제 실패: {path}, 오류: {e}")
+
+
+def get_rendition_root() -> str:
+    """렌디션이 저장되는 로컬 디렉터리를 반환합니다."""
+    return os.path.join(settings.MEDIA_ROOT, get_rendition_config()["DIR"])
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple, Union
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .logger import log_search_cache
+from .query_cache import normalize_query_text
+from .search_filters import split_tags
+from .vector_index import get_metric
+from .vector_storage import get_vector_storage_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_RESULT_CACHE = {
+    "ENABLED": True,
+    "CACHE_ALIAS": "default",
+    # 세대 번호로 무효화되므로 TTL은 태그/장소 수정 등 세대 밖 변경의 상한
+    "CACHE_TTL": 600,
+}
+
+CACHE_KEY_PREFIX = "imagesearch:search_results:"
+# 검색 대상 코퍼스의 세대 번호 (임베딩 완료/행 삭제 시 증가)
+GENERATION_KEY = "imagesearch:search_results:generation"
+
+
+def get_search_result_cache_config() -> dict:
+    """settings.SEARCH_RESULT_CACHE와 기본값을 합친 설정을 반환합니다."""
+    config = dict(DEFAULT_SEARCH_RESULT_CACHE)
+    config.update(getattr(settings, "SEARCH_RESULT_CACHE", {}) or {})
+    return config
+
+
+def _shared_cache(config: dict):
+    alias = config["CACHE_ALIAS"]
+    return caches[alias] if alias else None
+
+
+def get_corpus_generation() -> Optional[int]:
+    """현재 코퍼스 세대 번호를 반환합니다 (캐시를 쓸 수 없으면 None)."""
+    shared_cache = _shared_cache(get_search_result_cache_config())
+    if shared_cache is None:
+        return None
+    try:
+        generation = shared_cache.get(GENERATION_KEY)
+        if generation is None:
+            # 키가 만료/축출된 경우 이전 값과 겹치지 않도록 현재 시각으로 시작
+            shared_cache.add(GENERATION_KEY, int(time.time() * 1000), None)
+            generation = shared_cache.get(GENERATION_KEY)
+        return generation
+    except Exception as e:
+        logger.warning(f"검색 결과 캐시 세대 조회 실패: {e}")
+        return None
+
+
+def ranking_signature() -> list:
+    """결과 순위에 영향을 주는 벡터 설정 (거리 척도, 저장 모드)을 반환합니다.
+
+    설정을 바꾸면 세대가 같아도 다른 캐시 키/ETag가 되도록 키에 포함합니다.
+    """
+    return [get_metric(), get_vector_storage_config()["MODE"]]
+
+
+def bump_corpus_generation() -> None:
+    """코퍼스 세대 번호를 올려 기존 검색 결과 캐시를 모두 무효화합니다.
+
+    이전 세대의 키는 더 이상 조회되지 않고 TTL이 지나면 사라집니다.
+    """
+    shared_cache = _shared_cache(get_search_result_cache_config())
+    if shared_cache is None:
+        return
+    try:
+        shared_cache.incr(GENERATION_KEY)
+    except ValueError:
+        # 키가 없으면 새 세대로 시작
+        shared_cache.add(GENERATION_KEY, int(time.time() * 1000), None)
+    except Exception as e:
+        logger.warning(f"검색 결과 캐시 세대 갱신 실패: {e}")
+
+
+class SearchResultCache:
+    """검색 결과(정렬된 ID와 거리)를 코퍼스 세대별로 캐시합니다.
+
+    결과 행 자체는 저장하지 않으므로, 적중 시 in_bulk 한 번으로 행을 읽습니다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "hit_seconds": 0.0,
+            "miss_seconds": 0.0,
+        }
+
+    @staticmethod
+    def make_key(
+        generation: int,
+        embedding_model: str,
+        query_text: str,
+        tags: Optional[str] = None,
+        location: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> str:
+        """정규화된 검색어/필터/결과 수와 벡터 설정으로 캐시 키를 만듭니다."""
+        parts = [
+            embedding_model,
+            ranking_signature(),
+            normalize_query_text(query_text),
+            sorted(tag.lower() for tag in split_tags(tags)),
+            (location or "").strip().lower(),
+            (date_from or "").strip(),
+            (date_to or "").strip(),
+            limit,
+            ef_search,
+            probes,
+        ]
+        # Redis 키 길이/문자 제한을 피하기 위해 해시 사용
+        digest = hashlib.sha1(
+            json.dumps(parts, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        return f"{CACHE_KEY_PREFIX}{generation}:{digest}"
+
+    def get(self, key: str) -> Optional[Union[List[Tuple[int, float]], dict]]:
+        """set()으로 저장한 값을 반환합니다 (없으면 None)."""
+        shared_cache = _shared_cache(get_search_result_cache_config())
+        if shared_cache is None:
+            return None
+        try:
+            return shared_cache.get(key)
+        except Exception as e:
+            logger.warning(f"검색 결과 캐시 조회 실패: {e}")
+            return None
+
+    def set(self, key: str, entries: Union[Sequence[Tuple[int, float]], dict]) -> None:
+        """정렬된 (id, distance) 목록 (또는 목록을 담은 구간 정보)을 저장합니다."""
+        config = get_search_result_cache_config()
+        shared_cache = _shared_cache(config)
+        if shared_cache is None:
+            return
+        try:
+            if not isinstance(entries, dict):
+                entries = list(entries)
+            shared_cache.set(key, entries, config["CACHE_TTL"])
+        except Exception as e:
+            logger.warning(f"검색 결과 캐시 저장 실패: {e}")
+            return
+        with self._lock:
+            self._stats["stores"] += 1
+
+    def record(self, hit: bool, duration: float) -> None:
+        """캐시 적중 여부와 검색 소요 시간을 기록합니다."""
+        with self._lock:
+            if hit:
+                self._stats["hits"] += 1
+                self._stats["hit_seconds"] += duration
+            else:
+                self._stats["misses"] += 1
+                self._stats["miss_seconds"] += duration
+        log_search_cache(hit, duration, self.get_stats()["hit_ratio"])
+
+    def clear(self) -> None:
+        """지표를 초기화합니다 (공유 캐시는 유지)."""
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def get_stats(self) -> dict:
+        """적중률과 적중/미스별 평균 지연 시간(ms)을 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+        hits, misses = stats["hits"], stats["misses"]
+        lookups = hits + misses
+        stats["hit_ratio"] = hits / lookups if lookups else 0.0
+        stats["avg_hit_ms"] = stats["hit_seconds"] / hits * 1000 if hits else 0.0
+        stats["avg_miss_ms"] = stats["miss_seconds"] / misses * 1000 if misses else 0.0
+        return stats
+
+
+search_result_cache = SearchResultCache()
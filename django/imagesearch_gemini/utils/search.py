@@ -1,11 +1,37 @@
 import time
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 
-from django.db.models import QuerySet
+import numpy as np
+
+from django.db.models import Exists, Q, QuerySet, Subquery
 
 from ..models import ImageEmbedding, SearchQuery
+from .embedding_backends import get_embedding_backend
 from .embeddings import get_text_embedding
-from .logger import log_search_performance
+from .logger import log_search_performance, log_search_plan
+from .query_cache import normalize_query_text, query_embedding_cache
+from .result_cache import (
+    get_corpus_generation,
+    get_search_result_cache_config,
+    search_result_cache,
+)
+from .search_filters import apply_search_filters, split_tags
+from .search_planner import (
+    PLAN_ANN,
+    PLAN_EXACT,
+    SearchPlan,
+    count_filtered_rows,
+    get_search_planner_config,
+    plan_vector_search,
+)
+from .vector_index import (
+    HNSW_MAX_EF_SEARCH,
+    get_vector_index_config,
+    supports_iterative_scan,
+    vector_distance,
+    vector_search_session,
+)
+from .vector_storage import prepare_embedding
 
 
 class VectorSearchEngine:
@@ -24,7 +50,9 @@ class VectorSearchEngine:
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
         limit: int = DEFAULT_LIMIT,
-    ) -> Tuple[QuerySet, Optional[str]]:
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> Tuple[Union[QuerySet, List[ImageEmbedding]], Optional[str]]:
         """이미지를 검색합니다.
 
         Args:
@@ -34,13 +62,40 @@ class VectorSearchEngine:
             date_from: 시작 날짜 (YYYY-MM-DD)
             date_to: 종료 날짜 (YYYY-MM-DD)
             limit: 결과 제한 수
+            ef_search: HNSW 검색 후보 수 (None이면 settings 값)
+            probes: IVFFlat 탐색 리스트 수 (None이면 settings 값)
 
         Returns:
-            (검색 결과 QuerySet, 오류 메시지)
+            (검색 결과 QuerySet 또는 결과 캐시 적중 시 목록, 오류 메시지)
 
         """
         start_time = time.time()
 
+        # 같은 세대(임베딩 추가/삭제 없음)의 같은 검색이면 캐시된 ID 순서를 사용
+        cache_key = None
+        if query_text and get_search_result_cache_config()["ENABLED"]:
+            generation = get_corpus_generation()
+            if generation is not None:
+                cache_key = search_result_cache.make_key(
+                    generation,
+                    get_embedding_backend().name,
+                    query_text,
+                    tags,
+                    location,
+                    date_from,
+                    date_to,
+                    limit,
+                    ef_search,
+                    probes,
+                )
+                cached = search_result_cache.get(cache_key)
+                if cached is not None:
+                    results = cls._hydrate_results(cached)
+                    duration = time.time() - start_time
+                    search_result_cache.record(True, duration)
+                    log_search_performance(query_text, duration, len(results))
+                    return results, None
+
         # 기본 쿼리셋
         qs = ImageEmbedding.objects.filter(embedding_status="done")
 
@@ -49,19 +104,258 @@ class VectorSearchEngine:
 
         # 벡터 검색 적용
         if query_text:
-            qs, error = cls._apply_vector_search(qs, query_text, limit)
+            # 필터 선택도에 따라 정확 검색 / 반복 스캔 ANN / 부분 인덱스 중 선택
+            filtered = bool(
+                split_tags(tags)
+                or (location and location.strip())
+                or (date_from and date_from.strip())
+                or (date_to and date_to.strip())
+            )
+            plan = plan_vector_search(qs, limit, filtered, location)
+            qs, error = cls._apply_vector_search(qs, query_text, limit, plan)
             if error:
                 return qs, error
+            # ANN 파라미터는 트랜잭션 범위에서만 유효하므로 블록 안에서 평가
+            execute_start = time.perf_counter()
+            with vector_search_session(**plan.session_params(ef_search, probes, limit)):
+                result_count = len(qs)
+            log_search_plan(
+                plan.describe(),
+                plan.planning_seconds,
+                time.perf_counter() - execute_start,
+            )
+            if cache_key:
+                search_result_cache.set(
+                    cache_key, [(obj.id, float(obj.distance)) for obj in qs]
+                )
         else:
             # 텍스트 검색이 없는 경우 최신 순으로 제한
             qs = qs.order_by("-created_at")[:limit]
+            result_count = len(qs)
 
         # 성능 로깅
         duration = time.time() - start_time
-        log_search_performance(query_text or "no_query", duration, len(qs))
+        if cache_key:
+            search_result_cache.record(False, duration)
+        log_search_performance(query_text or "no_query", duration, result_count)
 
         return qs, None
 
+    @classmethod
+    def search_window(
+        cls,
+        query_text: str,
+        tags: Optional[str] = None,
+        location: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        window_size: int = 1000,
+        after: Optional[Tuple[float, int]] = None,
+        offset: int = 0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        """(distance, id) 순서의 검색 결과 구간을 ID/거리만으로 반환합니다.
+
+        페이지마다 상위 K개를 다시 계산하지 않도록 window_size개씩 한 번 검색해
+        검색 결과 캐시(코퍼스 세대별)에 저장하고, 다음 구간은 마지막 행 뒤부터
+        키셋 조건으로 검색합니다.
+
+        Args:
+            query_text: 검색어
+            tags: 태그 필터 (쉼표로 구분)
+            location: 위치 필터
+            date_from: 시작 날짜 (YYYY-MM-DD)
+            date_to: 종료 날짜 (YYYY-MM-DD)
+            window_size: 한 구간의 행 수
+            after: 구간 시작 위치 (distance, id), None이면 처음부터
+            offset: after 앞에 있는 결과 수 (ANN 탐색 한도 계산용)
+            ef_search: HNSW 검색 후보 수 (None이면 settings 값)
+            probes: IVFFlat 탐색 리스트 수 (None이면 settings 값)
+
+        Returns:
+            ({"entries": [(id, distance), ...], "exhausted": bool} 또는 None, 오류 메시지)
+
+        """
+        start_time = time.time()
+
+        cache_key = None
+        if get_search_result_cache_config()["ENABLED"]:
+            generation = get_corpus_generation()
+            if generation is not None:
+                cache_key = search_result_cache.make_key(
+                    generation,
+                    get_embedding_backend().name,
+                    query_text,
+                    tags,
+                    location,
+                    date_from,
+                    date_to,
+                    window_size,
+                    ef_search,
+                    probes,
+                )
+                # search_images 결과와 구분하고 구간 시작 위치별로 저장
+                cache_key += f":window:{after[0]!r}:{after[1]}" if after else ":window"
+                cached = search_result_cache.get(cache_key)
+                if cached is not None:
+                    search_result_cache.record(True, time.time() - start_time)
+                    return cached, None
+
+        qs = ImageEmbedding.objects.filter(embedding_status="done")
+        qs = cls._apply_filters(qs, tags, location, date_from, date_to)
+        filtered = bool(
+            split_tags(tags)
+            or (location and location.strip())
+            or (date_from and date_from.strip())
+            or (date_to and date_to.strip())
+        )
+        if not supports_iterative_scan():
+            # 반복 스캔 없이는 HNSW가 ef_search개(최대 1000)까지만 반환
+            window_size = min(window_size, HNSW_MAX_EF_SEARCH)
+        plan = plan_vector_search(qs, window_size, filtered, location)
+        rows, error = cls._window_rows(
+            qs, query_text, window_size, plan, after, ef_search, probes
+        )
+        if error:
+            return None, error
+        if plan.name != PLAN_EXACT and len(rows) < window_size:
+            # ANN 인덱스는 ef_search/max_scan_tuples에서 탐색을 멈추므로 (앞 구간
+            # 행을 키셋 조건으로 건너뛰는 뒤 구간일수록 빨리 멈춤) 결과가 모자라면
+            # 남은 행을 다시 확인해야 마지막 구간으로 판단할 수 있음
+            rows, error = cls._recheck_short_window(
+                qs,
+                query_text,
+                window_size,
+                plan,
+                rows,
+                after,
+                offset,
+                ef_search,
+                probes,
+            )
+            if error:
+                return None, error
+
+        entries = sorted(
+            ((image_id, float(distance)) for image_id, distance in rows),
+            key=lambda entry: (entry[1], entry[0]),
+        )
+        exhausted = len(entries) < window_size
+        if not exhausted:
+            # 경계에서 거리가 같은 행(유사 중복 재사용 임베딩 등)이 잘렸을 수 있으므로
+            # 마지막 거리와 같은 행은 다음 구간에서 id 순으로 다시 가져옴
+            boundary = entries[-1][1]
+            trimmed = [entry for entry in entries if entry[1] != boundary]
+            if trimmed:
+                entries = trimmed
+        window = {"entries": entries, "exhausted": exhausted}
+
+        duration = time.time() - start_time
+        if cache_key:
+            search_result_cache.set(cache_key, window)
+            search_result_cache.record(False, duration)
+        log_search_performance(query_text, duration, len(entries))
+        return window, None
+
+    @classmethod
+    def _recheck_short_window(
+        cls,
+        qs: QuerySet,
+        query_text: str,
+        window_size: int,
+        plan: SearchPlan,
+        rows: List[Tuple[int, float]],
+        after: Optional[Tuple[float, int]],
+        offset: int,
+        ef_search: Optional[int],
+        probes: Optional[int],
+    ) -> Tuple[Optional[List[Tuple[int, float]]], Optional[str]]:
+        """ANN 결과가 window_size보다 적은 구간을 한 번 더 검색합니다.
+
+        필터 결과가 EXACT_THRESHOLD 이하면 정확 검색으로 남은 행을 모두 확인하고,
+        그보다 크면 앞 구간(offset개)을 건너뛰고도 구간이 찰 만큼 반복 스캔 한도를
+        늘려 ANN으로 다시 찾습니다. 그래도 모자라면 마지막 구간으로 봅니다.
+
+        Returns:
+            (다시 찾은 행 또는 rows 그대로, 오류 메시지)
+
+        """
+        threshold = get_search_planner_config()["EXACT_THRESHOLD"]
+        filtered_rows = plan.filtered_rows
+        if filtered_rows is None:
+            filtered_rows = count_filtered_rows(qs, threshold)
+        if filtered_rows <= threshold:
+            return cls._window_rows(
+                qs,
+                query_text,
+                window_size,
+                SearchPlan(PLAN_EXACT, filtered_rows=filtered_rows),
+                after,
+                ef_search,
+                probes,
+            )
+
+        if supports_iterative_scan():
+            # 반복 스캔은 키셋/필터로 버려진 튜플도 한도에 포함하므로 여유를 둠
+            max_scan_tuples = (offset + window_size) * plan.oversample * 2
+            if max_scan_tuples > get_vector_index_config()["HNSW_MAX_SCAN_TUPLES"]:
+                rows, error = cls._window_rows(
+                    qs,
+                    query_text,
+                    window_size,
+                    plan,
+                    after,
+                    ef_search,
+                    probes,
+                    max_scan_tuples=max_scan_tuples,
+                )
+                if error:
+                    return None, error
+        return rows, None
+
+    @classmethod
+    def _window_rows(
+        cls,
+        qs: QuerySet,
+        query_text: str,
+        window_size: int,
+        plan: SearchPlan,
+        after: Optional[Tuple[float, int]],
+        ef_search: Optional[int],
+        probes: Optional[int],
+        max_scan_tuples: Optional[int] = None,
+    ) -> Tuple[Optional[List[Tuple[int, float]]], Optional[str]]:
+        """한 구간의 (id, distance) 행을 검색합니다."""
+        qs, error = cls._apply_vector_search(
+            qs, query_text, window_size, plan, after=after
+        )
+        if error:
+            return None, error
+        params = plan.session_params(ef_search, probes, window_size)
+        if plan.name != PLAN_EXACT:
+            # 키셋 조건이 인덱스가 먼저 돌려주는 가까운 행들을 모두 걸러내므로
+            # 필터가 없어도 구간이 찰 때까지 반복 스캔
+            params["iterative"] = True
+            params["max_scan_tuples"] = max_scan_tuples
+        with vector_search_session(**params):
+            return list(qs.values_list("id", "distance")), None
+
+    @classmethod
+    def _hydrate_results(cls, entries: List[Tuple[int, float]]) -> List[ImageEmbedding]:
+        """캐시된 (id, distance) 순서대로 in_bulk 한 번으로 행을 읽습니다.
+
+        캐시 이후 삭제된 행은 결과에서 제외됩니다.
+        """
+        objects = ImageEmbedding.objects.in_bulk([image_id for image_id, _ in entries])
+        results = []
+        for image_id, distance in entries:
+            obj = objects.get(image_id)
+            if obj is not None:
+                obj.distance = distance
+                results.append(obj)
+        return results
+
     @classmethod
     def _apply_filters(
         cls,
@@ -71,61 +365,85 @@ class VectorSearchEngine:
         date_from: Optional[str],
         date_to: Optional[str],
     ) -> QuerySet:
-        """필터를 적용합니다."""
-        # 태그 필터
-        if tags:
-            tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
-            for tag in tag_list:
-                qs = qs.filter(tags__name__icontains=tag)
-
-        # 위치 필터
-        if location:
-            qs = qs.filter(location_user__icontains=location)
-
-        # 날짜 필터
-        if date_from:
-            qs = qs.filter(date_taken_exif__date__gte=date_from)
-        if date_to:
-            qs = qs.filter(date_taken_exif__date__lte=date_to)
-
-        return qs
+        """필터를 적용합니다 (인덱스를 탈 수 있는 조건으로 변환)."""
+        return apply_search_filters(qs, tags, location, date_from, date_to)
 
     @classmethod
     def _apply_vector_search(
-        cls, qs: QuerySet, query_text: str, limit: int
+        cls,
+        qs: QuerySet,
+        query_text: str,
+        limit: int,
+        plan: Optional[SearchPlan] = None,
+        after: Optional[Tuple[float, int]] = None,
     ) -> Tuple[QuerySet, Optional[str]]:
-        """벡터 검색을 적용합니다."""
+        """벡터 검색을 적용합니다 (plan이 없으면 전체 ANN 검색).
+
+        after가 (distance, id)이면 그 뒤 순서의 행만 검색합니다 (키셋 페이지네이션).
+        """
         # 검색어 임베딩 가져오기
         query_embedding = cls._get_query_embedding(query_text)
         if query_embedding is None:
             return qs, "검색어 임베딩 생성에 실패했습니다."
 
-        # 벡터 유사도 검색
-        vec_str = "[" + ",".join(str(float(x)) for x in query_embedding) + "]"
-        qs = qs.extra(
-            select={"l2": f"embedding <-> '{vec_str}'::vector"}, order_by=["l2"]
-        )[:limit]
+        # 같은 백엔드가 만든 벡터끼리만 비교 (백엔드마다 벡터 공간이 다름)
+        qs = qs.filter(embedding_model=get_embedding_backend().name)
+
+        # 벡터 유사도 검색 (SQL에 문자열로 넣지 않고 바인딩 파라미터로 전달)
+        # 압축 저장 모드면 압축 컬럼으로 후보를 고른 뒤 float32 거리로 재정렬
+        # ip/cosine 척도는 저장된 벡터와 같이 단위 길이로 맞춤 (캐시된 기존 벡터 포함)
+        query_vector = np.asarray(prepare_embedding(query_embedding), dtype=np.float32)
+        if after is not None:
+            after_distance, after_id = after
+            qs = qs.alias(
+                keyset_distance=vector_distance("embedding", query_vector)
+            ).filter(
+                Q(keyset_distance__gt=after_distance)
+                | Q(keyset_distance=after_distance, id__gt=after_id)
+            )
+        qs = (plan or SearchPlan(PLAN_ANN)).build(qs, query_vector, limit)
 
         return qs, None
 
     @classmethod
     def _get_query_embedding(cls, query_text: str) -> Optional[List[float]]:
-        """검색어 임베딩을 가져오거나 새로 생성합니다."""
+        """검색어 임베딩을 가져오거나 새로 생성합니다.
+
+        프로세스 LRU → Redis → SearchQuery 테이블 순서로 조회하고,
+        모두 없을 때만 임베딩 API를 호출합니다.
+        """
+        normalized_text = normalize_query_text(query_text)
+        if not normalized_text:
+            return None
+        # 백엔드를 바꾸면 다른 벡터 공간이므로 캐시/DB 조회도 백엔드별로 구분
+        embedding_model = get_embedding_backend().name
+        cache_key = f"{embedding_model}:{normalized_text}"
+
+        # 캐시 확인 (LRU, Redis)
+        cached_embedding = query_embedding_cache.get(cache_key)
+        if cached_embedding is not None:
+            return cached_embedding
+
         # 데이터베이스에서 확인
-        search_query = SearchQuery.objects.filter(query_text=query_text).first()
+        search_query = SearchQuery.objects.filter(
+            query_text=normalized_text, query_embedding_model=embedding_model
+        ).first()
         if search_query and search_query.query_embedding is not None:
+            query_embedding_cache.record_db_hit()
+            query_embedding_cache.set(cache_key, search_query.query_embedding)
             return search_query.query_embedding
 
         # 새로 생성
         try:
-            embedding_model, embedding = get_text_embedding(query_text)
+            embedding_model, embedding = get_text_embedding(normalized_text)
             if embedding is not None:
                 # 데이터베이스에 저장
                 SearchQuery.objects.create(
-                    query_text=query_text,
+                    query_text=normalized_text,
                     query_embedding=embedding,
                     query_embedding_model=embedding_model,
                 )
+                query_embedding_cache.set(cache_key, embedding)
                 return embedding
         except Exception:
             # 로깅은 get_text_embedding에서 처리됨
@@ -145,28 +463,22 @@ class VectorSearchEngine:
             유사한 이미지들의 QuerySet
 
         """
-        try:
-            # 기준 이미지 조회
-            base_image = ImageEmbedding.objects.get(
-                id=image_id, embedding_status="done"
-            )
-
-            if base_image.embedding is None:
-                return ImageEmbedding.objects.none()
-
-            # 유사도 검색
-            vec_str = "[" + ",".join(str(float(x)) for x in base_image.embedding) + "]"
-            similar_images = (
-                ImageEmbedding.objects.filter(embedding_status="done")
-                .exclude(
-                    id=image_id  # 자기 자신 제외
-                )
-                .extra(
-                    select={"l2": f"embedding <-> '{vec_str}'::vector"}, order_by=["l2"]
-                )[:limit]
-            )
-
-            return similar_images
-
-        except ImageEmbedding.DoesNotExist:
-            return ImageEmbedding.objects.none()
+        # 기준 이미지 임베딩은 서브쿼리로 참조해 벡터가 Python을 거치지 않도록 함
+        base_image = ImageEmbedding.objects.filter(
+            id=image_id, embedding_status="done", embedding__isnull=False
+        )
+        base_embedding = base_image.values("embedding")[:1]
+
+        similar_images = (
+            ImageEmbedding.objects.filter(embedding_status="done")
+            .filter(Exists(base_embedding))  # 기준 이미지가 없으면 빈 결과
+            # 같은 백엔드가 만든 벡터끼리만 비교 (백엔드마다 벡터 공간이 다름)
+            .filter(embedding_model=Subquery(base_image.values("embedding_model")[:1]))
+            .exclude(id=image_id)  # 자기 자신 제외
+            .annotate(distance=vector_distance("embedding", Subquery(base_embedding)))
+            .order_by("distance")[:limit]
+        )
+        with vector_search_session(limit=limit):
+            len(similar_images)
+
+        return similar_images
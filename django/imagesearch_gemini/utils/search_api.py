@@ -0,0 +1,261 @@
+import base64
+import hashlib
+import json
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
+
+from ..models import ImageEmbedding
+from .embedding_backends import get_embedding_backend
+from .result_cache import (
+    get_corpus_generation,
+    get_search_result_cache_config,
+    ranking_signature,
+)
+from .search import VectorSearchEngine
+
+DEFAULT_SEARCH_API = {
+    "DEFAULT_PAGE_SIZE": 20,
+    "MAX_PAGE_SIZE": 100,
+    # 한 번의 벡터 검색으로 가져와 캐시하는 (id, distance) 수
+    "WINDOW_SIZE": 1000,
+}
+
+# JSON 응답에 필요한 컬럼만 읽음 (embedding, exif_json 등 큰 컬럼 제외)
+SEARCH_API_FIELDS = (
+    "id",
+    "image_path",
+    "renditions",
+    "city_from_gps",
+    "location_user",
+    "date_taken_user",
+    "date_taken_exif",
+    "created_at",
+)
+
+
+class InvalidCursor(ValueError):
+    """해석할 수 없는 페이지 커서입니다."""
+
+
+def get_search_api_config() -> dict:
+    """settings.SEARCH_API와 기본값을 합친 설정을 반환합니다."""
+    config = dict(DEFAULT_SEARCH_API)
+    config.update(getattr(settings, "SEARCH_API", {}) or {})
+    return config
+
+
+def encode_cursor(data: dict) -> str:
+    """커서 정보를 URL에 넣을 수 있는 문자열로 만듭니다."""
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[dict]:
+    """encode_cursor()로 만든 문자열을 커서 정보로 되돌립니다.
+
+    Raises:
+        InvalidCursor: 형식이 잘못된 경우
+
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("잘못된 커서입니다.") from e
+    if not isinstance(data, dict):
+        raise InvalidCursor("잘못된 커서입니다.")
+    return data
+
+
+def _position(value) -> Optional[Tuple[float, int]]:
+    if value is None:
+        return None
+    try:
+        distance, image_id = value
+        return float(distance), int(image_id)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursor("잘못된 커서입니다.") from e
+
+
+def search_etag(params: dict) -> Optional[str]:
+    """코퍼스 세대, 벡터 설정과 요청 파라미터로 ETag를 만듭니다.
+
+    세대가 같으면 같은 요청의 결과도 같으므로 검색 없이 304로 응답할 수
+    있습니다. 세대를 알 수 없으면 None을 반환합니다 (응답 내용으로 계산).
+    """
+    if not get_search_result_cache_config()["ENABLED"]:
+        return None
+    generation = get_corpus_generation()
+    if generation is None:
+        return None
+    key = json.dumps(
+        [
+            generation,
+            get_embedding_backend().name,
+            ranking_signature(),
+            sorted(params.items()),
+        ],
+        ensure_ascii=False,
+    )
+    return quote_etag(hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+
+def serialize_image(obj: ImageEmbedding, distance: Optional[float] = None) -> dict:
+    """검색 결과 한 건을 JSON으로 변환합니다."""
+    date_taken = obj.date_taken
+    return {
+        "id": obj.id,
+        "thumbnail_url": obj.thumbnail_url,
+        "preview_url": obj.preview_url,
+        "date_taken": date_taken.isoformat() if date_taken else None,
+        "city_from_gps": obj.city_from_gps,
+        "location_user": obj.location_user,
+        "tags": [tag.name for tag in obj.tags.all()],
+        "distance": distance,
+    }
+
+
+def _projection():
+    return ImageEmbedding.objects.only(*SEARCH_API_FIELDS).prefetch_related("tags")
+
+
+def _vector_page(
+    query_text: str, filters: dict, page_size: int, cursor: Optional[dict]
+) -> Tuple[List[dict], Optional[str], Optional[str]]:
+    """벡터 검색 결과를 캐시된 구간에서 잘라 한 페이지를 만듭니다."""
+    window_size = get_search_api_config()["WINDOW_SIZE"]
+    cursor = cursor or {}
+    # w: 현재 구간의 시작 위치, p: 이전 페이지 마지막 행 (모두 (distance, id)),
+    # o: 현재 구간 앞에 있는 결과 수
+    window_start = _position(cursor.get("w"))
+    position = _position(cursor.get("p"))
+    try:
+        offset = max(0, int(cursor.get("o") or 0))
+    except (TypeError, ValueError) as e:
+        raise InvalidCursor("잘못된 커서입니다.") from e
+
+    page: List[Tuple[int, float]] = []
+    has_more = False
+    while True:
+        window, error = VectorSearchEngine.search_window(
+            query_text,
+            window_size=window_size,
+            after=window_start,
+            offset=offset,
+            **filters,
+        )
+        if error:
+            return [], None, error
+        entries = window["entries"]
+        remaining = [
+            entry
+            for entry in entries
+            if position is None or (entry[1], entry[0]) > position
+        ]
+        take = page_size - len(page)
+        page.extend(remaining[:take])
+        if len(page) >= page_size:
+            has_more = len(remaining) > take or not window["exhausted"]
+            break
+        if window["exhausted"] or not entries:
+            break
+        # 현재 구간을 다 읽었으면 마지막 행 뒤부터 다음 구간
+        last_id, last_distance = entries[-1]
+        window_start = (last_distance, last_id)
+        offset += len(entries)
+        position = None
+
+    objects = _projection().in_bulk([image_id for image_id, _ in page])
+    results = [
+        serialize_image(objects[image_id], distance)
+        for image_id, distance in page
+        if image_id in objects
+    ]
+    next_cursor = None
+    if has_more and page:
+        last_id, last_distance = page[-1]
+        next_cursor = encode_cursor(
+            {
+                "w": list(window_start) if window_start else None,
+                "o": offset,
+                "p": [last_distance, last_id],
+            }
+        )
+    return results, next_cursor, None
+
+
+def _latest_page(
+    filters: dict, page_size: int, cursor: Optional[dict]
+) -> Tuple[List[dict], Optional[str], Optional[str]]:
+    """검색어가 없을 때 최신 순 결과를 (created_at, id) 키셋으로 나눕니다."""
+    qs = VectorSearchEngine._apply_filters(
+        _projection().filter(embedding_status="done"), **filters
+    )
+    if cursor:
+        created_at = parse_datetime(str(cursor.get("c")))
+        try:
+            last_id = int(cursor.get("i"))
+        except (TypeError, ValueError) as e:
+            raise InvalidCursor("잘못된 커서입니다.") from e
+        if created_at is None:
+            raise InvalidCursor("잘못된 커서입니다.")
+        qs = qs.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id)
+        )
+    rows = list(qs.order_by("-created_at", "-id")[: page_size + 1])
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor({"c": last.created_at.isoformat(), "i": last.id})
+    return [serialize_image(obj) for obj in rows], next_cursor, None
+
+
+def search_page(
+    query_text: Optional[str] = None,
+    tags: Optional[str] = None,
+    location: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str], Optional[str]]:
+    """검색 결과 한 페이지를 JSON으로 변환할 수 있는 형태로 반환합니다.
+
+    Args:
+        query_text: 검색어 (없으면 최신 순)
+        tags: 태그 필터 (쉼표로 구분)
+        location: 위치 필터
+        date_from: 시작 날짜 (YYYY-MM-DD)
+        date_to: 종료 날짜 (YYYY-MM-DD)
+        page_size: 페이지 크기 (MAX_PAGE_SIZE로 제한)
+        cursor: 이전 응답의 next_cursor
+
+    Returns:
+        (결과 목록, 다음 페이지 커서 또는 None, 오류 메시지)
+
+    Raises:
+        InvalidCursor: 커서 형식이 잘못된 경우
+
+    """
+    config = get_search_api_config()
+    page_size = max(
+        1, min(page_size or config["DEFAULT_PAGE_SIZE"], config["MAX_PAGE_SIZE"])
+    )
+    filters = {
+        "tags": tags,
+        "location": location,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+    decoded = decode_cursor(cursor)
+    if query_text:
+        return _vector_page(query_text, filters, page_size, decoded)
+    return _latest_page(filters, page_size, decoded)
@@ -0,0 +1,142 @@
+import datetime
+import logging
+from typing import List, Optional
+
+from taggit.models import Tag, TaggedItem
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.db.models import Case, Exists, Max, OuterRef, Q, QuerySet, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+logger = logging.getLogger(__name__)
+
+# taggit_tag.name 트라이그램 인덱스 (서드파티 모델이라 post_migrate에서 생성)
+TAG_NAME_TRGM_INDEX = "taggit_tag_name_upper_trgm"
+
+
+def split_tags(tags: Optional[str]) -> List[str]:
+    """쉼표로 구분된 태그 문자열을 중복 없는 목록으로 변환합니다."""
+    if not tags:
+        return []
+    return list(dict.fromkeys(tag.strip() for tag in tags.split(",") if tag.strip()))
+
+
+def _start_of_day(day: datetime.date) -> datetime.datetime:
+    return timezone.make_aware(
+        datetime.datetime.combine(day, datetime.time.min),
+        timezone.get_current_timezone(),
+    )
+
+
+def date_range_q(date_from: Optional[str], date_to: Optional[str]) -> Optional[Q]:
+    """촬영일 범위를 인덱스를 탈 수 있는 범위 조건으로 만듭니다.
+
+    표시용 촬영일(date_taken)과 같은 규칙으로, 사용자 입력 촬영일이 있으면
+    그 날짜를, 없으면 EXIF 촬영일시를 비교합니다. EXIF 컬럼은 행마다 날짜로
+    변환하지 않고 [시작일 00:00, 종료일+1 00:00) 구간(현재 타임존)과 비교합니다.
+
+    Args:
+        date_from: 시작 날짜 (YYYY-MM-DD)
+        date_to: 종료 날짜 (YYYY-MM-DD)
+
+    Returns:
+        Q 또는 None (조건 없음)
+
+    """
+    start = parse_date(date_from.strip()) if date_from else None
+    end = parse_date(date_to.strip()) if date_to else None
+    if start is None and end is None:
+        return None
+
+    user_q = Q()
+    exif_q = Q(date_taken_user__isnull=True)
+    if start:
+        user_q &= Q(date_taken_user__gte=start)
+        exif_q &= Q(date_taken_exif__gte=_start_of_day(start))
+    if end:
+        user_q &= Q(date_taken_user__lte=end)
+        exif_q &= Q(date_taken_exif__lt=_start_of_day(end + datetime.timedelta(days=1)))
+    return user_q | exif_q
+
+
+def location_q(location: Optional[str]) -> Optional[Q]:
+    """사용자 입력 장소 또는 GPS 도시명에 검색어가 포함된 조건을 만듭니다.
+
+    icontains는 UPPER(컬럼) LIKE로 변환되며, UPPER(컬럼) 트라이그램 GIN
+    인덱스가 선행 와일드카드 LIKE를 처리합니다.
+    """
+    location = (location or "").strip()
+    if not location:
+        return None
+    return Q(location_user__icontains=location) | Q(city_from_gps__icontains=location)
+
+
+def tags_exists(model, tags: List[str]) -> Optional[Exists]:
+    """모든 태그 검색어와 일치하는 태그를 가진 행을 하나의 EXISTS로 찾습니다.
+
+    태그마다 조인을 추가하지 않고, 이미지별로 태그 연결을 묶은 뒤 검색어마다
+    일치한 태그가 있는지를 HAVING으로 확인합니다 (AND 조건).
+    """
+    if not tags:
+        return None
+    tag_q = Q()
+    for tag in tags:
+        tag_q |= Q(tag__name__icontains=tag)
+    tagged = TaggedItem.objects.filter(
+        tag_q,
+        content_type_id=ContentType.objects.get_for_model(model).id,
+        object_id=OuterRef("pk"),
+    )
+    if len(tags) > 1:
+        matches = {
+            f"match_{i}": Max(
+                Case(When(tag__name__icontains=tag, then=Value(1)), default=Value(0))
+            )
+            for i, tag in enumerate(tags)
+        }
+        tagged = (
+            tagged.values("object_id")
+            .annotate(**matches)
+            .filter(**{name: 1 for name in matches})
+        )
+    return Exists(tagged)
+
+
+def apply_search_filters(
+    qs: QuerySet,
+    tags: Optional[str] = None,
+    location: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> QuerySet:
+    """태그/장소/촬영일 필터를 적용합니다.
+
+    모든 조건은 조인 없이 WHERE 절에 추가되므로 결과 행이 중복되지 않습니다.
+    """
+    conditions = [
+        tags_exists(qs.model, split_tags(tags)),
+        location_q(location),
+        date_range_q(date_from, date_to),
+    ]
+    for condition in conditions:
+        if condition is not None:
+            qs = qs.filter(condition)
+    return qs
+
+
+def create_tag_trigram_index(using: str = "default") -> None:
+    """taggit_tag.name 트라이그램 인덱스를 만듭니다 (pg_trgm 확장 필요)."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TAG_NAME_TRGM_INDEX} "
+                f"ON {Tag._meta.db_table} USING gin (UPPER(name) gin_trgm_ops)"
+            )
+    except Exception as e:
+        logger.warning(f"태그 트라이그램 인덱스 생성 실패: {e}")
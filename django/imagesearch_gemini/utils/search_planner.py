@@ -0,0 +1,278 @@
+import json
+import logging
+import math
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, QuerySet
+
+from .vector_index import (
+    METRICS,
+    PARTIAL_CITY_INDEX_PREFIX,
+    get_vector_index_config,
+    vector_distance,
+)
+from .vector_storage import MODE_FULL, annotate_distance, get_candidate_ef_search
+
+logger = logging.getLogger(__name__)
+
+# 필터 없음: 전체 ANN 인덱스 검색
+PLAN_ANN = "ann"
+# 필터 결과가 작음: 필터 인덱스로 후보를 모은 뒤 정확한 거리로 정렬
+PLAN_EXACT = "exact"
+# 필터 결과가 큼: 반복 스캔 + 선택도만큼 ef_search를 늘린 ANN
+PLAN_ITERATIVE = "iterative"
+# 장소가 부분 인덱스가 있는 도시: 해당 도시는 부분 인덱스, 나머지는 반복 스캔
+PLAN_PARTIAL_INDEX = "partial_index"
+
+DEFAULT_SEARCH_PLANNER = {
+    # 필터 결과가 이 행 수 이하면 정확 검색
+    "EXACT_THRESHOLD": 5000,
+    # 반복 스캔 시 limit 대비 최대 oversampling 배수
+    "MAX_OVERSAMPLE": 20,
+    # pgvector hnsw.ef_search 상한
+    "MAX_EF_SEARCH": 1000,
+    # 도시별 부분 인덱스 목록 캐시 시간(초)
+    "PARTIAL_INDEX_CACHE_SECONDS": 300,
+}
+
+# pg_get_expr(indpred) 예: ((city_from_gps)::text = 'Seoul'::text)
+_CITY_PREDICATE_RE = re.compile(r"city_from_gps\)?(?:::text)? = '((?:[^']|'')*)'")
+
+
+def get_search_planner_config() -> dict:
+    """settings.SEARCH_PLANNER와 기본값을 합친 설정을 반환합니다."""
+    config = dict(DEFAULT_SEARCH_PLANNER)
+    config.update(getattr(settings, "SEARCH_PLANNER", {}) or {})
+    return config
+
+
+class PartialIndexRegistry:
+    """DB에 만들어진 도시별 부분 ANN 인덱스 목록을 캐시합니다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._indexes: Optional[Dict[str, tuple]] = None
+        self._loaded_at = 0.0
+
+    def _load(self, table: str) -> Dict[str, tuple]:
+        opclass = METRICS[get_vector_index_config()["METRIC"]][1]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT c.relname, pg_get_expr(i.indpred, i.indrelid),
+                       pg_get_indexdef(i.indexrelid)
+                FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = to_regclass(%s) AND i.indisvalid
+                  AND i.indpred IS NOT NULL AND c.relname LIKE %s
+                """,
+                [table, PARTIAL_CITY_INDEX_PREFIX + "%"],
+            )
+            rows = cursor.fetchall()
+        indexes = {}
+        for name, predicate, definition in rows:
+            match = _CITY_PREDICATE_RE.search(predicate or "")
+            # 거리 척도를 바꾼 뒤 재생성하지 않은 인덱스는 사용할 수 없음
+            if match and opclass in definition:
+                city = match.group(1).replace("''", "'")
+                indexes[city.lower()] = (city, name)
+        return indexes
+
+    def find(self, table: str, location: str) -> Optional[tuple]:
+        """location과 이름이 같은 도시의 (도시명, 인덱스명)을 반환합니다."""
+        if connection.vendor != "postgresql":
+            return None
+        ttl = get_search_planner_config()["PARTIAL_INDEX_CACHE_SECONDS"]
+        with self._lock:
+            if self._indexes is None or time.monotonic() - self._loaded_at > ttl:
+                try:
+                    self._indexes = self._load(table)
+                except Exception as e:
+                    logger.warning(f"부분 인덱스 목록 조회 실패: {e}")
+                    self._indexes = {}
+                self._loaded_at = time.monotonic()
+            return self._indexes.get(location.strip().lower())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes = None
+
+
+partial_index_registry = PartialIndexRegistry()
+
+
+class SearchPlan:
+    """필터 선택도에 따라 고른 벡터 검색 방식입니다.
+
+    build()로 쿼리셋을 만들고, session_params()의 파라미터를 적용한
+    vector_search_session 안에서 평가합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        filtered_rows: Optional[int] = None,
+        selectivity: Optional[float] = None,
+        oversample: int = 1,
+        partial_city: Optional[str] = None,
+        partial_index: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.filtered_rows = filtered_rows
+        self.selectivity = selectivity
+        self.oversample = oversample
+        self.partial_city = partial_city
+        self.partial_index = partial_index
+        self.planning_seconds = 0.0
+
+    def __repr__(self) -> str:
+        return f"SearchPlan({self.describe()})"
+
+    def describe(self) -> str:
+        parts = [self.name]
+        if self.filtered_rows is not None:
+            parts.append(f"rows={self.filtered_rows}")
+        if self.selectivity is not None:
+            parts.append(f"selectivity={self.selectivity:.4f}")
+        if self.oversample > 1:
+            parts.append(f"oversample={self.oversample}")
+        if self.partial_index:
+            parts.append(f"index={self.partial_index}")
+        return " ".join(parts)
+
+    def session_params(
+        self, ef_search: Optional[int], probes: Optional[int], limit: int
+    ) -> dict:
+        """vector_search_session에 넘길 인자를 반환합니다."""
+        if self.name == PLAN_EXACT:
+            return {"exact": True}
+        config = get_vector_index_config()
+        ef_search = get_candidate_ef_search(ef_search, limit)
+        if self.oversample > 1:
+            max_ef = get_search_planner_config()["MAX_EF_SEARCH"]
+            ef_search = min(
+                max_ef,
+                max(ef_search or config["HNSW_EF_SEARCH"], limit * self.oversample),
+            )
+            probes = (probes or config["IVFFLAT_PROBES"]) * self.oversample
+        return {
+            "ef_search": ef_search,
+            "probes": probes,
+            "iterative": self.name in (PLAN_ITERATIVE, PLAN_PARTIAL_INDEX),
+            "limit": limit,
+        }
+
+    def build(self, qs: QuerySet, query_vector: np.ndarray, limit: int) -> QuerySet:
+        """필터가 적용된 쿼리셋에 계획에 맞는 거리 정렬을 적용합니다."""
+        if self.name == PLAN_EXACT:
+            # 후보가 적으므로 압축 모드여도 float32로 바로 정확히 계산
+            return annotate_distance(qs, query_vector, limit, mode=MODE_FULL)
+        if self.name != PLAN_PARTIAL_INDEX:
+            return annotate_distance(qs, query_vector, limit)
+
+        # 도시 조건이 부분 인덱스 조건과 같아야 Postgres가 부분 인덱스를 선택
+        city_q = Q(city_from_gps=self.partial_city)
+        # 부분 인덱스는 float32 embedding 컬럼에 만들어지므로 full 모드로 검색
+        city_ids = annotate_distance(
+            qs.filter(city_q), query_vector, limit, mode=MODE_FULL
+        ).values("id")
+        # location_user로만 일치한 다른 도시의 행
+        other_ids = annotate_distance(qs.exclude(city_q), query_vector, limit).values(
+            "id"
+        )
+        return (
+            qs.model.objects.filter(Q(id__in=city_ids) | Q(id__in=other_ids))
+            .annotate(distance=vector_distance("embedding", query_vector))
+            .order_by("distance")[:limit]
+        )
+
+
+def _planner_row_estimate(qs: QuerySet) -> Optional[int]:
+    """EXPLAIN(실행 없음)으로 Postgres 플래너의 예상 행 수를 구합니다."""
+    try:
+        plan = json.loads(qs.order_by().explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.debug(f"예상 행 수 조회 실패: {e}")
+        return None
+
+
+def _table_row_estimate(qs: QuerySet) -> Optional[int]:
+    """pg_class 통계로 전체 행 수를 추정합니다."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)",
+            [qs.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] <= 0:
+        return None
+    return int(row[0])
+
+
+def count_filtered_rows(qs: QuerySet, threshold: int) -> int:
+    """필터 결과 행 수를 threshold+1에서 멈춰 셉니다 (필터 인덱스만 사용)."""
+    return qs.order_by().values("id")[: threshold + 1].count()
+
+
+def plan_vector_search(
+    qs: QuerySet, limit: int, filtered: bool, location: Optional[str] = None
+) -> SearchPlan:
+    """필터 선택도를 추정해 벡터 검색 방식을 고릅니다.
+
+    1. 필터가 없으면 전체 ANN 인덱스 검색
+    2. 필터 결과가 EXACT_THRESHOLD 이하면 정확 검색 (LIMIT을 건 개수 조회로 확인)
+    3. 장소가 부분 인덱스가 있는 도시면 부분 인덱스 검색
+    4. 그 외에는 선택도의 역수만큼 oversampling한 반복 스캔 ANN
+
+    Args:
+        qs: 필터가 적용된 쿼리셋
+        limit: 결과 수
+        filtered: 필터 적용 여부
+        location: 장소 필터 (부분 인덱스 조회용)
+
+    Returns:
+        SearchPlan
+
+    """
+    start_time = time.perf_counter()
+    config = get_search_planner_config()
+    if not filtered or connection.vendor != "postgresql":
+        plan = SearchPlan(PLAN_ANN)
+        plan.planning_seconds = time.perf_counter() - start_time
+        return plan
+
+    threshold = config["EXACT_THRESHOLD"]
+    bounded_count = count_filtered_rows(qs, threshold)
+    if bounded_count <= threshold:
+        plan = SearchPlan(PLAN_EXACT, filtered_rows=bounded_count)
+    else:
+        filtered_rows = max(bounded_count, _planner_row_estimate(qs) or 0)
+        total_rows = _table_row_estimate(qs)
+        selectivity = min(1.0, filtered_rows / total_rows) if total_rows else None
+        oversample = (
+            min(config["MAX_OVERSAMPLE"], max(1, math.ceil(1 / selectivity)))
+            if selectivity
+            else config["MAX_OVERSAMPLE"]
+        )
+        partial = (
+            partial_index_registry.find(qs.model._meta.db_table, location)
+            if location and location.strip()
+            else None
+        )
+        plan = SearchPlan(
+            PLAN_PARTIAL_INDEX if partial else PLAN_ITERATIVE,
+            filtered_rows=filtered_rows,
+            selectivity=selectivity,
+            oversample=oversample,
+            partial_city=partial[0] if partial else None,
+            partial_index=partial[1] if partial else None,
+        )
+    plan.planning_seconds = time.perf_counter() - start_time
+    return plan
@@ -0,0 +1,131 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from timezonefinder import TimezoneFinder
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEZONE_RESOLVER = {
+    "IN_MEMORY": False,
+    "GRID_PRECISION": 2,
+    "MEMO_SIZE": 10000,
+}
+
+
+def _get_config() -> dict:
+    config = dict(DEFAULT_TIMEZONE_RESOLVER)
+    config.update(getattr(settings, "TIMEZONE_RESOLVER", {}) or {})
+    return config
+
+
+class TimezoneResolver:
+    """GPS 좌표의 타임존 이름을 찾는 프로세스 전역 리졸버입니다.
+
+    TimezoneFinder는 생성 시 폴리곤 데이터를 읽어 비용이 크므로 최초 사용 시
+    한 번만 만들고, 좌표는 격자 단위로 메모해 같은 장소의 반복 조회를 생략합니다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._finder: Optional[TimezoneFinder] = None
+        self._pid: Optional[int] = None
+        self._memo: "OrderedDict[Tuple[float, float], Optional[str]]" = OrderedDict()
+        self._metrics = {
+            "init_seconds": 0.0,
+            "lookup_seconds": 0.0,
+            "lookups": 0,
+            "memo_hits": 0,
+        }
+
+    def _get_finder(self, config: dict) -> TimezoneFinder:
+        if self._finder is None or self._pid != os.getpid():
+            start_time = time.perf_counter()
+            self._finder = TimezoneFinder(in_memory=config["IN_MEMORY"])
+            self._pid = os.getpid()
+            self._metrics["init_seconds"] = time.perf_counter() - start_time
+            logger.info(
+                f"TimezoneFinder loaded in {self._metrics['init_seconds']:.2f}s "
+                f"(in_memory={config['IN_MEMORY']})"
+            )
+        return self._finder
+
+    def resolve_many(
+        self, points: Iterable[Optional[Tuple[float, float]]]
+    ) -> List[Optional[str]]:
+        """여러 좌표의 타임존 이름을 반환합니다.
+
+        Args:
+            points: [(경도, 위도) 또는 None, ...]
+
+        Returns:
+            입력 순서와 같은 타임존 이름 목록 (찾지 못하면 None)
+
+        """
+        config = _get_config()
+        precision = config["GRID_PRECISION"]
+        results = []
+        with self._lock:
+            for point in points:
+                if not point:
+                    results.append(None)
+                    continue
+                key = (round(point[0], precision), round(point[1], precision))
+                if key in self._memo:
+                    self._memo.move_to_end(key)
+                    self._metrics["memo_hits"] += 1
+                    results.append(self._memo[key])
+                    continue
+
+                finder = self._get_finder(config)
+                start_time = time.perf_counter()
+                try:
+                    tzname = finder.timezone_at(lng=key[0], lat=key[1])
+                except Exception:
+                    tzname = None
+                self._metrics["lookup_seconds"] += time.perf_counter() - start_time
+                self._metrics["lookups"] += 1
+
+                self._memo[key] = tzname
+                while len(self._memo) > config["MEMO_SIZE"]:
+                    self._memo.popitem(last=False)
+                results.append(tzname)
+        return results
+
+    def resolve(self, lon: float, lat: float) -> Optional[str]:
+        """단일 좌표의 타임존 이름을 반환합니다."""
+        return self.resolve_many([(lon, lat)])[0]
+
+    def get_metrics(self) -> dict:
+        """초기화/조회 시간과 메모 적중 지표를 반환합니다."""
+        with self._lock:
+            return dict(self._metrics, memo_size=len(self._memo))
+
+    def clear(self) -> None:
+        """로드된 TimezoneFinder와 메모 캐시, 지표를 초기화합니다."""
+        with self._lock:
+            self._finder = None
+            self._pid = None
+            self._memo.clear()
+            for name in self._metrics:
+                self._metrics[name] = 0
+
+
+timezone_resolver = TimezoneResolver()
+
+
+def resolve_timezones(
+    points: Iterable[Optional[Tuple[float, float]]],
+) -> List[Optional[str]]:
+    """여러 GPS 좌표의 타임존 이름을 한 번에 반환합니다."""
+    return timezone_resolver.resolve_many(points)
+
+
+def get_timezone_resolver_metrics() -> dict:
+    """타임존 리졸버의 초기화/조회 시간 지표를 반환합니다."""
+    return timezone_resolver.get_metrics()
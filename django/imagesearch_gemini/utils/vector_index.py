@@ -0,0 +1,268 @@
+import hashlib
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from pgvector.django import (
+    CosineDistance,
+    HnswIndex,
+    IvfflatIndex,
+    L2Distance,
+    MaxInnerProduct,
+)
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Index, Q
+
+# ImageEmbedding.embedding ANN 인덱스 이름 (재생성 시에도 동일한 이름 유지)
+EMBEDDING_INDEX_NAME = "imgemb_embedding_ann"
+
+INDEX_TYPE_HNSW = "hnsw"
+INDEX_TYPE_IVFFLAT = "ivfflat"
+INDEX_TYPES = (INDEX_TYPE_HNSW, INDEX_TYPE_IVFFLAT)
+
+# pgvector가 허용하는 hnsw.ef_search 최대값
+HNSW_MAX_EF_SEARCH = 1000
+
+# 거리 척도
+# l2: 유클리드 거리 (<->)
+# cosine: 코사인 거리 (<=>)
+# ip: 음의 내적 (<#>), 단위 벡터에서는 코사인과 같은 순위이면서 비교 비용이 가장 낮음
+METRIC_L2 = "l2"
+METRIC_COSINE = "cosine"
+METRIC_IP = "ip"
+
+# 거리 척도별 (거리 함수, vector operator class, halfvec operator class)
+METRICS = {
+    METRIC_L2: (L2Distance, "vector_l2_ops", "halfvec_l2_ops"),
+    METRIC_COSINE: (CosineDistance, "vector_cosine_ops", "halfvec_cosine_ops"),
+    METRIC_IP: (MaxInnerProduct, "vector_ip_ops", "halfvec_ip_ops"),
+}
+# 저장/검색 시 벡터를 단위 길이로 정규화해야 하는 척도
+NORMALIZED_METRICS = (METRIC_COSINE, METRIC_IP)
+
+# 압축 컬럼(embedding_half, embedding_bits) HNSW 인덱스 (pgvector 0.7 이상)
+HALFVEC_INDEX_NAME = "imgemb_embedding_half_ann"
+BITS_INDEX_NAME = "imgemb_embedding_bits_ann"
+BITS_OPCLASS = "bit_hamming_ops"
+
+# 도시별 부분 ANN 인덱스 이름 접두사 (WHERE city_from_gps = '...')
+PARTIAL_CITY_INDEX_PREFIX = "imgemb_ann_city_"
+
+DEFAULT_VECTOR_INDEX = {
+    "TYPE": INDEX_TYPE_HNSW,
+    "HNSW_M": 16,
+    "HNSW_EF_CONSTRUCTION": 64,
+    "IVFFLAT_LISTS": 100,
+    "HNSW_EF_SEARCH": 40,
+    "IVFFLAT_PROBES": 10,
+    "METRIC": METRIC_L2,
+    # 필터가 있는 검색에서 사용할 HNSW 반복 스캔 (pgvector 0.8 이상, "off"면 사용 안 함)
+    "HNSW_ITERATIVE_SCAN": "strict_order",
+    "HNSW_MAX_SCAN_TUPLES": 20000,
+}
+
+
+def get_vector_index_config() -> dict:
+    """settings.VECTOR_INDEX 값을 기본값과 합쳐 반환합니다."""
+    config = dict(DEFAULT_VECTOR_INDEX)
+    config.update(getattr(settings, "VECTOR_INDEX", {}) or {})
+    config["TYPE"] = str(config["TYPE"]).lower()
+    if config["TYPE"] not in INDEX_TYPES:
+        raise ValueError(
+            f"지원하지 않는 벡터 인덱스 종류입니다: {config['TYPE']} "
+            f"(허용: {', '.join(INDEX_TYPES)})"
+        )
+    config["METRIC"] = str(config["METRIC"]).lower()
+    if config["METRIC"] not in METRICS:
+        raise ValueError(
+            f"지원하지 않는 거리 척도입니다: {config['METRIC']} "
+            f"(허용: {', '.join(METRICS)})"
+        )
+    return config
+
+
+def get_metric() -> str:
+    """settings.VECTOR_INDEX['METRIC'] 값을 반환합니다."""
+    return get_vector_index_config()["METRIC"]
+
+
+def uses_normalized_vectors(metric: Optional[str] = None) -> bool:
+    """현재 거리 척도가 단위 벡터 저장을 전제하는지 반환합니다."""
+    return (metric or get_metric()) in NORMALIZED_METRICS
+
+
+def vector_distance(field: str, vector, metric: Optional[str] = None):
+    """거리 척도에 맞는 거리 식(작을수록 가까움)을 반환합니다.
+
+    Args:
+        field: 벡터 컬럼명 (embedding, embedding_half)
+        vector: 검색어 벡터 또는 서브쿼리 식
+        metric: 거리 척도 (None이면 settings 값)
+
+    """
+    distance_class = METRICS[metric or get_metric()][0]
+    return distance_class(field, vector)
+
+
+def build_embedding_index(
+    name: str = EMBEDDING_INDEX_NAME,
+    index_type: Optional[str] = None,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    lists: Optional[int] = None,
+) -> Index:
+    """ImageEmbedding.embedding 컬럼용 ANN 인덱스 객체를 생성합니다.
+
+    인자를 생략하면 settings.VECTOR_INDEX 값을 사용합니다.
+
+    Args:
+        name: 인덱스 이름
+        index_type: "hnsw" 또는 "ivfflat"
+        m: HNSW 그래프의 노드당 연결 수
+        ef_construction: HNSW 생성 시 후보 리스트 크기
+        lists: IVFFlat 클러스터 수
+
+    Returns:
+        HnswIndex 또는 IvfflatIndex
+
+    """
+    config = get_vector_index_config()
+    index_type = (index_type or config["TYPE"]).lower()
+    opclass = METRICS[config["METRIC"]][1]
+
+    if index_type == INDEX_TYPE_HNSW:
+        return HnswIndex(
+            name=name,
+            fields=["embedding"],
+            m=m or config["HNSW_M"],
+            ef_construction=ef_construction or config["HNSW_EF_CONSTRUCTION"],
+            opclasses=[opclass],
+        )
+    if index_type == INDEX_TYPE_IVFFLAT:
+        return IvfflatIndex(
+            name=name,
+            fields=["embedding"],
+            lists=lists or config["IVFFLAT_LISTS"],
+            opclasses=[opclass],
+        )
+    raise ValueError(f"지원하지 않는 벡터 인덱스 종류입니다: {index_type}")
+
+
+def build_compact_indexes() -> list:
+    """압축 컬럼용 HNSW 인덱스 목록을 생성합니다.
+
+    압축 컬럼이 비어 있으면 인덱스도 비어 있으므로 VECTOR_STORAGE 모드와
+    관계없이 항상 정의합니다.
+    """
+    config = get_vector_index_config()
+    return [
+        HnswIndex(
+            name=name,
+            fields=[field],
+            m=config["HNSW_M"],
+            ef_construction=config["HNSW_EF_CONSTRUCTION"],
+            opclasses=[opclass],
+        )
+        for name, field, opclass in (
+            (HALFVEC_INDEX_NAME, "embedding_half", METRICS[config["METRIC"]][2]),
+            (BITS_INDEX_NAME, "embedding_bits", BITS_OPCLASS),
+        )
+    ]
+
+
+def build_partial_city_index(city: str, name: Optional[str] = None) -> HnswIndex:
+    """city_from_gps가 city인 행만 담는 부분 HNSW 인덱스 객체를 생성합니다.
+
+    검색 시 WHERE city_from_gps = city 조건이 있으면 Postgres가 이 인덱스를
+    선택하므로, 해당 도시로 필터링된 검색도 ANN으로 처리됩니다.
+    """
+    config = get_vector_index_config()
+    city_hash = hashlib.sha1(city.encode("utf-8")).hexdigest()[:12]
+    return HnswIndex(
+        name=name or f"{PARTIAL_CITY_INDEX_PREFIX}{city_hash}",
+        fields=["embedding"],
+        m=config["HNSW_M"],
+        ef_construction=config["HNSW_EF_CONSTRUCTION"],
+        opclasses=[METRICS[config["METRIC"]][1]],
+        condition=Q(city_from_gps=city),
+    )
+
+
+def get_search_params(
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    exact: bool = False,
+    iterative: bool = False,
+    limit: Optional[int] = None,
+    max_scan_tuples: Optional[int] = None,
+) -> dict:
+    """현재 인덱스 종류에 맞는 쿼리 시점 GUC 파라미터를 반환합니다.
+
+    Args:
+        ef_search: HNSW 검색 후보 수
+        probes: IVFFlat 탐색 리스트 수
+        exact: ANN 인덱스를 쓰지 않고 정확히 계산 (필터 결과가 작을 때)
+        iterative: 필터로 버려지는 결과만큼 HNSW 인덱스를 더 탐색 (반복 스캔)
+        limit: 가져올 결과 수 (HNSW는 ef_search개까지만 반환하므로 그 이상으로 올림)
+        max_scan_tuples: 반복 스캔 탐색 한도 (None이면 settings 값)
+
+    Returns:
+        {"hnsw.ef_search": int, ...} 또는 {"ivfflat.probes": int}
+
+    """
+    config = get_vector_index_config()
+    if exact:
+        # 인덱스 스캔만 끄면 필터 인덱스는 비트맵 스캔으로 계속 사용되고,
+        # 비트맵을 지원하지 않는 벡터 인덱스만 제외됨
+        return {"enable_indexscan": "off"}
+    if config["TYPE"] == INDEX_TYPE_HNSW:
+        ef_search = max(int(ef_search or config["HNSW_EF_SEARCH"]), int(limit or 0))
+        params = {"hnsw.ef_search": min(ef_search, HNSW_MAX_EF_SEARCH)}
+        iterative_scan = str(config["HNSW_ITERATIVE_SCAN"]).lower()
+        if iterative and iterative_scan != "off":
+            params["hnsw.iterative_scan"] = iterative_scan
+            params["hnsw.max_scan_tuples"] = int(
+                max_scan_tuples or config["HNSW_MAX_SCAN_TUPLES"]
+            )
+        return params
+    return {"ivfflat.probes": int(probes or config["IVFFLAT_PROBES"])}
+
+
+def supports_iterative_scan() -> bool:
+    """ANN 인덱스가 필터로 버려진 만큼 더 탐색(반복 스캔)할 수 있는지 반환합니다."""
+    config = get_vector_index_config()
+    return (
+        config["TYPE"] == INDEX_TYPE_HNSW
+        and str(config["HNSW_ITERATIVE_SCAN"]).lower() != "off"
+    )
+
+
+@contextmanager
+def vector_search_session(
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    exact: bool = False,
+    iterative: bool = False,
+    limit: Optional[int] = None,
+    max_scan_tuples: Optional[int] = None,
+) -> Iterator[None]:
+    """트랜잭션 범위에서만 유효한 ANN 검색 파라미터를 적용합니다.
+
+    set_config(..., true)는 SET LOCAL과 동일하게 트랜잭션 종료 시 원복되므로
+    커넥션 풀을 공유해도 다른 요청에 영향을 주지 않습니다.
+    쿼리셋은 반드시 이 블록 안에서 평가해야 파라미터가 적용됩니다.
+    """
+    params = get_search_params(
+        ef_search,
+        probes,
+        exact=exact,
+        iterative=iterative,
+        limit=limit,
+        max_scan_tuples=max_scan_tuples,
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for name, value in params.items():
+                cursor.execute("SELECT set_config(%s, %s, true)", [name, str(value)])
+        yield
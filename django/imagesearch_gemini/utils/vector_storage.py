@@ -0,0 +1,180 @@
+from typing import Optional, Sequence
+
+import numpy as np
+from pgvector import HalfVector
+from pgvector.django import BitField, HalfVectorField, HammingDistance, VectorField
+
+from django.conf import settings
+from django.db.models import Func, QuerySet
+from django.db.models.functions import Cast
+
+from .embedding_backends import VECTOR_DIMENSION
+from .vector_index import (
+    get_vector_index_config,
+    uses_normalized_vectors,
+    vector_distance,
+)
+
+# full: float32 embedding 컬럼을 ANN 인덱스로 직접 검색
+# halfvec: float16 embedding_half 인덱스로 후보를 고른 뒤 float32로 재정렬
+# binary: 부호 비트 embedding_bits 인덱스(해밍 거리)로 후보를 고른 뒤 float32로 재정렬
+MODE_FULL = "full"
+MODE_HALFVEC = "halfvec"
+MODE_BINARY = "binary"
+MODES = (MODE_FULL, MODE_HALFVEC, MODE_BINARY)
+
+DEFAULT_VECTOR_STORAGE = {
+    "MODE": MODE_FULL,
+    # MODE가 full이어도 압축 컬럼을 함께 기록 (모드 전환 전 미리 채워 둘 때)
+    "COMPACT_COLUMNS": False,
+    # 재정렬 대상 후보 수 (limit보다 작으면 limit 사용)
+    "RERANK_CANDIDATES": 200,
+}
+
+
+def get_vector_storage_config() -> dict:
+    """settings.VECTOR_STORAGE 값을 기본값과 합쳐 반환합니다."""
+    config = dict(DEFAULT_VECTOR_STORAGE)
+    config.update(getattr(settings, "VECTOR_STORAGE", {}) or {})
+    config["MODE"] = str(config["MODE"]).lower()
+    if config["MODE"] not in MODES:
+        raise ValueError(
+            f"지원하지 않는 벡터 저장 모드입니다: {config['MODE']} "
+            f"(허용: {', '.join(MODES)})"
+        )
+    return config
+
+
+def compact_columns_enabled() -> bool:
+    """새 임베딩을 저장할 때 halfvec/bit 컬럼도 채워야 하는지 반환합니다."""
+    config = get_vector_storage_config()
+    return config["COMPACT_COLUMNS"] or config["MODE"] != MODE_FULL
+
+
+class BinaryQuantize(Func):
+    """pgvector binary_quantize(): 양수 성분은 1, 나머지는 0인 비트열."""
+
+    function = "binary_quantize"
+    output_field = BitField()
+
+
+def quantize_embeddings(queryset: QuerySet) -> int:
+    """embedding 컬럼에서 embedding_half/embedding_bits를 DB 안에서 계산해 저장합니다.
+
+    벡터가 Python을 거치지 않도록 UPDATE 한 번으로 처리합니다.
+
+    Returns:
+        갱신된 행 수
+
+    """
+    return queryset.filter(embedding__isnull=False).update(
+        embedding_half=Cast("embedding", HalfVectorField(dimensions=VECTOR_DIMENSION)),
+        embedding_bits=Cast(
+            BinaryQuantize("embedding"), BitField(length=VECTOR_DIMENSION)
+        ),
+    )
+
+
+class L2Normalize(Func):
+    """pgvector l2_normalize(): 단위 길이로 정규화한 벡터."""
+
+    function = "l2_normalize"
+    output_field = VectorField()
+
+
+def normalize_vector(vector: Sequence[float]) -> list:
+    """벡터를 단위 길이로 정규화합니다 (영벡터는 그대로)."""
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        return vector.tolist()
+    return (vector / norm).tolist()
+
+
+def prepare_embedding(vector: Optional[Sequence[float]]) -> Optional[list]:
+    """저장/검색 전에 거리 척도에 맞게 벡터를 정리합니다 (ip/cosine은 정규화)."""
+    if vector is None or not uses_normalized_vectors():
+        return vector
+    return normalize_vector(vector)
+
+
+def normalize_embeddings(queryset: QuerySet) -> int:
+    """저장된 embedding을 DB 안에서 단위 길이로 정규화합니다.
+
+    Returns:
+        갱신된 행 수
+
+    """
+    return queryset.filter(embedding__isnull=False).update(
+        embedding=Cast(
+            L2Normalize("embedding"), VectorField(dimensions=VECTOR_DIMENSION)
+        )
+    )
+
+
+def binary_quantize(vector: Sequence[float]) -> str:
+    """검색어 벡터를 binary_quantize()와 같은 규칙의 비트 문자열로 변환합니다."""
+    return "".join("1" if x > 0 else "0" for x in np.asarray(vector).ravel())
+
+
+def get_rerank_candidates(limit: int) -> int:
+    """재정렬할 후보 수를 반환합니다."""
+    return max(limit, int(get_vector_storage_config()["RERANK_CANDIDATES"]))
+
+
+def get_candidate_ef_search(ef_search: Optional[int], limit: int) -> Optional[int]:
+    """압축 모드에서는 HNSW가 후보 수만큼 결과를 내도록 ef_search를 올립니다."""
+    if get_vector_storage_config()["MODE"] == MODE_FULL:
+        return ef_search
+    ef_search = ef_search or get_vector_index_config()["HNSW_EF_SEARCH"]
+    return max(ef_search, get_rerank_candidates(limit))
+
+
+def annotate_distance(
+    queryset: QuerySet,
+    query_vector: np.ndarray,
+    limit: int,
+    mode: Optional[str] = None,
+    candidates: Optional[int] = None,
+) -> QuerySet:
+    """검색어 벡터와의 거리로 정렬한 상위 limit개 쿼리셋을 반환합니다.
+
+    거리 식은 settings.VECTOR_INDEX['METRIC']를 따릅니다. 압축 모드에서는 압축
+    컬럼 인덱스로 후보를 먼저 고른 뒤(1단계), 후보만 float32 embedding으로
+    정확한 거리를 계산해 재정렬합니다(2단계). 두 단계 모두 한 번의 SQL
+    (IN 서브쿼리)로 실행되며, 결과에는 항상 정확한 distance 값이 붙습니다.
+
+    Args:
+        queryset: 필터가 적용된 ImageEmbedding 쿼리셋
+        query_vector: 검색어 벡터 (float32)
+        limit: 결과 수
+        mode: 저장 모드 (None이면 settings 값)
+        candidates: 재정렬 후보 수 (None이면 settings 값)
+
+    Returns:
+        distance 순으로 정렬·슬라이스된 쿼리셋
+
+    """
+    mode = mode or get_vector_storage_config()["MODE"]
+    if mode == MODE_FULL:
+        return queryset.annotate(
+            distance=vector_distance("embedding", query_vector)
+        ).order_by("distance")[:limit]
+
+    if mode == MODE_HALFVEC:
+        distance = vector_distance("embedding_half", HalfVector(query_vector))
+    elif mode == MODE_BINARY:
+        distance = HammingDistance("embedding_bits", binary_quantize(query_vector))
+    else:
+        raise ValueError(f"지원하지 않는 벡터 저장 모드입니다: {mode}")
+
+    candidate_ids = (
+        queryset.annotate(candidate_distance=distance)
+        .order_by("candidate_distance")
+        .values("id")[: candidates or get_rerank_candidates(limit)]
+    )
+    return (
+        queryset.model.objects.filter(id__in=candidate_ids)
+        .annotate(distance=vector_distance("embedding", query_vector))
+        .order_by("distance")[:limit]
+    )
@@ -0,0 +1,246 @@
+import hashlib
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import ImageEmbedding, IngestionJob, WatchedFolder
+from ..storage.google_drive import (
+    WATCH_CHANGE_FIELDS,
+    get_google_drive_change_token,
+    is_change_token_expired,
+    iter_google_drive_folder_images,
+    list_google_drive_changed_files,
+)
+from ..storage.onedrive import (
+    WATCH_ITEM_SELECT,
+    get_onedrive_delta_link,
+    is_delta_link_expired,
+    iter_onedrive_folder_items,
+    list_onedrive_changed_items,
+)
+
+logger = logging.getLogger(__name__)
+
+INFLIGHT_KEY_PREFIX = "imagesearch:watched:inflight"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+# source_ref IN (...) 조회 묶음 크기
+LOOKUP_BATCH_SIZE = 1000
+
+DEFAULT_WATCHED_FOLDER_SYNC = {
+    "INTERVAL": 300,  # 동기화 주기(초)
+    "MAX_ITEMS_PER_MINUTE": 120,  # 수신 단계에 넘기는 최대 속도
+    "CHUNK_SIZE": 20,  # ingest_receive_task 한 번에 넘기는 항목 수
+    "INFLIGHT_TTL": 6 * 3600,  # 수집 중 표시 유지 시간(초)
+}
+
+
+def get_watched_folder_config() -> dict:
+    """settings.WATCHED_FOLDER_SYNC와 기본값을 합친 설정을 반환합니다."""
+    config = dict(DEFAULT_WATCHED_FOLDER_SYNC)
+    config.update(getattr(settings, "WATCHED_FOLDER_SYNC", {}) or {})
+    return config
+
+
+def _is_image_name(name: Optional[str]) -> bool:
+    return bool(name) and name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _build_item(folder: WatchedFolder, file_id, name, version) -> dict:
+    return {
+        "provider": folder.provider,
+        "user_email": folder.user_email,
+        "file_id": file_id,
+        "name": name,
+        "drive_id": folder.drive_id,
+        "source_ref": f"{folder.provider}:{file_id}:{version or ''}",
+    }
+
+
+def _google_item(folder: WatchedFolder, file: dict) -> Optional[dict]:
+    """Drive 파일이 감시 폴더 바로 아래의 이미지이면 수집 항목으로 변환합니다."""
+    if not file or file.get("trashed"):
+        return None
+    if folder.folder_id not in file.get("parents", []):
+        return None
+    if not (
+        file.get("mimeType", "").startswith("image/")
+        or _is_image_name(file.get("name"))
+    ):
+        return None
+    # md5Checksum은 내용이 바뀔 때만 달라지므로 이름 변경은 다시 수집하지 않음
+    return _build_item(folder, file["id"], file.get("name"), file.get("md5Checksum"))
+
+
+def _onedrive_item(folder: WatchedFolder, item: dict) -> Optional[dict]:
+    """Graph 항목이 감시 폴더 바로 아래의 이미지이면 수집 항목으로 변환합니다."""
+    if not item or "deleted" in item or "file" not in item:
+        return None
+    if (item.get("parentReference") or {}).get("id") != folder.folder_id:
+        return None
+    if not _is_image_name(item.get("name")):
+        return None
+    return _build_item(folder, item["id"], item.get("name"), item.get("cTag"))
+
+
+def _collect_google(folder: WatchedFolder) -> Tuple[Iterable[dict], str]:
+    if not folder.scan_completed:
+        files = iter_google_drive_folder_images(
+            folder.user_email, folder.folder_id, folder.drive_id
+        )
+        return (_google_item(folder, file) for file in files), folder.cursor
+
+    changes, cursor = list_google_drive_changed_files(
+        folder.user_email, folder.cursor, fields=WATCH_CHANGE_FIELDS
+    )
+    files = (change.get("file") for change in changes if not change.get("removed"))
+    return (_google_item(folder, file) for file in files), cursor
+
+
+def _collect_onedrive(folder: WatchedFolder) -> Tuple[Iterable[dict], str]:
+    if not folder.scan_completed:
+        items = iter_onedrive_folder_items(
+            folder.user_email, folder.folder_id, folder.drive_id
+        )
+        return (_onedrive_item(folder, item) for item in items), folder.cursor
+
+    items, cursor = list_onedrive_changed_items(folder.user_email, folder.cursor)
+    return (_onedrive_item(folder, item) for item in items), cursor
+
+
+# 프로바이더별 (시작 커서 조회, 수집 대상 조회, 커서 만료 오류 판별) 함수
+PROVIDERS = {
+    "google": (
+        lambda folder: get_google_drive_change_token(folder.user_email),
+        _collect_google,
+        is_change_token_expired,
+    ),
+    "onedrive": (
+        lambda folder: get_onedrive_delta_link(
+            folder.user_email, select=WATCH_ITEM_SELECT, drive_id=folder.drive_id
+        ),
+        _collect_onedrive,
+        is_delta_link_expired,
+    ),
+}
+
+
+def _inflight_key(source_ref: str) -> str:
+    digest = hashlib.sha1(source_ref.encode("utf-8")).hexdigest()
+    return f"{INFLIGHT_KEY_PREFIX}:{digest}"
+
+
+def filter_new_items(items: List[dict]) -> List[dict]:
+    """이미 저장됐거나 수집 중인 항목을 source_ref 기준으로 걸러냅니다.
+
+    묶음마다 DB 조회 한 번과 캐시 조회 한 번만 사용합니다.
+    """
+    new_items = []
+    seen = set()
+    for start in range(0, len(items), LOOKUP_BATCH_SIZE):
+        batch = [
+            item
+            for item in items[start : start + LOOKUP_BATCH_SIZE]
+            if item["source_ref"] not in seen
+        ]
+        refs = [item["source_ref"] for item in batch]
+        seen.update(refs)
+        existing = set(
+            ImageEmbedding.objects.filter(source_ref__in=refs).values_list(
+                "source_ref", flat=True
+            )
+        )
+        inflight = cache.get_many([_inflight_key(ref) for ref in refs])
+        new_items.extend(
+            item
+            for item in batch
+            if item["source_ref"] not in existing
+            and _inflight_key(item["source_ref"]) not in inflight
+        )
+    return new_items
+
+
+def dispatch_items(folder: WatchedFolder, items: List[dict], config: dict) -> int:
+    """수집 항목을 IngestionJob 하나로 묶어 분당 처리량에 맞춰 예약합니다.
+
+    Returns:
+        예약한 항목 수
+
+    """
+    # 순환 import 방지 (tasks → utils)
+    from ..tasks import ingest_receive_task
+
+    if not items:
+        return 0
+    job = IngestionJob.objects.create(
+        source="watched", total_count=len(items), options=folder.options or {}
+    )
+    chunk_size = max(1, config["CHUNK_SIZE"])
+    seconds_per_chunk = chunk_size * 60.0 / max(1, config["MAX_ITEMS_PER_MINUTE"])
+    for index, start in enumerate(range(0, len(items), chunk_size)):
+        chunk = items[start : start + chunk_size]
+        ingest_receive_task.apply_async(
+            (str(job.id), chunk), countdown=index * seconds_per_chunk
+        )
+
+    # 다음 주기에 아직 저장되지 않은 항목을 다시 예약하지 않도록 표시
+    cache.set_many(
+        {_inflight_key(item["source_ref"]): str(job.id) for item in items},
+        config["INFLIGHT_TTL"],
+    )
+    return len(items)
+
+
+def sync_watched_folder(folder: WatchedFolder) -> int:
+    """감시 폴더의 새/변경 이미지만 찾아 수집 파이프라인에 넘깁니다.
+
+    처음에는 시작 커서를 먼저 받아 두고 폴더 전체를 스캔하며, 이후에는
+    커서 이후의 변경분만 조회합니다. 한 주기 처리량(MAX_ITEMS_PER_MINUTE ×
+    INTERVAL)을 넘는 항목은 커서를 옮기지 않고 다음 주기로 넘깁니다.
+
+    Args:
+        folder: WatchedFolder 객체
+
+    Returns:
+        이번 주기에 예약한 항목 수
+
+    """
+    config = get_watched_folder_config()
+    start_cursor_func, collect_func, cursor_expired_func = PROVIDERS[folder.provider]
+
+    try:
+        if folder.cursor is None:
+            # 스캔 전에 커서를 받아 두어야 스캔 중 추가된 파일도 다음 동기화에 잡힘
+            folder.cursor = start_cursor_func(folder)
+            folder.scan_completed = False
+            WatchedFolder.objects.filter(pk=folder.pk).update(
+                cursor=folder.cursor, scan_completed=False
+            )
+        entries, new_cursor = collect_func(folder)
+        items = filter_new_items([entry for entry in entries if entry])
+    except Exception as e:
+        logger.warning(f"감시 폴더 동기화 실패({folder}): {e}")
+        updates = {"last_error": str(e)}
+        if cursor_expired_func(e):
+            # 커서가 만료된 경우에만 다음 주기에 전체 스캔부터 다시 시작
+            # (이미 저장된 파일은 source_ref로 걸러지므로 다시 받지 않음).
+            # 네트워크 오류/토큰 만료/요청 제한은 커서를 유지해 변경분부터 재시도
+            updates.update(cursor=None, scan_completed=False)
+        WatchedFolder.objects.filter(pk=folder.pk).update(**updates)
+        return 0
+
+    budget = max(1, int(config["MAX_ITEMS_PER_MINUTE"] * config["INTERVAL"] / 60))
+    dispatched = dispatch_items(folder, items[:budget], config)
+
+    updates = {
+        "last_synced_at": timezone.now(),
+        "last_error": None,
+        "ingested_count": F("ingested_count") + dispatched,
+    }
+    if len(items) <= budget:
+        updates.update(cursor=new_cursor, scan_completed=True)
+    WatchedFolder.objects.filter(pk=folder.pk).update(**updates)
+    return dispatched
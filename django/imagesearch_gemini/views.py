@@ -1,22 +1,33 @@
+import hashlib
+import json
 import logging
+import mimetypes
 import urllib.parse
 
-from django.core.exceptions import ValidationError
+from django.conf import settings
 from django.core.paginator import Paginator
-from django.http import JsonResponse
+from django.db.models import prefetch_related_objects
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
-from imagesearch_gemini.tasks import generate_image_embedding_task
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, set_response_etag
+from django.views.static import serve
 
-from .models import ImageEmbedding
-from .storage.google_drive import (
-    list_folders_and_images_in_google_drive,
-    save_google_drive_image,
-)
+from .models import ImageEmbedding, IngestionJob
+from .storage.folder_cache import get_cloud_listing
+from .storage.google_drive import iter_google_drive_listing
 from .storage.local_drive import save_uploaded_image
-from .storage.onedrive import list_folders_and_images_in_onedrive, save_onedrive_image
-from .utils.image_processing import process_image
+from .storage.onedrive import iter_onedrive_listing
+from .tasks import ingest_receive_task
+from .utils.ingestion import get_spool_dir
 from .utils.logger import log_performance
+from .utils.renditions import (
+    get_rendition_config,
+    get_rendition_root,
+    rendition_accel_redirect,
+)
 from .utils.search import VectorSearchEngine
+from .utils.search_api import InvalidCursor, search_etag, search_page
 from .utils.validators import (
     DateValidator,
     TextValidator,
@@ -50,9 +61,11 @@ def image_select(request):
 
     if request.method == "POST":
         upload_type = request.POST.get("upload_type", "single")
-        user_date_taken = request.POST.get("date_taken")
-        user_location = request.POST.get("location")
-        user_tags = request.POST.get("tags")
+        options = {
+            "date_taken_user": request.POST.get("date_taken"),
+            "location_user": request.POST.get("location"),
+            "tags": request.POST.get("tags"),
+        }
 
         if upload_type == "cloud":
             image_urls = request.POST.get("image_urls")
@@ -64,73 +77,21 @@ def image_select(request):
 
             url_list = image_urls.split(",") if image_urls else []
             name_list = image_names.split(",") if image_names else []
-
-            saved_count = 0
-            skipped_count = 0
-            not_allowed_count = 0
-            download_failed_count = 0
-
-            for i, url in enumerate(url_list):
-                try:
-                    file_name = (
-                        name_list[i] if i < len(name_list) else f"cloud_image_{i}.jpg"
-                    )
-                    if not any(
-                        file_name.lower().endswith(ext)
-                        for ext in [".jpg", ".jpeg", ".png"]
-                    ):
-                        file_name += ".jpg"
-
-                    try:
-                        if "drive.google.com" in url:
-                            tmp_path = save_google_drive_image(
-                                image_url=url,
-                                file_name=file_name,
-                                date_taken_user=user_date_taken,
-                                location_user=user_location,
-                                tags=user_tags,
-                            )
-                        elif "1drv.ms" in url or "onedrive.live.com" in url:
-                            tmp_path = save_onedrive_image(
-                                image_url=url,
-                                file_name=file_name,
-                                date_taken_user=user_date_taken,
-                                location_user=user_location,
-                                tags=user_tags,
-                            )
-                        else:
-                            raise ValidationError("지원하지 않는 클라우드 URL입니다.")
-
-                        obj = process_image(
-                            image_path=tmp_path,
-                            date_taken_user=user_date_taken,
-                            user_location=user_location,
-                            tag_list=[
-                                t.strip() for t in user_tags.split(",") if t.strip()
-                            ]
-                            if user_tags
-                            else [],
-                        )
-                        if obj == "not_allowed":
-                            not_allowed_count += 1
-                        elif obj:
-                            generate_image_embedding_task.delay(obj.id)
-                            saved_count += 1
-                        else:
-                            skipped_count += 1
-                    except Exception as save_error:
-                        download_failed_count += 1
-                        context["message"] = str(save_error)
-                        logger.error(
-                            f"클라우드 이미지 저장 실패: {url}, 오류: {save_error}"
-                        )
-                except Exception as e:
-                    download_failed_count += 1
-                    logger.error(f"클라우드 이미지 처리 실패: {url}, 오류: {e}")
-
-            context["message"] = (
-                f"클라우드 이미지 처리: {saved_count}개 저장, {skipped_count}개 중복 건너뜀, {not_allowed_count}개 허용되지 않은 확장자 건너뜀, {download_failed_count}개 처리 실패"
+            items = [
+                {"url": url, "name": name_list[i] if i < len(name_list) else None}
+                for i, url in enumerate(url_list)
+            ]
+            # 다운로드는 수신 단계 워커에서 처리
+            job = IngestionJob.objects.create(
+                source="cloud", options=options, total_count=len(items)
             )
+            ingest_receive_task.delay(str(job.id), items)
+            return _ingestion_job_response(
+                request, job, f"클라우드 이미지 {len(items)}개 처리 작업을 등록했습니다."
+            )
+
+        if upload_type not in ("single", "folder"):
+            context = {"message": "알 수 없는 업로드 타입"}
             return render(request, "imagesearch_gemini/image_select.html", context)
 
         files = (
@@ -139,81 +100,76 @@ def image_select(request):
             else [request.FILES.get("image")]
         )
         files = [f for f in files if f]  # None 제거
+        if not files:
+            context = {"message": "파일이 없습니다."}
+            return render(request, "imagesearch_gemini/image_select.html", context)
 
-        if upload_type == "single":
-            if files:
-                try:
-                    tmp_path = save_uploaded_image(
-                        files[0],
-                        date_taken_user=user_date_taken,
-                        location_user=user_location,
-                        tags=user_tags,
-                    )
-                    obj = process_image(
-                        image_path=tmp_path,
-                        date_taken_user=user_date_taken,
-                        user_location=user_location,
-                        tag_list=[t.strip() for t in user_tags.split(",") if t.strip()]
-                        if user_tags
-                        else [],
-                    )
-                    if obj == "not_allowed":
-                        context = {
-                            "message": "jpg, jpeg, png 파일만 업로드할 수 있습니다."
-                        }
-                    elif obj:
-                        generate_image_embedding_task.delay(obj.id)
-                        context = {"message": "이미지 및 정보 저장 완료"}
-                    else:
-                        context = {
-                            "message": "중복된 이미지(이미 등록된 image_unique_id)로 저장하지 않았습니다."
-                        }
-                except Exception as e:
-                    context = {"message": str(e)}
-            else:
-                context = {"message": "파일이 없습니다."}
-
-        elif upload_type == "folder":
-            saved_count = 0
-            skipped_count = 0
-            not_allowed_count = 0
-            for image in files:
-                try:
-                    tmp_path = save_uploaded_image(
-                        image,
-                        date_taken_user=user_date_taken,
-                        location_user=user_location,
-                        tags=user_tags,
-                    )
-                    obj = process_image(
-                        image_path=tmp_path,
-                        date_taken_user=user_date_taken,
-                        user_location=user_location,
-                        tag_list=[t.strip() for t in user_tags.split(",") if t.strip()]
-                        if user_tags
-                        else [],
-                    )
-                    if obj == "not_allowed":
-                        not_allowed_count += 1
-                    elif obj:
-                        generate_image_embedding_task.delay(obj.id)
-                        saved_count += 1
-                    else:
-                        skipped_count += 1
-                except Exception as e:
-                    not_allowed_count += 1
-                    context["message"] = str(e)
-            context["message"] = (
-                f"폴더 업로드: {saved_count}개 저장, {skipped_count}개 중복 건너뜀, {not_allowed_count}개 허용되지 않은 확장자 건너뜀"
-            )
+        # 요청 안에서는 워커와 공유하는 스풀 디렉터리에 파일만 저장하고,
+        # EXIF 추출/지오코딩/저장소 업로드는 파이프라인 워커에서 처리
+        spool_dir = get_spool_dir()
+        items = []
+        not_allowed_count = 0
+        last_error = None
+        for image in files:
+            try:
+                hasher = hashlib.sha256()
+                tmp_path = save_uploaded_image(
+                    image,
+                    date_taken_user=options["date_taken_user"],
+                    location_user=options["location_user"],
+                    tags=options["tags"],
+                    hasher=hasher,
+                    spool_dir=spool_dir,
+                )
+                items.append({"path": tmp_path, "sha256": hasher.hexdigest()})
+            except Exception as e:
+                not_allowed_count += 1
+                last_error = str(e)
+
+        job = IngestionJob.objects.create(
+            source="upload",
+            options=options,
+            total_count=len(files),
+            not_allowed_count=not_allowed_count,
+            last_error=last_error,
+        )
+        if items:
+            ingest_receive_task.delay(str(job.id), items)
         else:
-            context = {"message": "알 수 없는 업로드 타입"}
+            IngestionJob.record(job.id)
+            job.refresh_from_db()
 
-        return render(request, "imagesearch_gemini/image_select.html", context)
+        message = f"이미지 {len(items)}개 처리 작업을 등록했습니다."
+        if not_allowed_count:
+            message += f" ({not_allowed_count}개 허용되지 않은 파일 건너뜀: {last_error})"
+        return _ingestion_job_response(request, job, message)
 
     return render(request, "imagesearch_gemini/image_select.html")
 
 
+def _ingestion_job_response(request, job, message):
+    """작업 ID를 바로 반환합니다 (JSON 요청이면 202, 아니면 진행 상황을 조회하는 화면)."""
+    status_url = reverse("ingestion_job_status", args=[job.id])
+    if "application/json" in request.headers.get("Accept", ""):
+        return JsonResponse(
+            {"job_id": str(job.id), "status_url": status_url, "message": message},
+            status=202,
+        )
+    context = {"message": message, "job_id": job.id, "job_status_url": status_url}
+    return render(request, "imagesearch_gemini/image_select.html", context)
+
+
+def ingestion_job_status(request, job_id):
+    """업로드 작업의 단계별 진행 상황과 처리량을 반환하는 뷰입니다."""
+    try:
+        job = IngestionJob.objects.get(pk=job_id)
+    except IngestionJob.DoesNotExist:
+        return JsonResponse(
+            {"success": False, "message": "작업을 찾을 수 없습니다."}, status=404
+        )
+    return JsonResponse({"success": True, **job.get_progress()})
+
+
 @log_performance
 def image_search(request):
     """이미지 검색 뷰입니다."""
@@ -260,6 +216,8 @@ def image_search(request):
                 {"results": [], "message": error, "query_text": query_text},
             )
 
+        # 템플릿에서 행마다 태그를 조회하지 않도록 한 번에 읽음
+        prefetch_related_objects(results, "tags")
         return render(
             request,
             "imagesearch_gemini/image_search.html",
@@ -269,6 +227,76 @@ def image_search(request):
     return render(request, "imagesearch_gemini/image_search.html")
 
 
+def search_api(request):
+    """JSON 검색 API 뷰입니다.
+
+    필요한 컬럼만 읽은 결과와 다음 페이지 커서(next_cursor)를 반환합니다.
+    코퍼스 세대가 같으면 If-None-Match 요청에 검색 없이 304로 응답합니다.
+    """
+    params = {
+        name: request.GET.get(name)
+        for name in (
+            "query_text",
+            "tags",
+            "location",
+            "date_from",
+            "date_to",
+            "page_size",
+            "cursor",
+        )
+        if request.GET.get(name)
+    }
+    query_text = params.get("query_text")
+
+    if query_text:
+        is_valid, error = TextValidator.validate_search_query(query_text)
+        if not is_valid:
+            return JsonResponse({"success": False, "message": error}, status=400)
+    date_from, date_to = params.get("date_from"), params.get("date_to")
+    if (date_from and date_from.strip()) or (date_to and date_to.strip()):
+        is_valid, error = DateValidator.validate_date_range(date_from, date_to)
+        if not is_valid:
+            return JsonResponse({"success": False, "message": error}, status=400)
+    try:
+        page_size = int(params["page_size"]) if "page_size" in params else None
+    except ValueError:
+        return JsonResponse(
+            {"success": False, "message": "page_size는 정수여야 합니다."}, status=400
+        )
+
+    etag = search_etag(params)
+    if etag:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+    try:
+        results, next_cursor, error = search_page(
+            query_text=query_text,
+            tags=params.get("tags"),
+            location=params.get("location"),
+            date_from=date_from,
+            date_to=date_to,
+            page_size=page_size,
+            cursor=params.get("cursor"),
+        )
+    except InvalidCursor as e:
+        return JsonResponse({"success": False, "message": str(e)}, status=400)
+    if error:
+        return JsonResponse({"success": False, "message": error}, status=502)
+
+    response = JsonResponse(
+        {"success": True, "results": results, "next_cursor": next_cursor}
+    )
+    # 세대를 알 수 없으면 응답 내용으로 ETag 계산
+    if etag:
+        response["ETag"] = etag
+    else:
+        set_response_etag(response)
+    response["Cache-Control"] = "private, no-cache"
+    return get_conditional_response(request, etag=response["ETag"], response=response)
+
+
 @log_performance
 def cloud_image_list(request):
     """클라우드 드라이브(Google/OneDrive)에서 폴더와 이미지를 동시에 가져와 폴더, 이미지는 순서로 보여줍니다."""
@@ -280,6 +308,8 @@ def cloud_image_list(request):
     drive_id = request.GET.get("drive_id") or request.POST.get("drive_id")
     is_shared = str(is_shared) == "1"  # True/False
     selected_images = request.POST.getlist("selected_images")
+    # 새로고침 요청 시 캐시를 건너뛰고 다시 조회
+    refresh = request.GET.get("refresh") == "1"
 
     folders, images = [], []
     folder_name = ""
@@ -287,10 +317,13 @@ def cloud_image_list(request):
 
     if cloud == "google":
         try:
-            folders, images, folder_name, parent_info = (
-                list_folders_and_images_in_google_drive(
-                    cloud_email, parent_id, is_shared=is_shared, drive_id=drive_id
-                )
+            folders, images, folder_name, parent_info = get_cloud_listing(
+                "google",
+                cloud_email,
+                parent_id,
+                is_shared=is_shared,
+                drive_id=drive_id,
+                refresh=refresh,
             )
         except Exception as e:
             context["message"] = str(e)
@@ -298,10 +331,13 @@ def cloud_image_list(request):
 
     elif cloud == "onedrive":
         try:
-            folders, images, folder_name, parent_info = (
-                list_folders_and_images_in_onedrive(
-                    cloud_email, parent_id, is_shared=is_shared, drive_id=drive_id
-                )
+            folders, images, folder_name, parent_info = get_cloud_listing(
+                "onedrive",
+                cloud_email,
+                parent_id,
+                is_shared=is_shared,
+                drive_id=drive_id,
+                refresh=refresh,
             )
         except Exception as e:
             context["message"] = str(e)
@@ -338,6 +374,49 @@ def cloud_image_list(request):
     return render(request, "imagesearch_gemini/cloud_image_list.html", context)
 
 
+def cloud_image_list_stream(request):
+    """클라우드 폴더 목록을 NDJSON으로 스트리밍합니다.
+
+    첫 줄은 {"type": "meta", ...}, 이후 폴더/이미지가 조회되는 대로 한 줄씩 전송하므로
+    항목이 많은 폴더도 전체 페이지를 다 받기 전에 표시를 시작할 수 있습니다.
+    """
+    cloud = request.GET.get("cloud")
+    cloud_email = request.GET.get("cloud_email")
+    parent_id = request.GET.get("parent_id")
+    drive_id = request.GET.get("drive_id")
+    is_shared = str(request.GET.get("is_shared")) == "1"
+
+    try:
+        if cloud == "google":
+            folder_name, parent_info, entries = iter_google_drive_listing(
+                cloud_email, parent_id, is_shared=is_shared, drive_id=drive_id
+            )
+        elif cloud == "onedrive":
+            folder_name, parent_info, entries = iter_onedrive_listing(
+                cloud_email, parent_id, is_shared=is_shared, drive_id=drive_id
+            )
+        else:
+            return JsonResponse(
+                {"success": False, "message": "지원하지 않는 클라우드입니다."},
+                status=400,
+            )
+    except Exception as e:
+        return JsonResponse({"success": False, "message": str(e)}, status=400)
+
+    def _lines():
+        meta = {"type": "meta", "folder_name": folder_name, "parent_info": parent_info}
+        yield json.dumps(meta, ensure_ascii=False) + "\n"
+        try:
+            for kind, item in entries:
+                yield json.dumps({"type": kind, **item}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"클라우드 목록 스트리밍 실패: {e}")
+            yield json.dumps({"type": "error", "message": str(e)}, ensure_ascii=False)
+            yield "\n"
+
+    return StreamingHttpResponse(_lines(), content_type="application/x-ndjson")
+
+
 @log_performance
 def embedding_status_list(request):
     """임베딩 상태 목록을 보여주는 뷰입니다."""
@@ -397,3 +476,26 @@ def similar_images(request, image_id):
             "imagesearch_gemini/similar_images.html",
             {"error": f"유사 이미지 검색 중 오류가 발생했습니다: {e}"},
         )
+
+
+def rendition(request, path):
+    """썸네일/미리보기 렌디션을 장기 캐시 헤더와 함께 반환합니다.
+
+    파일명이 원본 내용 해시로 정해지므로 내용이 바뀌면 URL도 바뀝니다.
+    파일 전송은 X-Accel-Redirect로 nginx에 맡기고, django.views.static.serve는
+    개발 환경(DEBUG)에서만 사용합니다.
+    """
+    config = get_rendition_config()
+    if config["X_ACCEL_REDIRECT"]:
+        accel_path = rendition_accel_redirect(path)
+        if accel_path is None:
+            raise Http404
+        content_type, _ = mimetypes.guess_type(path)
+        response = HttpResponse(content_type=content_type or "application/octet-stream")
+        response["X-Accel-Redirect"] = accel_path
+    elif settings.DEBUG:
+        response = serve(request, path, document_root=get_rendition_root())
+    else:
+        raise Http404
+    response["Cache-Control"] = f"public, max-age={config['CACHE_MAX_AGE']}, immutable"
+    return response
@@ -1,6 +1,20 @@
+import logging
+
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
 
 class OauthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "oauth"
+
+    def ready(self):
+        from .utils import CLIENT_CONFIG_FILES, load_client_config
+
+        # 클라이언트 설정은 시작 시 한 번만 읽음 (토큰 갱신 때 다시 열지 않음)
+        for provider in CLIENT_CONFIG_FILES:
+            try:
+                load_client_config(provider)
+            except (OSError, ValueError) as e:
+                logger.warning(f"OAuth 클라이언트 설정 로드 실패({provider}): {e}")
@@ -1,5 +1,3 @@
-import json
-import os
 import time
 
 import jwt
@@ -8,16 +6,9 @@ from google.auth.transport import requests
 from google.oauth2 import id_token
 from google_auth_oauthlib.flow import Flow
 
-from django.conf import settings
+from .utils import load_client_config, save_token
 
-from .utils import save_token
-
-CONFIG_FILE = os.path.join(
-    settings.BASE_DIR, "oauth/credentials/googledrive-auth-client.json"
-)
-
-with open(CONFIG_FILE, encoding="utf-8") as f:
-    config = json.load(f)
+config = load_client_config("google")
 CLIENT_ID = config["client_id"]
 CLIENT_SECRET = config["client_secret"]
 SCOPES = config.get(
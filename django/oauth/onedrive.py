@@ -1,19 +1,9 @@
-import json
-import os
-
 import jwt
 from msal import ConfidentialClientApplication
 
-from django.conf import settings
-
-from .utils import save_token
-
-CONFIG_FILE = os.path.join(
-    settings.BASE_DIR, "oauth/credentials/onedrive-auth-client.json"
-)
+from .utils import load_client_config, save_token
 
-with open(CONFIG_FILE, encoding="utf-8") as f:
-    config = json.load(f)
+config = load_client_config("onedrive")
 CLIENT_ID = config["client_id"]
 CLIENT_SECRET = config["client_secret"]
 TENANT_ID = config.get("tenant_id", "common")
@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from .utils import token_manager
+
+
+@shared_task
+def refresh_expiring_oauth_tokens() -> int:
+    """만료가 가까운 OAuth 토큰을 사용자 요청 전에 미리 갱신합니다.
+
+    Returns:
+        갱신한 토큰 수
+
+    """
+    return token_manager.refresh_expiring()
@@ -0,0 +1,90 @@
+"""OAuth 토큰 관리자 테스트입니다."""
+
+import datetime
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import OAuthToken
+from ..utils import LOCK_KEY_PREFIX, TokenManager, token_manager
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    OAUTH_TOKEN_MANAGER={"WAIT_TIMEOUT": 0.05, "POLL_INTERVAL": 0.01},
+)
+class TokenManagerTests(TestCase):
+    """OAuth 토큰 관리자 테스트 클래스입니다."""
+
+    def setUp(self):
+        """테스트 설정."""
+        self.user_email = "test@example.com"
+        cache.clear()
+        token_manager.clear()
+        self.manager = TokenManager()
+
+    def _create_token(self, expires_in):
+        return OAuthToken.objects.create(
+            user_email=self.user_email,
+            provider="google",
+            access_token="old_token",
+            refresh_token="refresh_token",
+            expires_at=timezone.now() + datetime.timedelta(seconds=expires_in),
+        )
+
+    def test_live_token_served_from_memory(self):
+        """유효한 토큰은 두 번째 조회부터 DB를 조회하지 않는지 테스트."""
+        self._create_token(3600)
+
+        self.assertEqual(self.manager.get(self.user_email, "google"), "old_token")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.manager.get(self.user_email, "google"), "old_token")
+        self.assertEqual(self.manager.get_stats()["local_hits"], 1)
+
+    @patch("oauth.utils.refresh_google_access_token")
+    def test_expired_token_refreshed_once(self, mock_refresh):
+        """만료된 토큰을 한 번만 갱신하고 refresh_token을 유지하는지 테스트."""
+        self._create_token(-10)
+        mock_refresh.return_value = {"access_token": "new_token", "expires_in": 3600}
+
+        self.assertEqual(self.manager.get(self.user_email, "google"), "new_token")
+        self.assertEqual(self.manager.get(self.user_email, "google"), "new_token")
+
+        mock_refresh.assert_called_once_with("refresh_token")
+        token = OAuthToken.objects.get(user_email=self.user_email)
+        self.assertEqual(token.refresh_token, "refresh_token")
+
+    @patch("oauth.utils.refresh_google_access_token")
+    def test_concurrent_refresh_waits_for_lock_holder(self, mock_refresh):
+        """다른 워커가 갱신 중이면 직접 갱신하지 않고 결과를 기다리는지 테스트."""
+        self._create_token(-10)
+        cache.add(
+            f"{LOCK_KEY_PREFIX}:{self.manager._key_suffix(self.user_email, 'google')}",
+            1,
+        )
+
+        self.assertIsNone(self.manager.get(self.user_email, "google"))
+        mock_refresh.assert_not_called()
+        self.assertEqual(self.manager.get_stats()["refresh_waits"], 1)
+
+    @patch("oauth.utils.refresh_google_access_token")
+    def test_refresh_expiring_tokens(self, mock_refresh):
+        """곧 만료될 토큰만 미리 갱신하는지 테스트."""
+        self._create_token(120)
+        OAuthToken.objects.create(
+            user_email="other@example.com",
+            provider="google",
+            access_token="other_token",
+            refresh_token="other_refresh",
+            expires_at=timezone.now() + datetime.timedelta(hours=1),
+        )
+        mock_refresh.return_value = {"access_token": "new_token", "expires_in": 3600}
+
+        self.assertEqual(self.manager.refresh_expiring(within_seconds=600), 1)
+        mock_refresh.assert_called_once_with("refresh_token")
@@ -1,14 +1,289 @@
 import datetime
+import functools
+import hashlib
 import json
+import logging
 import os
+import threading
+import time
 
 import requests
 
 from django.conf import settings
+from django.core.cache import caches
 from django.utils import timezone
 
 from .models import OAuthToken
 
+logger = logging.getLogger(__name__)
+
+CLIENT_CONFIG_FILES = {
+    "google": "oauth/credentials/googledrive-auth-client.json",
+    "onedrive": "oauth/credentials/onedrive-auth-client.json",
+}
+TOKEN_URLS = {
+    "google": "https://oauth2.googleapis.com/token",
+    "onedrive": "https://login.microsoftonline.com/consumers/oauth2/v2.0/token",
+}
+
+CACHE_KEY_PREFIX = "oauth:token"
+LOCK_KEY_PREFIX = "oauth:refresh"
+
+DEFAULT_OAUTH_TOKEN_MANAGER = {
+    "CACHE_ALIAS": "default",
+    "EXPIRY_SKEW": 60,  # 만료 이 시간(초) 전부터는 만료된 것으로 취급
+    "REFRESH_AHEAD": 600,  # beat 태스크가 미리 갱신하는 범위(초)
+    "LOCK_TIMEOUT": 30,  # refresh 단일 실행 락 유지 시간(초)
+    "WAIT_TIMEOUT": 10,  # 다른 워커의 refresh를 기다리는 최대 시간(초)
+    "POLL_INTERVAL": 0.2,
+    "REQUEST_TIMEOUT": 10,
+}
+
+
+def _get_config():
+    config = dict(DEFAULT_OAUTH_TOKEN_MANAGER)
+    config.update(getattr(settings, "OAUTH_TOKEN_MANAGER", {}) or {})
+    return config
+
+
+@functools.lru_cache(maxsize=None)
+def load_client_config(provider):
+    """프로바이더의 OAuth 클라이언트 설정(JSON)을 한 번만 읽어 반환합니다."""
+    config_file = os.path.join(settings.BASE_DIR, CLIENT_CONFIG_FILES[provider])
+    with open(config_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TokenManager:
+    """OAuth access token을 프로세스 메모리 → Redis → DB 순으로 조회합니다.
+
+    만료된 토큰의 refresh는 (사용자, 프로바이더)마다 한 워커만 수행하고
+    (Redis 락), 나머지 요청은 그 결과가 캐시에 올라오기를 기다립니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = {}  # {(user_email, provider): (access_token, expires_ts)}
+        self._stats = {
+            "local_hits": 0,
+            "cache_hits": 0,
+            "db_hits": 0,
+            "refreshes": 0,
+            "refresh_waits": 0,
+        }
+
+    @staticmethod
+    def _key_suffix(user_email, provider):
+        email_hash = hashlib.sha1((user_email or "").lower().encode("utf-8"))
+        return f"{provider}:{email_hash.hexdigest()}"
+
+    def _cache(self, config):
+        return caches[config["CACHE_ALIAS"]]
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _is_live(self, expires_ts, config):
+        return (
+            expires_ts is not None and expires_ts - config["EXPIRY_SKEW"] > time.time()
+        )
+
+    def _get_cached(self, user_email, provider, config):
+        key = (user_email, provider)
+        with self._lock:
+            entry = self._tokens.get(key)
+        if entry and self._is_live(entry[1], config):
+            self._count("local_hits")
+            return entry[0]
+
+        try:
+            entry = self._cache(config).get(
+                f"{CACHE_KEY_PREFIX}:{self._key_suffix(user_email, provider)}"
+            )
+        except Exception as e:
+            logger.warning(f"OAuth 토큰 캐시 조회 실패: {e}")
+            entry = None
+        if entry and self._is_live(entry[1], config):
+            with self._lock:
+                self._tokens[key] = tuple(entry)
+            self._count("cache_hits")
+            return entry[0]
+        return None
+
+    def store(self, user_email, provider, access_token, expires_at):
+        """유효한 토큰을 프로세스 메모리와 Redis에 저장합니다."""
+        config = _get_config()
+        key = (user_email, provider)
+        if not access_token or expires_at is None:
+            self.forget(user_email, provider)
+            return
+        expires_ts = expires_at.timestamp()
+        with self._lock:
+            self._tokens[key] = (access_token, expires_ts)
+        ttl = int(expires_ts - config["EXPIRY_SKEW"] - time.time())
+        if ttl <= 0:
+            return
+        try:
+            self._cache(config).set(
+                f"{CACHE_KEY_PREFIX}:{self._key_suffix(user_email, provider)}",
+                (access_token, expires_ts),
+                ttl,
+            )
+        except Exception as e:
+            logger.warning(f"OAuth 토큰 캐시 저장 실패: {e}")
+
+    def forget(self, user_email, provider):
+        """캐시된 토큰을 버립니다."""
+        with self._lock:
+            self._tokens.pop((user_email, provider), None)
+        try:
+            self._cache(_get_config()).delete(
+                f"{CACHE_KEY_PREFIX}:{self._key_suffix(user_email, provider)}"
+            )
+        except Exception as e:
+            logger.warning(f"OAuth 토큰 캐시 삭제 실패: {e}")
+
+    def _load_from_db(self, user_email, provider, config):
+        token = OAuthToken.objects.filter(
+            user_email=user_email, provider=provider
+        ).first()
+        if (
+            token
+            and token.expires_at
+            and self._is_live(token.expires_at.timestamp(), config)
+        ):
+            self.store(user_email, provider, token.access_token, token.expires_at)
+            return token, token.access_token
+        return token, None
+
+    def get(self, user_email, provider):
+        """유효한 access token을 반환합니다 (필요하면 refresh).
+
+        Returns:
+            access token 문자열 또는 None (토큰이 없거나 refresh 실패)
+
+        """
+        config = _get_config()
+        access_token = self._get_cached(user_email, provider, config)
+        if access_token:
+            return access_token
+
+        token, access_token = self._load_from_db(user_email, provider, config)
+        if access_token:
+            self._count("db_hits")
+            return access_token
+        if not token or not token.refresh_token:
+            return None
+        return self.refresh(user_email, provider)
+
+    def refresh(self, user_email, provider, force=False):
+        """refresh token으로 access token을 갱신합니다 (단일 실행).
+
+        Args:
+            user_email: 사용자 이메일
+            provider: "google" 또는 "onedrive"
+            force: 아직 유효한 토큰도 갱신할지 여부 (미리 갱신용)
+
+        Returns:
+            access token 문자열 또는 None
+
+        """
+        config = _get_config()
+        cache = self._cache(config)
+        lock_key = f"{LOCK_KEY_PREFIX}:{self._key_suffix(user_email, provider)}"
+        try:
+            acquired = cache.add(lock_key, 1, config["LOCK_TIMEOUT"])
+        except Exception as e:
+            # Redis 장애 시에는 단일 실행 보장 없이 진행
+            logger.warning(f"OAuth refresh 락 획득 실패: {e}")
+            acquired = True
+
+        if not acquired:
+            return self._wait_for_refresh(user_email, provider, config)
+
+        try:
+            token, access_token = self._load_from_db(user_email, provider, config)
+            if access_token and not force:
+                # 락을 기다리는 사이 다른 워커가 이미 갱신함
+                return access_token
+            if not token or not token.refresh_token:
+                return None
+
+            refresh_func = REFRESH_FUNCTIONS.get(provider)
+            new_token_data = refresh_func(token.refresh_token) if refresh_func else None
+            if not new_token_data or "access_token" not in new_token_data:
+                logger.warning(f"OAuth 토큰 갱신 실패: {provider} - {user_email}")
+                return access_token
+
+            self._count("refreshes")
+            # refresh_token이 응답에 없으면 기존 값 유지
+            save_token(
+                user_email,
+                provider,
+                {
+                    "access_token": new_token_data["access_token"],
+                    "refresh_token": new_token_data.get("refresh_token")
+                    or token.refresh_token,
+                    "expires_in": new_token_data.get("expires_in"),
+                },
+            )
+            return new_token_data["access_token"]
+        finally:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                pass
+
+    def _wait_for_refresh(self, user_email, provider, config):
+        self._count("refresh_waits")
+        deadline = time.monotonic() + config["WAIT_TIMEOUT"]
+        while time.monotonic() < deadline:
+            time.sleep(config["POLL_INTERVAL"])
+            access_token = self._get_cached(user_email, provider, config)
+            if access_token:
+                return access_token
+        _, access_token = self._load_from_db(user_email, provider, config)
+        return access_token
+
+    def refresh_expiring(self, within_seconds=None):
+        """곧 만료될 토큰을 미리 갱신합니다 (beat 태스크용).
+
+        Returns:
+            갱신에 성공한 토큰 수
+
+        """
+        config = _get_config()
+        within = config["REFRESH_AHEAD"] if within_seconds is None else within_seconds
+        deadline = timezone.now() + datetime.timedelta(seconds=within)
+        expiring = OAuthToken.objects.filter(
+            refresh_token__isnull=False, expires_at__lte=deadline
+        ).exclude(refresh_token="")
+
+        refreshed = 0
+        for user_email, provider in expiring.values_list("user_email", "provider"):
+            try:
+                if self.refresh(user_email, provider, force=True):
+                    refreshed += 1
+            except Exception as e:
+                logger.warning(f"OAuth 토큰 미리 갱신 실패({provider}): {e}")
+        return refreshed
+
+    def get_stats(self):
+        """캐시 적중/갱신 횟수를 반환합니다."""
+        with self._lock:
+            return dict(self._stats, size=len(self._tokens))
+
+    def clear(self):
+        """프로세스 캐시와 지표를 초기화합니다 (Redis는 유지)."""
+        with self._lock:
+            self._tokens.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+token_manager = TokenManager()
+
 
 def save_token(user_email, provider, token_data):
     expires_in = token_data.get("expires_in")
@@ -24,76 +299,44 @@ def save_token(user_email, provider, token_data):
             "expires_at": expires_at,
         },
     )
+    token_manager.store(user_email, provider, token_data["access_token"], expires_at)
 
 
 def get_token(user_email, provider):
-    token = OAuthToken.objects.filter(user_email=user_email, provider=provider).first()
-    if token:
-        if token.expires_at and token.expires_at > timezone.now():
-            return token.access_token
-        # 만료된 경우 refresh 시도
-        refresh_token = token.refresh_token
-        if refresh_token:
-            if provider == "google":
-                new_token_data = refresh_google_access_token(refresh_token)
-            elif provider == "onedrive":
-                new_token_data = refresh_onedrive_access_token(refresh_token)
-            else:
-                return None
-            if new_token_data and "access_token" in new_token_data:
-                # refresh_token이 응답에 없으면 기존 값 유지
-                new_refresh_token = new_token_data.get("refresh_token") or refresh_token
-                save_token(
-                    user_email,
-                    provider,
-                    {
-                        "access_token": new_token_data["access_token"],
-                        "refresh_token": new_refresh_token,
-                        "expires_in": new_token_data.get("expires_in"),
-                    },
-                )
-                return new_token_data["access_token"]
-    return None
+    return token_manager.get(user_email, provider)
 
 
-def refresh_google_access_token(refresh_token):
-    CONFIG_FILE = os.path.join(
-        settings.BASE_DIR, "oauth/credentials/googledrive-auth-client.json"
-    )
-    with open(CONFIG_FILE, encoding="utf-8") as f:
-        config = json.load(f)
-    client_id = config["client_id"]
-    client_secret = config["client_secret"]
-    token_url = "https://oauth2.googleapis.com/token"
+def _refresh_access_token(provider, refresh_token, **extra):
+    client_config = load_client_config(provider)
     data = {
-        "client_id": client_id,
-        "client_secret": client_secret,
+        "client_id": client_config["client_id"],
+        "client_secret": client_config["client_secret"],
         "refresh_token": refresh_token,
         "grant_type": "refresh_token",
+        **extra,
     }
-    response = requests.post(token_url, data=data)
+    response = requests.post(
+        TOKEN_URLS[provider], data=data, timeout=_get_config()["REQUEST_TIMEOUT"]
+    )
     if response.status_code == 200:
         return response.json()
     return None
 
 
+def refresh_google_access_token(refresh_token):
+    return _refresh_access_token("google", refresh_token)
+
+
 def refresh_onedrive_access_token(refresh_token):
-    CONFIG_FILE = os.path.join(
-        settings.BASE_DIR, "oauth/credentials/onedrive-auth-client.json"
+    return _refresh_access_token(
+        "onedrive",
+        refresh_token,
+        scope="https://graph.microsoft.com/.default offline_access",
     )
-    with open(CONFIG_FILE, encoding="utf-8") as f:
-        config = json.load(f)
-    client_id = config["client_id"]
-    client_secret = config["client_secret"]
-    token_url = "https://login.microsoftonline.com/consumers/oauth2/v2.0/token"
-    data = {
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "refresh_token": refresh_token,
-        "grant_type": "refresh_token",
-        "scope": "https://graph.microsoft.com/.default offline_access",
-    }
-    response = requests.post(token_url, data=data)
-    if response.status_code == 200:
-        return response.json()
-    return None
+
+
+# 프로바이더별 refresh 함수 (테스트에서 교체 가능하도록 이름으로 조회)
+REFRESH_FUNCTIONS = {
+    "google": lambda refresh_token: refresh_google_access_token(refresh_token),
+    "onedrive": lambda refresh_token: refresh_onedrive_access_token(refresh_token),
+}
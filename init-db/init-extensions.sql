@@ -3,3 +3,6 @@ CREATE EXTENSION IF NOT EXISTS vector;
 
 -- postgis 확장 활성화
 CREATE EXTENSION IF NOT EXISTS postgis;
+
+-- pg_trgm 확장 활성화 (장소/태그 부분 일치 검색 인덱스)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;